@@ -7,16 +7,16 @@ import logging
 import os
 from logging.handlers import RotatingFileHandler
 
+import click
 from flask import Flask
 from flask_cors import CORS
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
 from app.utils.database import init_database
+from app.utils.db_routing import RoutingSession, init_db_routing
 
 # Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def create_app(config_name="development"):
@@ -47,7 +47,14 @@ def create_app(config_name="development"):
 
     # Initialize extensions with app
     db.init_app(app)
-    migrate.init_app(app, db)
+    init_db_routing(app)
+
+    # Flask-Migrate (and Alembic) only back the `flask db` commands; servers
+    # and workers never load them
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
 
     # Enable CORS
     allowed_origins = [
@@ -75,8 +82,14 @@ def create_app(config_name="development"):
             r"/api/*": {
                 "origins": allowed_origins,
                 "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-                "expose_headers": ["Content-Range", "X-Content-Range"],
+                "allow_headers": [
+                    "Content-Type",
+                    "Authorization",
+                    "X-Requested-With",
+                    "Upload-Offset",
+                    "Upload-Checksum",
+                ],
+                "expose_headers": ["Content-Range", "X-Content-Range", "Upload-Offset"],
                 "supports_credentials": True,
                 "max_age": 3600,
             }
@@ -86,7 +99,7 @@ def create_app(config_name="development"):
 
     # Register blueprints
     from app.routes import admin_routes, auth_routes, course_routes, health_routes, notification_routes
-    from app.routes import quiz_routes
+    from app.routes import material_routes, metrics_routes, quiz_routes
 
     app.register_blueprint(health_routes.bp)
     app.register_blueprint(auth_routes.bp)
@@ -94,28 +107,37 @@ def create_app(config_name="development"):
     app.register_blueprint(notification_routes.bp)
     app.register_blueprint(course_routes.bp)
     app.register_blueprint(quiz_routes.bp)
+    app.register_blueprint(metrics_routes.bp)
+    app.register_blueprint(material_routes.bp)
 
     # Import all models to register them with SQLAlchemy metadata
     # This ensures db.create_all() can properly handle all model relationships
     from app.models import (  # noqa: F401
         User,
         Achievement,
+        AnalyticsRollupWatermark,
         AttemptAnswer,
         Certificate,
         CertificateSharingLog,
         CertificateTemplate,
         CertificateVerificationLog,
         Challenge,
+        ContentCompletionDailyRollup,
         Coupon,
         Course,
+        CourseActivityDailyRollup,
         CourseActivityLog,
         CourseCategory,
         CourseEnrollment,
+        CourseEnrollmentDailyRollup,
         CourseEnrollmentKey,
         CourseLesson,
         CourseReview,
         CourseSection,
+        CourseStats,
         CourseStatusAudit,
+        CourseUpload,
+        CourseUploadChunk,
         EmailVerificationToken,
         Invoice,
         LeaderboardSnapshot,
@@ -134,9 +156,12 @@ def create_app(config_name="development"):
         Permission,
         PointTransaction,
         Question,
+        QuestionItemStats,
         QuestionOption,
         Quiz,
         QuizAttempt,
+        QuizAttemptDeadline,
+        QuizAttemptSlot,
         Refund,
         Review,
         ReviewFlag,
@@ -144,6 +169,7 @@ def create_app(config_name="development"):
         ReviewVote,
         Role,
         RolePermission,
+        SchemaVersion,
         Streak,
         Transaction,
         UserAccountStatus,
@@ -167,20 +193,17 @@ def create_app(config_name="development"):
     skip_init = os.environ.get("SKIP_AUTO_INIT", "false").lower() == "true"
 
     if not app.testing and not skip_init:
+        from app.commands import auto_seed
+
+        # A database already at the current schema fingerprint costs one query;
+        # otherwise tables are created, migrations applied and empty tables
+        # auto-seeded with initial data
         app.logger.info("Initializing database...")
-        db_ready = init_database(app, db)
+        db_ready = init_database(app, db, seed=auto_seed)
         if not db_ready:
             app.logger.warning(
-                "Database initialization completed with warnings. Check logs above."
-            )
-
-        # Auto-seed empty tables with initial data (only when DB is ready)
-        if db_ready:
-            from app.commands import auto_seed
-            auto_seed(app)
-        else:
-            app.logger.warning(
-                "Skipping auto-seed: database tables may not be ready yet."
+                "Database initialization completed with warnings. Check logs above. "
+                "Auto-seed may not have run: database tables may not be ready yet."
             )
     elif skip_init:
         app.logger.info(
@@ -193,6 +216,16 @@ def create_app(config_name="development"):
 
     register_error_handlers(app)
 
+    # Per-request SQL counts / timing headers and N+1 warnings
+    from app.middleware.query_profiler import register_query_profiler
+
+    register_query_profiler(app)
+
+    # Per-route latency histograms and status counts for /metrics
+    from app.middleware.request_metrics import register_request_metrics
+
+    register_request_metrics(app)
+
     return app
 
 
@@ -488,6 +488,472 @@ def seed_cli():
 # ---------------------------------------------------------------------------
 # (seed templates command removed)
 
+# ---------------------------------------------------------------------------
+# Synthetic load-test data
+# ---------------------------------------------------------------------------
+
+
+def _count_option(ctx, param, value):
+    from app.utils.synthetic_data import parse_count
+
+    try:
+        return parse_count(value)
+    except ValueError:
+        raise click.BadParameter(f"{value!r} is not a count like 2000, 100k or 1M")
+
+
+@seed_cli.command("synthetic")
+@click.option("--users", default="1k", show_default=True, callback=_count_option,
+              help="Users (teachers included); accepts 100k, 1M")
+@click.option("--courses", default="50", show_default=True, callback=_count_option,
+              help="Published courses")
+@click.option("--enrollments", default="10k", show_default=True, callback=_count_option,
+              help="Student enrollments")
+@click.option("--sections", default=3, show_default=True, help="Sections per course")
+@click.option("--lessons", default=3, show_default=True, help="Lessons (videos) per section")
+@click.option("--questions", default=5, show_default=True, help="Questions per course quiz")
+@click.option("--progress", default=2, show_default=True,
+              help="Videos with watch progress per active enrollment")
+@click.option("--notifications", default=5, show_default=True, help="Notifications per student")
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per INSERT and commit")
+@click.option("--seed", type=int, default=None, help="Random seed for reproducible data")
+def seed_synthetic_data(users, courses, enrollments, sections, lessons, questions, progress,
+                        notifications, batch_size, seed):
+    """Fill the database with a production-sized synthetic dataset for load tests."""
+    import time
+
+    from app.utils.synthetic_data import SYNTHETIC_PASSWORD, seed_synthetic
+
+    current = {"table": None}
+
+    def report(table, inserted):
+        if current["table"] not in (None, table):
+            click.echo("")
+        current["table"] = table
+        click.echo(f"\r  {table:<28} {inserted:>10}", nl=False)
+
+    try:
+        started = time.perf_counter()
+        counts = seed_synthetic(
+            users=users,
+            courses=courses,
+            enrollments=enrollments,
+            sections_per_course=sections,
+            lessons_per_section=lessons,
+            questions_per_quiz=questions,
+            progress_per_enrollment=progress,
+            notifications_per_user=notifications,
+            batch_size=batch_size,
+            seed=seed,
+            progress_callback=report,
+        )
+        click.echo("")
+        elapsed = time.perf_counter() - started
+        click.echo(click.style(f"✓ Synthetic data seeded in {elapsed:.1f}s", fg="green", bold=True))
+        click.echo(f"  Users log in as syn_{counts['tag']}_<n> with password {SYNTHETIC_PASSWORD}")
+
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f"Error seeding synthetic data: {str(e)}", err=True)
+        logger.error(f"Error seeding synthetic data: {str(e)}", exc_info=True)
+
+
+# ===================== Analytics Commands =====================
+
+
+@click.group()
+def analytics_cli():
+    """Analytics maintenance commands."""
+    pass
+
+
+@analytics_cli.command("rollup")
+@click.option(
+    "--until",
+    default=None,
+    help="Process rows up to this ISO timestamp (default: now minus safety lag)",
+)
+def rollup_analytics(until):
+    """Fold new enrollment/activity/progress rows into the daily rollup tables."""
+    from app.services.courses.course_analytics_rollup_service import (
+        CourseAnalyticsRollupService,
+    )
+
+    try:
+        upper = datetime.fromisoformat(until) if until else None
+        result = CourseAnalyticsRollupService.refresh_rollups(until=upper)
+        click.echo(
+            click.style("✓ Analytics rollups refreshed", fg="green", bold=True)
+        )
+        click.echo(f"  Window: {result['window_start'] or 'beginning'} → {result['window_end']}")
+        click.echo(f"  Source rows folded in: {result['rows_processed']}")
+
+    except Exception as e:
+        click.echo(f"Error refreshing analytics rollups: {str(e)}", err=True)
+        logger.error(f"Error refreshing analytics rollups: {str(e)}", exc_info=True)
+
+
+@analytics_cli.command("check-stats")
+@click.option("--course-id", default=None, help="Check a single course (default: all courses)")
+@click.option("--fix", is_flag=True, help="Rewrite drifted course_stats rows from enrollments")
+def check_course_stats(course_id, fix):
+    """Detect drift between course_stats and course_enrollments."""
+    from app.services.courses.course_stats_service import CourseStatsService
+
+    try:
+        drifted = CourseStatsService.detect_drift(course_id=course_id, fix=fix)
+        if not drifted:
+            click.echo(click.style("✓ course_stats is consistent", fg="green", bold=True))
+            return
+
+        for entry in drifted:
+            click.echo(f"  {entry['course_id']}: expected={entry['expected']} "
+                       f"actual={entry['actual']}")
+        if fix:
+            click.echo(click.style(f"✓ Repaired {len(drifted)} course(s)", fg="green", bold=True))
+        else:
+            click.echo(click.style(f"⚠ {len(drifted)} course(s) drifted (use --fix to repair)",
+                                   fg="yellow", bold=True))
+
+    except Exception as e:
+        click.echo(f"Error checking course stats: {str(e)}", err=True)
+        logger.error(f"Error checking course stats: {str(e)}", exc_info=True)
+
+
+# ===================== Search Commands =====================
+
+
+@click.group()
+def search_cli():
+    """Catalogue search index commands."""
+    pass
+
+
+@search_cli.command("reindex")
+def reindex_courses():
+    """Create the course full-text index if missing and re-sync it."""
+    from app.services.courses.course_search_service import CourseSearchService
+
+    try:
+        result = CourseSearchService.rebuild_index()
+        click.echo(click.style("✓ Course search index rebuilt", fg="green", bold=True))
+        click.echo(f"  Dialect: {result['dialect']}")
+        click.echo(f"  Courses indexed: {result['indexed_courses']}")
+
+    except Exception as e:
+        click.echo(f"Error rebuilding search index: {str(e)}", err=True)
+        logger.error(f"Error rebuilding search index: {str(e)}", exc_info=True)
+
+
+# ===================== Quiz Commands =====================
+
+
+@click.group()
+def quiz_cli():
+    """Quiz maintenance commands."""
+    pass
+
+
+@quiz_cli.command("regrade")
+@click.argument("quiz_id")
+@click.option("--batch-size", default=1000, show_default=True, help="Attempts graded per batch")
+@click.option("--dry-run", is_flag=True, help="Report changes without writing them")
+def regrade_quiz(quiz_id, batch_size, dry_run):
+    """Re-grade all submitted attempts of a quiz against its current answer key."""
+    from app.services.quizzes.quiz_batch_grading_service import BatchGradingService
+
+    try:
+        result = BatchGradingService.regrade_quiz(quiz_id, batch_size=batch_size, dry_run=dry_run)
+        title = "✓ Quiz regrade computed (dry run)" if dry_run else "✓ Quiz regraded"
+        click.echo(click.style(title, fg="green", bold=True))
+        click.echo(f"  Attempts scanned: {result['attempts_scanned']}")
+        click.echo(f"  Answers changed: {result['answers_changed']}")
+        click.echo(f"  Attempts rescored: {result['attempts_changed']}")
+
+    except Exception as e:
+        click.echo(f"Error regrading quiz: {str(e)}", err=True)
+        logger.error(f"Error regrading quiz: {str(e)}", exc_info=True)
+
+
+@quiz_cli.command("item-analysis")
+@click.option("--quiz-id", default=None, help="Recompute a single quiz (default: all quizzes)")
+def recompute_item_analysis(quiz_id):
+    """Rebuild the per-question item-analysis store from graded attempts."""
+    from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
+
+    try:
+        if quiz_id:
+            results = [ItemAnalysisService.recompute_quiz(quiz_id)]
+        else:
+            results = ItemAnalysisService.recompute_all()
+        click.echo(click.style("✓ Item analysis recomputed", fg="green", bold=True))
+        click.echo(f"  Quizzes: {len(results)}")
+        click.echo(f"  Questions: {sum(r['questions'] for r in results)}")
+        click.echo(f"  Graded responses: {sum(r['responses'] for r in results)}")
+
+    except Exception as e:
+        click.echo(f"Error recomputing item analysis: {str(e)}", err=True)
+        logger.error(f"Error recomputing item analysis: {str(e)}", exc_info=True)
+
+
+@quiz_cli.command("autosave-checkpoint")
+def autosave_checkpoint():
+    """Flush buffered quiz autosaves to the database (run every checkpoint interval)."""
+    from app.services.quizzes.quiz_autosave_service import QuizAutosaveService
+
+    try:
+        if not current_app.config.get("QUIZ_AUTOSAVE_ENABLED"):
+            click.echo("Quiz autosave buffer is disabled (QUIZ_AUTOSAVE_ENABLED)")
+            return
+        result = QuizAutosaveService.checkpoint_dirty()
+        click.echo(click.style("✓ Autosave checkpoint complete", fg="green", bold=True))
+        click.echo(f"  Attempts: {result['attempts']}")
+        click.echo(f"  Answers written: {result['answers']}")
+
+    except Exception as e:
+        click.echo(f"Error checkpointing quiz autosaves: {str(e)}", err=True)
+        logger.error(f"Error checkpointing quiz autosaves: {str(e)}", exc_info=True)
+
+
+@quiz_cli.command("expire-attempts")
+@click.option("--batch-size", type=int, default=None, help="Attempts expired per transaction")
+@click.option(
+    "--every", type=int, default=None,
+    help="Keep running, sweeping every N seconds (default: sweep once)",
+)
+def expire_attempts(batch_size, every):
+    """Warn about and auto-submit overdue timed quiz attempts."""
+    import time
+
+    from app.services.quizzes.quiz_attempt_expiry_service import QuizAttemptExpiryService
+
+    batch_size = batch_size or current_app.config.get("QUIZ_EXPIRY_BATCH_SIZE", 500)
+    while True:
+        try:
+            warned = QuizAttemptExpiryService.send_overdue_warnings(limit=batch_size)
+            result = QuizAttemptExpiryService.expire_overdue(batch_size=batch_size)
+            click.echo(click.style("✓ Attempt expiry sweep complete", fg="green", bold=True))
+            click.echo(f"  Warnings sent: {warned}")
+            click.echo(f"  Attempts expired: {result['expired']} ({result['graded']} graded)")
+
+        except Exception as e:
+            click.echo(f"Error expiring quiz attempts: {str(e)}", err=True)
+            logger.error(f"Error expiring quiz attempts: {str(e)}", exc_info=True)
+
+        if not every:
+            return
+        db.session.remove()
+        time.sleep(every)
+
+
+# ===================== Upload Commands =====================
+
+
+@click.group()
+def uploads_cli():
+    """Resumable upload maintenance commands."""
+    pass
+
+
+@uploads_cli.command("cleanup")
+def cleanup_uploads():
+    """Delete expired unfinished uploads and their partial files."""
+    from app.services.courses.course_upload_service import CourseUploadService
+
+    try:
+        result = CourseUploadService.expire_stale_uploads()
+        click.echo(click.style("✓ Stale uploads cleaned up", fg="green", bold=True))
+        click.echo(f"  Uploads expired: {result['expired']}")
+        click.echo(f"  Space freed: {result['bytes_freed'] / 1024 / 1024:.1f} MB")
+
+    except Exception as e:
+        click.echo(f"Error cleaning up uploads: {str(e)}", err=True)
+        logger.error(f"Error cleaning up uploads: {str(e)}", exc_info=True)
+
+
+# ===================== Material Commands =====================
+
+
+@click.group()
+def materials_cli():
+    """Course material delivery commands."""
+    pass
+
+
+@materials_cli.command("flush-downloads")
+@click.option("--batch-size", default=500, show_default=True, help="Events written per batch")
+@click.option(
+    "--every", type=int, default=None,
+    help="Keep running, flushing every N seconds (default: flush once)",
+)
+def flush_downloads(batch_size, every):
+    """Write queued material download events to the course activity log."""
+    import time
+
+    from app.services.courses.material_delivery_service import MaterialDeliveryService
+
+    if not current_app.config.get("MATERIAL_DOWNLOAD_QUEUE_ENABLED"):
+        click.echo("Material download queue is disabled (MATERIAL_DOWNLOAD_QUEUE_ENABLED)")
+        return
+    while True:
+        try:
+            result = MaterialDeliveryService.flush_download_queue(batch_size=batch_size)
+            click.echo(click.style("✓ Download queue flushed", fg="green", bold=True))
+            click.echo(f"  Downloads recorded: {result['recorded']}")
+
+        except Exception as e:
+            click.echo(f"Error flushing material downloads: {str(e)}", err=True)
+            logger.error(f"Error flushing material downloads: {str(e)}", exc_info=True)
+
+        if not every:
+            return
+        db.session.remove()
+        time.sleep(every)
+
+
+# ===================== Benchmark Commands =====================
+
+
+@click.group()
+def benchmark_cli():
+    """Request benchmark commands."""
+    pass
+
+
+@benchmark_cli.command("run")
+@click.option("--iterations", default=100, show_default=True, help="Recorded user journeys")
+@click.option("--users", "virtual_users", default=20, show_default=True,
+              help="Synthetic students to cycle through")
+@click.option("--warmup", default=5, show_default=True, help="Unrecorded journeys run first")
+@click.option("--output", default="benchmark-baseline.json", show_default=True,
+              help="JSON baseline to write")
+def run_benchmark_suite(iterations, virtual_users, warmup, output):
+    """Benchmark the hot user journeys against the seeded database."""
+    from app.utils.benchmark import run_benchmark, write_baseline
+
+    try:
+        result = run_benchmark(current_app, iterations, virtual_users, warmup)
+        write_baseline(result, output)
+        click.echo(click.style(f"✓ Benchmark written to {output}", fg="green", bold=True))
+        click.echo(f"  {'scenario':<20} {'p50':>9} {'p95':>9} {'p99':>9} "
+                   f"{'queries':>8} {'errors':>7}")
+        for name, stats in result["scenarios"].items():
+            click.echo(
+                f"  {name:<20} {stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms "
+                f"{stats['p99_ms']:>7.1f}ms {stats['queries_max']:>8} {stats['errors']:>7}"
+            )
+
+    except Exception as e:
+        click.echo(f"Error running benchmark: {str(e)}", err=True)
+        logger.error(f"Error running benchmark: {str(e)}", exc_info=True)
+
+
+@benchmark_cli.command("compare")
+@click.argument("baseline_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("current_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--threshold", default=10.0, show_default=True,
+              help="Latency growth in percent that counts as a regression")
+def compare_benchmarks(baseline_path, current_path, threshold):
+    """Diff two benchmark baselines and flag regressions."""
+    from app.utils.benchmark import compare_baselines, read_baseline
+
+    try:
+        rows = compare_baselines(read_baseline(baseline_path), read_baseline(current_path),
+                                 threshold)
+        for row in rows:
+            change = "n/a" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+            line = (f"  {row['scenario']:<20} {row['metric']:<12} {row['baseline']:>10} → "
+                    f"{row['current']:<10} {change:>8}")
+            click.echo(click.style(line, fg="yellow") if row["regression"] else line)
+
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            click.echo(click.style(f"⚠ {len(regressions)} regression(s) above {threshold}%",
+                                   fg="yellow", bold=True))
+        else:
+            click.echo(click.style("✓ No regressions", fg="green", bold=True))
+
+    except Exception as e:
+        click.echo(f"Error comparing benchmarks: {str(e)}", err=True)
+        logger.error(f"Error comparing benchmarks: {str(e)}", exc_info=True)
+
+
+# ===================== Index Advisor =====================
+
+
+@click.command("index-advisor")
+@click.option("--plans", is_flag=True, help="Print the full plan of every query")
+def index_advisor(plans):
+    """EXPLAIN the catalogued hot queries and report the ones that scan a whole table."""
+    from app.utils.index_advisor import run_advisor
+
+    try:
+        report = run_advisor()
+        scanning = [entry for entry in report if entry["full_scans"]]
+
+        for entry in report:
+            if entry["full_scans"]:
+                status = click.style("⚠ full scan of " + ", ".join(entry["full_scans"]),
+                                     fg="yellow")
+            else:
+                status = click.style("✓ " + ", ".join(entry["indexes"]), fg="green")
+            click.echo(f"  {entry['name']:<36} {status}")
+            click.echo(f"  {'':<36} {entry['source']}")
+            if plans:
+                for row in entry["plan"]:
+                    click.echo(f"  {'':<38}{row.get('detail', row)}")
+
+        if scanning:
+            click.echo(click.style(f"⚠ {len(scanning)} of {len(report)} queries scan a table",
+                                   fg="yellow", bold=True))
+        else:
+            click.echo(click.style(f"✓ All {len(report)} catalogued queries use an index",
+                                   fg="green", bold=True))
+
+    except Exception as e:
+        click.echo(f"Error running the index advisor: {str(e)}", err=True)
+        logger.error(f"Error running the index advisor: {str(e)}", exc_info=True)
+
+
+# ===================== Start-up Profiling =====================
+
+
+@click.command("startup-profile")
+@click.option("--limit", default=25, show_default=True, help="Modules to list")
+@click.option(
+    "--sort",
+    "sort_by",
+    type=click.Choice(["cumulative", "self"]),
+    default="cumulative",
+    show_default=True,
+    help="Order modules by import time including or excluding their own imports",
+)
+@click.option("--config", "config_name", default=None, help="Configuration (default: FLASK_ENV)")
+def startup_profile(limit, sort_by, config_name):
+    """Report what building the app costs a worker, module by module."""
+    import os
+
+    from app.utils.startup import profile_startup
+
+    try:
+        result = profile_startup(config_name or os.environ.get("FLASK_ENV", "development"))
+        click.echo(click.style("✓ Worker start-up profiled", fg="green", bold=True))
+        click.echo(f"  create_app: {result['seconds'] * 1000:.0f}ms")
+        click.echo(f"  Imports: {result['import_ms']:.0f}ms ({len(result['modules'])} modules)")
+        click.echo(f"  Peak RSS: {result['max_rss_mb']:.1f}MB")
+        click.echo("")
+        click.echo(f"  {'cumulative':>10}  {'self':>8}  module")
+        modules = sorted(result["modules"], key=lambda m: m[f"{sort_by}_ms"], reverse=True)
+        for module in modules[:limit]:
+            click.echo(
+                f"  {module['cumulative_ms']:>8.1f}ms  {module['self_ms']:>6.1f}ms  "
+                f"{module['module']}"
+            )
+
+    except Exception as e:
+        click.echo(f"Error profiling start-up: {str(e)}", err=True)
+        logger.error(f"Error profiling start-up: {str(e)}", exc_info=True)
+
 
 # ===================== Auto-Seed on Startup =====================
 
@@ -613,3 +1079,11 @@ def register_db_commands(app):
     app.cli.add_command(db_cli)
     app.cli.add_command(admin_cli, name="admin")
     app.cli.add_command(seed_cli, name="seed")
+    app.cli.add_command(analytics_cli, name="analytics")
+    app.cli.add_command(search_cli, name="search")
+    app.cli.add_command(quiz_cli, name="quiz")
+    app.cli.add_command(uploads_cli, name="uploads")
+    app.cli.add_command(materials_cli, name="materials")
+    app.cli.add_command(benchmark_cli, name="benchmark")
+    app.cli.add_command(index_advisor)
+    app.cli.add_command(startup_profile)
@@ -23,6 +23,10 @@ Files:
     - audit_middleware.py: Audit logging
       (@audit_action, @log_authentication)
     - error_handlers.py: Exception handling
+    - query_profiler.py: Per-request SQL counts, timing and N+1 warnings
+      (register_query_profiler, count_queries)
+    - request_metrics.py: Per-route latency histograms and status counts
+      (register_request_metrics)
 """
 
 # Audit logging exports
@@ -51,6 +55,12 @@ from .cors_middleware import (
     setup_cors_error_handler,
 )
 
+# Query profiling exports
+from .query_profiler import QueryStats, count_queries, register_query_profiler
+
+# Request metrics exports
+from .request_metrics import register_request_metrics
+
 # Rate limiting exports
 from .rate_limiting_middleware import (
     RateLimiter,
@@ -108,4 +118,10 @@ __all__ = [
     "setup_cors_error_handler",
     "require_origin",
     "add_security_headers",
+    # Query Profiling
+    "register_query_profiler",
+    "count_queries",
+    "QueryStats",
+    # Request Metrics
+    "register_request_metrics",
 ]
@@ -48,8 +48,19 @@ def configure_cors(app, origins=None):
             r"/api/*": {
                 "origins": origins,
                 "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-                "expose_headers": ["Content-Range", "X-Content-Range", "X-Total-Count"],
+                "allow_headers": [
+                    "Content-Type",
+                    "Authorization",
+                    "X-Requested-With",
+                    "Upload-Offset",
+                    "Upload-Checksum",
+                ],
+                "expose_headers": [
+                    "Content-Range",
+                    "X-Content-Range",
+                    "X-Total-Count",
+                    "Upload-Offset",
+                ],
                 "supports_credentials": True,  # CRITICAL: Enables Access-Control-Allow-Credentials: true
                 "max_age": 3600,
             }
@@ -0,0 +1,135 @@
+"""
+SQL Query Profiler Middleware
+Counts the SQL statements and database time of every request, reports them in
+the X-DB-Queries and Server-Timing response headers, and logs a warning when a
+request runs the same statement shape many times (the N+1 pattern).
+
+count_queries() gives the same numbers for any block of code, e.g. in tests:
+
+    with count_queries() as stats:
+        client.get("/api/v1/courses")
+    assert stats.count <= 5, stats.report()
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Collectors receiving the statements of the current context (innermost last)
+_collectors = ContextVar("query_collectors", default=())
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape: literals and IN-lists collapsed, whitespace normalized."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _LITERAL.sub("?", shape)
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+class QueryStats:
+    """Statement count, database time and statement shapes of one scope."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """(shape, count) pairs run more than threshold times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.seconds * 1000:.1f}ms"]
+        lines += [f"  {n}x {shape[:200]}" for shape, n in self.shapes.most_common(10)]
+        return "\n".join(lines)
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements run inside the block (nested blocks all count)."""
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    started = conn.info.get("query_started")
+    if not collectors or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    for stats in collectors:
+        stats.record(statement, elapsed)
+
+
+def register_query_profiler(app):
+    """
+    Profile the SQL of every request (QUERY_PROFILER_ENABLED).
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get("QUERY_PROFILER_ENABLED", True):
+        return
+
+    @app.before_request
+    def _start_query_profile():
+        g.query_stats = QueryStats()
+        g.query_stats_token = _collectors.set(_collectors.get() + (g.query_stats,))
+
+    @app.after_request
+    def _report_query_profile(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers.add(
+            "Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+        )
+
+        threshold = app.config.get("QUERY_REPEAT_THRESHOLD", 10)
+        for shape, n in stats.repeated(threshold):
+            logger.warning(
+                "Possible N+1 on %s %s: %s executions of %s",
+                request.method, request.path, n, shape[:300],
+            )
+        return response
+
+    @app.teardown_request
+    def _stop_query_profile(exc):
+        token = g.pop("query_stats_token", None)
+        if token is not None:
+            try:
+                _collectors.reset(token)
+            except ValueError:
+                # Torn down from another context; drop every request collector
+                _collectors.set(())
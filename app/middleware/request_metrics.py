@@ -0,0 +1,75 @@
+"""
+Request Metrics Middleware
+Records the latency and status code of every request per blueprint and route
+(the URL rule, not the concrete path, so label cardinality stays bounded) and
+refreshes this worker's database pool gauges, for the /metrics endpoint.
+
+Recording is an in-memory write to the worker's mmap'd value file
+(app/utils/metrics.py); nothing is sent anywhere on the request path.
+"""
+
+import time
+
+from flask import g, request
+
+from app.utils import metrics
+from app.utils.db_pool import pool_status
+
+# How often a worker copies its pool state into the gauges
+POOL_SAMPLE_SECONDS = 1.0
+
+_pool_sampled_at = {"value": 0.0}
+
+
+def register_request_metrics(app):
+    """
+    Record request metrics (METRICS_ENABLED) into METRICS_DIR.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    metrics.configure(app.config["METRICS_DIR"])
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+
+        labels = {
+            "blueprint": request.blueprint or "",
+            "route": request.url_rule.rule if request.url_rule else "<unmatched>",
+            "method": request.method,
+        }
+        metrics.HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, **labels)
+        metrics.HTTP_REQUESTS.inc(status=str(response.status_code), **labels)
+
+        now = time.monotonic()
+        if now - _pool_sampled_at["value"] >= POOL_SAMPLE_SECONDS:
+            _pool_sampled_at["value"] = now
+            _sample_pool()
+        return response
+
+
+def _sample_pool():
+    from app import db
+
+    try:
+        status = pool_status(db.engine)
+    except Exception:
+        return
+    for state in ("size", "checked_in", "checked_out", "overflow"):
+        if state in status:
+            metrics.DB_POOL_CONNECTIONS.set(status[state], state=state)
+    if "checkouts" in status:
+        metrics.DB_POOL_CHECKOUTS.set(status["checkouts"], result="ok")
+        metrics.DB_POOL_CHECKOUTS.set(status["timeouts"], result="timeout")
+        metrics.DB_POOL_WAIT.set(status["wait_ms_avg"] / 1000, stat="avg")
+        metrics.DB_POOL_WAIT.set(status["wait_ms_max"] / 1000, stat="max")
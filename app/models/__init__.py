@@ -39,15 +39,22 @@ from app.models.certificates import (
 
 # Import all courses models
 from app.models.courses import (
+    AnalyticsRollupWatermark,
+    ContentCompletionDailyRollup,
     Course,
+    CourseActivityDailyRollup,
     CourseActivityLog,
     CourseCategory,
     CourseEnrollment,
+    CourseEnrollmentDailyRollup,
     CourseEnrollmentKey,
     CourseLesson,
     CourseReview,
     CourseSection,
+    CourseStats,
     CourseStatusAudit,
+    CourseUpload,
+    CourseUploadChunk,
     LessonContent,
     LessonContentProgress,
 )
@@ -69,9 +76,12 @@ from app.models.quizzes import (
     AttemptAnswer,
     ManualGrade,
     Question,
+    QuestionItemStats,
     QuestionOption,
     Quiz,
     QuizAttempt,
+    QuizAttemptDeadline,
+    QuizAttemptSlot,
 )
 
 # Import all reviews models
@@ -88,6 +98,9 @@ from app.models.rewards import (
     UserPoints,
 )
 
+# Schema bookkeeping
+from app.models.schema_version import SchemaVersion
+
 __all__ = [
     # Auth Models (12)
     "User",
@@ -109,7 +122,7 @@ __all__ = [
     "UserPreferences",
     "UserActivityLog",
     "UserStatistics",
-    # Courses Models (11)
+    # Courses Models (18)
     "CourseCategory",
     "Course",
     "CourseSection",
@@ -121,13 +134,23 @@ __all__ = [
     "CourseReview",
     "CourseActivityLog",
     "CourseStatusAudit",
-    # Quizzes Models (6)
+    "CourseEnrollmentDailyRollup",
+    "CourseActivityDailyRollup",
+    "ContentCompletionDailyRollup",
+    "AnalyticsRollupWatermark",
+    "CourseStats",
+    "CourseUpload",
+    "CourseUploadChunk",
+    # Quizzes Models (9)
     "Quiz",
     "Question",
     "QuestionOption",
     "QuizAttempt",
     "AttemptAnswer",
     "ManualGrade",
+    "QuestionItemStats",
+    "QuizAttemptSlot",
+    "QuizAttemptDeadline",
     # Notifications Models (6)
     "Notification",
     "NotificationPreferences",
@@ -157,4 +180,6 @@ __all__ = [
     "Invoice",
     "Refund",
     "Coupon",
+    # Schema bookkeeping
+    "SchemaVersion",
 ]
\ No newline at end of file
@@ -3,15 +3,22 @@ Courses Module Models
 Contains all database models for courses, lessons, content, enrollments, and tracking
 """
 
+from app.models.courses.analytics_rollup_watermark import AnalyticsRollupWatermark
+from app.models.courses.content_completion_daily_rollup import ContentCompletionDailyRollup
 from app.models.courses.course import Course
+from app.models.courses.course_activity_daily_rollup import CourseActivityDailyRollup
 from app.models.courses.course_activity_log import CourseActivityLog
 from app.models.courses.course_category import CourseCategory
 from app.models.courses.course_enrollment import CourseEnrollment
+from app.models.courses.course_enrollment_daily_rollup import CourseEnrollmentDailyRollup
 from app.models.courses.course_enrollment_key import CourseEnrollmentKey
 from app.models.courses.course_lesson import CourseLesson
 from app.models.courses.course_review import CourseReview
 from app.models.courses.course_section import CourseSection
+from app.models.courses.course_stats import CourseStats
 from app.models.courses.course_status_audit import CourseStatusAudit
+from app.models.courses.course_upload import CourseUpload
+from app.models.courses.course_upload_chunk import CourseUploadChunk
 from app.models.courses.lesson_content import LessonContent
 from app.models.courses.lesson_content_progress import LessonContentProgress
 
@@ -27,4 +34,11 @@ __all__ = [
     "CourseReview",
     "CourseActivityLog",
     "CourseStatusAudit",
+    "CourseEnrollmentDailyRollup",
+    "CourseActivityDailyRollup",
+    "ContentCompletionDailyRollup",
+    "AnalyticsRollupWatermark",
+    "CourseStats",
+    "CourseUpload",
+    "CourseUploadChunk",
 ]
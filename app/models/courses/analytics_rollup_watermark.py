@@ -0,0 +1,47 @@
+"""
+AnalyticsRollupWatermark Model
+Tracks how far each incremental analytics rollup job has processed
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class AnalyticsRollupWatermark(db.Model):
+    """
+    AnalyticsRollupWatermark model storing the high-water mark of a rollup job.
+
+    Every source row timestamped strictly before last_processed_at has been
+    folded into the rollup tables; rows at or after it are served live.
+
+    Attributes:
+        job_name: Rollup job identifier (primary key)
+        last_processed_at: Exclusive upper bound of the last processed window
+        last_run_at: Wall-clock time of the last successful run
+        rows_processed: Source rows folded in by the last run
+    """
+
+    __tablename__ = "analytics_rollup_watermarks"
+
+    # Primary Key
+    job_name = db.Column(db.String(50), primary_key=True, nullable=False)
+
+    # Progress
+    last_processed_at = db.Column(db.DateTime, nullable=False)
+    last_run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    rows_processed = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<AnalyticsRollupWatermark {self.job_name} - {self.last_processed_at}>"
+
+    def to_dict(self):
+        """Convert watermark to dictionary for JSON serialization."""
+        return {
+            "job_name": self.job_name,
+            "last_processed_at": (
+                self.last_processed_at.isoformat() if self.last_processed_at else None
+            ),
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "rows_processed": self.rows_processed,
+        }
@@ -0,0 +1,76 @@
+"""
+ContentCompletionDailyRollup Model
+Pre-aggregated per-content start/completion counts per day
+"""
+
+import uuid
+from datetime import datetime
+
+from app import db
+
+
+class ContentCompletionDailyRollup(db.Model):
+    """
+    ContentCompletionDailyRollup model holding per-content progress counts per day.
+
+    started_count counts LessonContentProgress rows by first_accessed day and
+    completed_count counts them by completed_at day, so summing over all days
+    yields the all-time totals shown on the analytics dashboard.
+
+    Attributes:
+        rollup_id: UUID primary key
+        course_id: Foreign key to Course
+        content_id: Foreign key to LessonContent
+        stat_date: Calendar day (UTC) the counts belong to
+        started_count: Progress records first accessed on stat_date
+        completed_count: Progress records completed on stat_date
+        updated_at: Last time the rollup job touched this row
+    """
+
+    __tablename__ = "content_completion_daily_rollups"
+
+    # Primary Key
+    rollup_id = db.Column(
+        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False
+    )
+
+    # Foreign Keys
+    course_id = db.Column(
+        db.String(36),
+        db.ForeignKey("courses.course_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    content_id = db.Column(
+        db.String(36),
+        db.ForeignKey("lesson_contents.content_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Aggregates
+    stat_date = db.Column(db.Date, nullable=False)
+    started_count = db.Column(db.Integer, default=0, nullable=False)
+    completed_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("content_id", "stat_date", name="unique_content_completion_day"),
+    )
+
+    def __repr__(self):
+        return f"<ContentCompletionDailyRollup {self.content_id} - {self.stat_date}>"
+
+    def to_dict(self):
+        """Convert rollup to dictionary for JSON serialization."""
+        return {
+            "rollup_id": self.rollup_id,
+            "course_id": self.course_id,
+            "content_id": self.content_id,
+            "stat_date": self.stat_date.isoformat() if self.stat_date else None,
+            "started_count": self.started_count,
+            "completed_count": self.completed_count,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -6,8 +6,35 @@ Represents course information including metadata, pricing, and status
 import uuid
 from datetime import datetime
 
+from sqlalchemy import DDL, event
+
 from app import db
 
+# SQLite has no FULLTEXT indexes; an external-content FTS5 table kept in sync by
+# triggers gives tests and local SQLite databases the same search semantics.
+COURSE_SEARCH_FTS_TABLE = "course_search_fts"
+
+COURSE_SEARCH_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {COURSE_SEARCH_FTS_TABLE} USING fts5("
+    "title, description, content='courses', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    # Default rank: bm25() with title hits weighted 10x description hits
+    f"INSERT INTO {COURSE_SEARCH_FTS_TABLE}({COURSE_SEARCH_FTS_TABLE}, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"CREATE TRIGGER IF NOT EXISTS courses_search_ai AFTER INSERT ON courses BEGIN "
+    f"INSERT INTO {COURSE_SEARCH_FTS_TABLE}(rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS courses_search_ad AFTER DELETE ON courses BEGIN "
+    f"INSERT INTO {COURSE_SEARCH_FTS_TABLE}({COURSE_SEARCH_FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS courses_search_au AFTER UPDATE OF title, description "
+    f"ON courses BEGIN "
+    f"INSERT INTO {COURSE_SEARCH_FTS_TABLE}({COURSE_SEARCH_FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    f"INSERT INTO {COURSE_SEARCH_FTS_TABLE}(rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+)
+
 
 class Course(db.Model):
     """
@@ -50,7 +77,7 @@ class Course(db.Model):
 
     # Foreign Keys
     category_id = db.Column(
-        db.String(36), db.ForeignKey("course_categories.category_id"), nullable=True
+        db.String(36), db.ForeignKey("course_categories.category_id"), nullable=True, index=True
     )
     instructor_id = db.Column(
         db.String(36), db.ForeignKey("users.user_id"), nullable=False, index=True
@@ -83,10 +110,18 @@ class Course(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = db.Column(
-        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
+    )
+
+    __table_args__ = (
+        # Catalogue search (MATCH ... AGAINST); SQLite uses COURSE_SEARCH_FTS_TABLE
+        db.Index(
+            "ft_courses_title_description", "title", "description", mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect="mysql"),
     )
 
     # Relationships
+    instructor = db.relationship("User", foreign_keys=[instructor_id], lazy="select")
     sections = db.relationship(
         "CourseSection", backref="course", lazy="dynamic", cascade="all, delete-orphan"
     )
@@ -139,3 +174,12 @@ class Course(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+for _statement in COURSE_SEARCH_SQLITE_DDL:
+    event.listen(Course.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Course.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {COURSE_SEARCH_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
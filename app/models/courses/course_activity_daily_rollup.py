@@ -0,0 +1,72 @@
+"""
+CourseActivityDailyRollup Model
+Pre-aggregated activity counts per course, day and activity type
+"""
+
+import uuid
+from datetime import datetime
+
+from app import db
+
+
+class CourseActivityDailyRollup(db.Model):
+    """
+    CourseActivityDailyRollup model holding activity-log counts per course/day/type.
+
+    Rows are maintained by CourseAnalyticsRollupService.refresh_rollups and only
+    cover activity log entries timestamped before the rollup watermark.
+
+    Attributes:
+        rollup_id: UUID primary key
+        course_id: Foreign key to Course
+        stat_date: Calendar day (UTC) the counts belong to
+        activity_type: Activity type (matches CourseActivityLog.activity_type)
+        activity_count: Number of activity log entries on stat_date
+        updated_at: Last time the rollup job touched this row
+    """
+
+    __tablename__ = "course_activity_daily_rollups"
+
+    # Primary Key
+    rollup_id = db.Column(
+        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False
+    )
+
+    # Foreign Keys
+    course_id = db.Column(
+        db.String(36),
+        db.ForeignKey("courses.course_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Aggregates
+    stat_date = db.Column(db.Date, nullable=False)
+    activity_type = db.Column(db.String(50), nullable=False)
+    activity_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "course_id", "stat_date", "activity_type", name="unique_course_activity_day"
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"<CourseActivityDailyRollup {self.course_id} - {self.stat_date} - "
+            f"{self.activity_type}>"
+        )
+
+    def to_dict(self):
+        """Convert rollup to dictionary for JSON serialization."""
+        return {
+            "rollup_id": self.rollup_id,
+            "course_id": self.course_id,
+            "stat_date": self.stat_date.isoformat() if self.stat_date else None,
+            "activity_type": self.activity_type,
+            "activity_count": self.activity_count,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -77,6 +77,13 @@ class CourseActivityLog(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # A student's activity feed in a course, newest first
+        db.Index(
+            "ix_course_activity_log_course_user_timestamp", "course_id", "user_id", "timestamp"
+        ),
+    )
+
     def get_metadata(self):
         """Safely parse JSON metadata."""
         if not self.meta_data:
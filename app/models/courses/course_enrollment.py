@@ -62,14 +62,20 @@ class CourseEnrollment(db.Model):
     )
 
     # Enrollment Timestamps
-    enrolled_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    enrolled_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     completed_at = db.Column(db.DateTime, nullable=True)
     last_accessed = db.Column(db.DateTime, nullable=True)
 
     # Learning Time
     total_time_spent_minutes = db.Column(db.Integer, default=0, nullable=False)
 
-    __table_args__ = (db.UniqueConstraint("user_id", "course_id", name="unique_user_course"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "course_id", name="unique_user_course"),
+        # "My courses" dashboard: keyset pagination on (enrolled_at, enrollment_id)
+        db.Index("ix_course_enrollments_user_enrolled_at", "user_id", "enrolled_at"),
+        # Instructor enrollment list filtered by status
+        db.Index("ix_course_enrollments_course_status", "course_id", "status"),
+    )
 
     def __repr__(self):
         return f"<CourseEnrollment {self.enrollment_id} - {self.user_id}>"
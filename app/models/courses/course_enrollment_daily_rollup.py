@@ -0,0 +1,64 @@
+"""
+CourseEnrollmentDailyRollup Model
+Pre-aggregated count of new enrollments per course per day
+"""
+
+import uuid
+from datetime import datetime
+
+from app import db
+
+
+class CourseEnrollmentDailyRollup(db.Model):
+    """
+    CourseEnrollmentDailyRollup model holding new-enrollment counts per course/day.
+
+    Rows are maintained by CourseAnalyticsRollupService.refresh_rollups and only
+    cover enrollments created before the rollup watermark.
+
+    Attributes:
+        rollup_id: UUID primary key
+        course_id: Foreign key to Course
+        stat_date: Calendar day (UTC) the counts belong to
+        new_enrollments: Number of enrollments created on stat_date
+        updated_at: Last time the rollup job touched this row
+    """
+
+    __tablename__ = "course_enrollment_daily_rollups"
+
+    # Primary Key
+    rollup_id = db.Column(
+        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False
+    )
+
+    # Foreign Keys
+    course_id = db.Column(
+        db.String(36),
+        db.ForeignKey("courses.course_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Aggregates
+    stat_date = db.Column(db.Date, nullable=False)
+    new_enrollments = db.Column(db.Integer, default=0, nullable=False)
+
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("course_id", "stat_date", name="unique_course_enrollment_day"),
+    )
+
+    def __repr__(self):
+        return f"<CourseEnrollmentDailyRollup {self.course_id} - {self.stat_date}>"
+
+    def to_dict(self):
+        """Convert rollup to dictionary for JSON serialization."""
+        return {
+            "rollup_id": self.rollup_id,
+            "course_id": self.course_id,
+            "stat_date": self.stat_date.isoformat() if self.stat_date else None,
+            "new_enrollments": self.new_enrollments,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,97 @@
+"""
+CourseStats Model
+Materialized per-course enrollment and progress statistics
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class CourseStats(db.Model):
+    """
+    CourseStats model holding one row of enrollment/progress counters per course.
+
+    Maintained transactionally by CourseStatsService alongside every enrollment
+    insert/delete and progress recalculation, so instructor dashboards read a
+    single row instead of aggregating course_enrollments.
+
+    Attributes:
+        course_id: Foreign key to Course (primary key)
+        enrolled_count: Enrollments in 'enrolled' status
+        in_progress_count: Enrollments in 'in_progress' status
+        completed_count: Enrollments in 'completed' status
+        dropped_count: Enrollments in 'dropped' status
+        progress_sum: Sum of enrollment.progress (for the running average)
+        last_activity_at: Latest enrollment/progress change
+        updated_at: Last time the counters were written
+    """
+
+    __tablename__ = "course_stats"
+
+    # Primary Key
+    course_id = db.Column(
+        db.String(36),
+        db.ForeignKey("courses.course_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+
+    # Enrollment Counters
+    enrolled_count = db.Column(db.Integer, default=0, nullable=False)
+    in_progress_count = db.Column(db.Integer, default=0, nullable=False)
+    completed_count = db.Column(db.Integer, default=0, nullable=False)
+    dropped_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # Progress
+    progress_sum = db.Column(db.BigInteger, default=0, nullable=False)
+
+    # Timestamps
+    last_activity_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    @property
+    def total_enrollments(self):
+        """Total enrollments across all statuses."""
+        return (
+            (self.enrolled_count or 0)
+            + (self.in_progress_count or 0)
+            + (self.completed_count or 0)
+            + (self.dropped_count or 0)
+        )
+
+    @property
+    def average_progress(self):
+        """Mean enrollment progress (0-100), or 0 when nobody is enrolled."""
+        total = self.total_enrollments
+        return (self.progress_sum or 0) / total if total else 0
+
+    def status_breakdown(self):
+        """Return {status: count} for statuses with at least one enrollment."""
+        counts = {
+            "enrolled": self.enrolled_count or 0,
+            "in_progress": self.in_progress_count or 0,
+            "completed": self.completed_count or 0,
+            "dropped": self.dropped_count or 0,
+        }
+        return {status: count for status, count in counts.items() if count}
+
+    def __repr__(self):
+        return f"<CourseStats {self.course_id} - {self.total_enrollments}>"
+
+    def to_dict(self):
+        """Convert stats to dictionary for JSON serialization."""
+        return {
+            "course_id": self.course_id,
+            "enrolled_count": self.enrolled_count,
+            "in_progress_count": self.in_progress_count,
+            "completed_count": self.completed_count,
+            "dropped_count": self.dropped_count,
+            "total_enrollments": self.total_enrollments,
+            "progress_sum": self.progress_sum,
+            "average_progress": round(self.average_progress, 1),
+            "last_activity_at": (
+                self.last_activity_at.isoformat() if self.last_activity_at else None
+            ),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,108 @@
+"""
+CourseUpload Model
+Resumable (chunked) upload of a course material file
+"""
+
+import uuid
+from datetime import datetime
+
+from app import db
+
+
+class CourseUpload(db.Model):
+    """
+    CourseUpload model tracking one chunked upload session.
+
+    The file is received in fixed-size chunks written straight into a
+    pre-allocated partial file; finalizing verifies the checksum and renames
+    the partial file to its final path.
+
+    Attributes:
+        upload_id: UUID primary key
+        course_id: Foreign key to Course
+        user_id: Foreign key to User (uploader)
+        filename: Sanitized original filename
+        total_size: File size in bytes
+        chunk_size: Bytes per chunk (the last chunk may be shorter)
+        checksum_sha256: Expected SHA-256 of the whole file (hex)
+        partial_path: Partial file, relative to UPLOAD_FOLDER
+        file_path: Final file, relative to UPLOAD_FOLDER (once completed)
+        status: uploading, finalizing, completed, failed
+        expires_at: Unfinished uploads are removed after this time (indexed)
+        completed_at: Finalization timestamp
+    """
+
+    __tablename__ = "course_uploads"
+
+    # Primary Key
+    upload_id = db.Column(
+        db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()), nullable=False
+    )
+
+    # Foreign Keys
+    course_id = db.Column(
+        db.String(36),
+        db.ForeignKey("courses.course_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    user_id = db.Column(
+        db.String(36),
+        db.ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # File Information
+    filename = db.Column(db.String(255), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    chunk_size = db.Column(db.Integer, nullable=False)
+    checksum_sha256 = db.Column(db.String(64), nullable=False)
+    partial_path = db.Column(db.String(500), nullable=False)
+    file_path = db.Column(db.String(500), nullable=True)
+
+    # Status
+    status = db.Column(
+        db.Enum("uploading", "finalizing", "completed", "failed"),
+        default="uploading",
+        nullable=False,
+    )
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    # Relationships
+    chunks = db.relationship(
+        "CourseUploadChunk", backref="upload", lazy="dynamic", cascade="all, delete-orphan"
+    )
+
+    @property
+    def total_chunks(self):
+        """Number of chunks the file is split into."""
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def chunk_length(self, index):
+        """Expected byte length of chunk index."""
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
+
+    def __repr__(self):
+        return f"<CourseUpload {self.upload_id} - {self.filename}>"
+
+    def to_dict(self):
+        """Convert upload to dictionary for JSON serialization."""
+        return {
+            "upload_id": self.upload_id,
+            "course_id": self.course_id,
+            "filename": self.filename,
+            "total_size": self.total_size,
+            "chunk_size": self.chunk_size,
+            "total_chunks": self.total_chunks,
+            "checksum_sha256": self.checksum_sha256,
+            "status": self.status,
+            "file_path": self.file_path,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
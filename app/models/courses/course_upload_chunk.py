@@ -0,0 +1,50 @@
+"""
+CourseUploadChunk Model
+One received chunk of a resumable course material upload
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class CourseUploadChunk(db.Model):
+    """
+    CourseUploadChunk model recording that a chunk was written.
+
+    Chunks of one upload may arrive in any order and in parallel; each one
+    is recorded once (composite primary key), so a retried chunk is harmless.
+
+    Attributes:
+        upload_id: Foreign key to CourseUpload
+        chunk_index: Chunk number (byte offset / chunk size)
+        size: Bytes written
+        received_at: When the chunk was written
+    """
+
+    __tablename__ = "course_upload_chunks"
+
+    # Primary Key
+    upload_id = db.Column(
+        db.String(36),
+        db.ForeignKey("course_uploads.upload_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    chunk_index = db.Column(db.Integer, primary_key=True, nullable=False)
+
+    # Chunk Information
+    size = db.Column(db.Integer, nullable=False)
+    received_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CourseUploadChunk {self.upload_id} #{self.chunk_index}>"
+
+    def to_dict(self):
+        """Convert chunk to dictionary for JSON serialization."""
+        return {
+            "upload_id": self.upload_id,
+            "chunk_index": self.chunk_index,
+            "size": self.size,
+            "received_at": self.received_at.isoformat() if self.received_at else None,
+        }
@@ -70,7 +70,7 @@ class LessonContentProgress(db.Model):
     # Common Progress Fields
     is_completed = db.Column(db.Boolean, default=False, nullable=False)
     completed_at = db.Column(db.DateTime, nullable=True, index=True)
-    first_accessed = db.Column(db.DateTime, nullable=True)
+    first_accessed = db.Column(db.DateTime, nullable=True, index=True)
     last_accessed = db.Column(db.DateTime, nullable=True)
 
     # Video-Specific Fields
@@ -97,7 +97,18 @@ class LessonContentProgress(db.Model):
     quiz_attempt_count = db.Column(db.Integer, default=0, nullable=True)
     quiz_last_attempted = db.Column(db.DateTime, nullable=True)
 
-    __table_args__ = (db.UniqueConstraint("content_id", "user_id", name="unique_user_content"),)
+    __table_args__ = (
+        db.UniqueConstraint("content_id", "user_id", name="unique_user_content"),
+        # Course progress: completed contents of one student in one course
+        db.Index(
+            "ix_lesson_content_progress_course_user_completed",
+            "course_id",
+            "user_id",
+            "is_completed",
+        ),
+        # Live session attendance per lesson
+        db.Index("ix_lesson_content_progress_lesson_attended", "lesson_id", "zoom_attended"),
+    )
 
     def __repr__(self):
         return f"<LessonContentProgress {self.progress_id} - {self.user_id}>"
@@ -6,9 +6,12 @@ Quizzes, questions, attempts, and grading models
 from app.models.quizzes.attempt_answer import AttemptAnswer
 from app.models.quizzes.manual_grade import ManualGrade
 from app.models.quizzes.question import Question
+from app.models.quizzes.question_item_stats import QuestionItemStats
 from app.models.quizzes.question_option import QuestionOption
 from app.models.quizzes.quiz import Quiz
 from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.models.quizzes.quiz_attempt_deadline import QuizAttemptDeadline
+from app.models.quizzes.quiz_attempt_slot import QuizAttemptSlot
 
 __all__ = [
     "Quiz",
@@ -17,4 +20,7 @@ __all__ = [
     "QuizAttempt",
     "AttemptAnswer",
     "ManualGrade",
+    "QuestionItemStats",
+    "QuizAttemptSlot",
+    "QuizAttemptDeadline",
 ]
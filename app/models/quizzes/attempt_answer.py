@@ -25,6 +25,17 @@ class AttemptAnswer(db.Model):
     """
 
     __tablename__ = "attempt_answers"
+    __table_args__ = (
+        # Per-question aggregates (statistics, item analysis) read only this index
+        db.Index(
+            "ix_attempt_answers_question_stats",
+            "question_id",
+            "is_correct",
+            "time_taken_seconds",
+        ),
+        # Saving an answer looks up the attempt's existing answer to the question
+        db.Index("ix_attempt_answers_attempt_question", "attempt_id", "question_id"),
+    )
 
     # Primary Key
     answer_id = db.Column(
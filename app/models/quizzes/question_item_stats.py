@@ -0,0 +1,97 @@
+"""
+QuestionItemStats Model
+Precomputed item analysis (difficulty / discrimination) per question
+"""
+
+from datetime import datetime
+
+from app import db
+
+# Attempt percentages are bucketed into whole percentage points (0..100)
+SCORE_BUCKETS = 101
+
+
+class QuestionItemStats(db.Model):
+    """
+    QuestionItemStats model holding one row of item-analysis data per question.
+
+    Stores the sufficient statistics of every graded response (counts, score
+    sums and a per-percentage score histogram) so a newly graded attempt can be
+    folded in without rereading earlier answers, plus the derived metrics the
+    analytics endpoint returns as a single-row read.
+
+    Attributes:
+        question_id: Foreign key to Question (primary key)
+        quiz_id: Foreign key to Quiz
+        responses: Graded responses counted
+        correct_responses: Responses marked correct
+        score_sum: Sum of attempt percentages over responses
+        score_sq_sum: Sum of squared attempt percentages
+        correct_score_sum: Sum of attempt percentages over correct responses
+        time_sum: Sum of time_taken_seconds over responses
+        score_histogram: Responses per whole attempt percentage (101 buckets)
+        correct_histogram: Correct responses per whole attempt percentage
+        distractor_counts: {option_id: times selected} for option questions
+        p_value: Proportion correct (item difficulty)
+        point_biserial: Correlation between correctness and attempt percentage
+        discrimination_index: Upper 27% minus lower 27% proportion correct
+        updated_at: Last time the row was written
+    """
+
+    __tablename__ = "question_item_stats"
+
+    # Primary Key
+    question_id = db.Column(
+        db.String(36),
+        db.ForeignKey("questions.question_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+
+    # Foreign Keys
+    quiz_id = db.Column(
+        db.String(36),
+        db.ForeignKey("quizzes.quiz_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Sufficient Statistics
+    responses = db.Column(db.Integer, default=0, nullable=False)
+    correct_responses = db.Column(db.Integer, default=0, nullable=False)
+    score_sum = db.Column(db.Float, default=0, nullable=False)
+    score_sq_sum = db.Column(db.Float, default=0, nullable=False)
+    correct_score_sum = db.Column(db.Float, default=0, nullable=False)
+    time_sum = db.Column(db.BigInteger, default=0, nullable=False)
+    score_histogram = db.Column(db.JSON, nullable=True)
+    correct_histogram = db.Column(db.JSON, nullable=True)
+    distractor_counts = db.Column(db.JSON, nullable=True)
+
+    # Derived Metrics
+    p_value = db.Column(db.Float, default=0, nullable=False)
+    point_biserial = db.Column(db.Float, default=0, nullable=False)
+    discrimination_index = db.Column(db.Float, default=0, nullable=False)
+
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<QuestionItemStats {self.question_id} - {self.responses}>"
+
+    def to_dict(self):
+        """Convert item statistics to dictionary for JSON serialization."""
+        return {
+            "question_id": self.question_id,
+            "quiz_id": self.quiz_id,
+            "responses": self.responses,
+            "correct_responses": self.correct_responses,
+            "p_value": self.p_value,
+            "point_biserial": self.point_biserial,
+            "discrimination_index": self.discrimination_index,
+            "distractor_counts": {
+                option_id: count
+                for option_id, count in (self.distractor_counts or {}).items()
+                if count
+            },
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -66,6 +66,11 @@ class QuizAttempt(db.Model):
         db.Enum("in_progress", "submitted", "graded"), default="in_progress", nullable=False
     )
 
+    __table_args__ = (
+        # A student's attempts at a quiz: in-progress lookup, attempt limits, best score
+        db.Index("ix_quiz_attempts_quiz_user_status", "quiz_id", "user_id", "status"),
+    )
+
     # Relationships
     answers = db.relationship(
         "AttemptAnswer", backref="attempt", lazy="dynamic", cascade="all, delete-orphan"
@@ -0,0 +1,69 @@
+"""
+QuizAttemptDeadline Model
+Deadline of an in-progress timed quiz attempt, scanned by the expiry sweeper
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class QuizAttemptDeadline(db.Model):
+    """
+    QuizAttemptDeadline model with one row per in-progress timed attempt.
+
+    Rows are written when a timed attempt starts and deleted when it is
+    submitted or expired, so the sweeper reads a small table through the
+    deadline_at index instead of scanning quiz_attempts. A deadline column on
+    quiz_attempts would index every attempt ever made, finished or untimed,
+    and the sweeper's warned_at updates would lock the rows that submissions
+    update. Attempts started before the sweeper existed got their rows from
+    the rb004_attempt_deadlines migration.
+
+    Attributes:
+        attempt_id: Foreign key to QuizAttempt (primary key)
+        quiz_id: Foreign key to Quiz
+        user_id: Foreign key to User
+        deadline_at: When the attempt's time limit runs out
+        warned_at: When the overdue warning was sent, if it was
+        created_at: Timestamp when the attempt started
+    """
+
+    __tablename__ = "quiz_attempt_deadlines"
+
+    # Primary Key
+    attempt_id = db.Column(
+        db.String(36),
+        db.ForeignKey("quiz_attempts.attempt_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+
+    # Foreign Keys
+    quiz_id = db.Column(
+        db.String(36), db.ForeignKey("quizzes.quiz_id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = db.Column(
+        db.String(36), db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
+    )
+
+    # Deadline
+    deadline_at = db.Column(db.DateTime, nullable=False, index=True)
+    warned_at = db.Column(db.DateTime, nullable=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<QuizAttemptDeadline {self.attempt_id} - {self.deadline_at}>"
+
+    def to_dict(self):
+        """Convert deadline to dictionary for JSON serialization."""
+        return {
+            "attempt_id": self.attempt_id,
+            "quiz_id": self.quiz_id,
+            "user_id": self.user_id,
+            "deadline_at": self.deadline_at.isoformat() if self.deadline_at else None,
+            "warned_at": self.warned_at.isoformat() if self.warned_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -0,0 +1,66 @@
+"""
+QuizAttemptSlot Model
+Per (quiz, student) row that serializes attempt starts
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class QuizAttemptSlot(db.Model):
+    """
+    QuizAttemptSlot model holding a student's attempt state for one quiz.
+
+    Starting an attempt locks this row and claims it with a conditional
+    update, so at most one attempt per (quiz, student) is in progress and
+    max_attempts cannot be bypassed by concurrent starts.
+
+    Attributes:
+        quiz_id: Foreign key to Quiz (primary key part)
+        user_id: Foreign key to User (primary key part)
+        active_attempt_id: The in_progress attempt, if any
+        completed_attempts: Submitted/graded attempts counted against max_attempts
+        updated_at: Last time the slot changed
+    """
+
+    __tablename__ = "quiz_attempt_slots"
+
+    # Primary Key
+    quiz_id = db.Column(
+        db.String(36),
+        db.ForeignKey("quizzes.quiz_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    user_id = db.Column(
+        db.String(36),
+        db.ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+
+    # Attempt State
+    active_attempt_id = db.Column(
+        db.String(36),
+        db.ForeignKey("quiz_attempts.attempt_id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True,
+    )
+    completed_attempts = db.Column(db.Integer, default=0, nullable=False)
+
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<QuizAttemptSlot {self.quiz_id} - {self.user_id}>"
+
+    def to_dict(self):
+        """Convert slot to dictionary for JSON serialization."""
+        return {
+            "quiz_id": self.quiz_id,
+            "user_id": self.user_id,
+            "active_attempt_id": self.active_attempt_id,
+            "completed_attempts": self.completed_attempts,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,42 @@
+"""
+SchemaVersion Model
+Records the schema the database was last initialized or migrated to
+"""
+
+from datetime import datetime
+
+from app import db
+
+
+class SchemaVersion(db.Model):
+    """
+    SchemaVersion model storing the fingerprint of the applied schema.
+
+    Boot compares the fingerprint of the models and migration revisions
+    (app/utils/database.py) with the stored one and skips table creation,
+    reflection, migrations and seeding when they match.
+
+    Attributes:
+        component: Schema owner (primary key), "app" for the application models
+        fingerprint: SHA-256 of the schema DDL and migration revisions
+        applied_at: When the fingerprint was recorded
+    """
+
+    __tablename__ = "schema_version"
+
+    # Primary Key
+    component = db.Column(db.String(50), primary_key=True, nullable=False)
+
+    fingerprint = db.Column(db.String(64), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SchemaVersion {self.component} - {self.fingerprint[:12]}>"
+
+    def to_dict(self):
+        """Convert schema version to dictionary for JSON serialization."""
+        return {
+            "component": self.component,
+            "fingerprint": self.fingerprint,
+            "applied_at": self.applied_at.isoformat() if self.applied_at else None,
+        }
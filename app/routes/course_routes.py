@@ -24,8 +24,11 @@ from app.services.courses import (
     CourseSectionService,
     CourseService,
     CourseStatusService,
+    CourseUploadService,
+    MaterialDeliveryService,
 )
 from app.utils.decorators import handle_exceptions, validate_json
+from app.utils.http_cache import cached_response
 from app.utils.response import error_response, paginated_response, success_response
 
 bp = Blueprint("courses", __name__, url_prefix="/api/v1")
@@ -93,6 +96,7 @@ def create_course():
 
 @bp.route("/courses", methods=["GET"])
 @handle_exceptions
+@cached_response(CourseService.get_catalogue_version, tags=lambda: ["catalogue"])
 def search_courses():
     """
     Search / list published public courses. No authentication required.
@@ -131,6 +135,7 @@ def search_courses():
 
 @bp.route("/courses/categories", methods=["GET"])
 @handle_exceptions
+@cached_response(CourseService.get_categories_version, tags=lambda: ["categories"])
 def get_categories():
     """
     Get all course categories. No authentication required.
@@ -148,6 +153,9 @@ def get_categories():
 
 @bp.route("/courses/<course_id>", methods=["GET"])
 @handle_exceptions
+@cached_response(
+    CourseService.get_course_version, tags=lambda course_id: [f"course:{course_id}"]
+)
 def get_course(course_id):
     """
     Get a single course by ID. No authentication required.
@@ -386,22 +394,29 @@ def get_my_courses():
 
     Query Params:
         status: Filter by enrollment status
-        page, limit: Pagination
+        page, limit: Offset pagination
+        cursor: Keyset pagination instead of page (empty for the first page,
+            then the previous response's next_cursor)
 
     Returns:
-        200: Paginated enrolled course list
+        200: Paginated enrolled course list (each with a progress snapshot)
     """
     try:
         page = request.args.get("page", 1, type=int)
         limit = request.args.get("limit", 20, type=int)
         limit = max(1, min(limit, 100))
+        cursor = request.args.get("cursor")
 
         result = CourseEnrollmentService.get_my_courses(
             user_id=request.user_id,
             status=request.args.get("status"),
             page=page,
             limit=limit,
+            cursor=cursor,
         )
+        if cursor is not None:
+            return success_response(data=result, message="Courses retrieved successfully")
+
         return paginated_response(
             data=result["courses"],
             total=result["total"],
@@ -954,34 +969,165 @@ def download_pdf_content(course_id, lesson_id, content_id):
     """
     Get PDF download URL. Requires owner or enrollment.
 
+    Uploaded files get a short-lived signed /uploads/ URL (see
+    MATERIAL_URL_TTL_SECONDS); external URLs are returned as stored.
+
     Returns:
-        200: PDF file URL
+        200: PDF file URL, title and URL expiry
     """
     try:
-        from app.services.courses.course_service import CourseService
-        from app.models.courses.lesson_content import LessonContent
+        download = MaterialDeliveryService.get_pdf_download(
+            course_id=course_id,
+            lesson_id=lesson_id,
+            content_id=content_id,
+            user_id=request.user_id,
+            user_role=request.user_role,
+        )
+        return success_response(data=download, message="PDF download URL retrieved")
 
-        CourseService.verify_owner_or_enrolled(course_id, request.user_id, request.user_role)
+    except Exception as e:
+        return _handle_lms_error(e)
 
-        content = LessonContent.query.filter_by(
-            content_id=content_id, lesson_id=lesson_id, content_type="pdf"
-        ).first()
-        if not content:
-            return error_response("PDF content not found", 404)
 
-        # Track download
-        CourseActivityService.track_activity(
+# ──────────────────────────────────────────────────────────────────────────────
+# Course Material Uploads  (chunked, resumable)
+# ──────────────────────────────────────────────────────────────────────────────
+
+
+@bp.route("/courses/<course_id>/uploads", methods=["POST"])
+@handle_exceptions
+@require_auth
+def create_upload(course_id):
+    """
+    Start a resumable material upload. Owner or admin only.
+
+    Request Body:
+        filename (required), total_size (required, bytes),
+        checksum_sha256 (required, hex digest of the whole file), chunk_size
+
+    Returns:
+        201: Upload data (upload_id, chunk_size, total_chunks, expires_at)
+    """
+    try:
+        data = request.get_json() or {}
+
+        for field in ["filename", "total_size", "checksum_sha256"]:
+            if not data.get(field):
+                return error_response(f"{field} is required", 400)
+
+        upload = CourseUploadService.create_upload(
             course_id=course_id,
             user_id=request.user_id,
-            activity_type="pdf_download",
-            lesson_id=lesson_id,
-            content_id=content_id,
+            user_role=request.user_role,
+            filename=data["filename"],
+            total_size=data["total_size"],
+            checksum_sha256=data["checksum_sha256"],
+            chunk_size=data.get("chunk_size"),
         )
+        return success_response(data=upload, message="Upload created", status_code=201)
 
-        return success_response(
-            data={"pdf_file_url": content.pdf_file_url, "title": content.title},
-            message="PDF download URL retrieved",
+    except Exception as e:
+        return _handle_lms_error(e)
+
+
+@bp.route("/courses/<course_id>/uploads/<upload_id>", methods=["PATCH"])
+@handle_exceptions
+@require_auth
+def upload_chunk(course_id, upload_id):
+    """
+    Upload one chunk as the raw request body. Owner or admin only.
+
+    Chunks may be sent in any order and in parallel.
+
+    Headers:
+        Upload-Offset (required): Byte offset of the chunk, a multiple of chunk_size
+        Upload-Checksum: Optional "sha256 <base64 digest>" of the chunk
+
+    Returns:
+        200: Chunk receipt; the Upload-Offset response header is the chunk end
+    """
+    try:
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            return error_response("Upload-Offset header is required", 400)
+
+        result = CourseUploadService.write_chunk(
+            course_id=course_id,
+            upload_id=upload_id,
+            user_id=request.user_id,
+            user_role=request.user_role,
+            offset=offset,
+            stream=request.stream,
+            checksum=request.headers.get("Upload-Checksum"),
+        )
+        response, status_code = success_response(data=result, message="Chunk received")
+        response.headers["Upload-Offset"] = str(result["offset"])
+        return response, status_code
+
+    except Exception as e:
+        return _handle_lms_error(e)
+
+
+@bp.route("/courses/<course_id>/uploads/<upload_id>", methods=["GET"])
+@handle_exceptions
+@require_auth
+def get_upload_status(course_id, upload_id):
+    """
+    Get upload progress, including missing chunks to resume. Owner or admin only.
+
+    Returns:
+        200: Upload data with received_chunks, missing_chunks and offset
+    """
+    try:
+        upload = CourseUploadService.get_upload_status(
+            course_id=course_id,
+            upload_id=upload_id,
+            user_id=request.user_id,
+            user_role=request.user_role,
         )
+        return success_response(data=upload, message="Upload status retrieved")
+
+    except Exception as e:
+        return _handle_lms_error(e)
+
+
+@bp.route("/courses/<course_id>/uploads/<upload_id>/complete", methods=["POST"])
+@handle_exceptions
+@require_auth
+def complete_upload(course_id, upload_id):
+    """
+    Verify the checksum and store the uploaded file. Owner or admin only.
+
+    Returns:
+        200: Upload data with file_path and file_url
+    """
+    try:
+        upload = CourseUploadService.complete_upload(
+            course_id=course_id,
+            upload_id=upload_id,
+            user_id=request.user_id,
+            user_role=request.user_role,
+        )
+        return success_response(data=upload, message="Upload completed")
+
+    except Exception as e:
+        return _handle_lms_error(e)
+
+
+@bp.route("/courses/<course_id>/uploads/<upload_id>", methods=["DELETE"])
+@handle_exceptions
+@require_auth
+def abort_upload(course_id, upload_id):
+    """Abort an unfinished upload and delete its data. Owner or admin only."""
+    try:
+        CourseUploadService.abort_upload(
+            course_id=course_id,
+            upload_id=upload_id,
+            user_id=request.user_id,
+            user_role=request.user_role,
+        )
+        return success_response(message="Upload aborted")
 
     except Exception as e:
         return _handle_lms_error(e)
@@ -1605,6 +1751,9 @@ def create_review(course_id):
 
 @bp.route("/courses/<course_id>/reviews", methods=["GET"])
 @handle_exceptions
+@cached_response(
+    CourseReviewService.get_reviews_version, tags=lambda course_id: [f"course:{course_id}"]
+)
 def get_reviews(course_id):
     """
     Get reviews for a course. No authentication required.
@@ -0,0 +1,38 @@
+"""
+Material Routes
+Serves uploaded files through short-lived signed URLs
+"""
+
+from flask import Blueprint, request
+
+from app.exceptions import LMSException
+from app.services.courses.material_delivery_service import MaterialDeliveryService
+from app.utils.decorators import handle_exceptions
+from app.utils.response import error_response
+
+bp = Blueprint("materials", __name__)
+
+
+@bp.route("/uploads/<path:relative_path>", methods=["GET"])
+@handle_exceptions
+def serve_material(relative_path):
+    """
+    GET /uploads/<path>?expires=<unix time>&signature=<hmac>
+    Serve a file under UPLOAD_FOLDER. No session is needed: the caller was
+    authorized when the URL was signed (e.g. the PDF download endpoint).
+    Supports Range, If-None-Match and If-Modified-Since.
+
+    Returns:
+        200/206/304: File (or partial file / not modified)
+        403: Missing, invalid or expired signature
+        404: File not found
+    """
+    try:
+        return MaterialDeliveryService.serve_file(
+            relative_path,
+            expires=request.args.get("expires"),
+            signature=request.args.get("signature"),
+        )
+
+    except LMSException as e:
+        return error_response(e.message, e.status_code)
@@ -0,0 +1,35 @@
+"""
+Metrics Routes
+Prometheus scrape endpoint
+"""
+
+import hmac
+
+from flask import Blueprint, Response, current_app, request
+
+from app.services.metrics_service import MetricsService
+
+bp = Blueprint("metrics", __name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    GET /metrics
+    Prometheus text exposition of request latency histograms and status counts
+    (per blueprint and route, all workers), DB pool, Redis and notification
+    metrics. When METRICS_TOKEN is set it must be sent as a Bearer token.
+
+    Returns:
+        200: text/plain exposition
+        401: Missing or wrong token
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return Response("Unauthorized\n", status=401, content_type=CONTENT_TYPE)
+
+    return Response(MetricsService.render_metrics(), content_type=CONTENT_TYPE)
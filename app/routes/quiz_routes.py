@@ -24,14 +24,17 @@ Endpoint map:
 
   Grading Endpoints
     POST   /api/v1/answers/<answer_id>/grade                - Grade essay answer
+    POST   /api/v1/quizzes/<quiz_id>/grades                 - Grade many answers at once
     GET    /api/v1/quizzes/<quiz_id>/submissions/<user_id>  - Get submission for grading
+    GET    /api/v1/quizzes/<quiz_id>/grading-queue          - Ungraded answers by question
 
   Analytics Endpoints
     GET    /api/v1/quizzes/<quiz_id>/statistics             - Quiz statistics (instructor)
     GET    /api/v1/questions/<question_id>/analytics        - Question analytics
+    GET    /api/v1/quizzes/<quiz_id>/results/export         - Stream results (csv/jsonl/parquet)
 """
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, stream_with_context
 
 from app.exceptions import (
     AuthorizationError,
@@ -45,6 +48,7 @@ from app.services.quizzes import (
     QuizAnswerService,
     QuizAttemptService,
     QuizGradingService,
+    QuizResultsExportService,
     QuizService,
 )
 from app.services.quizzes import QuestionService
@@ -507,7 +511,7 @@ def get_quiz_results(quiz_id):
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-# Grading Endpoints (endpoints 13-14)
+# Grading Endpoints (endpoints 13-16)
 # ══════════════════════════════════════════════════════════════════════════════
 
 
@@ -553,6 +557,45 @@ def grade_answer(answer_id):
         return _handle_lms_error(e)
 
 
+@bp.route("/quizzes/<quiz_id>/grades", methods=["POST"])
+@handle_exceptions
+@require_auth
+@require_role("teacher", "admin")
+def grade_answers_bulk(quiz_id):
+    """
+    Manually grade many essay/short-answer answers of a quiz in one request.
+    Every touched attempt is recalculated once; all grades apply or none do.
+
+    URL Params:
+        quiz_id (str): Quiz UUID
+
+    Request Body:
+        grades (required): List of {answer_id, points_awarded, feedback}
+
+    Returns:
+        200: Graded count and recalculated attempts
+        400: Validation error (malformed item, points out of range)
+        403: Not authorized
+        404: Quiz or answer not found
+    """
+    try:
+        data = request.get_json() or {}
+
+        if not data.get("grades"):
+            return error_response("grades is required", 400)
+
+        result = QuizGradingService.grade_answers_bulk(
+            quiz_id=quiz_id,
+            grader_id=request.user_id,
+            grader_role=request.user_role,
+            grades=data["grades"],
+        )
+        return success_response(data=result, message="Answers graded successfully")
+
+    except Exception as e:
+        return _handle_lms_error(e)
+
+
 @bp.route("/quizzes/<quiz_id>/submissions/<user_id>", methods=["GET"])
 @handle_exceptions
 @require_auth
@@ -583,8 +626,49 @@ def get_submission_for_grading(quiz_id, user_id):
         return _handle_lms_error(e)
 
 
+@bp.route("/quizzes/<quiz_id>/grading-queue", methods=["GET"])
+@handle_exceptions
+@require_auth
+@require_role("teacher", "admin")
+def get_grading_queue(quiz_id):
+    """
+    Page through the ungraded essay/short-answer answers of a quiz, grouped by
+    question so instructors can grade one question across all students.
+
+    URL Params:
+        quiz_id (str): Quiz UUID
+
+    Query Params:
+        question_id: Restrict the queue to one question
+        limit: Answers per page (default 50, max 200)
+        cursor: Previous response's next_cursor
+
+    Returns:
+        200: Questions with their ungraded answers, has_more and next_cursor
+        400: Invalid cursor
+        403: Not authorized
+        404: Quiz not found
+    """
+    try:
+        limit = request.args.get("limit", 50, type=int)
+        limit = max(1, min(limit, 200))
+
+        queue = QuizGradingService.get_grading_queue(
+            quiz_id=quiz_id,
+            grader_id=request.user_id,
+            grader_role=request.user_role,
+            question_id=request.args.get("question_id"),
+            limit=limit,
+            cursor=request.args.get("cursor"),
+        )
+        return success_response(data=queue, message="Grading queue retrieved successfully")
+
+    except Exception as e:
+        return _handle_lms_error(e)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
-# Analytics Endpoints (endpoints 15-16)
+# Analytics Endpoints (endpoints 17-19)
 # ══════════════════════════════════════════════════════════════════════════════
 
 
@@ -632,7 +716,8 @@ def get_question_analytics(question_id):
 
     Returns:
         200: Analytics including correct_percentage, average_time_seconds,
-             difficulty_rating, and discrimination_index
+             difficulty_rating, and discrimination_index, computed over
+             responses of graded attempts only
         403: Not authorized
         404: Question not found
     """
@@ -646,3 +731,44 @@ def get_question_analytics(question_id):
 
     except Exception as e:
         return _handle_lms_error(e)
+
+
+@bp.route("/quizzes/<quiz_id>/results/export", methods=["GET"])
+@handle_exceptions
+@require_auth
+@require_role("teacher", "admin")
+def export_quiz_results(quiz_id):
+    """
+    Stream every submitted/graded attempt of a quiz as a file download.
+    Only the course instructor or admin may access.
+
+    URL Params:
+        quiz_id (str): Quiz UUID
+
+    Query Params:
+        format: csv (default), jsonl or parquet
+        layout: long (default, one row per answer) or wide (one row per
+                attempt with q<N>_answer / q<N>_correct / q<N>_points columns)
+
+    Returns:
+        200: Streamed file
+        400: Unknown format/layout
+        403: Not authorized
+        404: Quiz not found
+    """
+    try:
+        export = QuizResultsExportService.export_results(
+            quiz_id=quiz_id,
+            user_id=request.user_id,
+            user_role=request.user_role,
+            fmt=request.args.get("format", "csv"),
+            layout=request.args.get("layout", "long"),
+        )
+        return Response(
+            stream_with_context(export["chunks"]),
+            mimetype=export["mimetype"],
+            headers={"Content-Disposition": f'attachment; filename="{export["filename"]}"'},
+        )
+
+    except Exception as e:
+        return _handle_lms_error(e)
@@ -4,6 +4,7 @@ Services for handling all course-related workflows
 """
 
 from app.services.courses.course_service import CourseService
+from app.services.courses.course_search_service import CourseSearchService
 from app.services.courses.course_status_service import CourseStatusService
 from app.services.courses.course_enrollment_service import CourseEnrollmentService
 from app.services.courses.course_enrollment_key_service import CourseEnrollmentKeyService
@@ -14,9 +15,14 @@ from app.services.courses.course_progress_service import CourseProgressService
 from app.services.courses.course_activity_service import CourseActivityService
 from app.services.courses.course_review_service import CourseReviewService
 from app.services.courses.course_analytics_service import CourseAnalyticsService
+from app.services.courses.course_analytics_rollup_service import CourseAnalyticsRollupService
+from app.services.courses.course_stats_service import CourseStatsService
+from app.services.courses.course_upload_service import CourseUploadService
+from app.services.courses.material_delivery_service import MaterialDeliveryService
 
 __all__ = [
     "CourseService",
+    "CourseSearchService",
     "CourseStatusService",
     "CourseEnrollmentService",
     "CourseEnrollmentKeyService",
@@ -27,4 +33,8 @@ __all__ = [
     "CourseActivityService",
     "CourseReviewService",
     "CourseAnalyticsService",
+    "CourseAnalyticsRollupService",
+    "CourseStatsService",
+    "CourseUploadService",
+    "MaterialDeliveryService",
 ]
@@ -56,29 +56,6 @@ class CourseActivityService(BaseService):
         Returns:
             dict: Created activity log entry
         """
-        device_type = None
-        browser = None
-        ip_address = None
-
-        try:
-            ua = flask_request.headers.get("User-Agent", "")
-            ip_address = flask_request.remote_addr
-
-            # Simple UA parsing
-            if "Mobile" in ua:
-                device_type = "mobile"
-            elif "Tablet" in ua:
-                device_type = "tablet"
-            else:
-                device_type = "desktop"
-
-            for b in ["Chrome", "Firefox", "Safari", "Edge", "Opera"]:
-                if b in ua:
-                    browser = b
-                    break
-        except Exception:
-            pass
-
         log = CourseActivityLog(
             activity_id=str(uuid.uuid4()),
             course_id=course_id,
@@ -87,11 +64,9 @@ class CourseActivityService(BaseService):
             user_id=user_id,
             activity_type=activity_type,
             activity_description=activity_description,
-            device_type=device_type,
-            browser=browser,
-            ip_address=ip_address,
             session_id=session_id,
             timestamp=datetime.utcnow(),
+            **CourseActivityService.client_details(),
         )
         if metadata:
             log.set_metadata(metadata)
@@ -101,6 +76,37 @@ class CourseActivityService(BaseService):
         logger.debug("Activity tracked for user %s in course %s: %s", user_id, course_id, activity_type)
         return log.to_dict()
 
+    @staticmethod
+    def client_details() -> dict:
+        """
+        Device, browser and IP of the current request (all None outside one).
+
+        Returns:
+            dict: device_type, browser, ip_address
+        """
+        details = {"device_type": None, "browser": None, "ip_address": None}
+
+        try:
+            ua = flask_request.headers.get("User-Agent", "")
+            details["ip_address"] = flask_request.remote_addr
+
+            # Simple UA parsing
+            if "Mobile" in ua:
+                details["device_type"] = "mobile"
+            elif "Tablet" in ua:
+                details["device_type"] = "tablet"
+            else:
+                details["device_type"] = "desktop"
+
+            for b in ["Chrome", "Firefox", "Safari", "Edge", "Opera"]:
+                if b in ua:
+                    details["browser"] = b
+                    break
+        except Exception:
+            pass
+
+        return details
+
     # ──────────────────────────────────────────────────────────────────────────
     # Read
     # ──────────────────────────────────────────────────────────────────────────
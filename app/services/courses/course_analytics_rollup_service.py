@@ -0,0 +1,413 @@
+"""
+Course Analytics Rollup Service
+Maintains daily analytics rollup tables incrementally and serves
+rollup + live-delta aggregates to the course analytics dashboard.
+"""
+
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+
+from app import db
+from app.models.courses.analytics_rollup_watermark import AnalyticsRollupWatermark
+from app.models.courses.content_completion_daily_rollup import ContentCompletionDailyRollup
+from app.models.courses.course_activity_daily_rollup import CourseActivityDailyRollup
+from app.models.courses.course_activity_log import CourseActivityLog
+from app.models.courses.course_enrollment import CourseEnrollment
+from app.models.courses.course_enrollment_daily_rollup import CourseEnrollmentDailyRollup
+from app.models.courses.lesson_content_progress import LessonContentProgress
+from app.services.base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_JOB_NAME = "course_analytics_daily"
+
+# Rows committed slightly after their timestamp (long transactions, clock skew)
+# must not fall behind the watermark, so the job never processes the last few minutes.
+ROLLUP_SAFETY_LAG = timedelta(minutes=2)
+
+# Upper bound for IN (...) lists when loading existing rollup rows
+_IN_CHUNK_SIZE = 500
+
+
+def _as_date(value) -> date:
+    """Normalize func.date() output (date on MySQL, ISO string on SQLite)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _chunked(items: list, size: int):
+    """Yield successive fixed-size chunks of a list."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CourseAnalyticsRollupService(BaseService):
+    """Service for incremental daily analytics rollups."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Incremental job
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def refresh_rollups(until: datetime = None) -> dict:
+        """
+        Fold source rows created since the watermark into the daily rollup tables.
+
+        Scans only the window [watermark, until) of CourseEnrollment.enrolled_at,
+        CourseActivityLog.timestamp, LessonContentProgress.first_accessed and
+        LessonContentProgress.completed_at (all indexed), then advances the
+        watermark in the same transaction. Intended to run from a single
+        scheduler (``flask analytics rollup``); the first run backfills history.
+        The watermark row stays locked until the run commits, so an
+        unenrollment (see record_unenrollment) either sees the new watermark
+        or is already reflected in the rows this run reads.
+
+        Args:
+            until: Exclusive upper bound of the window (default: now - safety lag)
+
+        Returns:
+            dict: Window bounds and number of source rows folded in
+        """
+        upper = until or (datetime.utcnow() - ROLLUP_SAFETY_LAG)
+        watermark = (
+            AnalyticsRollupWatermark.query.filter_by(job_name=ROLLUP_JOB_NAME)
+            .with_for_update()
+            .first()
+        )
+        lower = watermark.last_processed_at if watermark else None
+
+        if lower is not None and lower >= upper:
+            db.session.rollback()
+            return {
+                "job_name": ROLLUP_JOB_NAME,
+                "window_start": lower.isoformat(),
+                "window_end": upper.isoformat(),
+                "rows_processed": 0,
+            }
+
+        try:
+            now = datetime.utcnow()
+            rows_processed = 0
+
+            # Enrollments per course/day
+            increments = {}
+            for course_id, day, count in CourseAnalyticsRollupService._window_counts(
+                CourseEnrollment.enrolled_at, [CourseEnrollment.course_id], lower, upper
+            ):
+                increments[(course_id, _as_date(day))] = {"new_enrollments": count}
+                rows_processed += count
+            CourseAnalyticsRollupService._merge_increments(
+                CourseEnrollmentDailyRollup, ("course_id", "stat_date"), increments, now
+            )
+
+            # Activity per course/day/type
+            increments = {}
+            activity_counts = CourseAnalyticsRollupService._window_counts(
+                CourseActivityLog.timestamp,
+                [CourseActivityLog.course_id, CourseActivityLog.activity_type],
+                lower,
+                upper,
+            )
+            for course_id, activity_type, day, count in activity_counts:
+                increments[(course_id, _as_date(day), activity_type)] = {"activity_count": count}
+                rows_processed += count
+            CourseAnalyticsRollupService._merge_increments(
+                CourseActivityDailyRollup,
+                ("course_id", "stat_date", "activity_type"),
+                increments,
+                now,
+            )
+
+            # Content starts (by first_accessed) and completions (by completed_at)
+            increments = {}
+            for course_id, content_id, day, count in CourseAnalyticsRollupService._window_counts(
+                LessonContentProgress.first_accessed,
+                [LessonContentProgress.course_id, LessonContentProgress.content_id],
+                lower,
+                upper,
+            ):
+                key = (course_id, _as_date(day), content_id)
+                increments.setdefault(key, {"started_count": 0, "completed_count": 0})
+                increments[key]["started_count"] += count
+                rows_processed += count
+            for course_id, content_id, day, count in CourseAnalyticsRollupService._window_counts(
+                LessonContentProgress.completed_at,
+                [LessonContentProgress.course_id, LessonContentProgress.content_id],
+                lower,
+                upper,
+                LessonContentProgress.is_completed == True,  # noqa: E712
+            ):
+                key = (course_id, _as_date(day), content_id)
+                increments.setdefault(key, {"started_count": 0, "completed_count": 0})
+                increments[key]["completed_count"] += count
+                rows_processed += count
+            CourseAnalyticsRollupService._merge_increments(
+                ContentCompletionDailyRollup,
+                ("course_id", "stat_date", "content_id"),
+                increments,
+                now,
+            )
+
+            if not watermark:
+                watermark = AnalyticsRollupWatermark(job_name=ROLLUP_JOB_NAME)
+                db.session.add(watermark)
+            watermark.last_processed_at = upper
+            watermark.last_run_at = now
+            watermark.rows_processed = rows_processed
+
+            db.session.commit()
+            logger.info(
+                "Analytics rollup advanced to %s (%d source rows)",
+                upper.isoformat(),
+                rows_processed,
+            )
+
+            return {
+                "job_name": ROLLUP_JOB_NAME,
+                "window_start": lower.isoformat() if lower else None,
+                "window_end": upper.isoformat(),
+                "rows_processed": rows_processed,
+            }
+
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error refreshing analytics rollups: %s", str(exc), exc_info=True)
+            raise
+
+    @staticmethod
+    def record_unenrollment(course_id: str, enrolled_at: datetime) -> None:
+        """
+        Take a deleted enrollment back out of the new-enrollment rollup.
+
+        Call in the transaction that deletes the enrollment. An enrollment at or
+        past the watermark is only counted live, so its deletion needs no
+        correction. The watermark is read FOR SHARE, so this waits for a
+        running refresh_rollups and sees the watermark it commits. Does not commit.
+
+        Args:
+            course_id: Course UUID
+            enrolled_at: enrolled_at of the deleted enrollment
+        """
+        if enrolled_at is None:
+            return
+        watermark = (
+            AnalyticsRollupWatermark.query.filter_by(job_name=ROLLUP_JOB_NAME)
+            .with_for_update(read=True)
+            .first()
+        )
+        if watermark is None or enrolled_at >= watermark.last_processed_at:
+            return
+        CourseEnrollmentDailyRollup.query.filter(
+            CourseEnrollmentDailyRollup.course_id == course_id,
+            CourseEnrollmentDailyRollup.stat_date == enrolled_at.date(),
+            CourseEnrollmentDailyRollup.new_enrollments > 0,
+        ).update(
+            {
+                CourseEnrollmentDailyRollup.new_enrollments: (
+                    CourseEnrollmentDailyRollup.new_enrollments - 1
+                ),
+                CourseEnrollmentDailyRollup.updated_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Rollup + live delta reads
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_watermark() -> datetime:
+        """Return the current rollup watermark (None if the job never ran)."""
+        watermark = AnalyticsRollupWatermark.query.get(ROLLUP_JOB_NAME)
+        return watermark.last_processed_at if watermark else None
+
+    @staticmethod
+    def get_new_enrollment_count(course_id: str, since: date, watermark: datetime = None) -> int:
+        """Count enrollments created on or after ``since`` (calendar day granularity)."""
+        rolled = (
+            db.session.query(
+                func.coalesce(func.sum(CourseEnrollmentDailyRollup.new_enrollments), 0)
+            )
+            .filter(
+                CourseEnrollmentDailyRollup.course_id == course_id,
+                CourseEnrollmentDailyRollup.stat_date >= since,
+            )
+            .scalar()
+        )
+        live_from = CourseAnalyticsRollupService._live_from(since, watermark)
+        live = CourseEnrollment.query.filter(
+            CourseEnrollment.course_id == course_id,
+            CourseEnrollment.enrolled_at >= live_from,
+        ).count()
+        return int(rolled or 0) + live
+
+    @staticmethod
+    def get_activity_breakdown(course_id: str, since: date, watermark: datetime = None) -> dict:
+        """Return {activity_type: count} for activity on or after ``since``."""
+        breakdown = {}
+        rolled = (
+            db.session.query(
+                CourseActivityDailyRollup.activity_type,
+                func.sum(CourseActivityDailyRollup.activity_count),
+            )
+            .filter(
+                CourseActivityDailyRollup.course_id == course_id,
+                CourseActivityDailyRollup.stat_date >= since,
+            )
+            .group_by(CourseActivityDailyRollup.activity_type)
+            .all()
+        )
+        for activity_type, count in rolled:
+            breakdown[activity_type] = int(count or 0)
+
+        live_from = CourseAnalyticsRollupService._live_from(since, watermark)
+        live = (
+            db.session.query(
+                CourseActivityLog.activity_type, func.count(CourseActivityLog.activity_id)
+            )
+            .filter(
+                CourseActivityLog.course_id == course_id,
+                CourseActivityLog.timestamp >= live_from,
+            )
+            .group_by(CourseActivityLog.activity_type)
+            .all()
+        )
+        for activity_type, count in live:
+            breakdown[activity_type] = breakdown.get(activity_type, 0) + count
+
+        return breakdown
+
+    @staticmethod
+    def get_content_completion_counts(course_id: str, watermark: datetime = None) -> dict:
+        """
+        Return all-time {content_id: (total_started, total_completed)} for a course.
+
+        Without a watermark the counts come straight from LessonContentProgress.
+        """
+        counts = {}
+
+        if watermark is None:
+            rows = (
+                db.session.query(
+                    LessonContentProgress.content_id,
+                    func.count(LessonContentProgress.progress_id),
+                    func.sum(LessonContentProgress.is_completed.cast(db.Integer)),
+                )
+                .filter(LessonContentProgress.course_id == course_id)
+                .group_by(LessonContentProgress.content_id)
+                .all()
+            )
+            return {content_id: (total, int(done or 0)) for content_id, total, done in rows}
+
+        rolled = (
+            db.session.query(
+                ContentCompletionDailyRollup.content_id,
+                func.sum(ContentCompletionDailyRollup.started_count),
+                func.sum(ContentCompletionDailyRollup.completed_count),
+            )
+            .filter(ContentCompletionDailyRollup.course_id == course_id)
+            .group_by(ContentCompletionDailyRollup.content_id)
+            .all()
+        )
+        for content_id, started, completed in rolled:
+            counts[content_id] = [int(started or 0), int(completed or 0)]
+
+        live_started = (
+            db.session.query(
+                LessonContentProgress.content_id, func.count(LessonContentProgress.progress_id)
+            )
+            .filter(
+                LessonContentProgress.course_id == course_id,
+                LessonContentProgress.first_accessed >= watermark,
+            )
+            .group_by(LessonContentProgress.content_id)
+            .all()
+        )
+        for content_id, count in live_started:
+            counts.setdefault(content_id, [0, 0])[0] += count
+
+        live_completed = (
+            db.session.query(
+                LessonContentProgress.content_id, func.count(LessonContentProgress.progress_id)
+            )
+            .filter(
+                LessonContentProgress.course_id == course_id,
+                LessonContentProgress.is_completed == True,  # noqa: E712
+                LessonContentProgress.completed_at >= watermark,
+            )
+            .group_by(LessonContentProgress.content_id)
+            .all()
+        )
+        for content_id, count in live_completed:
+            counts.setdefault(content_id, [0, 0])[1] += count
+
+        return {content_id: tuple(pair) for content_id, pair in counts.items()}
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _live_from(since: date, watermark: datetime = None) -> datetime:
+        """Start of the live-delta window: the later of ``since`` and the watermark."""
+        window_start = datetime.combine(since, datetime.min.time())
+        if watermark is None:
+            return window_start
+        return max(window_start, watermark)
+
+    @staticmethod
+    def _window_counts(ts_column, group_columns: list, lower: datetime, upper: datetime, *filters):
+        """Count rows per (group_columns, day(ts_column)) within [lower, upper)."""
+        day = func.date(ts_column)
+        q = db.session.query(*group_columns, day, func.count()).filter(
+            ts_column.isnot(None), ts_column < upper, *filters
+        )
+        if lower is not None:
+            q = q.filter(ts_column >= lower)
+        return q.group_by(*group_columns, day).all()
+
+    @staticmethod
+    def _merge_increments(model, key_fields: tuple, increments: dict, now: datetime) -> None:
+        """
+        Add per-key counter deltas to a rollup table, creating missing rows.
+
+        Args:
+            model: Rollup model with course_id / stat_date columns
+            key_fields: Column names forming the rollup key (course_id, stat_date, ...)
+            increments: {key_tuple: {counter_column: delta}}
+            now: Timestamp written to updated_at
+        """
+        if not increments:
+            return
+
+        course_ids = sorted({key[0] for key in increments})
+        min_day = min(key[1] for key in increments)
+        max_day = max(key[1] for key in increments)
+
+        existing = {}
+        for chunk in _chunked(course_ids, _IN_CHUNK_SIZE):
+            rows = model.query.filter(
+                model.course_id.in_(chunk),
+                model.stat_date >= min_day,
+                model.stat_date <= max_day,
+            ).all()
+            for row in rows:
+                existing[tuple(getattr(row, field) for field in key_fields)] = row
+
+        for key, deltas in increments.items():
+            row = existing.get(key)
+            if row is None:
+                row = model(rollup_id=str(uuid.uuid4()), **dict(zip(key_fields, key)))
+                for column in deltas:
+                    setattr(row, column, 0)
+                db.session.add(row)
+                existing[key] = row
+            for column, delta in deltas.items():
+                setattr(row, column, (getattr(row, column) or 0) + delta)
+            row.updated_at = now
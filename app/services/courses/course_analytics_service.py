@@ -6,16 +6,15 @@ Provides analytics for courses: enrollment trends, content views, attendance, re
 import logging
 from datetime import datetime, timedelta
 
-from sqlalchemy import func
-
 from app import db
 from app.exceptions import ResourceNotFoundError
 from app.models.courses.course import Course
-from app.models.courses.course_activity_log import CourseActivityLog
-from app.models.courses.course_enrollment import CourseEnrollment
 from app.models.courses.lesson_content import LessonContent
 from app.models.courses.lesson_content_progress import LessonContentProgress
 from app.services.base_service import BaseService
+from app.services.courses.course_analytics_rollup_service import CourseAnalyticsRollupService
+from app.services.courses.course_stats_service import CourseStatsService
+from app.utils.db_routing import read_only
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +23,7 @@ class CourseAnalyticsService(BaseService):
     """Service for course-level analytics (instructor / admin)."""
 
     @staticmethod
+    @read_only
     def get_course_analytics(course_id: str, user_id: str, user_role: str) -> dict:
         """
         Get comprehensive analytics for a course.
@@ -46,71 +46,54 @@ class CourseAnalyticsService(BaseService):
 
         course = Course.query.get(course_id)
 
-        # Enrollment counts by status
-        enrollment_stats = (
-            db.session.query(CourseEnrollment.status, func.count(CourseEnrollment.enrollment_id))
-            .filter(CourseEnrollment.course_id == course_id)
-            .group_by(CourseEnrollment.status)
-            .all()
-        )
-        enrollment_breakdown = {status: count for status, count in enrollment_stats}
+        # Enrollment counts by status and average progress (materialized row)
+        stats = CourseStatsService.get_course_stats(course_id)
+        enrollment_breakdown = stats.status_breakdown()
+
+        # Time-windowed and per-content counts come from the daily rollups
+        # plus a live delta of rows newer than the rollup watermark.
+        watermark = CourseAnalyticsRollupService.get_watermark()
+        thirty_days_ago = (datetime.utcnow() - timedelta(days=30)).date()
 
         # Enrollments over last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_enrollments = CourseEnrollment.query.filter(
-            CourseEnrollment.course_id == course_id,
-            CourseEnrollment.enrolled_at >= thirty_days_ago,
-        ).count()
+        recent_enrollments = CourseAnalyticsRollupService.get_new_enrollment_count(
+            course_id, thirty_days_ago, watermark
+        )
 
         # Content completion rates
         total_contents = LessonContent.query.filter_by(course_id=course_id).count()
-        content_completions = (
-            db.session.query(
-                LessonContentProgress.content_id,
-                func.count(LessonContentProgress.progress_id).label("total"),
-                func.sum(LessonContentProgress.is_completed.cast(db.Integer)).label("completed"),
-            )
-            .filter(LessonContentProgress.course_id == course_id)
-            .group_by(LessonContentProgress.content_id)
-            .all()
+        content_completions = CourseAnalyticsRollupService.get_content_completion_counts(
+            course_id, watermark
         )
 
+        contents = {}
+        if content_completions:
+            contents = {
+                c.content_id: c
+                for c in LessonContent.query.filter(
+                    LessonContent.content_id.in_(list(content_completions))
+                ).all()
+            }
+
         content_stats = []
-        for row in content_completions:
-            content = LessonContent.query.get(row.content_id)
+        for content_id, (total, completed) in content_completions.items():
+            content = contents.get(content_id)
             if content:
                 content_stats.append({
-                    "content_id": row.content_id,
+                    "content_id": content_id,
                     "title": content.title,
                     "content_type": content.content_type,
-                    "total_views": row.total,
-                    "total_completed": int(row.completed or 0),
+                    "total_views": total,
+                    "total_completed": completed,
                     "completion_rate": round(
-                        (int(row.completed or 0) / row.total) * 100, 1
-                    ) if row.total > 0 else 0,
+                        (completed / total) * 100, 1
+                    ) if total > 0 else 0,
                 })
 
-        # Average progress
-        avg_progress = (
-            db.session.query(func.avg(CourseEnrollment.progress))
-            .filter(CourseEnrollment.course_id == course_id)
-            .scalar()
-        )
-
         # Activity count by type (last 30 days)
-        activity_stats = (
-            db.session.query(
-                CourseActivityLog.activity_type,
-                func.count(CourseActivityLog.activity_id).label("count"),
-            )
-            .filter(
-                CourseActivityLog.course_id == course_id,
-                CourseActivityLog.timestamp >= thirty_days_ago,
-            )
-            .group_by(CourseActivityLog.activity_type)
-            .all()
+        activity_breakdown = CourseAnalyticsRollupService.get_activity_breakdown(
+            course_id, thirty_days_ago, watermark
         )
-        activity_breakdown = {atype: count for atype, count in activity_stats}
 
         return {
             "course_id": course_id,
@@ -118,7 +101,7 @@ class CourseAnalyticsService(BaseService):
             "total_enrollments": course.total_enrollments,
             "recent_enrollments_30d": recent_enrollments,
             "enrollment_breakdown": enrollment_breakdown,
-            "average_progress_percent": round(float(avg_progress), 1) if avg_progress else 0,
+            "average_progress_percent": round(stats.average_progress, 1),
             "total_contents": total_contents,
             "content_completion_stats": content_stats,
             "activity_breakdown_30d": activity_breakdown,
@@ -127,6 +110,7 @@ class CourseAnalyticsService(BaseService):
         }
 
     @staticmethod
+    @read_only
     def get_lesson_attendance(
         course_id: str, lesson_id: str, user_id: str, user_role: str
     ) -> dict:
@@ -249,7 +233,7 @@ class CourseAnalyticsService(BaseService):
             content_id=recording_id, is_completed=True
         ).count()
 
-        total_enrolled = CourseEnrollment.query.filter_by(course_id=course_id).count()
+        total_enrolled = CourseStatsService.get_course_stats(course_id).total_enrollments
 
         return {
             "recording_id": recording_id,
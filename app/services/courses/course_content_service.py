@@ -12,6 +12,7 @@ from app.exceptions import ResourceNotFoundError, ValidationError
 from app.models.courses.course_lesson import CourseLesson
 from app.models.courses.lesson_content import LessonContent
 from app.services.base_service import BaseService
+from app.utils.db_routing import read_only
 
 logger = logging.getLogger(__name__)
 
@@ -412,6 +413,7 @@ class CourseContentService(BaseService):
     # ──────────────────────────────────────────────────────────────────────────
 
     @staticmethod
+    @read_only
     def get_course_content(course_id: str, user_id: str, user_role: str) -> dict:
         """
         Get full course content structure (sections → lessons → contents).
@@ -3,16 +3,24 @@ Course Enrollment Service
 Handles student enrollment, unenrollment, and enrollment listing
 """
 
+import base64
 import logging
 import uuid
 from datetime import datetime, date
 
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only, selectinload
+
 from app import db
 from app.exceptions import AuthorizationError, ConflictError, ResourceNotFoundError, ValidationError
+from app.models.auth import User
 from app.models.courses.course import Course
+from app.models.courses.course_category import CourseCategory
 from app.models.courses.course_enrollment import CourseEnrollment
 from app.models.courses.course_enrollment_key import CourseEnrollmentKey
 from app.services.base_service import BaseService
+from app.services.courses.course_analytics_rollup_service import CourseAnalyticsRollupService
+from app.services.courses.course_stats_service import CourseStatsService
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +104,7 @@ class CourseEnrollmentService(BaseService):
             progress=0,
         )
         db.session.add(enrollment)
+        CourseStatsService.record_enrollment_change(course_id, new_status="enrolled")
 
         # Increment total_enrollments counter
         course.total_enrollments = (course.total_enrollments or 0) + 1
@@ -136,7 +145,13 @@ class CourseEnrollmentService(BaseService):
 
         course = Course.query.get(course_id)
 
+        old_status, old_progress = enrollment.status, enrollment.progress
+        enrolled_at = enrollment.enrolled_at
         db.session.delete(enrollment)
+        CourseStatsService.record_enrollment_change(
+            course_id, old_status=old_status, old_progress=old_progress
+        )
+        CourseAnalyticsRollupService.record_unenrollment(course_id, enrolled_at)
 
         if course and course.total_enrollments and course.total_enrollments > 0:
             course.total_enrollments -= 1
@@ -149,30 +164,98 @@ class CourseEnrollmentService(BaseService):
     # ──────────────────────────────────────────────────────────────────────────
 
     @staticmethod
-    def get_my_courses(user_id: str, status: str = None, page: int = 1, limit: int = 20) -> dict:
+    def get_my_courses(
+        user_id: str, status: str = None, page: int = 1, limit: int = 20, cursor: str = None
+    ) -> dict:
         """
-        Get all courses a student is enrolled in.
+        Get all courses a student is enrolled in, newest enrollment first.
+
+        Enrollment and course columns come from one joined query; instructor
+        and category are batch-loaded with selectinload. Pass ``cursor`` (the
+        previous response's ``next_cursor``, or an empty string for the first
+        page) to use keyset pagination on enrolled_at instead of OFFSET.
 
         Returns:
-            dict: Paginated list of enrolled courses with progress
+            dict: Enrolled courses with a progress snapshot, plus page/total
+            metadata (offset mode) or next_cursor/has_more (keyset mode)
         """
-        q = CourseEnrollment.query.filter_by(user_id=user_id)
+        q = (
+            db.session.query(CourseEnrollment, Course)
+            .join(Course, Course.course_id == CourseEnrollment.course_id)
+            .filter(CourseEnrollment.user_id == user_id)
+            .options(
+                load_only(
+                    CourseEnrollment.enrollment_id,
+                    CourseEnrollment.course_id,
+                    CourseEnrollment.user_id,
+                    CourseEnrollment.key_id,
+                    CourseEnrollment.enrollment_method,
+                    CourseEnrollment.progress,
+                    CourseEnrollment.status,
+                    CourseEnrollment.enrolled_at,
+                    CourseEnrollment.completed_at,
+                    CourseEnrollment.last_accessed,
+                    CourseEnrollment.total_time_spent_minutes,
+                ),
+                load_only(
+                    Course.course_id,
+                    Course.title,
+                    Course.slug,
+                    Course.thumbnail_url,
+                    Course.difficulty,
+                    Course.language,
+                    Course.duration_hours,
+                    Course.course_type,
+                    Course.category_id,
+                    Course.instructor_id,
+                    Course.rating,
+                ),
+                selectinload(Course.instructor).load_only(
+                    User.user_id, User.first_name, User.last_name, User.profile_picture
+                ),
+                selectinload(Course.category).load_only(
+                    CourseCategory.category_id, CourseCategory.name, CourseCategory.slug
+                ),
+            )
+        )
         if status:
             q = q.filter(CourseEnrollment.status == status)
 
-        total = q.count()
+        order_by = (CourseEnrollment.enrolled_at.desc(), CourseEnrollment.enrollment_id.desc())
+
+        if cursor is not None:
+            if cursor:
+                enrolled_at, enrollment_id = CourseEnrollmentService._decode_cursor(cursor)
+                q = q.filter(
+                    or_(
+                        CourseEnrollment.enrolled_at < enrolled_at,
+                        and_(
+                            CourseEnrollment.enrolled_at == enrolled_at,
+                            CourseEnrollment.enrollment_id < enrollment_id,
+                        ),
+                    )
+                )
+            rows = q.order_by(*order_by).limit(limit + 1).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            return {
+                "courses": [CourseEnrollmentService._my_course_dict(e, c) for e, c in rows],
+                "limit": limit,
+                "has_more": has_more,
+                "next_cursor": (
+                    CourseEnrollmentService._encode_cursor(rows[-1][0]) if has_more else None
+                ),
+            }
+
+        count_q = CourseEnrollment.query.filter_by(user_id=user_id)
+        if status:
+            count_q = count_q.filter(CourseEnrollment.status == status)
+        total = count_q.count()
         offset = (page - 1) * limit
-        enrollments = q.order_by(CourseEnrollment.enrolled_at.desc()).offset(offset).limit(limit).all()
-
-        result = []
-        for enrollment in enrollments:
-            course = Course.query.get(enrollment.course_id)
-            if course:
-                data = {**course.to_dict(), **enrollment.to_dict()}
-                result.append(data)
+        rows = q.order_by(*order_by).offset(offset).limit(limit).all()
 
         return {
-            "courses": result,
+            "courses": [CourseEnrollmentService._my_course_dict(e, c) for e, c in rows],
             "total": total,
             "page": page,
             "limit": limit,
@@ -202,7 +285,12 @@ class CourseEnrollmentService(BaseService):
         if status:
             q = q.filter(CourseEnrollment.status == status)
 
-        total = q.count()
+        # Totals come from the materialized stats row instead of COUNT(*)
+        stats = CourseStatsService.get_course_stats(course_id)
+        if status:
+            total = stats.status_breakdown().get(status, 0)
+        else:
+            total = stats.total_enrollments
         offset = (page - 1) * limit
         enrollments = q.order_by(CourseEnrollment.enrolled_at.desc()).offset(offset).limit(limit).all()
 
@@ -213,3 +301,65 @@ class CourseEnrollmentService(BaseService):
             "limit": limit,
             "total_pages": (total + limit - 1) // limit,
         }
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _my_course_dict(enrollment: "CourseEnrollment", course: "Course") -> dict:
+        """Serialize one "my courses" row (dashboard columns only)."""
+        instructor = course.instructor
+        category = course.category
+        return {
+            "course_id": course.course_id,
+            "title": course.title,
+            "slug": course.slug,
+            "thumbnail_url": course.thumbnail_url,
+            "difficulty": course.difficulty,
+            "language": course.language,
+            "duration_hours": course.duration_hours,
+            "course_type": course.course_type,
+            "category_id": course.category_id,
+            "instructor_id": course.instructor_id,
+            "rating": float(course.rating) if course.rating else None,
+            "instructor": {
+                "user_id": instructor.user_id,
+                "first_name": instructor.first_name,
+                "last_name": instructor.last_name,
+                "profile_picture": instructor.profile_picture,
+            } if instructor else None,
+            "category": {
+                "category_id": category.category_id,
+                "name": category.name,
+                "slug": category.slug,
+            } if category else None,
+            **enrollment.to_dict(),
+            "progress_snapshot": {
+                "overall_progress": enrollment.progress,
+                "enrollment_status": enrollment.status,
+                "completed_at": (
+                    enrollment.completed_at.isoformat() if enrollment.completed_at else None
+                ),
+                "last_accessed": (
+                    enrollment.last_accessed.isoformat() if enrollment.last_accessed else None
+                ),
+                "total_time_spent_minutes": enrollment.total_time_spent_minutes,
+            },
+        }
+
+    @staticmethod
+    def _encode_cursor(enrollment: "CourseEnrollment") -> str:
+        """Opaque keyset cursor for the row after ``enrollment``."""
+        raw = f"{enrollment.enrolled_at.isoformat()}|{enrollment.enrollment_id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """Decode a keyset cursor into (enrolled_at, enrollment_id)."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            enrolled_at, enrollment_id = raw.split("|", 1)
+            return datetime.fromisoformat(enrolled_at), enrollment_id
+        except (ValueError, UnicodeError):
+            raise ValidationError("Invalid cursor")
@@ -14,6 +14,7 @@ from app.models.courses.course_lesson import CourseLesson
 from app.models.courses.lesson_content import LessonContent
 from app.models.courses.lesson_content_progress import LessonContentProgress
 from app.services.base_service import BaseService
+from app.services.courses.course_stats_service import CourseStatsService
 
 logger = logging.getLogger(__name__)
 
@@ -158,8 +159,11 @@ class CourseProgressService(BaseService):
         if device_type:
             progress.zoom_device_type = device_type
         progress.last_accessed = now
-        progress.is_completed = True
-        progress.completed_at = now
+        # completed_at is the first completion, as for videos and lessons;
+        # repeat attendance moves last_accessed and the zoom_* fields only
+        if not progress.is_completed:
+            progress.is_completed = True
+            progress.completed_at = now
 
         db.session.commit()
         CourseProgressService._recalculate_enrollment_progress(course_id, user_id)
@@ -277,13 +281,23 @@ class CourseProgressService(BaseService):
             course_id=course_id, user_id=user_id
         ).first()
         if enrollment:
+            old_status, old_progress = enrollment.status, enrollment.progress
+            now = datetime.utcnow()
             enrollment.progress = percentage
-            enrollment.last_accessed = datetime.utcnow()
+            enrollment.last_accessed = now
             if percentage >= 100:
                 enrollment.status = "completed"
-                enrollment.completed_at = datetime.utcnow()
+                enrollment.completed_at = now
             elif percentage > 0:
                 enrollment.status = "in_progress"
+            CourseStatsService.record_enrollment_change(
+                course_id,
+                old_status=old_status,
+                new_status=enrollment.status,
+                old_progress=old_progress,
+                new_progress=percentage,
+                activity_at=now,
+            )
             db.session.commit()
             return enrollment.to_dict()
 
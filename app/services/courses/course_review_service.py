@@ -89,6 +89,7 @@ class CourseReviewService(BaseService):
         CourseReviewService._update_course_rating(course_id, db.session)
 
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
 
         logger.info("Review created for course %s by user %s", course_id, user_id)
         return review.to_dict()
@@ -133,6 +134,19 @@ class CourseReviewService(BaseService):
             "total_pages": (total + limit - 1) // limit,
         }
 
+    @staticmethod
+    def get_reviews_version(course_id: str) -> tuple:
+        """
+        Validator for a course's public review list.
+
+        Returns:
+            tuple: (version string, last modified datetime)
+        """
+        last_modified, count = db.session.query(
+            func.max(CourseReview.updated_at), func.count(CourseReview.review_id)
+        ).filter(CourseReview.course_id == course_id).one()
+        return f"{count}:{last_modified}", last_modified
+
     # ──────────────────────────────────────────────────────────────────────────
     # Internal
     # ──────────────────────────────────────────────────────────────────────────
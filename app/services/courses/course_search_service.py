@@ -0,0 +1,159 @@
+"""
+Course Search Service
+Full-text catalogue search backed by a MySQL FULLTEXT index (FTS5 on SQLite)
+"""
+
+import logging
+import re
+
+from sqlalchemy import column, inspect, literal_column, or_, select, table, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+
+from app import db
+from app.models.courses.course import (
+    COURSE_SEARCH_FTS_TABLE,
+    COURSE_SEARCH_SQLITE_DDL,
+    Course,
+)
+from app.services.base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_QUERY_TERMS = 8
+MYSQL_MIN_TOKEN_LENGTH = 3  # innodb_ft_min_token_size default
+MYSQL_FULLTEXT_INDEX = "ft_courses_title_description"
+
+
+class CourseSearchService(BaseService):
+    """Service for full-text course search and search index maintenance."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Query
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def search(q, query: str, offset: int = 0, limit: int = 20) -> tuple:
+        """
+        Run a full-text search over an already-filtered Course query.
+
+        Every term must match (AND) and each term is treated as a prefix, so
+        "pyth prog" finds "Python Programming". Results are ranked by relevance,
+        newest first on ties.
+
+        Args:
+            q: Course query with the non-text filters (status, category, ...) applied
+            query: Raw user search string
+            offset: Rows to skip
+            limit: Page size
+
+        Returns:
+            tuple: (total matching courses, list of Course for the page)
+        """
+        dialect = db.engine.dialect.name
+        terms = CourseSearchService._tokenize(query)
+        if dialect == "mysql":
+            terms = [t for t in terms if len(t) >= MYSQL_MIN_TOKEN_LENGTH]
+
+        if terms and dialect == "mysql":
+            against = " ".join(f"+{term}*" for term in terms)
+            score = mysql_match(Course.title, Course.description, against=against)
+            score = score.in_boolean_mode()
+            q = q.filter(score)
+            total = q.count()
+            courses = (
+                q.order_by(score.desc(), Course.created_at.desc()).offset(offset).limit(limit).all()
+            )
+            return total, courses
+
+        if terms and dialect == "sqlite":
+            fts = table(COURSE_SEARCH_FTS_TABLE, column("rowid"), column("rank"))
+            match = text(f"{COURSE_SEARCH_FTS_TABLE} MATCH :match").bindparams(
+                match=" ".join(f'"{term}"*' for term in terms)
+            )
+            # Count through an IN (...) so the FTS lookup runs once; a plain join
+            # lets the planner probe the FTS table once per candidate course.
+            total = q.filter(
+                literal_column("courses.rowid").in_(select(fts.c.rowid).where(match))
+            ).count()
+            # rank is bm25() with the column weights configured at table
+            # creation (lower is better)
+            courses = (
+                q.join(fts, fts.c.rowid == literal_column("courses.rowid"))
+                .filter(match)
+                .order_by(fts.c.rank.asc(), Course.created_at.desc())
+                .offset(offset)
+                .limit(limit)
+                .all()
+            )
+            return total, courses
+
+        # No usable terms (or an unsupported dialect): substring match
+        like = f"%{query}%"
+        q = q.filter(or_(Course.title.ilike(like), Course.description.ilike(like)))
+        total = q.count()
+        courses = q.order_by(Course.created_at.desc()).offset(offset).limit(limit).all()
+        return total, courses
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Index maintenance
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def rebuild_index() -> dict:
+        """
+        Create the search index if it is missing and re-sync it with courses.
+
+        Only needed for databases created before the index existed; new rows
+        are indexed incrementally (FULLTEXT on MySQL, triggers on SQLite).
+
+        Returns:
+            dict: Dialect and number of indexed courses
+        """
+        dialect = db.engine.dialect.name
+
+        try:
+            if dialect == "sqlite":
+                for statement in COURSE_SEARCH_SQLITE_DDL:
+                    db.session.execute(text(statement))
+                db.session.execute(
+                    text(
+                        f"INSERT INTO {COURSE_SEARCH_FTS_TABLE}({COURSE_SEARCH_FTS_TABLE}) "
+                        "VALUES ('rebuild')"
+                    )
+                )
+            elif dialect == "mysql":
+                existing = {
+                    index["name"] for index in inspect(db.engine).get_indexes(Course.__tablename__)
+                }
+                if MYSQL_FULLTEXT_INDEX not in existing:
+                    db.session.execute(
+                        text(
+                            f"ALTER TABLE {Course.__tablename__} ADD FULLTEXT INDEX "
+                            f"{MYSQL_FULLTEXT_INDEX} (title, description)"
+                        )
+                    )
+            else:
+                logger.warning("No full-text search index for dialect %s", dialect)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error rebuilding course search index: %s", str(exc))
+            raise
+
+        indexed = Course.query.count()
+        logger.info("Course search index rebuilt (%s, %d courses)", dialect, indexed)
+        return {"dialect": dialect, "indexed_courses": indexed}
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _tokenize(query: str) -> list:
+        """Split a search string into lower-cased word terms (operators dropped)."""
+        terms = []
+        for term in TOKEN_RE.findall((query or "").lower()):
+            if term not in terms:
+                terms.append(term)
+        return terms[:MAX_QUERY_TERMS]
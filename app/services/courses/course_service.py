@@ -8,13 +8,16 @@ import re
 import uuid
 from datetime import datetime
 
-from sqlalchemy import or_
+from sqlalchemy import func
 
 from app import db
 from app.exceptions import AuthorizationError, ConflictError, ResourceNotFoundError, ValidationError
 from app.models.courses.course import Course
 from app.models.courses.course_category import CourseCategory
 from app.services.base_service import BaseService
+from app.services.courses.course_search_service import CourseSearchService
+from app.utils.db_routing import read_only
+from app.utils.http_cache import invalidate_cached_responses
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +152,7 @@ class CourseService(BaseService):
         return course.to_dict()
 
     @staticmethod
+    @read_only
     def search_courses(
         query: str = None,
         category_id: str = None,
@@ -164,6 +168,9 @@ class CourseService(BaseService):
         """
         Search and filter published public courses.
 
+        Free-text queries go through CourseSearchService (full-text index,
+        relevance ranking, prefix matching); other filters are plain equality.
+
         Returns:
             dict: Paginated course list
         """
@@ -172,10 +179,6 @@ class CourseService(BaseService):
             Course.visibility == visibility,
         )
 
-        if query:
-            like = f"%{query}%"
-            q = q.filter(or_(Course.title.ilike(like), Course.description.ilike(like)))
-
         if category_id:
             q = q.filter(Course.category_id == category_id)
         if course_type:
@@ -187,9 +190,12 @@ class CourseService(BaseService):
         if is_paid is not None:
             q = q.filter(Course.is_paid == is_paid)
 
-        total = q.count()
         offset = (page - 1) * limit
-        courses = q.order_by(Course.created_at.desc()).offset(offset).limit(limit).all()
+        if query:
+            total, courses = CourseSearchService.search(q, query, offset=offset, limit=limit)
+        else:
+            total = q.count()
+            courses = q.order_by(Course.created_at.desc()).offset(offset).limit(limit).all()
 
         return {
             "courses": [c.to_dict() for c in courses],
@@ -257,6 +263,7 @@ class CourseService(BaseService):
 
         course.updated_at = datetime.utcnow()
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
 
         logger.info("Course updated: %s", course_id)
         return course.to_dict()
@@ -298,6 +305,7 @@ class CourseService(BaseService):
 
         db.session.delete(course)
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course deleted: %s by %s", course_id, instructor_id)
 
     # ──────────────────────────────────────────────────────────────────────────
@@ -310,6 +318,56 @@ class CourseService(BaseService):
         categories = CourseCategory.query.order_by(CourseCategory.name.asc()).all()
         return [c.to_dict() for c in categories]
 
+    # ──────────────────────────────────────────────────────────────────────────
+    # HTTP cache validators
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_catalogue_version() -> tuple:
+        """
+        Validator for the public course listing.
+
+        Returns:
+            tuple: (version string, last modified datetime)
+        """
+        last_modified, count = db.session.query(
+            func.max(Course.updated_at), func.count(Course.course_id)
+        ).one()
+        return f"{count}:{last_modified}", last_modified
+
+    @staticmethod
+    def get_course_version(course_id: str):
+        """
+        Validator for a single course.
+
+        Returns:
+            tuple | None: (version string, last modified datetime), None if not found
+        """
+        updated_at = (
+            db.session.query(Course.updated_at).filter(Course.course_id == course_id).scalar()
+        )
+        if updated_at is None:
+            return None
+        return str(updated_at), updated_at
+
+    @staticmethod
+    def get_categories_version() -> tuple:
+        """
+        Validator for the category list (categories are insert-only).
+
+        Returns:
+            tuple: (version string, last modified datetime)
+        """
+        last_modified, count = db.session.query(
+            func.max(CourseCategory.created_at), func.count(CourseCategory.category_id)
+        ).one()
+        return f"{count}:{last_modified}", last_modified
+
+    @staticmethod
+    def invalidate_public_cache(course_id: str) -> None:
+        """Drop shared-cache entries for the catalogue and one course (after commit)."""
+        invalidate_cached_responses("catalogue", f"course:{course_id}")
+
     @staticmethod
     def verify_course_owner(course_id: str, user_id: str, user_role: str) -> "Course":
         """
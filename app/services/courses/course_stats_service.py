@@ -0,0 +1,245 @@
+"""
+Course Stats Service
+Maintains the materialized course_stats row (enrollment counts by status,
+progress sum, last activity) and detects drift against course_enrollments.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.courses.course_enrollment import CourseEnrollment
+from app.models.courses.course_stats import CourseStats
+from app.services.base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+# Enrollment status -> CourseStats counter column
+STATUS_COUNTERS = {
+    "enrolled": "enrolled_count",
+    "in_progress": "in_progress_count",
+    "completed": "completed_count",
+    "dropped": "dropped_count",
+}
+
+COUNTER_FIELDS = tuple(STATUS_COUNTERS.values()) + ("progress_sum",)
+
+
+class CourseStatsService(BaseService):
+    """Service for the materialized per-course enrollment statistics."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Write path (called inside the caller's transaction)
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def record_enrollment_change(
+        course_id: str,
+        old_status: str = None,
+        new_status: str = None,
+        old_progress: int = 0,
+        new_progress: int = 0,
+        activity_at: datetime = None,
+    ) -> None:
+        """
+        Apply one enrollment change to the course's stats row.
+
+        Pass old_status=None for a new enrollment and new_status=None for a
+        removed one. The counters are bumped with a single atomic
+        ``UPDATE ... SET col = col + delta`` so concurrent writers do not lose
+        increments. Does not commit; the caller's commit makes the enrollment
+        change and the stats change land together.
+
+        Args:
+            course_id: Course UUID
+            old_status: Status before the change (None if the enrollment is new)
+            new_status: Status after the change (None if the enrollment was removed)
+            old_progress: Progress before the change
+            new_progress: Progress after the change
+            activity_at: Timestamp of the change (default: now)
+        """
+        now = datetime.utcnow()
+        activity_at = activity_at or now
+
+        values = {}
+        if old_status != new_status:
+            if old_status in STATUS_COUNTERS:
+                column = getattr(CourseStats, STATUS_COUNTERS[old_status])
+                values[column] = column - 1
+            if new_status in STATUS_COUNTERS:
+                column = getattr(CourseStats, STATUS_COUNTERS[new_status])
+                values[column] = column + 1
+
+        progress_delta = (new_progress or 0) - (old_progress or 0)
+        if progress_delta:
+            values[CourseStats.progress_sum] = CourseStats.progress_sum + progress_delta
+
+        values[CourseStats.last_activity_at] = case(
+            (
+                or_(
+                    CourseStats.last_activity_at.is_(None),
+                    CourseStats.last_activity_at < activity_at,
+                ),
+                activity_at,
+            ),
+            else_=CourseStats.last_activity_at,
+        )
+        values[CourseStats.updated_at] = now
+
+        if CourseStatsService._apply_delta(course_id, values):
+            return
+
+        # First change for this course: materialize from the base table,
+        # which (after the flush) already reflects the pending change. The
+        # insert runs in a savepoint so that, when a concurrent first change
+        # created the row in the meantime, the duplicate key only rolls back
+        # the savepoint (not the caller's enrollment) and the delta is applied
+        # to the row that won instead.
+        db.session.flush()
+        try:
+            with db.session.begin_nested():
+                CourseStatsService.rebuild_course_stats(course_id)
+        except IntegrityError:
+            logger.info("course_stats row for %s created concurrently; applying delta", course_id)
+            CourseStatsService._apply_delta(course_id, values)
+
+    @staticmethod
+    def rebuild_course_stats(course_id: str) -> CourseStats:
+        """
+        Recompute a course's stats row from course_enrollments (caller commits).
+
+        Returns:
+            CourseStats: The refreshed stats row
+        """
+        expected = CourseStatsService._aggregate_enrollments([course_id]).get(course_id, {})
+
+        stats = CourseStats.query.get(course_id)
+        if not stats:
+            stats = CourseStats(course_id=course_id)
+            db.session.add(stats)
+
+        for field in COUNTER_FIELDS:
+            setattr(stats, field, expected.get(field, 0))
+        stats.last_activity_at = expected.get("last_activity_at")
+        stats.updated_at = datetime.utcnow()
+        return stats
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Read path
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_course_stats(course_id: str) -> CourseStats:
+        """
+        Return the stats row for a course, materializing it on first access.
+
+        Returns:
+            CourseStats: Stats row (single primary-key lookup once materialized)
+        """
+        stats = CourseStats.query.get(course_id)
+        if stats:
+            return stats
+
+        try:
+            stats = CourseStatsService.rebuild_course_stats(course_id)
+            db.session.commit()
+            return stats
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error materializing stats for course %s: %s", course_id, str(exc))
+            raise
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Drift detection
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def detect_drift(course_id: str = None, fix: bool = False) -> list:
+        """
+        Compare course_stats against fresh aggregates over course_enrollments.
+
+        Args:
+            course_id: Limit the check to one course (default: all courses)
+            fix: Overwrite drifted (or missing) rows with the recomputed values
+
+        Returns:
+            list: One dict per drifted course with expected/actual counters
+        """
+        course_ids = [course_id] if course_id else None
+        expected_by_course = CourseStatsService._aggregate_enrollments(course_ids)
+
+        stats_q = CourseStats.query
+        if course_id:
+            stats_q = stats_q.filter(CourseStats.course_id == course_id)
+        stats_by_course = {s.course_id: s for s in stats_q.all()}
+
+        drifted = []
+        for cid in sorted(set(expected_by_course) | set(stats_by_course)):
+            expected = {
+                field: expected_by_course.get(cid, {}).get(field, 0) for field in COUNTER_FIELDS
+            }
+            stats = stats_by_course.get(cid)
+            actual = (
+                {field: getattr(stats, field) or 0 for field in COUNTER_FIELDS} if stats else None
+            )
+            if actual == expected:
+                continue
+
+            drifted.append({"course_id": cid, "expected": expected, "actual": actual})
+            if fix:
+                CourseStatsService.rebuild_course_stats(cid)
+
+        if fix and drifted:
+            try:
+                db.session.commit()
+                logger.warning("Repaired course_stats drift for %d course(s)", len(drifted))
+            except Exception:
+                db.session.rollback()
+                raise
+
+        return drifted
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _apply_delta(course_id: str, values: dict) -> int:
+        """Atomically apply counter deltas; returns the number of rows updated."""
+        return (
+            CourseStats.query.filter(CourseStats.course_id == course_id)
+            .update(values, synchronize_session=False)
+        )
+
+    @staticmethod
+    def _aggregate_enrollments(course_ids: list = None) -> dict:
+        """Aggregate counters per course straight from course_enrollments."""
+        q = db.session.query(
+            CourseEnrollment.course_id,
+            CourseEnrollment.status,
+            func.count(CourseEnrollment.enrollment_id),
+            func.sum(CourseEnrollment.progress),
+            func.max(CourseEnrollment.enrolled_at),
+            func.max(CourseEnrollment.last_accessed),
+        )
+        if course_ids:
+            q = q.filter(CourseEnrollment.course_id.in_(course_ids))
+
+        result = {}
+        for cid, status, count, progress_sum, last_enrolled, last_accessed in q.group_by(
+            CourseEnrollment.course_id, CourseEnrollment.status
+        ).all():
+            entry = result.setdefault(cid, {field: 0 for field in COUNTER_FIELDS})
+            if status in STATUS_COUNTERS:
+                entry[STATUS_COUNTERS[status]] += count
+            entry["progress_sum"] += int(progress_sum or 0)
+
+            latest = max((ts for ts in (last_enrolled, last_accessed) if ts), default=None)
+            current = entry.get("last_activity_at")
+            if latest and (current is None or latest > current):
+                entry["last_activity_at"] = latest
+
+        return result
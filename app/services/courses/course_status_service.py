@@ -14,6 +14,7 @@ from app.exceptions import AuthorizationError, ConflictError, ResourceNotFoundEr
 from app.models.courses.course import Course
 from app.models.courses.course_status_audit import CourseStatusAudit
 from app.services.base_service import BaseService
+from app.services.courses.course_service import CourseService
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +97,7 @@ class CourseStatusService(BaseService):
             course_id, user_id, "publish", previous_status, "published", change_reason=reason
         )
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course %s published by %s", course_id, user_id)
         return course.to_dict()
 
@@ -117,6 +119,7 @@ class CourseStatusService(BaseService):
             course_id, user_id, "unpublish", previous_status, "draft", change_reason=reason
         )
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course %s unpublished by %s", course_id, user_id)
         return course.to_dict()
 
@@ -138,6 +141,7 @@ class CourseStatusService(BaseService):
             course_id, user_id, "archive", previous_status, "archived", change_reason=reason
         )
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course %s archived by %s", course_id, user_id)
         return course.to_dict()
 
@@ -159,6 +163,7 @@ class CourseStatusService(BaseService):
             course_id, user_id, "unarchive", previous_status, "draft", change_reason=reason
         )
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course %s unarchived by %s", course_id, user_id)
         return course.to_dict()
 
@@ -187,6 +192,7 @@ class CourseStatusService(BaseService):
             change_reason=reason,
         )
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course %s set to private by %s", course_id, user_id)
         return course.to_dict()
 
@@ -211,5 +217,6 @@ class CourseStatusService(BaseService):
             change_reason=reason,
         )
         db.session.commit()
+        CourseService.invalidate_public_cache(course_id)
         logger.info("Course %s set to public by %s", course_id, user_id)
         return course.to_dict()
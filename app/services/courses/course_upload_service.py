@@ -0,0 +1,511 @@
+"""
+Course Upload Service
+Chunked, resumable uploads of course materials (create, write chunks, finalize)
+
+Protocol (modelled on tus):
+    1. create_upload reserves the file: its size and SHA-256 are declared up
+       front and a partial file of that size is pre-allocated on disk.
+    2. write_chunk streams one chunk of the request body straight into the
+       partial file at its offset with os.pwrite. Chunks are aligned to
+       chunk_size, may arrive in any order, in parallel, and be retried.
+    3. get_upload_status lists the missing chunks so a client can resume.
+    4. complete_upload verifies the whole-file checksum and atomically links
+       the partial file to a free name under courses/materials/<course_id>/.
+"""
+
+import base64
+import binascii
+import errno
+import hashlib
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.exceptions import ConflictError, LMSException, ResourceNotFoundError, ValidationError
+from app.models.courses.course_upload import CourseUpload
+from app.models.courses.course_upload_chunk import CourseUploadChunk
+from app.services.base_service import BaseService
+from app.utils.file_handler import FileHandler
+
+logger = logging.getLogger(__name__)
+
+# Request bodies and files are streamed in blocks of this size
+IO_BLOCK_SIZE = 1024 * 1024
+
+MIN_CHUNK_SIZE = 256 * 1024
+
+PARTIAL_DIRECTORY = ".partial"
+
+# How long past its expiry an upload left finalizing is kept before cleanup
+FINALIZING_GRACE = timedelta(hours=1)
+
+
+class CourseUploadService(BaseService):
+    """Service for resumable course material uploads."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Create
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def create_upload(
+        course_id: str,
+        user_id: str,
+        user_role: str,
+        filename: str,
+        total_size: int,
+        checksum_sha256: str,
+        chunk_size: int = None,
+    ) -> dict:
+        """
+        Start an upload and pre-allocate its partial file.
+
+        Args:
+            course_id: Course UUID
+            user_id: Uploader user ID
+            user_role: Uploader role
+            filename: Original filename (sanitized)
+            total_size: File size in bytes
+            checksum_sha256: Hex SHA-256 of the whole file
+            chunk_size: Optional bytes per chunk (default UPLOAD_CHUNK_SIZE)
+
+        Returns:
+            dict: Upload data including total_chunks
+
+        Raises:
+            ValidationError: Invalid filename, size, checksum or chunk size
+            AuthorizationError: Not the course owner
+            LMSException: 507 when the disk cannot hold the file
+        """
+        from app.services.courses.course_service import CourseService
+
+        CourseService.verify_course_owner(course_id, user_id, user_role)
+
+        safe_name = secure_filename(filename or "")
+        extension = FileHandler.get_file_extension(safe_name)
+        allowed = current_app.config.get("ALLOWED_EXTENSIONS", set())
+        if not safe_name or extension not in allowed:
+            raise ValidationError(f"Invalid file type. Allowed: {', '.join(sorted(allowed))}")
+
+        max_size = current_app.config.get("MAX_UPLOAD_SIZE")
+        if not isinstance(total_size, int) or total_size < 1:
+            raise ValidationError("total_size must be a positive integer")
+        if max_size and total_size > max_size:
+            raise ValidationError(f"File size must not exceed {max_size} bytes")
+
+        checksum = (checksum_sha256 or "").strip().lower()
+        if len(checksum) != 64 or any(c not in "0123456789abcdef" for c in checksum):
+            raise ValidationError("checksum_sha256 must be a hex SHA-256 digest")
+
+        chunk_size = chunk_size or current_app.config.get("UPLOAD_CHUNK_SIZE")
+        max_chunk = current_app.config.get("MAX_CONTENT_LENGTH")
+        if not isinstance(chunk_size, int) or chunk_size < MIN_CHUNK_SIZE:
+            raise ValidationError(f"chunk_size must be at least {MIN_CHUNK_SIZE} bytes")
+        if max_chunk and chunk_size > max_chunk:
+            raise ValidationError(f"chunk_size must not exceed {max_chunk} bytes")
+
+        upload_id = str(uuid.uuid4())
+        partial_path = os.path.join(
+            "courses", "materials", course_id, PARTIAL_DIRECTORY, f"{upload_id}.part"
+        )
+        CourseUploadService._allocate(CourseUploadService._absolute(partial_path), total_size)
+
+        upload = CourseUpload(
+            upload_id=upload_id,
+            course_id=course_id,
+            user_id=user_id,
+            filename=safe_name,
+            total_size=total_size,
+            chunk_size=chunk_size,
+            checksum_sha256=checksum,
+            partial_path=partial_path,
+            expires_at=datetime.utcnow()
+            + timedelta(hours=current_app.config.get("UPLOAD_SESSION_TTL_HOURS", 24)),
+        )
+        try:
+            db.session.add(upload)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            CourseUploadService._remove(partial_path)
+            raise
+
+        logger.info(
+            f"Upload {upload.upload_id} started: {safe_name} ({total_size} bytes, "
+            f"{upload.total_chunks} chunks) for course {course_id}"
+        )
+        return upload.to_dict()
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Chunks
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def write_chunk(
+        course_id: str,
+        upload_id: str,
+        user_id: str,
+        user_role: str,
+        offset: int,
+        stream,
+        checksum: str = None,
+    ) -> dict:
+        """
+        Write one chunk from a request body stream into the partial file.
+
+        Args:
+            course_id: Course UUID
+            upload_id: Upload UUID
+            user_id: Uploader user ID
+            user_role: Uploader role
+            offset: Byte offset of the chunk (a multiple of chunk_size)
+            stream: Readable body stream (request.stream)
+            checksum: Optional "sha256 <base64 digest>" of the chunk
+
+        Returns:
+            dict: chunk_index, offset (end of this chunk), received_chunks and
+                  total_chunks
+
+        Raises:
+            ConflictError: Upload is no longer accepting chunks, or bad offset
+            ValidationError: Body length or chunk checksum mismatch (the chunk
+                             is then reported missing, even if received before)
+        """
+        upload = CourseUploadService._get_upload(course_id, upload_id, user_id, user_role)
+        if upload.status != "uploading":
+            raise ConflictError(f"Upload status must be uploading, not {upload.status}")
+
+        if not isinstance(offset, int) or offset < 0 or offset >= upload.total_size:
+            raise ConflictError(f"Upload-Offset must be between 0 and {upload.total_size - 1}")
+        if offset % upload.chunk_size:
+            raise ConflictError(f"Upload-Offset must be a multiple of {upload.chunk_size}")
+
+        chunk_index = offset // upload.chunk_size
+        length = upload.chunk_length(chunk_index)
+        expected_digest = CourseUploadService._parse_checksum(checksum)
+        digest = hashlib.sha256() if expected_digest else None
+
+        written = 0
+        try:
+            fd = os.open(CourseUploadService._absolute(upload.partial_path), os.O_WRONLY)
+            try:
+                while written < length:
+                    block = stream.read(min(IO_BLOCK_SIZE, length - written))
+                    if not block:
+                        break
+                    if digest:
+                        digest.update(block)
+                    view = memoryview(block)
+                    while view:
+                        count = os.pwrite(fd, view, offset + written)
+                        view = view[count:]
+                        written += count
+            finally:
+                os.close(fd)
+
+            if written < length or stream.read(1):
+                raise ValidationError(f"Chunk {chunk_index} must be exactly {length} bytes")
+            if digest and digest.digest() != expected_digest:
+                raise ValidationError(f"Chunk {chunk_index} checksum is invalid")
+        except Exception:
+            # The bytes were written in place, so a failed retry of a received
+            # chunk has overwritten it; report it missing again
+            db.session.rollback()
+            CourseUploadChunk.query.filter_by(upload_id=upload_id, chunk_index=chunk_index).delete()
+            db.session.commit()
+            raise
+
+        db.session.add(CourseUploadChunk(upload_id=upload_id, chunk_index=chunk_index, size=length))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A retried chunk: the same bytes were rewritten in place
+            db.session.rollback()
+
+        return {
+            "upload_id": upload_id,
+            "chunk_index": chunk_index,
+            "offset": offset + length,
+            "received_chunks": upload.chunks.count(),
+            "total_chunks": upload.total_chunks,
+        }
+
+    @staticmethod
+    def get_upload_status(course_id: str, upload_id: str, user_id: str, user_role: str) -> dict:
+        """
+        Upload data with its received and missing chunks, for resuming.
+
+        Returns:
+            dict: Upload data plus received_chunks, missing_chunks,
+                  bytes_received and offset (contiguous bytes from the start)
+        """
+        upload = CourseUploadService._get_upload(course_id, upload_id, user_id, user_role)
+        received = CourseUploadService._received_indexes(upload_id)
+
+        contiguous = 0
+        while contiguous in received:
+            contiguous += 1
+
+        data = upload.to_dict()
+        data.update(
+            {
+                "received_chunks": len(received),
+                "missing_chunks": [i for i in range(upload.total_chunks) if i not in received],
+                "bytes_received": sum(upload.chunk_length(i) for i in received),
+                "offset": min(contiguous * upload.chunk_size, upload.total_size),
+            }
+        )
+        return data
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Finalize / Abort
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def complete_upload(course_id: str, upload_id: str, user_id: str, user_role: str) -> dict:
+        """
+        Verify the file checksum and move it to its final location.
+
+        Returns:
+            dict: Upload data including file_path and file_url
+
+        Raises:
+            ConflictError: Upload already finalizing or not uploading
+            ValidationError: Chunks missing, or the file checksum does not match
+                             (the upload is then marked failed and discarded)
+
+        Any other error puts the upload back to uploading (failed if its file
+        is gone) before it is re-raised.
+        """
+        upload = CourseUploadService._get_upload(course_id, upload_id, user_id, user_role)
+
+        # Claim the upload so concurrent completes cannot both move the file
+        claimed = CourseUpload.query.filter_by(upload_id=upload_id, status="uploading").update(
+            {"status": "finalizing"}, synchronize_session=False
+        )
+        db.session.commit()
+        if not claimed:
+            db.session.refresh(upload)
+            raise ConflictError(f"Upload status must be uploading, not {upload.status}")
+
+        partial = CourseUploadService._absolute(upload.partial_path)
+        final_path = None
+        try:
+            missing = upload.total_chunks - len(CourseUploadService._received_indexes(upload_id))
+            if missing:
+                CourseUploadService._set_status(upload, "uploading")
+                raise ValidationError(
+                    f"All chunks must be uploaded before completing ({missing} missing)"
+                )
+
+            if CourseUploadService._file_sha256(partial) != upload.checksum_sha256:
+                CourseUploadService._remove(upload.partial_path)
+                CourseUploadService._set_status(upload, "failed")
+                logger.warning(f"Upload {upload_id} failed checksum verification")
+                raise ValidationError("File checksum is invalid; the upload was discarded")
+
+            fd = os.open(partial, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            directory = os.path.dirname(os.path.dirname(partial))
+            final_path = CourseUploadService._link_unique(partial, directory, upload.filename)
+            os.remove(partial)
+
+            upload.file_path = os.path.relpath(final_path, CourseUploadService._root())
+            upload.completed_at = datetime.utcnow()
+            CourseUploadService._set_status(upload, "completed")
+        except ValidationError:
+            raise
+        except Exception:
+            # Release the claim so the client can complete again (or abort)
+            db.session.rollback()
+            if final_path:
+                if os.path.exists(partial):
+                    os.remove(final_path)
+                else:
+                    os.replace(final_path, partial)
+            CourseUploadService._set_status(
+                upload, "uploading" if os.path.exists(partial) else "failed"
+            )
+            logger.error(f"Upload {upload_id} could not be finalized", exc_info=True)
+            raise
+
+        logger.info(f"Upload {upload_id} completed: {upload.file_path}")
+        data = upload.to_dict()
+        data["file_url"] = FileHandler.get_file_url(upload.file_path)
+        return data
+
+    @staticmethod
+    def abort_upload(course_id: str, upload_id: str, user_id: str, user_role: str) -> None:
+        """
+        Cancel an unfinished upload and delete its partial file.
+
+        Raises:
+            ConflictError: Upload is finalizing or already completed
+        """
+        upload = CourseUploadService._get_upload(course_id, upload_id, user_id, user_role)
+        if upload.status in ("finalizing", "completed"):
+            raise ConflictError(f"Upload must not be aborted once {upload.status}")
+
+        CourseUploadService._remove(upload.partial_path)
+        db.session.delete(upload)
+        db.session.commit()
+        logger.info(f"Upload {upload_id} aborted")
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Maintenance
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def expire_stale_uploads(now: datetime = None) -> dict:
+        """
+        Delete unfinished or failed uploads past their expiry and their files.
+
+        Uploads left finalizing by a crashed worker are deleted once they are
+        FINALIZING_GRACE past their expiry, so a finalize still running is not.
+
+        Returns:
+            dict: {expired, bytes_freed}
+        """
+        now = now or datetime.utcnow()
+        stale = CourseUpload.query.filter(
+            or_(
+                and_(
+                    CourseUpload.status.in_(("uploading", "failed")),
+                    CourseUpload.expires_at < now,
+                ),
+                and_(
+                    CourseUpload.status == "finalizing",
+                    CourseUpload.expires_at < now - FINALIZING_GRACE,
+                ),
+            )
+        ).all()
+
+        freed = 0
+        for upload in stale:
+            if CourseUploadService._remove(upload.partial_path):
+                freed += upload.total_size
+            db.session.delete(upload)
+        db.session.commit()
+
+        if stale:
+            logger.info(f"Expired {len(stale)} stale upload(s), freed {freed} bytes")
+        return {"expired": len(stale), "bytes_freed": freed}
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _get_upload(course_id: str, upload_id: str, user_id: str, user_role: str) -> CourseUpload:
+        from app.services.courses.course_service import CourseService
+
+        CourseService.verify_course_owner(course_id, user_id, user_role)
+        upload = CourseUpload.query.filter_by(upload_id=upload_id, course_id=course_id).first()
+        if not upload:
+            raise ResourceNotFoundError("Upload not found")
+        return upload
+
+    @staticmethod
+    def _received_indexes(upload_id: str) -> set:
+        rows = db.session.query(CourseUploadChunk.chunk_index).filter_by(upload_id=upload_id)
+        return {index for (index,) in rows}
+
+    @staticmethod
+    def _set_status(upload: CourseUpload, status: str) -> None:
+        upload.status = status
+        db.session.commit()
+
+    @staticmethod
+    def _parse_checksum(header: str):
+        """Decode an Upload-Checksum value ("sha256 <base64>") into raw digest bytes."""
+        if not header:
+            return None
+        algorithm, _, encoded = header.strip().partition(" ")
+        if algorithm.lower() != "sha256":
+            raise ValidationError("Only sha256 chunk checksums are supported")
+        try:
+            digest = base64.b64decode(encoded.strip(), validate=True)
+        except (binascii.Error, ValueError):
+            raise ValidationError("Invalid chunk checksum encoding")
+        if len(digest) != hashlib.sha256().digest_size:
+            raise ValidationError("Invalid chunk checksum length")
+        return digest
+
+    @staticmethod
+    def _root() -> str:
+        return current_app.config.get("UPLOAD_FOLDER", "uploads")
+
+    @staticmethod
+    def _absolute(relative_path: str) -> str:
+        return os.path.join(CourseUploadService._root(), relative_path)
+
+    @staticmethod
+    def _allocate(path: str, size: int) -> None:
+        """Create the partial file with its blocks reserved up front."""
+        Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o640)
+        try:
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except AttributeError:
+                os.ftruncate(fd, size)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise LMSException("Insufficient storage for this upload", status_code=507)
+                # Filesystems without fallocate support get a sparse file
+                os.ftruncate(fd, size)
+        except Exception:
+            os.close(fd)
+            os.remove(path)
+            raise
+        os.close(fd)
+
+    @staticmethod
+    def _remove(relative_path: str) -> bool:
+        try:
+            os.remove(CourseUploadService._absolute(relative_path))
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _link_unique(source: str, directory: str, filename: str) -> str:
+        """
+        Hard-link source into directory as filename, or as the next free
+        <stem>_<n> name. os.link never replaces an existing file, so uploads
+        finalized at the same time under the same name cannot overwrite each
+        other.
+        """
+        stem, _, extension = filename.rpartition(".")
+        candidate = filename
+        while True:
+            path = os.path.join(directory, candidate)
+            try:
+                os.link(source, path)
+                return path
+            except FileExistsError:
+                candidate = FileHandler.get_next_filename(directory, stem, extension)
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        buffer = bytearray(IO_BLOCK_SIZE)
+        view = memoryview(buffer)
+        with open(path, "rb", buffering=0) as handle:
+            while True:
+                count = handle.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+        return digest.hexdigest()
@@ -0,0 +1,263 @@
+"""
+Material Delivery Service
+Authorizes material downloads once, hands out short-lived signed URLs and
+serves the signed files without holding a worker for the whole transfer.
+
+Files are served with Range, ETag and If-Modified-Since support either by the
+WSGI server (wsgi.file_wrapper, i.e. sendfile under gunicorn) or, with
+MATERIAL_DELIVERY_MODE, by the front-end server via X-Accel-Redirect (nginx)
+or X-Sendfile (Apache/lighttpd).
+
+Download events are pushed onto a Redis list when MATERIAL_DOWNLOAD_QUEUE_ENABLED
+is set and written to course_activity_logs in bulk by
+``flask materials flush-downloads``; without Redis they are written directly.
+"""
+
+import json
+import logging
+import mimetypes
+import os
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import quote
+
+import redis
+from flask import Response, current_app, request
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+
+from app import db
+from app.exceptions import AuthorizationError, ResourceNotFoundError
+from app.models.courses.course_activity_log import CourseActivityLog
+from app.models.courses.lesson_content import LessonContent
+from app.services.base_service import BaseService
+from app.services.courses.course_activity_service import CourseActivityService
+from app.utils.redis_client import get_redis_client
+from app.utils.signed_urls import sign_file_url, verify_signature
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_QUEUE_KEY = "material_downloads:queue"
+
+# Directories under UPLOAD_FOLDER that are never served (in-progress uploads)
+HIDDEN_DIRECTORIES = (".partial",)
+
+
+class MaterialDeliveryService(BaseService):
+    """Service for signed material URLs and file delivery."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Authorize
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_pdf_download(
+        course_id: str, lesson_id: str, content_id: str, user_id: str, user_role: str
+    ) -> dict:
+        """
+        Authorize a PDF download and return a signed URL for it.
+
+        Args:
+            course_id: Course UUID
+            lesson_id: Lesson UUID
+            content_id: PDF content UUID
+            user_id: Requesting user ID
+            user_role: Requesting user role
+
+        Returns:
+            dict: pdf_file_url (signed for local files), title, expires_at
+
+        Raises:
+            ResourceNotFoundError: Course or PDF content not found
+            AuthorizationError: Not the owner or enrolled
+        """
+        from app.services.courses.course_service import CourseService
+
+        CourseService.verify_owner_or_enrolled(course_id, user_id, user_role)
+
+        content = LessonContent.query.filter_by(
+            content_id=content_id, lesson_id=lesson_id, content_type="pdf"
+        ).first()
+        if not content:
+            raise ResourceNotFoundError("PDF content not found")
+
+        signed = sign_file_url(content.pdf_file_url)
+        MaterialDeliveryService.record_download(course_id, user_id, lesson_id, content_id)
+
+        return {
+            "pdf_file_url": signed["url"],
+            "title": content.title,
+            "expires_at": (
+                datetime.utcfromtimestamp(signed["expires"]).isoformat()
+                if signed["expires"]
+                else None
+            ),
+        }
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Serve
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def serve_file(relative_path: str, expires, signature) -> Response:
+        """
+        Build the response for a signed /uploads/ URL.
+
+        Range, If-None-Match and If-Modified-Since are answered by werkzeug in
+        "wsgi" mode and by the front-end server in the offload modes.
+
+        Args:
+            relative_path: File path relative to UPLOAD_FOLDER
+            expires: expires query parameter
+            signature: signature query parameter
+
+        Returns:
+            Response: File response (200/206/304)
+
+        Raises:
+            AuthorizationError: Missing, invalid or expired signature
+            ResourceNotFoundError: No such file
+        """
+        if not verify_signature(relative_path, expires, signature):
+            raise AuthorizationError("Invalid or expired download link")
+
+        root = current_app.config.get("UPLOAD_FOLDER", "uploads")
+        path = safe_join(root, relative_path)
+        parts = relative_path.split("/")
+        if not path or any(part in HIDDEN_DIRECTORIES for part in parts):
+            raise ResourceNotFoundError("File not found")
+        if not os.path.isfile(path):
+            raise ResourceNotFoundError("File not found")
+
+        mode = current_app.config.get("MATERIAL_DELIVERY_MODE", "wsgi")
+        if mode == "x-accel-redirect":
+            prefix = current_app.config.get("MATERIAL_ACCEL_REDIRECT_PREFIX", "/protected-uploads/")
+            mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            response = Response(mimetype=mimetype)
+            response.headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(relative_path)}"
+        else:
+            response = send_file(
+                os.path.abspath(path),
+                request.environ,
+                conditional=True,
+                etag=True,
+                max_age=0,
+                use_x_sendfile=mode == "x-sendfile",
+            )
+
+        # The signed URL is unique per expiry, so it may be cached until then,
+        # but only by the browser it was issued to
+        response.cache_control.public = None
+        response.cache_control.no_cache = None
+        response.cache_control.private = True
+        response.cache_control.max_age = max(int(expires) - int(time.time()), 0)
+        response.expires = None
+        return response
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Download tracking
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def record_download(course_id: str, user_id: str, lesson_id: str, content_id: str) -> None:
+        """
+        Record a pdf_download activity, queued in Redis when enabled.
+
+        Falls back to writing the activity log directly when the queue is
+        disabled or Redis is unavailable, so no download goes unrecorded.
+        """
+        event = {
+            "course_id": course_id,
+            "user_id": user_id,
+            "lesson_id": lesson_id,
+            "content_id": content_id,
+            "requested_at": datetime.utcnow().isoformat(),
+            **CourseActivityService.client_details(),
+        }
+
+        client = MaterialDeliveryService._redis_client()
+        if client is not None:
+            try:
+                client.rpush(DOWNLOAD_QUEUE_KEY, json.dumps(event))
+                return
+            except redis.RedisError as exc:
+                logger.warning("Material downloads: could not queue event: %s", exc)
+
+        CourseActivityService.track_activity(
+            course_id=course_id,
+            user_id=user_id,
+            activity_type="pdf_download",
+            lesson_id=lesson_id,
+            content_id=content_id,
+        )
+
+    @staticmethod
+    def flush_download_queue(batch_size: int = 500) -> dict:
+        """
+        Move queued download events into course_activity_logs.
+
+        Events are stamped with the flush time (the request time is kept in
+        their metadata) so the analytics rollup, which only scans rows newer
+        than its watermark, still counts events that waited in the queue.
+
+        Returns:
+            dict: {recorded, batches}
+        """
+        client = MaterialDeliveryService._redis_client()
+        if client is None:
+            return {"recorded": 0, "batches": 0}
+
+        table = CourseActivityLog.__table__
+        recorded = batches = 0
+        while True:
+            pipe = client.pipeline()
+            pipe.lrange(DOWNLOAD_QUEUE_KEY, 0, batch_size - 1)
+            pipe.ltrim(DOWNLOAD_QUEUE_KEY, batch_size, -1)
+            raw_events, _ = pipe.execute()
+            if not raw_events:
+                break
+
+            now = datetime.utcnow()
+            rows = []
+            for raw in raw_events:
+                event = json.loads(raw)
+                rows.append(
+                    {
+                        "activity_id": str(uuid.uuid4()),
+                        "course_id": event["course_id"],
+                        "lesson_id": event.get("lesson_id"),
+                        "content_id": event.get("content_id"),
+                        "user_id": event["user_id"],
+                        "activity_type": "pdf_download",
+                        "activity_description": None,
+                        "device_type": event.get("device_type"),
+                        "browser": event.get("browser"),
+                        "ip_address": event.get("ip_address"),
+                        "session_id": None,
+                        "meta_data": json.dumps({"requested_at": event.get("requested_at")}),
+                        "timestamp": now,
+                        "created_at": now,
+                    }
+                )
+            try:
+                db.session.execute(table.insert(), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # Put the batch back at the head of the queue, in order
+                client.lpush(DOWNLOAD_QUEUE_KEY, *reversed(raw_events))
+                raise
+
+            recorded += len(rows)
+            batches += 1
+            if len(raw_events) < batch_size:
+                break
+
+        if recorded:
+            logger.info(f"Material downloads: recorded {recorded} queued event(s)")
+        return {"recorded": recorded, "batches": batches}
+
+    @staticmethod
+    def _redis_client():
+        return get_redis_client("MATERIAL_DOWNLOAD_QUEUE_ENABLED")
@@ -8,6 +8,7 @@ from datetime import datetime
 
 from app import db
 from app.services.base_service import BaseService
+from app.utils.db_pool import pool_status
 
 
 class HealthCheckService(BaseService):
@@ -30,6 +31,7 @@ class HealthCheckService(BaseService):
             "timestamp": datetime.utcnow().isoformat(),
             "environment": os.environ.get("FLASK_ENV", "development"),
             "database": db_status,
+            "database_pool": HealthCheckService._database_pool(),
         }
 
     @staticmethod
@@ -77,3 +79,16 @@ class HealthCheckService(BaseService):
             return "healthy"
         except Exception as e:
             return f"unhealthy: {str(e)}"
+
+    @staticmethod
+    def _database_pool():
+        """
+        Connection pool state of this worker process
+
+        Returns:
+            dict: Pool size, checked-out/overflow counts and checkout wait times
+        """
+        try:
+            return pool_status(db.engine)
+        except Exception as e:
+            return {"error": str(e)}
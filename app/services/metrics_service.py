@@ -0,0 +1,104 @@
+"""
+Metrics Service
+Builds the Prometheus text exposition served at /metrics
+"""
+
+import logging
+import time
+
+import redis
+from flask import current_app
+from sqlalchemy import func
+
+from app import db
+from app.models.notifications.notification_batch import NotificationBatch
+from app.models.notifications.notification_delivery_log import NotificationDeliveryLog
+from app.services.base_service import BaseService
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Redis round trips slower than this count as Redis being down for the scrape
+REDIS_PING_TIMEOUT_SECONDS = 0.5
+
+
+class MetricsService(BaseService):
+    """Service for the metrics endpoint"""
+
+    @staticmethod
+    def render_metrics():
+        """
+        Request, pool and notification metrics of all workers, plus values
+        measured at scrape time (Redis latency, notification queue depth)
+
+        Returns:
+            str: Prometheus text exposition format (version 0.0.4)
+        """
+        return (
+            metrics.render()
+            + MetricsService._redis_metrics()
+            + MetricsService._notification_queue_metrics()
+        )
+
+    @staticmethod
+    def _redis_metrics():
+        """
+        Round trip of a Redis PING
+
+        Returns:
+            str: lms_redis_up and lms_redis_ping_seconds families
+        """
+        latency = None
+        try:
+            client = redis.from_url(
+                current_app.config["REDIS_URL"],
+                socket_timeout=REDIS_PING_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_PING_TIMEOUT_SECONDS,
+            )
+            started = time.perf_counter()
+            client.ping()
+            latency = time.perf_counter() - started
+        except Exception as e:
+            logger.debug(f"Redis ping failed during metrics scrape: {e}")
+
+        up = int(latency is not None)
+        text = metrics.format_family(
+            "lms_redis_up", "gauge", "Whether Redis answered a PING.", [({}, up)]
+        )
+        if latency is not None:
+            text += metrics.format_family(
+                "lms_redis_ping_seconds", "gauge", "Redis PING round trip.", [({}, latency)]
+            )
+        return text
+
+    @staticmethod
+    def _notification_queue_metrics():
+        """
+        Notification deliveries and batches waiting to be sent
+
+        Returns:
+            str: lms_notification_queue_depth family
+        """
+        try:
+            pending = (
+                db.session.query(NotificationDeliveryLog.channel, func.count())
+                .filter(NotificationDeliveryLog.status == "pending")
+                .group_by(NotificationDeliveryLog.channel)
+                .all()
+            )
+            batches = NotificationBatch.query.filter(
+                NotificationBatch.status.in_(("scheduled", "sending"))
+            ).count()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Notification queue depth unavailable: {e}")
+            return ""
+
+        samples = [({"queue": "deliveries", "channel": channel or ""}, n) for channel, n in pending]
+        samples.append(({"queue": "batches", "channel": ""}, batches))
+        return metrics.format_family(
+            "lms_notification_queue_depth",
+            "gauge",
+            "Pending notification deliveries by channel and unsent batches.",
+            samples,
+        )
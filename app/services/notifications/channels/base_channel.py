@@ -8,6 +8,7 @@ import uuid
 from datetime import datetime
 from app import db
 from app.models.notifications.notification_delivery_log import NotificationDeliveryLog
+from app.utils import metrics
 
 
 class BaseNotificationChannel(ABC):
@@ -56,6 +57,25 @@ class BaseNotificationChannel(ABC):
         """
         pass
 
+    def deliver(self, **kwargs) -> dict:
+        """
+        Send through this channel, recording send latency and outcome metrics.
+
+        Args:
+            **kwargs: send() arguments
+
+        Returns:
+            dict: send() result
+        """
+        outcome = "error"
+        try:
+            with metrics.NOTIFICATION_SEND_DURATION.time(channel=self.channel_name):
+                result = self.send(**kwargs)
+            outcome = (result or {}).get("status", "unknown")
+            return result
+        finally:
+            metrics.NOTIFICATION_SENDS.inc(channel=self.channel_name, status=outcome)
+
     @abstractmethod
     def retry(self, delivery_log_id: str) -> dict:
         """
@@ -14,9 +14,6 @@ from app import db
 from app.models.auth.user import User
 from app.models.notifications.notification_preferences import NotificationPreferences
 from app.models.notifications.notification_type_preferences import NotificationTypePreferences
-from app.services.notifications.channels.email_channel import EmailChannel
-from app.services.notifications.channels.whatsapp_channel import WhatsAppChannel
-from app.services.notifications.channels.in_app_channel import InAppChannel
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +47,8 @@ class NotificationService:
         Args:
             app: Flask application instance
         """
+        from app.services.notifications.channels import EmailChannel, InAppChannel, WhatsAppChannel
+
         self.app = app
         template_dir = os.path.join(app.root_path, 'templates')
         self.env = Environment(loader=FileSystemLoader(template_dir))
@@ -184,7 +183,7 @@ class NotificationService:
                     
                     if html_content:
                         # Send with HTML content (and optional plain text fallback)
-                        self.email_channel.send(
+                        self.email_channel.deliver(
                             recipient=user.email,
                             subject=subject,
                             content=plain_text_content,  # Plain text fallback
@@ -235,7 +234,7 @@ class NotificationService:
                         
                         logger.info(f"Sending WhatsApp notification {template_name} to {user.phone} - MessageType: {message_type}, Priority: {priority}, ContentLength: {len(content)}")
                         
-                        send_result = self.whatsapp_channel.send(
+                        send_result = self.whatsapp_channel.deliver(
                             phone=user.phone,
                             content=content,
                             messageType=message_type,
@@ -279,7 +278,7 @@ class NotificationService:
                         
                         content = content.strip()
                         
-                        self.in_app_channel.send(
+                        self.in_app_channel.deliver(
                             recipient=user_id,
                             content=content,
                             subject=subject,
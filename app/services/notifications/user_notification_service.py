@@ -10,6 +10,7 @@ from app import db
 from app.exceptions import ResourceNotFoundError
 from app.models.notifications.notification import Notification
 from app.services.base_service import BaseService
+from app.utils.db_routing import read_only
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ class UserNotificationService(BaseService):
     """Service for user notification management."""
 
     @staticmethod
+    @read_only
     def get_user_notifications(
         user_id: str,
         limit: int = 20,
@@ -209,6 +211,7 @@ class UserNotificationService(BaseService):
             raise Exception(f"Failed to delete notification: {str(e)}")
 
     @staticmethod
+    @read_only
     def get_unread_count(user_id: str) -> dict:
         """
         Get count of unread notifications.
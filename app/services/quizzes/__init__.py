@@ -10,6 +10,12 @@ from app.services.quizzes.quiz_attempt_service import QuizAttemptService
 from app.services.quizzes.quiz_answer_service import QuizAnswerService
 from app.services.quizzes.quiz_grading_service import QuizGradingService
 from app.services.quizzes.quiz_analytics_service import QuizAnalyticsService
+from app.services.quizzes.quiz_snapshot_service import QuizSnapshotService
+from app.services.quizzes.quiz_batch_grading_service import BatchGradingService
+from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
+from app.services.quizzes.quiz_autosave_service import QuizAutosaveService
+from app.services.quizzes.quiz_attempt_expiry_service import QuizAttemptExpiryService
+from app.services.quizzes.quiz_results_export_service import QuizResultsExportService
 
 __all__ = [
     "QuizService",
@@ -18,4 +24,10 @@ __all__ = [
     "QuizAnswerService",
     "QuizGradingService",
     "QuizAnalyticsService",
+    "QuizSnapshotService",
+    "BatchGradingService",
+    "ItemAnalysisService",
+    "QuizAutosaveService",
+    "QuizAttemptExpiryService",
+    "QuizResultsExportService",
 ]
@@ -13,6 +13,7 @@ from app.models.quizzes.question import Question
 from app.models.quizzes.question_option import QuestionOption
 from app.models.quizzes.quiz import Quiz
 from app.services.base_service import BaseService
+from app.services.quizzes.quiz_snapshot_service import QuizSnapshotService
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +127,9 @@ class QuestionService(BaseService):
                     db.session.add(option)
                     option_dicts.append(option.to_dict())
 
+            QuizSnapshotService.bump_version(quiz)
             db.session.commit()
+            QuizSnapshotService.invalidate(quiz_id)
             logger.info("Question %s created in quiz %s", question.question_id, quiz_id)
 
             data = question.to_dict()
@@ -247,7 +250,7 @@ class QuestionService(BaseService):
             if not question:
                 raise ResourceNotFoundError("Question not found")
 
-            QuestionService._get_quiz_with_auth(question.quiz_id, user_id, user_role)
+            quiz = QuestionService._get_quiz_with_auth(question.quiz_id, user_id, user_role)
 
             allowed_fields = (
                 "question_type", "question_text", "points",
@@ -273,7 +276,9 @@ class QuestionService(BaseService):
                     )
                     db.session.add(option)
 
+            QuizSnapshotService.bump_version(quiz)
             db.session.commit()
+            QuizSnapshotService.invalidate(quiz.quiz_id)
             logger.info("Question %s updated by user %s", question_id, user_id)
             return QuestionService.get_question(question_id)
 
@@ -311,10 +316,12 @@ class QuestionService(BaseService):
             if not question:
                 raise ResourceNotFoundError("Question not found")
 
-            QuestionService._get_quiz_with_auth(question.quiz_id, user_id, user_role)
+            quiz = QuestionService._get_quiz_with_auth(question.quiz_id, user_id, user_role)
 
             db.session.delete(question)
+            QuizSnapshotService.bump_version(quiz)
             db.session.commit()
+            QuizSnapshotService.invalidate(quiz.quiz_id)
             logger.info("Question %s deleted by user %s", question_id, user_id)
             return True
 
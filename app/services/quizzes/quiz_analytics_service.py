@@ -5,7 +5,7 @@ Provides quiz-level and question-level performance statistics for instructors.
 
 import logging
 
-from sqlalchemy import func
+from sqlalchemy import case, func
 
 from app import db
 from app.exceptions import AuthorizationError, ResourceNotFoundError
@@ -15,6 +15,8 @@ from app.models.quizzes.question import Question
 from app.models.quizzes.quiz import Quiz
 from app.models.quizzes.quiz_attempt import QuizAttempt
 from app.services.base_service import BaseService
+from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
+from app.utils.db_routing import read_only
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,7 @@ class QuizAnalyticsService(BaseService):
     # ──────────────────────────────────────────────────────────────────────────
 
     @staticmethod
+    @read_only
     def get_quiz_statistics(quiz_id: str, user_id: str, user_role: str) -> dict:
         """
         Return overall quiz performance statistics for an instructor.
@@ -57,12 +60,19 @@ class QuizAnalyticsService(BaseService):
                 raise AuthorizationError("Only the course instructor can view quiz statistics")
 
         # Aggregate submitted/graded attempts
-        attempts = QuizAttempt.query.filter(
-            QuizAttempt.quiz_id == quiz_id,
-            QuizAttempt.status.in_(["submitted", "graded"]),
-        ).all()
-
-        total_attempts = len(attempts)
+        total_attempts, average_score, passed_count, average_time = (
+            db.session.query(
+                func.count(QuizAttempt.attempt_id),
+                func.avg(func.coalesce(QuizAttempt.percentage, 0)),
+                func.sum(case((QuizAttempt.passed.is_(True), 1), else_=0)),
+                func.avg(func.coalesce(QuizAttempt.time_taken_minutes, 0)),
+            )
+            .filter(
+                QuizAttempt.quiz_id == quiz_id,
+                QuizAttempt.status.in_(["submitted", "graded"]),
+            )
+            .one()
+        )
 
         if total_attempts == 0:
             return {
@@ -74,59 +84,53 @@ class QuizAnalyticsService(BaseService):
                 "questions": [],
             }
 
-        average_score = round(
-            sum(float(a.percentage or 0) for a in attempts) / total_attempts, 2
+        # Per-question stats in one grouped query, answered from the
+        # (question_id, is_correct, time_taken_seconds) index alone
+        questions = (
+            db.session.query(Question.question_id, Question.question_text)
+            .filter(Question.quiz_id == quiz_id)
+            .order_by(Question.question_order.asc(), Question.created_at.asc())
+            .all()
         )
-        pass_rate = round(
-            sum(1 for a in attempts if a.passed) / total_attempts * 100, 2
-        )
-        average_time = round(
-            sum(a.time_taken_minutes or 0 for a in attempts) / total_attempts, 1
-        )
-
-        # Per-question stats
-        questions = Question.query.filter_by(quiz_id=quiz_id).all()
-        question_stats = []
-        for q in questions:
-            q_answers = AttemptAnswer.query.filter_by(question_id=q.question_id).all()
-            answered_count = len(q_answers)
-
-            if answered_count == 0:
-                question_stats.append(
-                    {
-                        "question_id": q.question_id,
-                        "question_text": q.question_text,
-                        "total_answers": 0,
-                        "correct_answers": 0,
-                        "correct_percentage": 0,
-                        "average_time_seconds": 0,
-                    }
+        aggregates = {
+            row[0]: row[1:]
+            for row in db.session.query(
+                AttemptAnswer.question_id,
+                func.count(AttemptAnswer.question_id),
+                func.sum(case((AttemptAnswer.is_correct.is_(True), 1), else_=0)),
+                func.avg(func.coalesce(AttemptAnswer.time_taken_seconds, 0)),
+            )
+            .filter(
+                AttemptAnswer.question_id.in_(
+                    db.session.query(Question.question_id).filter(Question.quiz_id == quiz_id)
                 )
-                continue
-
-            correct_count = sum(1 for a in q_answers if a.is_correct)
-            correct_pct = round(correct_count / answered_count * 100, 2)
-            avg_time = round(
-                sum(a.time_taken_seconds or 0 for a in q_answers) / answered_count, 1
             )
+            .group_by(AttemptAnswer.question_id)
+        }
 
+        question_stats = []
+        for question_id, question_text in questions:
+            answered_count, correct_count, avg_time = aggregates.get(question_id, (0, 0, 0))
+            correct_count = int(correct_count or 0)
             question_stats.append(
                 {
-                    "question_id": q.question_id,
-                    "question_text": q.question_text,
+                    "question_id": question_id,
+                    "question_text": question_text,
                     "total_answers": answered_count,
                     "correct_answers": correct_count,
-                    "correct_percentage": correct_pct,
-                    "average_time_seconds": avg_time,
+                    "correct_percentage": (
+                        round(correct_count / answered_count * 100, 2) if answered_count else 0
+                    ),
+                    "average_time_seconds": round(float(avg_time), 1) if answered_count else 0,
                 }
             )
 
         return {
             "quiz_id": quiz_id,
             "total_attempts": total_attempts,
-            "average_score": average_score,
-            "pass_rate": pass_rate,
-            "average_time_minutes": average_time,
+            "average_score": round(float(average_score or 0), 2),
+            "pass_rate": round(int(passed_count or 0) / total_attempts * 100, 2),
+            "average_time_minutes": round(float(average_time or 0), 1),
             "questions": question_stats,
         }
 
@@ -142,7 +146,13 @@ class QuizAnalyticsService(BaseService):
         Includes:
         - total_attempts, correct_attempts, correct_percentage
         - average_time_seconds
-        - Discrimination index (point-biserial approximation)
+        - Discrimination index (upper minus lower 27% proportion correct)
+        - p_value, point_biserial and distractor_counts per option
+
+        Served from the precomputed item-analysis store, so every figure covers
+        responses of graded attempts only: answers of attempts still in
+        progress or awaiting manual grading are not counted (the live query
+        this replaced counted every stored answer).
 
         Args:
             question_id: Question UUID
@@ -169,8 +179,9 @@ class QuizAnalyticsService(BaseService):
             if not course or course.instructor_id != user_id:
                 raise AuthorizationError("Only the course instructor can view question analytics")
 
-        answers = AttemptAnswer.query.filter_by(question_id=question_id).all()
-        total = len(answers)
+        # Single-row read from the item-analysis store
+        stats = ItemAnalysisService.get_item_stats(question)
+        total = stats.responses
 
         if total == 0:
             return {
@@ -181,80 +192,25 @@ class QuizAnalyticsService(BaseService):
                 "average_time_seconds": 0,
                 "difficulty_rating": 0,
                 "discrimination_index": 0,
+                "p_value": 0,
+                "point_biserial": 0,
+                "distractor_counts": {},
             }
 
-        correct_answers = [a for a in answers if a.is_correct]
-        correct_count = len(correct_answers)
-        correct_pct = round(correct_count / total * 100, 2)
-        avg_time = round(sum(a.time_taken_seconds or 0 for a in answers) / total, 1)
+        correct_pct = round(stats.correct_responses / total * 100, 2)
 
         # Difficulty rating: 0-5 scale (5 = hardest) inversely proportional to correct%
         difficulty_rating = round(5 * (1 - correct_pct / 100), 2)
 
-        # Discrimination index: correlation between correct answer and quiz score
-        discrimination_index = QuizAnalyticsService._compute_discrimination(question_id, answers)
-
         return {
             "question_id": question_id,
             "total_attempts": total,
-            "correct_attempts": correct_count,
+            "correct_attempts": stats.correct_responses,
             "correct_percentage": correct_pct,
-            "average_time_seconds": avg_time,
+            "average_time_seconds": round(stats.time_sum / total, 1),
             "difficulty_rating": difficulty_rating,
-            "discrimination_index": discrimination_index,
+            "discrimination_index": round(stats.discrimination_index, 2),
+            "p_value": stats.p_value,
+            "point_biserial": stats.point_biserial,
+            "distractor_counts": stats.to_dict()["distractor_counts"],
         }
-
-    # ──────────────────────────────────────────────────────────────────────────
-    # Internal helpers
-    # ──────────────────────────────────────────────────────────────────────────
-
-    @staticmethod
-    def _compute_discrimination(question_id: str, answers: list) -> float:
-        """
-        Approximate point-biserial discrimination index.
-        Returns a value in [0, 1] indicating how well the question differentiates
-        high and low scorers (0 = no discrimination, 1 = perfect).
-        """
-        try:
-            if len(answers) < 4:
-                return 0.0
-
-            attempt_ids = [a.attempt_id for a in answers]
-            attempt_scores = {
-                a.attempt_id: float(a.percentage or 0)
-                for a in QuizAttempt.query.filter(QuizAttempt.attempt_id.in_(attempt_ids)).all()
-            }
-
-            correct_scores = [
-                attempt_scores.get(a.attempt_id, 0) for a in answers if a.is_correct
-            ]
-            incorrect_scores = [
-                attempt_scores.get(a.attempt_id, 0) for a in answers if not a.is_correct
-            ]
-
-            if not correct_scores or not incorrect_scores:
-                return 0.0
-
-            mean_correct = sum(correct_scores) / len(correct_scores)
-            mean_incorrect = sum(incorrect_scores) / len(incorrect_scores)
-
-            # Simple upper-lower discrimination index
-            all_scores = list(attempt_scores.values())
-            all_scores.sort()
-            n = len(all_scores)
-            upper_cut = all_scores[int(n * 0.67)] if n >= 3 else all_scores[-1]
-            lower_cut = all_scores[int(n * 0.33)] if n >= 3 else all_scores[0]
-
-            upper_group = [a for a in answers if attempt_scores.get(a.attempt_id, 0) >= upper_cut]
-            lower_group = [a for a in answers if attempt_scores.get(a.attempt_id, 0) <= lower_cut]
-
-            if not upper_group or not lower_group:
-                return round((mean_correct - mean_incorrect) / 100, 2)
-
-            p_upper = sum(1 for a in upper_group if a.is_correct) / len(upper_group)
-            p_lower = sum(1 for a in lower_group if a.is_correct) / len(lower_group)
-
-            return round(p_upper - p_lower, 2)
-
-        except Exception:
-            return 0.0
@@ -12,10 +12,17 @@ from app import db
 from app.exceptions import AuthorizationError, ConflictError, ResourceNotFoundError, ValidationError
 from app.models.quizzes.attempt_answer import AttemptAnswer
 from app.models.quizzes.question import Question
-from app.models.quizzes.question_option import QuestionOption
 from app.models.quizzes.quiz import Quiz
 from app.models.quizzes.quiz_attempt import QuizAttempt
 from app.services.base_service import BaseService
+from app.services.quizzes.quiz_attempt_service import QuizAttemptService
+from app.services.quizzes.quiz_autosave_service import QuizAutosaveService
+from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
+from app.services.quizzes.quiz_snapshot_service import (
+    QuestionSnapshot,
+    QuizSnapshotService,
+    normalize_text_answer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +49,9 @@ class QuizAnswerService(BaseService):
         Save (or update) a student's answer for one question within an attempt.
         Does NOT auto-grade; grading happens at submission time.
 
+        Attempts with an autosave buffer are saved to Redis only; the answer
+        reaches attempt_answers at the next checkpoint or on submission.
+
         Args:
             attempt_id: Attempt UUID
             user_id: Student's user ID (ownership check)
@@ -59,6 +69,12 @@ class QuizAnswerService(BaseService):
             ValidationError: Question does not belong to this quiz
         """
         try:
+            buffered = QuizAutosaveService.save(
+                attempt_id, user_id, question_id, answer, time_taken_seconds
+            )
+            if buffered is not None:
+                return buffered
+
             attempt = QuizAttempt.query.get(attempt_id)
             if not attempt:
                 raise ResourceNotFoundError("Attempt not found")
@@ -146,8 +162,11 @@ class QuizAnswerService(BaseService):
         Raises:
             ResourceNotFoundError: Attempt not found
             AuthorizationError: Attempt does not belong to user
-            ConflictError: Already submitted
+            ConflictError: Already submitted, or its autosaved answers are still
+                being flushed
+            LMSException: Autosaved answers could not be read (503)
         """
+        closing = buffered = False
         try:
             attempt = QuizAttempt.query.get(attempt_id)
             if not attempt:
@@ -156,27 +175,35 @@ class QuizAnswerService(BaseService):
             if attempt.user_id != user_id:
                 raise AuthorizationError("This attempt does not belong to you")
 
-            if attempt.status != "in_progress":
-                raise ConflictError("Quiz has already been submitted")
-
             quiz = Quiz.query.get(attempt.quiz_id)
             if not quiz:
                 raise ResourceNotFoundError("Quiz not found")
 
+            # Another submission or the expiry sweep may be finalizing it
+            if not QuizAttemptService.claim_attempt(attempt_id):
+                raise ConflictError("Quiz has already been submitted")
+
+            # Close the autosave buffer and write its answers in this transaction
+            closing = True
+            buffered = QuizAutosaveService.close(attempt_id)
+            if buffered:
+                QuizAutosaveService.checkpoint(attempt_id, commit=False)
+
             submitted_at = datetime.utcnow()
 
             # Calculate time taken
             time_delta = submitted_at - attempt.started_at
             time_taken_minutes = int(time_delta.total_seconds() / 60)
 
-            # Get all questions and the student's answers
-            questions = Question.query.filter_by(quiz_id=attempt.quiz_id).all()
+            # Questions and answer keys come from the compiled snapshot
+            snapshot = QuizSnapshotService.get_snapshot(quiz)
+            questions = snapshot.questions
             answers_map = {
                 a.question_id: a
                 for a in AttemptAnswer.query.filter_by(attempt_id=attempt_id).all()
             }
 
-            total_points = sum(q.points or 0 for q in questions)
+            total_points = snapshot.total_points
             score = 0
             results = []
             has_manual_questions = False
@@ -227,8 +254,15 @@ class QuizAnswerService(BaseService):
             attempt.submitted_at = submitted_at
             attempt.time_taken_minutes = time_taken_minutes
             attempt.status = "submitted" if has_manual_questions else "graded"
+            QuizAttemptService.release_slot(attempt)
+            QuizAttemptService.clear_deadline(attempt_id)
+
+            if attempt.status == "graded":
+                ItemAnalysisService.record_attempt(attempt, quiz, list(answers_map.values()))
 
             db.session.commit()
+            if buffered:
+                QuizAutosaveService.discard(attempt_id)
             logger.info("Quiz attempt %s submitted by user %s", attempt_id, user_id)
 
             return {
@@ -245,9 +279,13 @@ class QuizAnswerService(BaseService):
 
         except (ResourceNotFoundError, AuthorizationError, ConflictError):
             db.session.rollback()
+            if closing:
+                QuizAutosaveService.reopen(attempt_id)
             raise
         except Exception as exc:
             db.session.rollback()
+            if closing:
+                QuizAutosaveService.reopen(attempt_id)
             logger.error("Error submitting quiz attempt %s: %s", attempt_id, str(exc), exc_info=True)
             raise
 
@@ -256,38 +294,33 @@ class QuizAnswerService(BaseService):
     # ──────────────────────────────────────────────────────────────────────────
 
     @staticmethod
-    def _auto_grade(question: Question, user_answer: str):
+    def _auto_grade(question: QuestionSnapshot, user_answer: str):
         """
-        Auto-grade an objective question.
+        Auto-grade an objective question against its compiled answer key.
 
         Returns:
             (is_correct: bool, points_earned: int, correct_answer_text: str)
         """
-        options = QuestionOption.query.filter_by(question_id=question.question_id).all()
-        correct_options = [o for o in options if o.is_correct]
-        correct_ids = {o.option_id for o in correct_options}
-        correct_texts = [o.option_text for o in correct_options]
-        correct_answer_text = ", ".join(correct_texts)
+        correct_answer_text = question.correct_answer_text
 
         if not user_answer:
             return False, 0, correct_answer_text
 
         if question.question_type == "multiple_choice":
-            is_correct = user_answer.strip() in correct_ids
+            is_correct = user_answer.strip() in question.correct_option_ids
             points = question.points if is_correct else 0
             return is_correct, points, correct_answer_text
 
         if question.question_type == "multiple_answer":
             # Expect comma-separated option_ids
             submitted = {a.strip() for a in user_answer.split(",") if a.strip()}
-            is_correct = submitted == correct_ids
+            is_correct = submitted == question.correct_option_ids
             points = question.points if is_correct else 0
             return is_correct, points, correct_answer_text
 
         if question.question_type in ("fill_blank", "matching"):
             # Case-insensitive text comparison against correct option texts
-            submitted = user_answer.strip().lower()
-            is_correct = any(c.option_text.strip().lower() == submitted for c in correct_options)
+            is_correct = normalize_text_answer(user_answer) in question.correct_texts
             points = question.points if is_correct else 0
             return is_correct, points, correct_answer_text
 
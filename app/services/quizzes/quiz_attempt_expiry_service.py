@@ -0,0 +1,303 @@
+"""
+Quiz Attempt Expiry Service
+Closes timed attempts whose deadline has passed (auto-submitting them through
+the batch grader) and sends the overdue warning shortly before the deadline.
+Driven periodically by `flask quiz expire-attempts`.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app import db
+from app.exceptions import LMSException
+from app.models.auth import User
+from app.models.courses.course import Course
+from app.models.quizzes.attempt_answer import AttemptAnswer
+from app.models.quizzes.quiz import Quiz
+from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.models.quizzes.quiz_attempt_deadline import QuizAttemptDeadline
+from app.services.base_service import BaseService
+from app.services.quizzes.quiz_attempt_service import QuizAttemptService
+from app.services.quizzes.quiz_autosave_service import QuizAutosaveService
+from app.services.quizzes.quiz_batch_grading_service import BatchGradingService
+from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPIRY_BATCH_SIZE = 500
+
+
+class QuizAttemptExpiryService(BaseService):
+    """Service for timed-attempt deadlines, expiry and overdue warnings."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Expiry
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def expire_overdue(now: datetime = None, batch_size: int = DEFAULT_EXPIRY_BATCH_SIZE) -> dict:
+        """
+        Auto-submit every in_progress attempt whose deadline (plus
+        QUIZ_EXPIRY_GRACE_SECONDS for in-flight submissions) has passed.
+
+        Attempts are processed in deadline order, batch_size at a time, with one
+        commit per batch. Each attempt is submitted as of its deadline.
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+            batch_size: Attempts expired per transaction
+
+        Returns:
+            dict: expired, graded (no manual questions left) and batches
+        """
+        now = now or datetime.utcnow()
+        grace = current_app.config.get("QUIZ_EXPIRY_GRACE_SECONDS", 60)
+        cutoff = now - timedelta(seconds=grace)
+        summary = {"expired": 0, "graded": 0, "batches": 0}
+
+        while True:
+            rows = (
+                db.session.query(
+                    QuizAttemptDeadline.attempt_id,
+                    QuizAttemptDeadline.quiz_id,
+                    QuizAttemptDeadline.deadline_at,
+                )
+                .filter(QuizAttemptDeadline.deadline_at <= cutoff)
+                .order_by(QuizAttemptDeadline.deadline_at.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            try:
+                expired, graded, buffered, done = QuizAttemptExpiryService._expire_batch(rows)
+                db.session.commit()
+            except Exception as exc:
+                db.session.rollback()
+                logger.error("Error expiring quiz attempts: %s", str(exc), exc_info=True)
+                raise
+
+            for attempt_id in buffered:
+                QuizAutosaveService.discard(attempt_id)
+
+            summary["expired"] += expired
+            summary["graded"] += graded
+            summary["batches"] += 1
+            # Stop when the batch was the last one or every row is locked by a
+            # submission in progress (it is picked up on the next run)
+            if len(rows) < batch_size or not done:
+                break
+
+        if summary["expired"]:
+            logger.info(
+                "Expired %s quiz attempts (%s graded) in %s batches",
+                summary["expired"], summary["graded"], summary["batches"],
+            )
+        return summary
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Overdue warnings
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def send_overdue_warnings(now: datetime = None, limit: int = DEFAULT_EXPIRY_BATCH_SIZE) -> int:
+        """
+        Send quiz_attempt_overdue_warning to students whose attempt ends within
+        QUIZ_EXPIRY_WARNING_MINUTES. Each attempt is warned at most once: rows
+        are marked before sending, and sending is best-effort.
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+            limit: Maximum warnings sent per call
+
+        Returns:
+            int: Number of warnings sent
+        """
+        now = now or datetime.utcnow()
+        lead = timedelta(minutes=current_app.config.get("QUIZ_EXPIRY_WARNING_MINUTES", 5))
+
+        rows = (
+            db.session.query(
+                QuizAttemptDeadline.attempt_id,
+                QuizAttemptDeadline.user_id,
+                QuizAttemptDeadline.deadline_at,
+                Quiz.quiz_id,
+                Quiz.title.label("quiz_title"),
+                Course.course_id,
+                Course.title.label("course_title"),
+                User.first_name,
+                User.last_name,
+            )
+            .join(Quiz, Quiz.quiz_id == QuizAttemptDeadline.quiz_id)
+            .join(Course, Course.course_id == Quiz.course_id)
+            .join(User, User.user_id == QuizAttemptDeadline.user_id)
+            .filter(
+                QuizAttemptDeadline.warned_at.is_(None),
+                QuizAttemptDeadline.deadline_at > now,
+                QuizAttemptDeadline.deadline_at <= now + lead,
+            )
+            .order_by(QuizAttemptDeadline.deadline_at.asc())
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            return 0
+
+        table = QuizAttemptDeadline.__table__
+        try:
+            db.session.execute(
+                table.update()
+                .where(table.c.attempt_id.in_([row.attempt_id for row in rows]))
+                .values(warned_at=now)
+            )
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error marking overdue warnings: %s", str(exc), exc_info=True)
+            raise
+
+        from app.services.notifications import NotificationService
+
+        service = NotificationService()
+        frontend_url = current_app.config.get("FRONTEND_URL", "http://localhost:5173")
+        sent = 0
+        for row in rows:
+            try:
+                service.send_quiz_attempt_overdue_warning(
+                    user_id=row.user_id,
+                    course_name=row.course_title,
+                    current_year=now.year,
+                    due_date=row.deadline_at.isoformat(),
+                    platform_url=frontend_url,
+                    preferences_url=f"{frontend_url}/notifications/preferences",
+                    quiz_name=row.quiz_title,
+                    quiz_url=f"{frontend_url}/courses/{row.course_id}/quizzes/{row.quiz_id}",
+                    recipient_name=f"{row.first_name} {row.last_name}".strip(),
+                    unsubscribe_url=f"{frontend_url}/unsubscribe",
+                )
+                sent += 1
+            except Exception as exc:
+                logger.warning(
+                    "Overdue warning for attempt %s failed: %s", row.attempt_id, exc
+                )
+        return sent
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _expire_batch(rows: list) -> tuple:
+        """
+        Expire one batch of deadline rows inside the caller's transaction.
+
+        Returns:
+            (expired, graded, buffered attempt_ids, deadline rows removed)
+        """
+        attempt_ids = [row.attempt_id for row in rows]
+        deadline_of = {row.attempt_id: row.deadline_at for row in rows}
+
+        in_progress = {
+            attempt_id
+            for (attempt_id,) in db.session.query(QuizAttempt.attempt_id).filter(
+                QuizAttempt.attempt_id.in_(attempt_ids),
+                QuizAttempt.status == "in_progress",
+            )
+        }
+        # Attempts being submitted right now are locked; skip rather than wait
+        attempts = (
+            db.session.query(
+                QuizAttempt.attempt_id,
+                QuizAttempt.quiz_id,
+                QuizAttempt.user_id,
+                QuizAttempt.started_at,
+            )
+            .filter(
+                QuizAttempt.attempt_id.in_(in_progress),
+                QuizAttempt.status == "in_progress",
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        locked = {attempt.attempt_id for attempt in attempts}
+        skipped = in_progress - locked
+
+        # Buffered autosaves are part of the submission; an attempt whose
+        # buffer cannot be flushed now is left for the next run
+        buffered = []
+        for attempt in list(attempts):
+            try:
+                if not QuizAutosaveService.close(attempt.attempt_id):
+                    continue
+                QuizAutosaveService.checkpoint(attempt.attempt_id, commit=False)
+            except LMSException as exc:
+                QuizAutosaveService.reopen(attempt.attempt_id)
+                attempts.remove(attempt)
+                skipped.add(attempt.attempt_id)
+                logger.warning("Expiry of attempt %s deferred: %s", attempt.attempt_id, exc)
+                continue
+            buffered.append(attempt.attempt_id)
+
+        # Where FOR UPDATE is not enforced (SQLite) a submission may have
+        # claimed an attempt after it was selected; leave it to that submission
+        attempts = [a for a in attempts if QuizAttemptService.claim_attempt(a.attempt_id)]
+        claimed = {attempt.attempt_id for attempt in attempts}
+        buffered = [attempt_id for attempt_id in buffered if attempt_id in claimed]
+
+        by_quiz = {}
+        for attempt in attempts:
+            by_quiz.setdefault(attempt.quiz_id, []).append(attempt)
+        quizzes = {
+            quiz.quiz_id: quiz for quiz in Quiz.query.filter(Quiz.quiz_id.in_(list(by_quiz)))
+        }
+
+        graded = 0
+        for quiz_id, quiz_attempts in by_quiz.items():
+            quiz = quizzes[quiz_id]
+            graded_ids = BatchGradingService.submit_attempts(
+                quiz,
+                [
+                    (a.attempt_id, a.started_at, deadline_of[a.attempt_id])
+                    for a in quiz_attempts
+                ],
+            )
+            QuizAttemptService.release_slots(
+                quiz_id, [(a.attempt_id, a.user_id) for a in quiz_attempts]
+            )
+            if graded_ids:
+                QuizAttemptExpiryService._record_item_analysis(quiz, graded_ids)
+                graded += len(graded_ids)
+
+        done = [attempt_id for attempt_id in attempt_ids if attempt_id not in skipped]
+        if done:
+            table = QuizAttemptDeadline.__table__
+            db.session.execute(table.delete().where(table.c.attempt_id.in_(done)))
+
+        return len(attempts), graded, buffered, len(done)
+
+    @staticmethod
+    def _record_item_analysis(quiz: Quiz, attempt_ids: list) -> None:
+        """Fold freshly graded attempts into the item-analysis store from plain rows."""
+        attempts = {
+            row.attempt_id: row
+            for row in db.session.query(QuizAttempt.attempt_id, QuizAttempt.percentage).filter(
+                QuizAttempt.attempt_id.in_(attempt_ids)
+            )
+        }
+        answers = {}
+        for row in db.session.query(
+            AttemptAnswer.attempt_id,
+            AttemptAnswer.question_id,
+            AttemptAnswer.is_correct,
+            AttemptAnswer.time_taken_seconds,
+            AttemptAnswer.user_answer,
+        ).filter(AttemptAnswer.attempt_id.in_(attempt_ids)):
+            answers.setdefault(row.attempt_id, []).append(row)
+
+        ItemAnalysisService.record_attempts(
+            [(attempts[attempt_id], answers.get(attempt_id, [])) for attempt_id in attempt_ids],
+            quiz,
+        )
@@ -5,20 +5,32 @@ Enforces max_attempts, availability windows, and enrollment checks.
 """
 
 import logging
+import random
 import uuid
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
 from app import db
 from app.exceptions import AuthorizationError, ConflictError, ResourceNotFoundError, ValidationError
 from app.models.courses.course_enrollment import CourseEnrollment
-from app.models.quizzes.question import Question
-from app.models.quizzes.question_option import QuestionOption
 from app.models.quizzes.quiz import Quiz
 from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.models.quizzes.quiz_attempt_deadline import QuizAttemptDeadline
+from app.models.quizzes.quiz_attempt_slot import QuizAttemptSlot
 from app.services.base_service import BaseService
+from app.services.quizzes.quiz_autosave_service import QuizAutosaveService
+from app.services.quizzes.quiz_snapshot_service import QuizSnapshotService
 
 logger = logging.getLogger(__name__)
 
+# MySQL deadlock (1213) and lock wait timeout (1205) error codes
+LOCK_CONFLICT_ERRORS = (1205, 1213)
+
+# Extra tries at creating a missing attempt slot after a lock conflict
+SLOT_LOCK_RETRIES = 1
+
 
 class QuizAttemptService(BaseService):
     """Service for quiz attempt lifecycle management."""
@@ -76,21 +88,21 @@ class QuizAttemptService(BaseService):
                 if not enrollment or enrollment.status == "dropped":
                     raise AuthorizationError("You must be enrolled in this course to take the quiz")
 
-            # Check for already in-progress attempt
-            in_progress = QuizAttempt.query.filter_by(
-                quiz_id=quiz_id, user_id=user_id, status="in_progress"
-            ).first()
-            if in_progress:
-                raise ConflictError(
-                    "You already have an in-progress attempt for this quiz",
-                )
-
-            # Max attempts check
-            completed_attempts = QuizAttempt.query.filter(
-                QuizAttempt.quiz_id == quiz_id,
-                QuizAttempt.user_id == user_id,
-                QuizAttempt.status.in_(["submitted", "graded"]),
-            ).count()
+            # Lock the (quiz, user) slot; the in-progress and max_attempts
+            # checks below read it instead of racing on the attempts table
+            slot = QuizAttemptService._lock_slot(quiz_id, user_id)
+            seen_active = slot.active_attempt_id
+            seen_completed = slot.completed_attempts
+            completed_attempts = seen_completed
+
+            if seen_active:
+                active = db.session.get(QuizAttempt, seen_active)
+                if active is not None and active.status == "in_progress":
+                    raise ConflictError(
+                        "You already have an in-progress attempt for this quiz",
+                    )
+                # The attempt left in_progress without releasing the slot
+                completed_attempts = QuizAttemptService._count_completed(quiz_id, user_id)
 
             if quiz.max_attempts and completed_attempts >= quiz.max_attempts:
                 raise ConflictError(
@@ -106,12 +118,55 @@ class QuizAttemptService(BaseService):
                 status="in_progress",
             )
             db.session.add(attempt)
+            db.session.flush()
+
+            # Timed attempts are auto-submitted by the expiry sweeper
+            if quiz.duration_minutes:
+                db.session.add(
+                    QuizAttemptDeadline(
+                        attempt_id=attempt.attempt_id,
+                        quiz_id=quiz_id,
+                        user_id=user_id,
+                        deadline_at=now + timedelta(minutes=quiz.duration_minutes),
+                        created_at=now,
+                    )
+                )
+
+            # Claim the slot only if nobody changed it since it was read; this
+            # is what keeps databases without SELECT ... FOR UPDATE race-free
+            slots = QuizAttemptSlot.__table__
+            claimed = db.session.execute(
+                slots.update()
+                .where(
+                    slots.c.quiz_id == quiz_id,
+                    slots.c.user_id == user_id,
+                    slots.c.completed_attempts == seen_completed,
+                    (
+                        slots.c.active_attempt_id == seen_active
+                        if seen_active
+                        else slots.c.active_attempt_id.is_(None)
+                    ),
+                )
+                .values(
+                    active_attempt_id=attempt.attempt_id,
+                    completed_attempts=completed_attempts,
+                    updated_at=now,
+                )
+            ).rowcount
+            if claimed != 1:
+                raise ConflictError(
+                    "You already have an in-progress attempt for this quiz",
+                )
+
             db.session.commit()
             logger.info("Quiz attempt %s started by user %s", attempt.attempt_id, user_id)
 
             # Build question list (no correct-answer hints)
             questions = QuizAttemptService._build_question_list(quiz)
 
+            # Autosaves go to the Redis buffer when it is enabled
+            QuizAutosaveService.open_buffer(attempt, quiz, QuizSnapshotService.get_snapshot(quiz))
+
             expires_at = None
             if quiz.duration_minutes:
                 expires_at = (now + timedelta(minutes=quiz.duration_minutes)).isoformat()
@@ -190,6 +245,207 @@ class QuizAttemptService(BaseService):
         )
         return [a.to_dict() for a in attempts]
 
+    # ──────────────────────────────────────────────────────────────────────────
+    # Submission claim
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def claim_attempt(attempt_id: str) -> bool:
+        """
+        Take an in_progress attempt out of in_progress before finalizing it.
+
+        Submission and expiry both claim the attempt with one conditional
+        UPDATE, so exactly one of them finalizes it: the row stays locked until
+        the claimer commits and a second claim then matches no row. The caller
+        sets the final status. Does not commit.
+
+        Returns:
+            bool: True if this caller claimed the attempt
+        """
+        attempts = QuizAttempt.__table__
+        return bool(
+            db.session.execute(
+                attempts.update()
+                .where(attempts.c.attempt_id == attempt_id, attempts.c.status == "in_progress")
+                .values(status="submitted")
+            ).rowcount
+        )
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Attempt slots
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def release_slot(attempt: QuizAttempt) -> None:
+        """
+        Count a finished attempt against max_attempts and free its slot.
+
+        Call in the same transaction that moves the attempt out of in_progress
+        (submission, expiry). If the slot no longer points at the attempt (a
+        legacy duplicate or a repeated submission), the completed count is
+        recomputed instead of incremented. Does not commit.
+        """
+        slots = QuizAttemptSlot.__table__
+        now = datetime.utcnow()
+        released = db.session.execute(
+            slots.update()
+            .where(
+                slots.c.quiz_id == attempt.quiz_id,
+                slots.c.user_id == attempt.user_id,
+                slots.c.active_attempt_id == attempt.attempt_id,
+            )
+            .values(
+                active_attempt_id=None,
+                completed_attempts=slots.c.completed_attempts + 1,
+                updated_at=now,
+            )
+        ).rowcount
+        if released:
+            return
+
+        completed = (
+            db.session.query(func.count(QuizAttempt.attempt_id))
+            .filter(
+                QuizAttempt.quiz_id == attempt.quiz_id,
+                QuizAttempt.user_id == attempt.user_id,
+                QuizAttempt.status.in_(["submitted", "graded"]),
+            )
+            .scalar_subquery()
+        )
+        db.session.execute(
+            slots.update()
+            .where(slots.c.quiz_id == attempt.quiz_id, slots.c.user_id == attempt.user_id)
+            .values(completed_attempts=completed, updated_at=now)
+        )
+
+    @staticmethod
+    def clear_deadline(attempt_id: str) -> None:
+        """Forget the deadline of a finished timed attempt (caller commits)."""
+        deadlines = QuizAttemptDeadline.__table__
+        db.session.execute(deadlines.delete().where(deadlines.c.attempt_id == attempt_id))
+
+    @staticmethod
+    def release_slots(quiz_id: str, attempts: list) -> None:
+        """
+        Bulk release_slot for many finished attempts of one quiz: a single
+        UPDATE recounts completed attempts and frees the matching slots.
+        Does not commit.
+
+        Args:
+            quiz_id: Quiz UUID
+            attempts: (attempt_id, user_id) pairs
+        """
+        if not attempts:
+            return
+        slots = QuizAttemptSlot.__table__
+        attempts_table = QuizAttempt.__table__
+        completed = (
+            select(func.count(attempts_table.c.attempt_id))
+            .where(
+                attempts_table.c.quiz_id == slots.c.quiz_id,
+                attempts_table.c.user_id == slots.c.user_id,
+                attempts_table.c.status.in_(["submitted", "graded"]),
+            )
+            .scalar_subquery()
+        )
+        db.session.execute(
+            slots.update()
+            .where(
+                slots.c.quiz_id == quiz_id,
+                slots.c.user_id.in_({user_id for _, user_id in attempts}),
+            )
+            .values(
+                completed_attempts=completed,
+                active_attempt_id=case(
+                    (
+                        slots.c.active_attempt_id.in_([a for a, _ in attempts]),
+                        None,
+                    ),
+                    else_=slots.c.active_attempt_id,
+                ),
+                updated_at=datetime.utcnow(),
+            )
+        )
+
+    @staticmethod
+    def _lock_slot(quiz_id: str, user_id: str) -> QuizAttemptSlot:
+        """
+        Return the (quiz, user) slot locked FOR UPDATE, creating it from the
+        attempts table on first use.
+
+        The insert runs in a savepoint. A concurrent creator makes it fail on
+        the primary key, and the winner's row is locked instead. Two first
+        starts can also deadlock on the gap locks of the empty FOR UPDATE
+        reads (MySQL 1213) or time out waiting for each other (1205). The
+        transaction has only read so far, so it is rolled back and the slot
+        is looked up once more.
+
+        Raises:
+            ConflictError: The slot could not be created or locked
+        """
+        query = (
+            QuizAttemptSlot.query.filter_by(quiz_id=quiz_id, user_id=user_id)
+            .with_for_update()
+            .populate_existing()
+        )
+        for retry in range(SLOT_LOCK_RETRIES + 1):
+            slot = query.first()
+            if slot is not None:
+                return slot
+
+            active = (
+                db.session.query(QuizAttempt.attempt_id)
+                .filter_by(quiz_id=quiz_id, user_id=user_id, status="in_progress")
+                .order_by(QuizAttempt.started_at.desc())
+                .first()
+            )
+            slot = QuizAttemptSlot(
+                quiz_id=quiz_id,
+                user_id=user_id,
+                active_attempt_id=active[0] if active else None,
+                completed_attempts=QuizAttemptService._count_completed(quiz_id, user_id),
+                updated_at=datetime.utcnow(),
+            )
+            try:
+                with db.session.begin_nested():
+                    db.session.add(slot)
+                return slot
+            except IntegrityError:
+                slot = query.first()
+                if slot is None:
+                    raise ConflictError("Could not start the attempt, please retry")
+                return slot
+            except OperationalError as exc:
+                if not QuizAttemptService._is_lock_conflict(exc):
+                    raise
+                # A deadlock aborts the whole InnoDB transaction, savepoint included
+                db.session.rollback()
+                logger.warning(
+                    "Lock conflict creating attempt slot (%s, %s), attempt %d: %s",
+                    quiz_id, user_id, retry + 1, exc.orig,
+                )
+
+        raise ConflictError("Could not start the attempt, please retry")
+
+    @staticmethod
+    def _is_lock_conflict(exc: BaseException) -> bool:
+        """True for a deadlock or lock wait timeout, also when it broke the savepoint rollback."""
+        while exc is not None:
+            if isinstance(exc, OperationalError):
+                args = getattr(exc.orig, "args", ())
+                if args and args[0] in LOCK_CONFLICT_ERRORS:
+                    return True
+            exc = exc.__context__
+        return False
+
+    @staticmethod
+    def _count_completed(quiz_id: str, user_id: str) -> int:
+        return QuizAttempt.query.filter(
+            QuizAttempt.quiz_id == quiz_id,
+            QuizAttempt.user_id == user_id,
+            QuizAttempt.status.in_(["submitted", "graded"]),
+        ).count()
+
     # ──────────────────────────────────────────────────────────────────────────
     # Internal helpers
     # ──────────────────────────────────────────────────────────────────────────
@@ -197,47 +453,33 @@ class QuizAttemptService(BaseService):
     @staticmethod
     def _build_question_list(quiz: Quiz) -> list:
         """Build and optionally shuffle the question list for an attempt."""
-        import random
-
-        questions = (
-            Question.query.filter_by(quiz_id=quiz.quiz_id)
-            .order_by(Question.question_order.asc(), Question.created_at.asc())
-            .all()
-        )
+        snapshot = QuizSnapshotService.get_snapshot(quiz)
 
+        questions = list(snapshot.questions)
         if quiz.shuffle_questions:
             random.shuffle(questions)
 
         result = []
         for q in questions:
-            q_dict = {
-                "question_id": q.question_id,
-                "question_text": q.question_text,
-                "question_type": q.question_type,
-                "points": q.points,
-                "options": [],
-            }
-
-            options = (
-                QuestionOption.query.filter_by(question_id=q.question_id)
-                .order_by(QuestionOption.option_order.asc())
-                .all()
-            )
-
+            options = list(q.options)
             if quiz.shuffle_answers:
-                import random as _r
-                options = list(options)
-                _r.shuffle(options)
+                random.shuffle(options)
 
-            q_dict["options"] = [
+            result.append(
                 {
-                    "option_id": opt.option_id,
-                    "option_text": opt.option_text,
-                    "option_order": opt.option_order,
+                    "question_id": q.question_id,
+                    "question_text": q.question_text,
+                    "question_type": q.question_type,
+                    "points": q.points,
+                    "options": [
+                        {
+                            "option_id": opt.option_id,
+                            "option_text": opt.option_text,
+                            "option_order": opt.option_order,
+                        }
+                        for opt in options
+                    ],
                 }
-                for opt in options
-            ]
-
-            result.append(q_dict)
+            )
 
         return result
@@ -0,0 +1,473 @@
+"""
+Quiz Autosave Service
+Buffers in-progress answers in a Redis hash per attempt so autosaves cost one
+Redis round trip instead of several SQL statements and a commit. Buffered
+answers are written to attempt_answers in one bulk upsert on submit and at
+periodic checkpoints, so a crash loses at most one checkpoint interval.
+"""
+
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+import redis
+from flask import current_app
+from sqlalchemy import bindparam, func
+
+from app import db
+from app.exceptions import AuthorizationError, ConflictError, LMSException, ValidationError
+from app.models.quizzes.attempt_answer import AttemptAnswer
+from app.models.quizzes.quiz import Quiz
+from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.services.base_service import BaseService
+from app.services.quizzes.quiz_snapshot_service import QuizSnapshot, QuizSnapshotService
+from app.utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "quiz_autosave"
+DIRTY_SET_KEY = f"{REDIS_KEY_PREFIX}:dirty"
+TIME_FIELD_SUFFIX = "#t"  # must match _SAVE_SCRIPT
+FLUSH_LOCK_TIMEOUT = 30
+FLUSH_LOCK_WAIT = 5
+
+# Store one answer only while the buffer is open; refresh both TTLs and mark
+# the attempt dirty for the checkpoint sweep. Returns 0 once closed.
+# time_taken_seconds lives in its own field so a save without it keeps the
+# previous value, as the SQL path does.
+_SAVE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'open' then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+if ARGV[5] ~= '' then
+    redis.call('HSET', KEYS[2], ARGV[1] .. '#t', ARGV[5])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('SADD', KEYS[3], ARGV[3])
+return 1
+"""
+
+# Set the buffer status if the buffer still exists. Returns 1 if it did.
+_STATUS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[1])
+return 1
+"""
+
+# Lua source -> Script registered with the shared client (runs via EVALSHA)
+_scripts = {}
+
+
+class QuizAutosaveService(BaseService):
+    """Service for the Redis-backed per-attempt answer buffer."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Buffer lifecycle
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def open_buffer(attempt: QuizAttempt, quiz: Quiz, snapshot: QuizSnapshot) -> bool:
+        """
+        Create the buffer for a freshly started attempt.
+
+        The buffer lives as long as the attempt may run (time limit plus a
+        grace period, or QUIZ_AUTOSAVE_UNTIMED_TTL for untimed quizzes).
+
+        Args:
+            attempt: Committed in_progress attempt
+            quiz: The attempt's quiz
+            snapshot: Snapshot the attempt's questions were built from
+
+        Returns:
+            bool: True if the buffer was created
+        """
+        client = QuizAutosaveService._redis_client()
+        if client is None:
+            return False
+
+        deadline = 0.0
+        if quiz.duration_minutes:
+            started_at = attempt.started_at.replace(tzinfo=timezone.utc).timestamp()
+            deadline = started_at + quiz.duration_minutes * 60
+
+        meta_key, answers_key = QuizAutosaveService._keys(attempt.attempt_id)
+        try:
+            pipe = client.pipeline()
+            pipe.delete(answers_key)
+            pipe.hset(
+                meta_key,
+                mapping={
+                    "user_id": attempt.user_id,
+                    "quiz_id": quiz.quiz_id,
+                    "version": snapshot.version,
+                    "deadline": deadline,
+                    "status": "open",
+                    "checkpoint_at": time.time(),
+                },
+            )
+            pipe.expire(meta_key, QuizAutosaveService._ttl(deadline))
+            pipe.execute()
+            return True
+        except redis.RedisError as exc:
+            logger.warning(
+                "Quiz autosave: could not open buffer for %s: %s", attempt.attempt_id, exc
+            )
+            return False
+
+    @staticmethod
+    def close(attempt_id: str) -> bool:
+        """
+        Stop accepting saves for an attempt (first step of submission).
+
+        Returns:
+            bool: True if the attempt has a buffer that must be flushed, False
+            if it has none
+
+        Raises:
+            LMSException: Redis failed, so whether answers are buffered is
+                unknown (503)
+        """
+        try:
+            return QuizAutosaveService._set_status(attempt_id, "closed")
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: could not close buffer for %s: %s", attempt_id, exc)
+            raise LMSException("Saved answers are temporarily unavailable", 503) from exc
+
+    @staticmethod
+    def reopen(attempt_id: str) -> None:
+        """
+        Accept saves again after a submission that failed and rolled back.
+
+        Safe to call whether or not the close succeeded or a buffer exists.
+        """
+        try:
+            QuizAutosaveService._set_status(attempt_id, "open")
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: could not reopen buffer for %s: %s", attempt_id, exc)
+
+    @staticmethod
+    def discard(attempt_id: str) -> None:
+        """Delete the buffer once its answers are committed with the submission."""
+        client = QuizAutosaveService._redis_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.delete(*QuizAutosaveService._keys(attempt_id))
+            pipe.srem(DIRTY_SET_KEY, attempt_id)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: could not discard buffer for %s: %s", attempt_id, exc)
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Save
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def save(
+        attempt_id: str,
+        user_id: str,
+        question_id: str,
+        answer,
+        time_taken_seconds: int = None,
+    ):
+        """
+        Buffer one answer without touching the database.
+
+        Ownership, submission state and the time limit are checked against the
+        buffer metadata and the question against the cached quiz snapshot.
+
+        Args:
+            attempt_id: Attempt UUID
+            user_id: Student's user ID (ownership check)
+            question_id: Question UUID
+            answer: Option UUID string (MCQ) or text string (short/essay/fill)
+            time_taken_seconds: Optional time spent on this question
+
+        Returns:
+            dict or None: Saved answer metadata, or None when the attempt has no
+            buffer (autosave disabled, Redis unavailable, attempt started before
+            autosave was enabled) and the caller must save through SQL
+
+        Raises:
+            AuthorizationError: Attempt does not belong to user
+            ConflictError: Attempt submitted or time limit exceeded
+            ValidationError: Question does not belong to this quiz
+        """
+        client = QuizAutosaveService._redis_client()
+        if client is None:
+            return None
+
+        meta_key, answers_key = QuizAutosaveService._keys(attempt_id)
+        try:
+            meta = client.hgetall(meta_key)
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: buffer read failed for %s: %s", attempt_id, exc)
+            return None
+        if not meta:
+            return None
+
+        if meta["user_id"] != user_id:
+            raise AuthorizationError("This attempt does not belong to you")
+
+        if meta["status"] != "open":
+            raise ConflictError("Cannot save answers - quiz has already been submitted")
+
+        now = time.time()
+        deadline = float(meta["deadline"])
+        if deadline and now > deadline:
+            raise ConflictError("Quiz time limit exceeded. Please submit the quiz.")
+
+        snapshot = QuizSnapshotService.peek_snapshot(meta["quiz_id"], meta["version"])
+        if snapshot is None:
+            quiz = Quiz.query.get(meta["quiz_id"])
+            snapshot = QuizSnapshotService.get_snapshot(quiz) if quiz else None
+        if snapshot is None or snapshot.get_question(question_id) is None:
+            raise ValidationError("Question does not belong to this quiz")
+
+        if answer is None:
+            raise ValidationError("answer is required")
+
+        saved_at = datetime.utcnow()
+        payload = json.dumps({"user_answer": str(answer), "answered_at": saved_at.isoformat()})
+        try:
+            stored = QuizAutosaveService._script(client, _SAVE_SCRIPT)(
+                keys=[meta_key, answers_key, DIRTY_SET_KEY],
+                args=[
+                    question_id,
+                    payload,
+                    attempt_id,
+                    QuizAutosaveService._ttl(deadline),
+                    "" if time_taken_seconds is None else int(time_taken_seconds),
+                ],
+            )
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: buffer write failed for %s: %s", attempt_id, exc)
+            return None
+        if not stored:
+            raise ConflictError("Cannot save answers - quiz has already been submitted")
+
+        interval = current_app.config.get("QUIZ_AUTOSAVE_CHECKPOINT_SECONDS", 30)
+        if now - float(meta.get("checkpoint_at") or 0) >= interval:
+            try:
+                QuizAutosaveService.checkpoint(attempt_id)
+            except Exception as exc:
+                # The answer is safely buffered; the sweep will retry
+                logger.warning(
+                    "Quiz autosave: inline checkpoint failed for %s: %s", attempt_id, exc
+                )
+
+        return {
+            "question_id": question_id,
+            "saved_at": saved_at.isoformat(),
+        }
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Checkpoint / flush
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def checkpoint(attempt_id: str, commit: bool = True) -> int:
+        """
+        Write every buffered answer of an attempt to attempt_answers.
+
+        The upsert is idempotent (the buffer keeps every answer until it is
+        discarded), and a per-attempt Redis lock keeps two writers from
+        inserting the same answer twice.
+
+        A periodic checkpoint that cannot run is skipped, since the buffer keeps
+        the answers for the next one. Inside a submission the buffer is about
+        to be discarded, so the submission must fail instead.
+
+        Args:
+            attempt_id: Attempt UUID
+            commit: Commit the upsert (False when called inside submission)
+
+        Returns:
+            int: Number of answers written
+
+        Raises:
+            ConflictError: Another flush holds the lock (only when commit=False)
+            LMSException: Redis failed mid-flush, 503 (only when commit=False)
+        """
+        client = QuizAutosaveService._redis_client()
+        if client is None:
+            return 0
+
+        meta_key, answers_key = QuizAutosaveService._keys(attempt_id)
+        try:
+            lock = client.lock(
+                f"{REDIS_KEY_PREFIX}:{attempt_id}:lock",
+                timeout=FLUSH_LOCK_TIMEOUT,
+                blocking_timeout=FLUSH_LOCK_WAIT,
+            )
+            if not lock.acquire():
+                logger.warning(
+                    "Quiz autosave: checkpoint of %s skipped, flush in progress", attempt_id
+                )
+                if not commit:
+                    raise ConflictError("Answers are still being saved, please try again")
+                return 0
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: checkpoint lock failed for %s: %s", attempt_id, exc)
+            if not commit:
+                raise LMSException("Saved answers are temporarily unavailable", 503) from exc
+            return 0
+
+        try:
+            # Clear the dirty flag before reading so a save racing with this
+            # checkpoint marks the attempt dirty again
+            client.srem(DIRTY_SET_KEY, attempt_id)
+            entries = client.hgetall(answers_key)
+            try:
+                written = QuizAutosaveService._upsert(attempt_id, entries)
+                if commit:
+                    db.session.commit()
+            except Exception:
+                if commit:
+                    db.session.rollback()
+                client.sadd(DIRTY_SET_KEY, attempt_id)
+                raise
+            if client.exists(meta_key):
+                client.hset(meta_key, "checkpoint_at", time.time())
+            return written
+        except redis.RedisError as exc:
+            logger.warning("Quiz autosave: checkpoint failed for %s: %s", attempt_id, exc)
+            if not commit:
+                raise LMSException("Saved answers are temporarily unavailable", 503) from exc
+            return 0
+        finally:
+            try:
+                lock.release()
+            except redis.RedisError:
+                pass
+
+    @staticmethod
+    def checkpoint_dirty() -> dict:
+        """
+        Checkpoint every attempt saved to since its last checkpoint.
+
+        Run every QUIZ_AUTOSAVE_CHECKPOINT_SECONDS (`flask quiz
+        autosave-checkpoint` from cron) so attempts that stop saving, or whose
+        student never submits, still reach the database.
+
+        Returns:
+            dict: {"attempts": checkpointed attempts, "answers": answers written}
+        """
+        client = QuizAutosaveService._redis_client()
+        if client is None:
+            return {"attempts": 0, "answers": 0}
+
+        attempts = answers = 0
+        for attempt_id in list(client.sscan_iter(DIRTY_SET_KEY)):
+            try:
+                answers += QuizAutosaveService.checkpoint(attempt_id)
+                attempts += 1
+            except Exception as exc:
+                logger.error("Quiz autosave: checkpoint of %s failed: %s", attempt_id, exc)
+        return {"attempts": attempts, "answers": answers}
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _upsert(attempt_id: str, entries: dict) -> int:
+        """Bulk upsert buffered answers: one select, one UPDATE and one INSERT batch."""
+        if not entries:
+            return 0
+
+        existing = dict(
+            db.session.query(AttemptAnswer.question_id, AttemptAnswer.answer_id).filter(
+                AttemptAnswer.attempt_id == attempt_id
+            )
+        )
+        updates, inserts = [], []
+        for question_id, raw in entries.items():
+            if question_id.endswith(TIME_FIELD_SUFFIX):
+                continue
+            entry = json.loads(raw)
+            time_taken = entries.get(question_id + TIME_FIELD_SUFFIX)
+            entry["time_taken_seconds"] = int(time_taken) if time_taken is not None else None
+            answered_at = datetime.fromisoformat(entry["answered_at"])
+            answer_id = existing.get(question_id)
+            if answer_id:
+                updates.append(
+                    {
+                        "b_answer_id": answer_id,
+                        "b_user_answer": entry["user_answer"],
+                        "b_time_taken_seconds": entry["time_taken_seconds"],
+                        "b_answered_at": answered_at,
+                    }
+                )
+            else:
+                inserts.append(
+                    {
+                        "answer_id": str(uuid.uuid4()),
+                        "attempt_id": attempt_id,
+                        "question_id": question_id,
+                        "user_answer": entry["user_answer"],
+                        "time_taken_seconds": entry["time_taken_seconds"],
+                        "answered_at": answered_at,
+                    }
+                )
+
+        table = AttemptAnswer.__table__
+        if updates:
+            # A row written later through the SQL fallback is never overwritten
+            db.session.execute(
+                table.update()
+                .where(table.c.answer_id == bindparam("b_answer_id"))
+                .where(table.c.answered_at <= bindparam("b_answered_at"))
+                .values(
+                    user_answer=bindparam("b_user_answer"),
+                    time_taken_seconds=func.coalesce(
+                        bindparam("b_time_taken_seconds", type_=db.Integer),
+                        table.c.time_taken_seconds,
+                    ),
+                    answered_at=bindparam("b_answered_at"),
+                ),
+                updates,
+            )
+        if inserts:
+            db.session.execute(table.insert(), inserts)
+        return len(updates) + len(inserts)
+
+    @staticmethod
+    def _set_status(attempt_id: str, status: str) -> bool:
+        """Set the buffer status; False if there is no buffer. Raises RedisError."""
+        client = QuizAutosaveService._redis_client()
+        if client is None:
+            return False
+        meta_key, _ = QuizAutosaveService._keys(attempt_id)
+        script = QuizAutosaveService._script(client, _STATUS_SCRIPT)
+        return bool(script(keys=[meta_key], args=[status]))
+
+    @staticmethod
+    def _script(client, source: str):
+        """Return the Lua script registered with this client, registering it only once."""
+        script = _scripts.get(source)
+        if script is None or script.registered_client is not client:
+            script = _scripts[source] = client.register_script(source)
+        return script
+
+    @staticmethod
+    def _ttl(deadline: float) -> int:
+        if not deadline:
+            return current_app.config.get("QUIZ_AUTOSAVE_UNTIMED_TTL", 86400)
+        grace = current_app.config.get("QUIZ_AUTOSAVE_TTL_GRACE", 300)
+        return max(int(deadline - time.time()) + grace, grace)
+
+    @staticmethod
+    def _keys(attempt_id: str) -> tuple:
+        return f"{REDIS_KEY_PREFIX}:{attempt_id}:meta", f"{REDIS_KEY_PREFIX}:{attempt_id}:answers"
+
+    @staticmethod
+    def _redis_client():
+        return get_redis_client("QUIZ_AUTOSAVE_ENABLED")
@@ -0,0 +1,507 @@
+"""
+Quiz Batch Grading Service
+Vectorized auto-grading of many attempts at once against a compiled answer key,
+used to regrade a quiz in bulk after its answer key has been corrected.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sqlalchemy import bindparam
+
+from app import db
+from app.exceptions import ResourceNotFoundError
+from app.models.quizzes.attempt_answer import AttemptAnswer
+from app.models.quizzes.quiz import Quiz
+from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.services.base_service import BaseService
+from app.services.quizzes.quiz_answer_service import AUTO_GRADED_TYPES
+from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
+from app.services.quizzes.quiz_snapshot_service import (
+    QuizSnapshot,
+    QuizSnapshotService,
+    normalize_text_answer,
+)
+
+# NumPy is imported where it is used, keeping it out of worker start-up
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Answer-matrix cell codes that never match an accepted answer
+NO_ANSWER = -1
+UNKNOWN_ANSWER = -2
+_PADDING = -3
+
+DEFAULT_BATCH_SIZE = 1000
+UPDATE_CHUNK_SIZE = 500
+
+
+def canonical_answer(question_type: str, raw: str) -> str:
+    """
+    Reduce a raw answer to the form compared against the answer key.
+
+    Mirrors QuizAnswerService._auto_grade: option id for multiple_choice, the
+    sorted set of option ids for multiple_answer, trimmed lower-case text for
+    fill_blank / matching.
+    """
+    if question_type == "multiple_answer":
+        return ",".join(sorted({a.strip() for a in raw.split(",") if a.strip()}))
+    if question_type in ("fill_blank", "matching"):
+        return normalize_text_answer(raw)
+    return raw.strip()
+
+
+@dataclass(frozen=True)
+class BatchAnswerKey:
+    """
+    Answer key of one quiz compiled into arrays.
+
+    Every answer the key knows about (option ids, normalized option texts and
+    the correct multiple_answer combination) is interned into an integer
+    token, so a batch of attempts becomes an int64 matrix of tokens and
+    grading is a broadcast comparison against the accepted tokens per column.
+
+    Attributes:
+        question_ids: Column order of the answer matrix
+        question_types: Question type per column
+        points: int64 points per column
+        auto_mask: True for columns that are auto-graded
+        accepted: (questions x k) int64 accepted tokens, padded with -3
+        vocabulary: Canonical answer string -> token
+    """
+
+    question_ids: tuple
+    question_types: tuple
+    points: "np.ndarray"
+    auto_mask: "np.ndarray"
+    accepted: "np.ndarray"
+    vocabulary: dict
+
+    @classmethod
+    def compile(cls, snapshot: QuizSnapshot) -> "BatchAnswerKey":
+        import numpy as np
+
+        vocabulary = {}
+
+        def intern(value: str) -> int:
+            return vocabulary.setdefault(value, len(vocabulary))
+
+        accepted_rows = []
+        for q in snapshot.questions:
+            accepted = set()
+            if q.question_type == "multiple_choice":
+                for opt in q.options:
+                    token = intern(opt.option_id)
+                    if opt.is_correct:
+                        accepted.add(token)
+            elif q.question_type == "multiple_answer":
+                accepted.add(intern(",".join(sorted(q.correct_option_ids))))
+            elif q.question_type in ("fill_blank", "matching"):
+                for opt in q.options:
+                    token = intern(normalize_text_answer(opt.option_text))
+                    if opt.is_correct:
+                        accepted.add(token)
+            accepted_rows.append(sorted(accepted))
+
+        width = max((len(row) for row in accepted_rows), default=0) or 1
+        accepted = np.full((len(accepted_rows), width), _PADDING, dtype=np.int64)
+        for idx, row in enumerate(accepted_rows):
+            accepted[idx, : len(row)] = row
+
+        return cls(
+            question_ids=tuple(q.question_id for q in snapshot.questions),
+            question_types=tuple(q.question_type for q in snapshot.questions),
+            points=np.array([q.points for q in snapshot.questions], dtype=np.int64),
+            auto_mask=np.array(
+                [q.question_type in AUTO_GRADED_TYPES for q in snapshot.questions], dtype=bool
+            ),
+            accepted=accepted,
+            vocabulary=vocabulary,
+        )
+
+    @property
+    def column_of(self) -> dict:
+        return {question_id: idx for idx, question_id in enumerate(self.question_ids)}
+
+    def encode(self, column: int, raw: str) -> int:
+        """Token for one raw answer in the given column."""
+        if not raw:
+            return NO_ANSWER
+        canonical = canonical_answer(self.question_types[column], raw)
+        return self.vocabulary.get(canonical, UNKNOWN_ANSWER)
+
+
+@dataclass(frozen=True)
+class BatchGradeResult:
+    """Output of BatchGradingService.grade for an attempts x questions matrix."""
+
+    correct: "np.ndarray"
+    points_earned: "np.ndarray"
+    totals: "np.ndarray"
+
+
+class BatchGradingService(BaseService):
+    """Service for vectorized grading and bulk regrading of quiz attempts."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Engine
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def grade(key: BatchAnswerKey, answers: "np.ndarray") -> BatchGradeResult:
+        """
+        Grade a matrix of encoded answers.
+
+        Args:
+            key: Compiled answer key
+            answers: (attempts x questions) int64 tokens from BatchAnswerKey.encode
+
+        Returns:
+            BatchGradeResult: Correctness and points per cell (auto-graded
+            columns only; manual columns are False / 0) and auto score per attempt
+        """
+        import numpy as np
+
+        correct = (answers[:, :, None] == key.accepted[None, :, :]).any(axis=2)
+        correct &= key.auto_mask[None, :]
+        points_earned = np.where(correct, key.points[None, :], 0)
+        return BatchGradeResult(
+            correct=correct, points_earned=points_earned, totals=points_earned.sum(axis=1)
+        )
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Regrade
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def regrade_quiz(
+        quiz_id: str, batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False
+    ) -> dict:
+        """
+        Re-grade every submitted / graded attempt of a quiz against its current
+        answer key and write the differences back with bulk updates.
+
+        Manually graded answers keep their points; attempt score, percentage and
+        passed are recomputed the same way as on submission. Attempt status is
+        left alone, so attempts awaiting manual grading stay in that queue.
+        Each batch of attempts is committed separately, so the command can be
+        re-run safely if interrupted.
+
+        Args:
+            quiz_id: Quiz UUID
+            batch_size: Attempts graded per batch
+            dry_run: Compute changes without writing them
+
+        Returns:
+            dict: attempts_scanned, answers_changed, attempts_changed
+
+        Raises:
+            ResourceNotFoundError: Quiz not found
+        """
+        quiz = Quiz.query.get(quiz_id)
+        if not quiz:
+            raise ResourceNotFoundError("Quiz not found")
+
+        snapshot = QuizSnapshotService.get_snapshot(quiz)
+        key = BatchAnswerKey.compile(snapshot)
+
+        attempt_ids = [
+            row.attempt_id
+            for row in db.session.query(QuizAttempt.attempt_id)
+            .filter(
+                QuizAttempt.quiz_id == quiz_id,
+                QuizAttempt.status.in_(["submitted", "graded"]),
+            )
+            .order_by(QuizAttempt.attempt_id)
+        ]
+
+        summary = {
+            "quiz_id": quiz_id,
+            "attempts_scanned": len(attempt_ids),
+            "answers_changed": 0,
+            "attempts_changed": 0,
+            "dry_run": dry_run,
+        }
+
+        try:
+            for start in range(0, len(attempt_ids), batch_size):
+                chunk = attempt_ids[start : start + batch_size]
+                answers_changed, attempts_changed = BatchGradingService._regrade_chunk(
+                    quiz, snapshot, key, chunk, dry_run
+                )
+                summary["answers_changed"] += answers_changed
+                summary["attempts_changed"] += attempts_changed
+                if not dry_run:
+                    db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error regrading quiz %s: %s", quiz_id, str(exc), exc_info=True)
+            raise
+
+        # Attempt scores moved, so item statistics are rebuilt rather than patched
+        if not dry_run and summary["answers_changed"]:
+            ItemAnalysisService.recompute_quiz(quiz_id)
+
+        logger.info(
+            "Quiz %s regraded: %s attempts, %s answers changed",
+            quiz_id, summary["attempts_scanned"], summary["answers_changed"],
+        )
+        return summary
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Bulk submission
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def submit_attempts(quiz: Quiz, attempts: list) -> list:
+        """
+        Submit many in_progress attempts of one quiz the way submit_quiz would.
+
+        Auto-graded answers get is_correct / points_earned from the vectorized
+        grader, manual answers are left for grading, and each attempt gets its
+        score, percentage, passed, status, submitted_at and time_taken_minutes.
+        Writes are grouped UPDATEs plus one executemany; does not commit.
+
+        Args:
+            quiz: The attempts' Quiz
+            attempts: (attempt_id, started_at, submitted_at) tuples
+
+        Returns:
+            list: attempt_ids whose status is now "graded"
+        """
+        if not attempts:
+            return []
+
+        snapshot = QuizSnapshotService.get_snapshot(quiz)
+        key = BatchAnswerKey.compile(snapshot)
+        attempt_ids = [attempt_id for attempt_id, _, _ in attempts]
+        row_of = {attempt_id: idx for idx, attempt_id in enumerate(attempt_ids)}
+
+        answer_rows = (
+            db.session.query(
+                AttemptAnswer.answer_id,
+                AttemptAnswer.attempt_id,
+                AttemptAnswer.question_id,
+                AttemptAnswer.user_answer,
+            )
+            .filter(AttemptAnswer.attempt_id.in_(attempt_ids))
+            .all()
+        )
+        row_idx, col_idx, matrix = BatchGradingService._encode_answers(key, row_of, answer_rows)
+        result = BatchGradingService.grade(key, matrix)
+
+        # Answers to questions no longer in the quiz are left as they are
+        answer_updates = {}
+        for i, answer in enumerate(answer_rows):
+            col = int(col_idx[i])
+            if col < 0:
+                continue
+            if key.auto_mask[col]:
+                row = int(row_idx[i])
+                group = (bool(result.correct[row, col]), int(result.points_earned[row, col]))
+            else:
+                group = (None, None)
+            answer_updates.setdefault(group, []).append(answer.answer_id)
+
+        answers_table = AttemptAnswer.__table__
+        for (is_correct, points_earned), answer_ids in answer_updates.items():
+            for start in range(0, len(answer_ids), UPDATE_CHUNK_SIZE):
+                db.session.execute(
+                    answers_table.update()
+                    .where(answers_table.c.answer_id.in_(
+                        answer_ids[start : start + UPDATE_CHUNK_SIZE]
+                    ))
+                    .values(is_correct=is_correct, points_earned=points_earned)
+                )
+
+        has_manual_questions = not bool(key.auto_mask.all())
+        status = "submitted" if has_manual_questions else "graded"
+        total_points = snapshot.total_points
+        passing_score = quiz.passing_score or 70
+        attempt_updates = []
+        for attempt_id, started_at, submitted_at in attempts:
+            score = int(result.totals[row_of[attempt_id]])
+            percentage = round((score / total_points * 100), 2) if total_points else 0.0
+            attempt_updates.append(
+                {
+                    "b_attempt_id": attempt_id,
+                    "b_score": score,
+                    "b_total_points": total_points,
+                    "b_percentage": percentage,
+                    "b_passed": None if has_manual_questions else percentage >= passing_score,
+                    "b_submitted_at": submitted_at,
+                    "b_time_taken_minutes": int((submitted_at - started_at).total_seconds() / 60),
+                    "b_status": status,
+                }
+            )
+
+        attempts_table = QuizAttempt.__table__
+        db.session.execute(
+            attempts_table.update()
+            .where(attempts_table.c.attempt_id == bindparam("b_attempt_id"))
+            .values(
+                score=bindparam("b_score"),
+                total_points=bindparam("b_total_points"),
+                percentage=bindparam("b_percentage"),
+                passed=bindparam("b_passed"),
+                submitted_at=bindparam("b_submitted_at"),
+                time_taken_minutes=bindparam("b_time_taken_minutes"),
+                status=bindparam("b_status"),
+            ),
+            attempt_updates,
+        )
+
+        return [] if has_manual_questions else attempt_ids
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _encode_answers(key: BatchAnswerKey, row_of: dict, answer_rows: list) -> tuple:
+        """
+        Encode answer rows into an (attempts x questions) token matrix.
+
+        Returns:
+            (row_idx, col_idx, matrix): per-answer matrix coordinates (col -1
+            for questions not in the key) and the encoded matrix
+        """
+        import numpy as np
+
+        column_of = key.column_of
+        rows, cols, tokens = [], [], []
+        for answer in answer_rows:
+            col = column_of.get(answer.question_id, -1)
+            rows.append(row_of[answer.attempt_id])
+            cols.append(col)
+            tokens.append(key.encode(col, answer.user_answer) if col >= 0 else NO_ANSWER)
+
+        row_idx = np.array(rows, dtype=np.int64)
+        col_idx = np.array(cols, dtype=np.int64)
+        known = col_idx >= 0
+
+        matrix = np.full((len(row_of), len(key.question_ids)), NO_ANSWER, dtype=np.int64)
+        matrix[row_idx[known], col_idx[known]] = np.array(tokens, dtype=np.int64)[known]
+        return row_idx, col_idx, matrix
+
+    @staticmethod
+    def _regrade_chunk(quiz, snapshot, key, attempt_ids, dry_run) -> tuple:
+        import numpy as np
+
+        row_of = {attempt_id: idx for idx, attempt_id in enumerate(attempt_ids)}
+
+        answer_rows = (
+            db.session.query(
+                AttemptAnswer.answer_id,
+                AttemptAnswer.attempt_id,
+                AttemptAnswer.question_id,
+                AttemptAnswer.user_answer,
+                AttemptAnswer.is_correct,
+                AttemptAnswer.points_earned,
+            )
+            .filter(AttemptAnswer.attempt_id.in_(attempt_ids))
+            .all()
+        )
+
+        old_correct, old_points = [], []
+        for answer in answer_rows:
+            old_correct.append(-1 if answer.is_correct is None else int(answer.is_correct))
+            old_points.append(-1 if answer.points_earned is None else answer.points_earned)
+        old_correct = np.array(old_correct, dtype=np.int8)  # -1 = NULL
+        old_points = np.array(old_points, dtype=np.int64)  # -1 = NULL
+
+        row_idx, col_idx, matrix = BatchGradingService._encode_answers(key, row_of, answer_rows)
+        known = col_idx >= 0
+        result = BatchGradingService.grade(key, matrix)
+
+        auto = np.zeros(len(answer_rows), dtype=bool)
+        auto[known] = key.auto_mask[col_idx[known]]
+        safe_col = np.where(known, col_idx, 0)
+        new_correct = result.correct[row_idx, safe_col].astype(np.int8)
+        new_points = result.points_earned[row_idx, safe_col]
+        changed = auto & ((old_correct != new_correct) | (old_points != new_points))
+
+        # Manually graded answers keep their points
+        manual = ~auto
+        manual_points = np.bincount(
+            row_idx[manual], weights=np.maximum(old_points[manual], 0), minlength=len(attempt_ids)
+        ).astype(np.int64)
+        scores = result.totals + manual_points
+
+        # Changed answers collapse into a handful of (is_correct, points) groups
+        answer_updates = {}
+        changed_idx = np.flatnonzero(changed)
+        groups = np.unique(
+            np.stack([new_correct[changed_idx], new_points[changed_idx]], axis=1), axis=0
+        )
+        for is_correct, points_earned in groups.tolist():
+            in_group = (new_correct[changed_idx] == is_correct) & (
+                new_points[changed_idx] == points_earned
+            )
+            selected = changed_idx[in_group]
+            answer_updates[(bool(is_correct), points_earned)] = [
+                answer_rows[i].answer_id for i in selected.tolist()
+            ]
+
+        total_points = snapshot.total_points
+        passing_score = quiz.passing_score or 70
+        attempts = (
+            db.session.query(
+                QuizAttempt.attempt_id,
+                QuizAttempt.score,
+                QuizAttempt.total_points,
+                QuizAttempt.passed,
+                QuizAttempt.status,
+            )
+            .filter(QuizAttempt.attempt_id.in_(attempt_ids))
+            .all()
+        )
+        attempt_updates = []
+        for attempt in attempts:
+            row = row_of[attempt.attempt_id]
+            score = int(scores[row])
+            percentage = round((score / total_points * 100), 2) if total_points else 0.0
+            # Attempts still awaiting manual grading stay undecided
+            passed = percentage >= passing_score if attempt.status == "graded" else None
+            if (attempt.score, attempt.total_points, attempt.passed) != (
+                score, total_points, passed
+            ):
+                attempt_updates.append(
+                    {
+                        "b_attempt_id": attempt.attempt_id,
+                        "b_score": score,
+                        "b_total_points": total_points,
+                        "b_percentage": percentage,
+                        "b_passed": passed,
+                    }
+                )
+
+        if not dry_run:
+            answers_table = AttemptAnswer.__table__
+            for (is_correct, points_earned), answer_ids in answer_updates.items():
+                for start in range(0, len(answer_ids), UPDATE_CHUNK_SIZE):
+                    db.session.execute(
+                        answers_table.update()
+                        .where(answers_table.c.answer_id.in_(
+                            answer_ids[start : start + UPDATE_CHUNK_SIZE]
+                        ))
+                        .values(is_correct=is_correct, points_earned=points_earned)
+                    )
+            if attempt_updates:
+                attempts_table = QuizAttempt.__table__
+                db.session.execute(
+                    attempts_table.update()
+                    .where(attempts_table.c.attempt_id == bindparam("b_attempt_id"))
+                    .values(
+                        score=bindparam("b_score"),
+                        total_points=bindparam("b_total_points"),
+                        percentage=bindparam("b_percentage"),
+                        passed=bindparam("b_passed"),
+                    ),
+                    attempt_updates,
+                )
+
+        return int(changed.sum()), len(attempt_updates)
@@ -4,10 +4,13 @@ Handles manual grading of essay/short-answer questions and
 retrieving full submissions for instructor review.
 """
 
+import base64
 import logging
 import uuid
 from datetime import datetime
 
+from sqlalchemy import and_, case, func, or_
+
 from app import db
 from app.exceptions import AuthorizationError, ConflictError, ResourceNotFoundError, ValidationError
 from app.models.courses.course import Course
@@ -17,9 +20,15 @@ from app.models.quizzes.question import Question
 from app.models.quizzes.quiz import Quiz
 from app.models.quizzes.quiz_attempt import QuizAttempt
 from app.services.base_service import BaseService
+from app.services.quizzes.quiz_answer_service import AUTO_GRADED_TYPES
+from app.services.quizzes.quiz_item_analysis_service import ItemAnalysisService
 
 logger = logging.getLogger(__name__)
 
+# Bulk grading limits
+MAX_BULK_GRADES = 2000
+BULK_QUERY_CHUNK = 500
+
 
 class QuizGradingService(BaseService):
     """Service for manual grading of subjective quiz answers."""
@@ -105,6 +114,10 @@ class QuizGradingService(BaseService):
                 )
                 db.session.add(grade)
 
+            # A regraded attempt leaves the item-analysis store until it is rescored
+            if attempt.status == "graded":
+                ItemAnalysisService.record_attempt(attempt, quiz, sign=-1)
+
             # Update the answer record
             answer.points_earned = points_awarded
             answer.is_correct = points_awarded > 0
@@ -114,6 +127,10 @@ class QuizGradingService(BaseService):
             # Recalculate attempt score and check if fully graded
             QuizGradingService._recalculate_attempt_score(attempt, quiz)
 
+            if attempt.status == "graded":
+                db.session.flush()
+                ItemAnalysisService.record_attempt(attempt, quiz)
+
             db.session.commit()
             logger.info("Answer %s graded by user %s (%d pts)", answer_id, grader_id, points_awarded)
 
@@ -127,6 +144,173 @@ class QuizGradingService(BaseService):
             logger.error("Error grading answer %s: %s", answer_id, str(exc), exc_info=True)
             raise
 
+    # ──────────────────────────────────────────────────────────────────────────
+    # Grade many answers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def grade_answers_bulk(quiz_id: str, grader_id: str, grader_role: str, grades: list) -> dict:
+        """
+        Manually grade many answers of one quiz in a single transaction.
+
+        Authorizes once for the quiz, loads answers, questions, attempts and
+        existing grades with one query each, upserts the ManualGrade rows in one
+        flush and recalculates every touched attempt exactly once with one
+        aggregate query. Either every grade is applied or none is.
+
+        Args:
+            quiz_id: Quiz UUID every answer must belong to
+            grader_id: Instructor/admin user ID
+            grader_role: User's role
+            grades: List of {"answer_id", "points_awarded", "feedback"} dicts
+
+        Returns:
+            dict: Graded answer count and the recalculated attempts
+
+        Raises:
+            ResourceNotFoundError: Quiz or an answer not found
+            AuthorizationError: User is not course instructor or admin
+            ValidationError: Malformed item, duplicate answer or points out of range
+        """
+        try:
+            quiz = Quiz.query.get(quiz_id)
+            if not quiz:
+                raise ResourceNotFoundError("Quiz not found")
+
+            if grader_role != "admin":
+                course = Course.query.get(quiz.course_id)
+                if not course or course.instructor_id != grader_id:
+                    raise AuthorizationError("Only the course instructor can grade answers")
+
+            items = QuizGradingService._validate_bulk_grades(grades)
+
+            # Answers with their question's max points, checked against this quiz
+            answer_ids = list(items)
+            answers, max_points = {}, {}
+            for chunk in QuizGradingService._chunks(answer_ids):
+                rows = (
+                    db.session.query(AttemptAnswer, Question.points, Question.quiz_id)
+                    .join(Question, Question.question_id == AttemptAnswer.question_id)
+                    .filter(AttemptAnswer.answer_id.in_(chunk))
+                )
+                for answer, points, answer_quiz_id in rows:
+                    if answer_quiz_id != quiz_id:
+                        raise ValidationError(
+                            f"Answer {answer.answer_id} does not belong to this quiz"
+                        )
+                    answers[answer.answer_id] = answer
+                    max_points[answer.answer_id] = points
+
+            missing = [answer_id for answer_id in answer_ids if answer_id not in answers]
+            if missing:
+                raise ResourceNotFoundError(f"Answer {missing[0]} not found")
+
+            for answer_id, (points_awarded, _) in items.items():
+                if max_points[answer_id] and points_awarded > max_points[answer_id]:
+                    raise ValidationError(
+                        f"points_awarded ({points_awarded}) for answer {answer_id} cannot "
+                        f"exceed question points ({max_points[answer_id]})"
+                    )
+
+            attempt_ids = sorted({a.attempt_id for a in answers.values()})
+            attempts = {}
+            for chunk in QuizGradingService._chunks(attempt_ids):
+                attempts.update(
+                    (a.attempt_id, a)
+                    for a in QuizAttempt.query.filter(QuizAttempt.attempt_id.in_(chunk))
+                )
+
+            # Graded attempts leave the item-analysis store until they are rescored
+            was_graded = [attempts[a] for a in attempt_ids if attempts[a].status == "graded"]
+            attempt_answers = QuizGradingService._answers_by_attempt(
+                [a.attempt_id for a in was_graded]
+            )
+            ItemAnalysisService.record_attempts(
+                [(a, attempt_answers.get(a.attempt_id, [])) for a in was_graded], quiz, sign=-1
+            )
+
+            existing_grades = {}
+            for chunk in QuizGradingService._chunks(answer_ids):
+                for grade in ManualGrade.query.filter(ManualGrade.answer_id.in_(chunk)):
+                    existing_grades.setdefault(grade.answer_id, grade)
+
+            now = datetime.utcnow()
+            for answer_id, (points_awarded, feedback) in items.items():
+                grade = existing_grades.get(answer_id)
+                if grade:
+                    grade.points_awarded = points_awarded
+                    grade.feedback = feedback
+                    grade.graded_by = grader_id
+                    grade.graded_at = now
+                else:
+                    db.session.add(
+                        ManualGrade(
+                            grade_id=str(uuid.uuid4()),
+                            answer_id=answer_id,
+                            graded_by=grader_id,
+                            points_awarded=points_awarded,
+                            feedback=feedback,
+                            graded_at=now,
+                        )
+                    )
+                answer = answers[answer_id]
+                answer.points_earned = points_awarded
+                answer.is_correct = points_awarded > 0
+
+            db.session.flush()
+
+            touched = [attempts[a] for a in attempt_ids]
+            QuizGradingService._recalculate_attempt_scores(touched, quiz)
+
+            now_graded = [a for a in touched if a.status == "graded"]
+            if now_graded:
+                db.session.flush()
+                attempt_answers.update(
+                    QuizGradingService._answers_by_attempt(
+                        [a.attempt_id for a in now_graded if a.attempt_id not in attempt_answers]
+                    )
+                )
+                ItemAnalysisService.record_attempts(
+                    [(a, attempt_answers.get(a.attempt_id, [])) for a in now_graded], quiz
+                )
+
+            # Built before commit, which would expire every touched attempt
+            result = {
+                "quiz_id": quiz_id,
+                "graded": len(items),
+                "attempts": [
+                    {
+                        "attempt_id": a.attempt_id,
+                        "user_id": a.user_id,
+                        "score": a.score,
+                        "total_points": a.total_points,
+                        "percentage": float(a.percentage) if a.percentage is not None else None,
+                        "passed": a.passed,
+                        "status": a.status,
+                    }
+                    for a in touched
+                ],
+            }
+
+            db.session.commit()
+            logger.info(
+                "%d answers of quiz %s graded by user %s (%d attempts recalculated)",
+                len(items),
+                quiz_id,
+                grader_id,
+                len(touched),
+            )
+
+            return result
+
+        except (ResourceNotFoundError, AuthorizationError, ValidationError):
+            db.session.rollback()
+            raise
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error bulk grading quiz %s: %s", quiz_id, str(exc), exc_info=True)
+            raise
+
     # ──────────────────────────────────────────────────────────────────────────
     # Get submission for grading
     # ──────────────────────────────────────────────────────────────────────────
@@ -172,12 +356,28 @@ class QuizGradingService(BaseService):
         if not attempt:
             raise ResourceNotFoundError("No submission found for this student")
 
-        # Build answer list
-        answers = AttemptAnswer.query.filter_by(attempt_id=attempt.attempt_id).all()
+        # Answers, questions and grades in one query
+        rows = (
+            db.session.query(AttemptAnswer, Question, ManualGrade)
+            .outerjoin(Question, Question.question_id == AttemptAnswer.question_id)
+            .outerjoin(ManualGrade, ManualGrade.answer_id == AttemptAnswer.answer_id)
+            .filter(AttemptAnswer.attempt_id == attempt.attempt_id)
+            .order_by(
+                Question.question_order.asc(),
+                Question.created_at.asc(),
+                AttemptAnswer.answer_id.asc(),
+                ManualGrade.graded_at.asc(),
+            )
+            .all()
+        )
+
         answer_list = []
-        for ans in answers:
-            question = Question.query.get(ans.question_id)
-            grade = ManualGrade.query.filter_by(answer_id=ans.answer_id).first()
+        seen = set()
+        for ans, question, grade in rows:
+            # An answer regraded with several ManualGrade rows appears once
+            if ans.answer_id in seen:
+                continue
+            seen.add(ans.answer_id)
 
             answer_list.append(
                 {
@@ -208,6 +408,140 @@ class QuizGradingService(BaseService):
             "answers": answer_list,
         }
 
+    # ──────────────────────────────────────────────────────────────────────────
+    # Grading queue
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_grading_queue(
+        quiz_id: str,
+        grader_id: str,
+        grader_role: str,
+        question_id: str = None,
+        limit: int = 50,
+        cursor: str = None,
+    ) -> dict:
+        """
+        Page through every ungraded manual answer of a quiz, question by question.
+
+        Answers of submitted attempts whose question needs manual grading and
+        that have no points yet are returned in (question order, question,
+        answer) keyset order and grouped by question, so an instructor can
+        grade one question across all students before moving to the next.
+
+        Args:
+            quiz_id: Quiz UUID
+            grader_id: Instructor's user ID
+            grader_role: Instructor's role
+            question_id: Optional question UUID to restrict the queue to
+            limit: Answers per page
+            cursor: Previous response's next_cursor (omit for the first page)
+
+        Returns:
+            dict: questions (each with its answers on this page), limit,
+            has_more and next_cursor
+
+        Raises:
+            ResourceNotFoundError: Quiz not found
+            AuthorizationError: Not the course instructor/admin
+            ValidationError: Invalid cursor
+        """
+        quiz = Quiz.query.get(quiz_id)
+        if not quiz:
+            raise ResourceNotFoundError("Quiz not found")
+
+        if grader_role != "admin":
+            course = Course.query.get(quiz.course_id)
+            if not course or course.instructor_id != grader_id:
+                raise AuthorizationError("Only the course instructor can view submissions")
+
+        question_order = func.coalesce(Question.question_order, 0)
+        q = (
+            db.session.query(
+                AttemptAnswer.answer_id,
+                AttemptAnswer.attempt_id,
+                AttemptAnswer.user_answer,
+                AttemptAnswer.time_taken_seconds,
+                AttemptAnswer.answered_at,
+                QuizAttempt.user_id,
+                QuizAttempt.submitted_at,
+                Question.question_id,
+                Question.question_text,
+                Question.question_type,
+                Question.points,
+                question_order.label("question_order"),
+            )
+            .join(Question, Question.question_id == AttemptAnswer.question_id)
+            .join(QuizAttempt, QuizAttempt.attempt_id == AttemptAnswer.attempt_id)
+            .filter(
+                Question.quiz_id == quiz_id,
+                Question.question_type.notin_(AUTO_GRADED_TYPES),
+                AttemptAnswer.is_correct.is_(None),
+                AttemptAnswer.points_earned.is_(None),
+                QuizAttempt.status == "submitted",
+            )
+        )
+        if question_id:
+            q = q.filter(Question.question_id == question_id)
+
+        if cursor:
+            after_order, after_question, after_answer = QuizGradingService._decode_queue_cursor(
+                cursor
+            )
+            q = q.filter(
+                or_(
+                    question_order > after_order,
+                    and_(question_order == after_order, Question.question_id > after_question),
+                    and_(
+                        question_order == after_order,
+                        Question.question_id == after_question,
+                        AttemptAnswer.answer_id > after_answer,
+                    ),
+                )
+            )
+
+        rows = (
+            q.order_by(
+                question_order.asc(), Question.question_id.asc(), AttemptAnswer.answer_id.asc()
+            )
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        questions = []
+        for row in rows:
+            if not questions or questions[-1]["question_id"] != row.question_id:
+                questions.append(
+                    {
+                        "question_id": row.question_id,
+                        "question_text": row.question_text,
+                        "question_type": row.question_type,
+                        "max_points": row.points,
+                        "answers": [],
+                    }
+                )
+            questions[-1]["answers"].append(
+                {
+                    "answer_id": row.answer_id,
+                    "attempt_id": row.attempt_id,
+                    "user_id": row.user_id,
+                    "user_answer": row.user_answer,
+                    "time_taken_seconds": row.time_taken_seconds,
+                    "answered_at": row.answered_at.isoformat() if row.answered_at else None,
+                    "submitted_at": row.submitted_at.isoformat() if row.submitted_at else None,
+                }
+            )
+
+        return {
+            "quiz_id": quiz_id,
+            "questions": questions,
+            "limit": limit,
+            "has_more": has_more,
+            "next_cursor": QuizGradingService._encode_queue_cursor(rows[-1]) if has_more else None,
+        }
+
     # ──────────────────────────────────────────────────────────────────────────
     # Internal helpers
     # ──────────────────────────────────────────────────────────────────────────
@@ -218,18 +552,105 @@ class QuizGradingService(BaseService):
         Recompute total score and determine whether the attempt is fully graded.
         Updates attempt in-place (caller must commit).
         """
-        all_answers = AttemptAnswer.query.filter_by(attempt_id=attempt.attempt_id).all()
-        total_earned = sum(a.points_earned or 0 for a in all_answers)
-        all_graded = all(a.points_earned is not None or a.is_correct is not None for a in all_answers)
+        QuizGradingService._recalculate_attempt_scores([attempt], quiz)
 
-        questions = Question.query.filter_by(quiz_id=quiz.quiz_id).all()
-        total_points = sum(q.points or 0 for q in questions)
-        percentage = round((total_earned / total_points * 100), 2) if total_points else 0.0
+    @staticmethod
+    def _recalculate_attempt_scores(attempts: list, quiz: Quiz) -> None:
+        """
+        Recompute score, percentage and graded status of many attempts of one
+        quiz with one aggregate query over their answers. Updates the attempts
+        in-place (caller must flush pending answer changes first and commit).
+        """
+        if not attempts:
+            return
+
+        total_points = (
+            db.session.query(func.coalesce(func.sum(Question.points), 0))
+            .filter(Question.quiz_id == quiz.quiz_id)
+            .scalar()
+        )
 
-        attempt.score = total_earned
-        attempt.total_points = total_points
-        attempt.percentage = percentage
+        ungraded = case(
+            (AttemptAnswer.points_earned.is_(None) & AttemptAnswer.is_correct.is_(None), 1),
+            else_=0,
+        )
+        totals = {}
+        attempt_ids = [a.attempt_id for a in attempts]
+        for chunk in QuizGradingService._chunks(attempt_ids):
+            totals.update(
+                (attempt_id, (earned, pending))
+                for attempt_id, earned, pending in db.session.query(
+                    AttemptAnswer.attempt_id,
+                    func.coalesce(func.sum(AttemptAnswer.points_earned), 0),
+                    func.sum(ungraded),
+                )
+                .filter(AttemptAnswer.attempt_id.in_(chunk))
+                .group_by(AttemptAnswer.attempt_id)
+            )
 
-        if all_graded:
-            attempt.passed = percentage >= (quiz.passing_score or 70)
-            attempt.status = "graded"
+        for attempt in attempts:
+            total_earned, pending = totals.get(attempt.attempt_id, (0, 0))
+            total_earned = int(total_earned)
+            percentage = round((total_earned / total_points * 100), 2) if total_points else 0.0
+
+            attempt.score = total_earned
+            attempt.total_points = total_points
+            attempt.percentage = percentage
+
+            if not pending:
+                attempt.passed = percentage >= (quiz.passing_score or 70)
+                attempt.status = "graded"
+
+    @staticmethod
+    def _validate_bulk_grades(grades) -> dict:
+        """Validate bulk grade items; returns {answer_id: (points_awarded, feedback)}."""
+        if not isinstance(grades, list) or not grades:
+            raise ValidationError("grades must be a non-empty list")
+        if len(grades) > MAX_BULK_GRADES:
+            raise ValidationError(f"At most {MAX_BULK_GRADES} grades can be submitted at once")
+
+        items = {}
+        for index, item in enumerate(grades):
+            if not isinstance(item, dict) or not item.get("answer_id"):
+                raise ValidationError(f"grades[{index}].answer_id is required")
+            points_awarded = item.get("points_awarded")
+            if points_awarded is None:
+                raise ValidationError(f"grades[{index}].points_awarded is required")
+            if not isinstance(points_awarded, int) or isinstance(points_awarded, bool):
+                raise ValidationError(f"grades[{index}].points_awarded must be an integer")
+            if points_awarded < 0:
+                raise ValidationError(f"grades[{index}].points_awarded cannot be negative")
+            if item["answer_id"] in items:
+                raise ValidationError(f"grades[{index}]: answer graded twice in one request")
+            items[item["answer_id"]] = (points_awarded, item.get("feedback"))
+        return items
+
+    @staticmethod
+    def _answers_by_attempt(attempt_ids: list) -> dict:
+        """Load the answers of many attempts with one query per chunk."""
+        answers = {}
+        for chunk in QuizGradingService._chunks(attempt_ids):
+            for answer in AttemptAnswer.query.filter(AttemptAnswer.attempt_id.in_(chunk)):
+                answers.setdefault(answer.attempt_id, []).append(answer)
+        return answers
+
+    @staticmethod
+    def _encode_queue_cursor(row) -> str:
+        """Opaque keyset cursor for the grading-queue row after ``row``."""
+        raw = f"{row.question_order}|{row.question_id}|{row.answer_id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_queue_cursor(cursor: str) -> tuple:
+        """Decode a grading-queue cursor into (question_order, question_id, answer_id)."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            question_order, question_id, answer_id = raw.split("|", 2)
+            return int(question_order), question_id, answer_id
+        except (ValueError, UnicodeError):
+            raise ValidationError("Invalid cursor")
+
+    @staticmethod
+    def _chunks(values: list):
+        for start in range(0, len(values), BULK_QUERY_CHUNK):
+            yield values[start:start + BULK_QUERY_CHUNK]
@@ -0,0 +1,459 @@
+"""
+Quiz Item Analysis Service
+Maintains the per-question item-analysis store (difficulty, point-biserial,
+upper/lower 27% discrimination, distractor counts). Graded attempts are folded
+in incrementally; a NumPy batch recompute rebuilds a quiz from scratch.
+"""
+
+import logging
+import math
+from collections import Counter
+from datetime import datetime
+from itertools import groupby
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.quizzes.attempt_answer import AttemptAnswer
+from app.models.quizzes.question_item_stats import SCORE_BUCKETS, QuestionItemStats
+from app.models.quizzes.quiz import Quiz
+from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.services.base_service import BaseService
+from app.services.quizzes.quiz_snapshot_service import QuizSnapshotService
+
+logger = logging.getLogger(__name__)
+
+# Share of responses in each of the upper / lower discrimination groups
+GROUP_FRACTION = 0.27
+
+# Discrimination is reported as 0 below this many responses
+MIN_RESPONSES = 4
+
+# Rows fetched per round trip when streaming answers for a batch recompute
+STREAM_BATCH_SIZE = 5000
+
+OPTION_QUESTION_TYPES = ("multiple_choice", "multiple_answer")
+
+
+def score_bucket(percentage) -> int:
+    """Histogram bucket (whole percentage point, 0..100) of an attempt percentage."""
+    return min(max(int(math.floor(float(percentage or 0))), 0), SCORE_BUCKETS - 1)
+
+
+def derive_item_metrics(
+    responses: int,
+    correct: int,
+    score_sum: float,
+    score_sq_sum: float,
+    correct_score_sum: float,
+    score_histogram: list,
+    correct_histogram: list,
+) -> tuple:
+    """
+    Compute (p_value, point_biserial, discrimination_index) from sufficient statistics.
+
+    The upper / lower groups are the top / bottom 27% of responses by attempt
+    percentage; the boundary bucket is included whole, so tied scores are
+    never split between groups.
+    """
+    if not responses:
+        return 0.0, 0.0, 0.0
+
+    p_value = correct / responses
+
+    point_biserial = 0.0
+    incorrect = responses - correct
+    mean = score_sum / responses
+    variance = score_sq_sum / responses - mean * mean
+    if correct and incorrect and variance > 1e-9:
+        mean_correct = correct_score_sum / correct
+        mean_incorrect = (score_sum - correct_score_sum) / incorrect
+        point_biserial = (
+            (mean_correct - mean_incorrect)
+            / math.sqrt(variance)
+            * math.sqrt(p_value * (1 - p_value))
+        )
+
+    discrimination = 0.0
+    if responses >= MIN_RESPONSES and score_histogram and correct_histogram:
+        group_size = max(1, math.ceil(GROUP_FRACTION * responses))
+
+        def group_p(buckets) -> float:
+            total = right = 0
+            for bucket in buckets:
+                total += score_histogram[bucket]
+                right += correct_histogram[bucket]
+                if total >= group_size:
+                    break
+            return right / total if total else 0.0
+
+        discrimination = group_p(range(SCORE_BUCKETS - 1, -1, -1)) - group_p(range(SCORE_BUCKETS))
+
+    return round(p_value, 4), round(point_biserial, 4), round(discrimination, 4)
+
+
+class ItemAnalysisService(BaseService):
+    """Service for the per-question item-analysis store."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Read
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_item_stats(question) -> QuestionItemStats:
+        """
+        Return the item-analysis row of a question.
+
+        A question without a stored row (no graded response folded in yet, or
+        stats never rebuilt) gets its statistics computed from the database into
+        a transient row; the read never writes. The row is persisted by the next
+        graded attempt or ``flask quiz item-analysis``.
+
+        Args:
+            question: Loaded Question instance
+
+        Returns:
+            QuestionItemStats: Stored (or computed, unsaved) statistics
+        """
+        stats = QuestionItemStats.query.get(question.question_id)
+        if stats is None:
+            quiz = Quiz.query.get(question.quiz_id)
+            computed, _ = ItemAnalysisService._compute_rows(quiz, [question.question_id])
+            stats = QuestionItemStats(
+                question_id=question.question_id,
+                quiz_id=question.quiz_id,
+                **computed[question.question_id],
+            )
+        return stats
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Incremental updates
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def record_attempt(attempt: QuizAttempt, quiz: Quiz, answers: list = None, sign: int = 1):
+        """
+        Fold a graded attempt into (sign=1) or out of (sign=-1) the store.
+
+        Call with sign=-1 before changing a graded attempt's answers or score
+        and with sign=1 once it is graded again. Rows are locked in question_id
+        order; a missing row is rebuilt from the database instead. Does not commit.
+
+        Args:
+            attempt: Graded QuizAttempt
+            quiz: The attempt's Quiz
+            answers: The attempt's AttemptAnswer rows (queried when omitted)
+            sign: 1 to add the attempt, -1 to remove it
+        """
+        if answers is None:
+            answers = AttemptAnswer.query.filter_by(attempt_id=attempt.attempt_id).all()
+        ItemAnalysisService.record_attempts([(attempt, answers)], quiz, sign)
+
+    @staticmethod
+    def record_attempts(graded: list, quiz: Quiz, sign: int = 1):
+        """
+        Fold many graded attempts of one quiz into or out of the store at once.
+
+        Same contract as record_attempt, but each row is written once for the
+        whole batch. Counters, histogram buckets and distractor counts are
+        applied as atomic ``col = col + delta`` updates (in question_id order),
+        so concurrent submissions never read-modify-write the same row; the
+        derived metrics are then recomputed from the updated row. Does not commit.
+
+        Args:
+            graded: List of (QuizAttempt, its AttemptAnswer rows) pairs
+            quiz: The attempts' Quiz
+            sign: 1 to add the attempts, -1 to remove them
+        """
+        graded = [
+            (attempt, [a for a in answers if a.is_correct is not None])
+            for attempt, answers in graded
+        ]
+        graded = [(attempt, answers) for attempt, answers in graded if answers]
+        if not graded:
+            return
+
+        snapshot = QuizSnapshotService.get_snapshot(quiz)
+        deltas = {}
+        for attempt, answers in graded:
+            percentage = float(attempt.percentage or 0)
+            bucket = score_bucket(percentage)
+            for answer in answers:
+                delta = deltas.get(answer.question_id)
+                if delta is None:
+                    delta = deltas[answer.question_id] = {
+                        "counters": Counter(),
+                        "scores": Counter(),
+                        "corrects": Counter(),
+                        "distractors": Counter(),
+                    }
+                is_correct = bool(answer.is_correct)
+                counters = delta["counters"]
+                counters["responses"] += sign
+                counters["correct_responses"] += sign if is_correct else 0
+                counters["score_sum"] += sign * percentage
+                counters["score_sq_sum"] += sign * percentage * percentage
+                counters["correct_score_sum"] += sign * percentage if is_correct else 0
+                counters["time_sum"] += sign * (answer.time_taken_seconds or 0)
+                delta["scores"][bucket] += sign
+                if is_correct:
+                    delta["corrects"][bucket] += sign
+
+                question = snapshot.get_question(answer.question_id)
+                if question and question.question_type in OPTION_QUESTION_TYPES:
+                    for option_id in ItemAnalysisService._selected_options(
+                        question, answer.user_answer
+                    ):
+                        delta["distractors"][option_id] += sign
+
+        now = datetime.utcnow()
+        for question_id in sorted(deltas):
+            values = ItemAnalysisService._delta_values(deltas[question_id], now)
+            if ItemAnalysisService._apply_delta(question_id, values):
+                continue
+
+            # First graded response of this question: materialize the row from
+            # the database, which (after the flush) already holds the state
+            # being added (sign=1) or about to be removed (sign=-1). The insert
+            # runs in a savepoint so a row created concurrently only rolls back
+            # the savepoint, and the delta is applied to that row instead.
+            db.session.flush()
+            try:
+                with db.session.begin_nested():
+                    ItemAnalysisService._rebuild(quiz, [question_id])
+            except IntegrityError:
+                logger.info(
+                    "Item stats row for %s created concurrently; applying delta", question_id
+                )
+                ItemAnalysisService._apply_delta(question_id, values)
+            else:
+                if sign < 0:
+                    ItemAnalysisService._apply_delta(question_id, values)
+
+        # Derived metrics are recomputed from the rows this transaction now holds
+        for row in (
+            QuestionItemStats.query.filter(QuestionItemStats.question_id.in_(list(deltas)))
+            .populate_existing()
+        ):
+            ItemAnalysisService._apply_metrics(row)
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Batch recompute
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def recompute_quiz(quiz_id: str) -> dict:
+        """
+        Rebuild the item-analysis rows of every question in a quiz from scratch.
+
+        Returns:
+            dict: quiz_id, questions, responses
+        """
+        quiz = Quiz.query.get(quiz_id)
+        if not quiz:
+            return {"quiz_id": quiz_id, "questions": 0, "responses": 0}
+
+        try:
+            snapshot = QuizSnapshotService.get_snapshot(quiz)
+            question_ids = [q.question_id for q in snapshot.questions]
+            responses = ItemAnalysisService._rebuild(quiz, question_ids)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error recomputing item analysis for quiz %s: %s", quiz_id, str(exc))
+            raise
+
+        logger.info("Item analysis recomputed for quiz %s (%s responses)", quiz_id, responses)
+        return {"quiz_id": quiz_id, "questions": len(question_ids), "responses": responses}
+
+    @staticmethod
+    def recompute_all() -> list:
+        """Rebuild the item-analysis rows of every quiz."""
+        return [
+            ItemAnalysisService.recompute_quiz(quiz_id)
+            for (quiz_id,) in db.session.query(Quiz.quiz_id).order_by(Quiz.quiz_id).all()
+        ]
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _rebuild(quiz: Quiz, question_ids: list) -> int:
+        """
+        Replace the rows of the given questions with statistics computed from
+        all graded responses, streamed question by question. Does not commit.
+        """
+        if not question_ids:
+            return 0
+
+        computed, total = ItemAnalysisService._compute_rows(quiz, question_ids)
+        now = datetime.utcnow()
+        existing = {
+            row.question_id: row
+            for row in QuestionItemStats.query.filter(
+                QuestionItemStats.question_id.in_(question_ids)
+            )
+        }
+        for question_id in question_ids:
+            row = existing.get(question_id)
+            if row is None:
+                row = QuestionItemStats(question_id=question_id, quiz_id=quiz.quiz_id)
+                db.session.add(row)
+            for field, value in computed[question_id].items():
+                setattr(row, field, value)
+            row.updated_at = now
+        db.session.flush()
+        return total
+
+    @staticmethod
+    def _compute_rows(quiz: Quiz, question_ids: list) -> tuple:
+        """
+        Compute the statistics of the given questions from all graded responses,
+        streamed question by question, without writing anything.
+
+        Returns:
+            tuple: ({question_id: column values}, responses read)
+        """
+        snapshot = QuizSnapshotService.get_snapshot(quiz)
+        stream = (
+            db.session.query(
+                AttemptAnswer.question_id,
+                AttemptAnswer.is_correct,
+                AttemptAnswer.user_answer,
+                AttemptAnswer.time_taken_seconds,
+                QuizAttempt.percentage,
+            )
+            .join(QuizAttempt, QuizAttempt.attempt_id == AttemptAnswer.attempt_id)
+            .filter(
+                QuizAttempt.quiz_id == quiz.quiz_id,
+                QuizAttempt.status == "graded",
+                AttemptAnswer.question_id.in_(question_ids),
+                AttemptAnswer.is_correct.isnot(None),
+            )
+            .order_by(AttemptAnswer.question_id)
+            .yield_per(STREAM_BATCH_SIZE)
+        )
+
+        computed = {}
+        total = 0
+        for question_id, rows in groupby(stream, key=lambda row: row[0]):
+            rows = list(rows)
+            total += len(rows)
+            computed[question_id] = ItemAnalysisService._compute_row(
+                snapshot.get_question(question_id), rows
+            )
+        for question_id in question_ids:
+            if question_id not in computed:
+                computed[question_id] = ItemAnalysisService._compute_row(None, [])
+        return computed, total
+
+    @staticmethod
+    def _compute_row(question, rows: list) -> dict:
+        """Vectorized statistics for one question's (question_id, is_correct, ...) rows."""
+        # Only batch recomputes need NumPy; keep it out of worker start-up
+        import numpy as np
+
+        scores = np.array([float(r[4] or 0) for r in rows], dtype=np.float64)
+        correct = np.array([bool(r[1]) for r in rows], dtype=bool)
+        times = np.array([r[3] or 0 for r in rows], dtype=np.int64)
+        buckets = np.clip(np.floor(scores).astype(np.int64), 0, SCORE_BUCKETS - 1)
+
+        distractors = Counter()
+        if question and question.question_type in OPTION_QUESTION_TYPES:
+            for row in rows:
+                distractors.update(ItemAnalysisService._selected_options(question, row[2]))
+
+        values = {
+            "responses": int(len(rows)),
+            "correct_responses": int(correct.sum()),
+            "score_sum": float(scores.sum()),
+            "score_sq_sum": float(np.square(scores).sum()),
+            "correct_score_sum": float(scores[correct].sum()),
+            "time_sum": int(times.sum()),
+            "score_histogram": np.bincount(buckets, minlength=SCORE_BUCKETS).tolist(),
+            "correct_histogram": np.bincount(
+                buckets[correct], minlength=SCORE_BUCKETS
+            ).tolist(),
+            "distractor_counts": dict(distractors),
+        }
+        values["p_value"], values["point_biserial"], values["discrimination_index"] = (
+            derive_item_metrics(
+                values["responses"],
+                values["correct_responses"],
+                values["score_sum"],
+                values["score_sq_sum"],
+                values["correct_score_sum"],
+                values["score_histogram"],
+                values["correct_histogram"],
+            )
+        )
+        return values
+
+    @staticmethod
+    def _delta_values(delta: dict, now: datetime) -> dict:
+        """
+        UPDATE values adding one question's accumulated deltas to its row.
+
+        Histogram buckets and distractor counts are incremented in place with
+        JSON_SET / JSON_EXTRACT (supported by MySQL and SQLite alike).
+        """
+        values = {
+            getattr(QuestionItemStats, column): getattr(QuestionItemStats, column) + amount
+            for column, amount in delta["counters"].items()
+        }
+        for column, increments in (
+            (QuestionItemStats.score_histogram, delta["scores"]),
+            (QuestionItemStats.correct_histogram, delta["corrects"]),
+        ):
+            paths = {f"$[{bucket}]": amount for bucket, amount in increments.items() if amount}
+            if paths:
+                values[column] = ItemAnalysisService._json_increment(column, paths)
+        paths = {
+            f'$."{option_id}"': amount
+            for option_id, amount in delta["distractors"].items()
+            if amount
+        }
+        if paths:
+            values[QuestionItemStats.distractor_counts] = ItemAnalysisService._json_increment(
+                func.coalesce(QuestionItemStats.distractor_counts, "{}"), paths
+            )
+        values[QuestionItemStats.updated_at] = now
+        return values
+
+    @staticmethod
+    def _json_increment(document, paths: dict):
+        """JSON_SET(document, path, COALESCE(JSON_EXTRACT(document, path), 0) + delta, ...)."""
+        args = [document]
+        for path, amount in sorted(paths.items()):
+            args += [path, func.coalesce(func.json_extract(document, path), 0) + amount]
+        return func.json_set(*args)
+
+    @staticmethod
+    def _apply_delta(question_id: str, values: dict) -> int:
+        """Atomically apply counter deltas; returns the number of rows updated."""
+        return QuestionItemStats.query.filter(
+            QuestionItemStats.question_id == question_id
+        ).update(values, synchronize_session=False)
+
+    @staticmethod
+    def _apply_metrics(row: QuestionItemStats) -> None:
+        row.p_value, row.point_biserial, row.discrimination_index = derive_item_metrics(
+            row.responses,
+            row.correct_responses,
+            row.score_sum,
+            row.score_sq_sum,
+            row.correct_score_sum,
+            row.score_histogram,
+            row.correct_histogram,
+        )
+
+    @staticmethod
+    def _selected_options(question, user_answer: str) -> list:
+        """Option ids of the question picked in a raw answer."""
+        if not user_answer:
+            return []
+        known = {opt.option_id for opt in question.options}
+        picked = {part.strip() for part in user_answer.split(",")}
+        return sorted(picked & known)
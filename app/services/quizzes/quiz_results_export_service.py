@@ -0,0 +1,368 @@
+"""
+Quiz Results Export Service
+Streams every submitted attempt of a quiz as CSV, JSON Lines or Parquet for
+instructors, in long (one row per answer) or wide (one row per attempt) layout.
+Rows are read through a server-side cursor and written out chunk by chunk, so
+memory stays flat regardless of class size.
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app import db
+from app.exceptions import AuthorizationError, ResourceNotFoundError, ValidationError
+from app.models.auth import User
+from app.models.courses.course import Course
+from app.models.quizzes.attempt_answer import AttemptAnswer
+from app.models.quizzes.question import Question
+from app.models.quizzes.quiz import Quiz
+from app.models.quizzes.quiz_attempt import QuizAttempt
+from app.services.base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_LAYOUTS = ("long", "wide")
+
+# Rows fetched per cursor round trip and written per CSV/JSONL chunk
+STREAM_BATCH_SIZE = 1000
+# Rows per Parquet row group (the unit buffered before it is written out)
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# (column, type) pairs; types are mapped to Arrow types for Parquet
+ATTEMPT_COLUMNS = (
+    ("attempt_id", "string"),
+    ("user_id", "string"),
+    ("email", "string"),
+    ("student_name", "string"),
+    ("status", "string"),
+    ("started_at", "timestamp"),
+    ("submitted_at", "timestamp"),
+    ("time_taken_minutes", "int"),
+    ("score", "int"),
+    ("total_points", "int"),
+    ("percentage", "float"),
+    ("passed", "bool"),
+)
+ANSWER_COLUMNS = (
+    ("question_id", "string"),
+    ("question_order", "int"),
+    ("question_type", "string"),
+    ("user_answer", "string"),
+    ("is_correct", "bool"),
+    ("points_earned", "int"),
+    ("time_taken_seconds", "int"),
+)
+# Per-question columns of the wide layout, as q<N>_<suffix>
+WIDE_QUESTION_COLUMNS = (("answer", "string"), ("correct", "bool"), ("points", "int"))
+
+
+class QuizResultsExportService(BaseService):
+    """Service for streaming quiz results exports."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Export
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def export_results(
+        quiz_id: str,
+        user_id: str,
+        user_role: str,
+        fmt: str = "csv",
+        layout: str = "long",
+    ) -> dict:
+        """
+        Prepare a streamed export of all submitted/graded attempts of a quiz.
+
+        Validation and authorization happen here; the database is only read
+        once the returned chunks are iterated (inside the response).
+
+        Args:
+            quiz_id: Quiz UUID
+            user_id: Requesting instructor's user ID
+            user_role: Requesting user's role
+            fmt: csv, jsonl or parquet
+            layout: long (one row per answer) or wide (one row per attempt,
+                    with q<N>_answer / q<N>_correct / q<N>_points columns)
+
+        Returns:
+            dict: chunks (iterator of str/bytes), mimetype, filename
+
+        Raises:
+            ValidationError: Unknown format/layout, or Parquet support missing
+            ResourceNotFoundError: Quiz not found
+            AuthorizationError: Not the course instructor/admin
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        if layout not in EXPORT_LAYOUTS:
+            raise ValidationError(f"layout must be one of: {', '.join(EXPORT_LAYOUTS)}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValidationError("Parquet export is not available on this server")
+
+        quiz = Quiz.query.get(quiz_id)
+        if not quiz:
+            raise ResourceNotFoundError("Quiz not found")
+
+        if user_role != "admin":
+            course = Course.query.get(quiz.course_id)
+            if not course or course.instructor_id != user_id:
+                raise AuthorizationError("Only the course instructor can export quiz results")
+
+        question_ids = [
+            question_id
+            for (question_id,) in db.session.query(Question.question_id)
+            .filter(Question.quiz_id == quiz_id)
+            .order_by(Question.question_order.asc(), Question.created_at.asc())
+        ]
+
+        if layout == "wide":
+            columns = list(ATTEMPT_COLUMNS) + [
+                (f"q{position}_{suffix}", kind)
+                for position in range(1, len(question_ids) + 1)
+                for suffix, kind in WIDE_QUESTION_COLUMNS
+            ]
+            rows = QuizResultsExportService._wide_rows(quiz_id, question_ids)
+        else:
+            columns = list(ATTEMPT_COLUMNS) + list(ANSWER_COLUMNS)
+            rows = QuizResultsExportService._long_rows(quiz_id)
+
+        writers = {
+            "csv": QuizResultsExportService._csv_chunks,
+            "jsonl": QuizResultsExportService._jsonl_chunks,
+            "parquet": QuizResultsExportService._parquet_chunks,
+        }
+        mimetype, extension = EXPORT_FORMATS[fmt]
+        logger.info("Exporting results of quiz %s as %s (%s)", quiz_id, fmt, layout)
+        return {
+            "chunks": writers[fmt](columns, rows),
+            "mimetype": mimetype,
+            "filename": f"quiz-{quiz_id}-results-{layout}.{extension}",
+        }
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Row sources
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _stream(quiz_id: str):
+        """
+        Attempt + answer rows of a quiz, ordered by attempt, through a
+        server-side cursor (yield_per implies stream_results).
+        """
+        stmt = (
+            select(
+                QuizAttempt.attempt_id,
+                QuizAttempt.user_id,
+                User.email,
+                User.first_name,
+                User.last_name,
+                QuizAttempt.status,
+                QuizAttempt.started_at,
+                QuizAttempt.submitted_at,
+                QuizAttempt.time_taken_minutes,
+                QuizAttempt.score,
+                QuizAttempt.total_points,
+                QuizAttempt.percentage,
+                QuizAttempt.passed,
+                AttemptAnswer.question_id,
+                Question.question_order,
+                Question.question_type,
+                AttemptAnswer.user_answer,
+                AttemptAnswer.is_correct,
+                AttemptAnswer.points_earned,
+                AttemptAnswer.time_taken_seconds,
+            )
+            .select_from(QuizAttempt)
+            .join(User, User.user_id == QuizAttempt.user_id)
+            .outerjoin(AttemptAnswer, AttemptAnswer.attempt_id == QuizAttempt.attempt_id)
+            .outerjoin(Question, Question.question_id == AttemptAnswer.question_id)
+            .where(
+                QuizAttempt.quiz_id == quiz_id,
+                QuizAttempt.status.in_(["submitted", "graded"]),
+            )
+            .order_by(
+                QuizAttempt.submitted_at.asc(),
+                QuizAttempt.attempt_id.asc(),
+                Question.question_order.asc(),
+                AttemptAnswer.question_id.asc(),
+            )
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        result = db.session.execute(stmt)
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    @staticmethod
+    def _attempt_values(row) -> list:
+        return [
+            row.attempt_id,
+            row.user_id,
+            row.email,
+            f"{row.first_name or ''} {row.last_name or ''}".strip(),
+            row.status,
+            row.started_at,
+            row.submitted_at,
+            row.time_taken_minutes,
+            row.score,
+            row.total_points,
+            float(row.percentage) if row.percentage is not None else None,
+            row.passed,
+        ]
+
+    @staticmethod
+    def _long_rows(quiz_id: str):
+        """One row per answer (attempts without answers get one empty row)."""
+        for row in QuizResultsExportService._stream(quiz_id):
+            yield QuizResultsExportService._attempt_values(row) + [
+                row.question_id,
+                row.question_order,
+                row.question_type,
+                row.user_answer,
+                row.is_correct,
+                row.points_earned,
+                row.time_taken_seconds,
+            ]
+
+    @staticmethod
+    def _wide_rows(quiz_id: str, question_ids: list):
+        """One row per attempt; answers fill their question's columns."""
+        column_of = {question_id: idx for idx, question_id in enumerate(question_ids)}
+        offset = len(ATTEMPT_COLUMNS)
+        width = len(WIDE_QUESTION_COLUMNS)
+
+        current_id, current = None, None
+        for row in QuizResultsExportService._stream(quiz_id):
+            if row.attempt_id != current_id:
+                if current is not None:
+                    yield current
+                current_id = row.attempt_id
+                current = QuizResultsExportService._attempt_values(row)
+                current += [None] * (width * len(question_ids))
+            idx = column_of.get(row.question_id)
+            if idx is not None:
+                start = offset + idx * width
+                current[start : start + width] = [
+                    row.user_answer,
+                    row.is_correct,
+                    row.points_earned,
+                ]
+        if current is not None:
+            yield current
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Writers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _csv_chunks(columns: list, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([name for name, _ in columns])
+        for count, row in enumerate(rows, 1):
+            writer.writerow(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            )
+            if count % STREAM_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def _jsonl_chunks(columns: list, rows):
+        names = [name for name, _ in columns]
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(dict(zip(names, row)), default=_json_default))
+            if len(lines) == STREAM_BATCH_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _parquet_chunks(columns: list, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrow_types = {
+            "string": pa.string(),
+            "timestamp": pa.timestamp("us"),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+        }
+        schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns])
+
+        def row_group(batch):
+            return pa.Table.from_arrays(
+                [
+                    pa.array(values, type=field.type)
+                    for values, field in zip(zip(*batch), schema)
+                ],
+                schema=schema,
+            )
+
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema) as writer:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == PARQUET_ROW_GROUP_SIZE:
+                    writer.write_table(row_group(batch))
+                    batch = []
+                    yield sink.drain()
+            if batch:
+                writer.write_table(row_group(batch))
+        yield sink.drain()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
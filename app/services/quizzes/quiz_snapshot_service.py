@@ -0,0 +1,329 @@
+"""
+Quiz Snapshot Service
+Compiles a quiz's questions and options into an immutable snapshot that attempt
+start and auto-grading read instead of querying questions/options every time.
+Snapshots are cached per (quiz_id, version) in-process and, optionally, in Redis.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+from flask import current_app
+
+from app.models.quizzes.question import Question
+from app.models.quizzes.question_option import QuestionOption
+from app.models.quizzes.quiz import Quiz
+from app.services.base_service import BaseService
+from app.utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "quiz_snapshot"
+LOCAL_CACHE_SIZE = 256
+
+_local_cache = OrderedDict()
+_local_cache_lock = threading.Lock()
+
+
+def normalize_text_answer(value: str) -> str:
+    """Normalization used for fill_blank / matching answers (trim + case-fold)."""
+    return (value or "").strip().lower()
+
+
+@dataclass(frozen=True)
+class OptionSnapshot:
+    """One answer option as compiled into a quiz snapshot."""
+
+    option_id: str
+    option_text: str
+    option_order: int
+    is_correct: bool
+
+
+@dataclass(frozen=True)
+class QuestionSnapshot:
+    """One question with its options and precomputed answer key."""
+
+    question_id: str
+    question_type: str
+    question_text: str
+    points: int
+    explanation: str
+    options: tuple
+    correct_option_ids: frozenset
+    correct_texts: frozenset
+    correct_answer_text: str
+
+    @classmethod
+    def build(cls, question_id, question_type, question_text, points, explanation, options):
+        options = tuple(options)
+        correct = [o for o in options if o.is_correct]
+        return cls(
+            question_id=question_id,
+            question_type=question_type,
+            question_text=question_text,
+            points=points or 0,
+            explanation=explanation,
+            options=options,
+            correct_option_ids=frozenset(o.option_id for o in correct),
+            correct_texts=frozenset(normalize_text_answer(o.option_text) for o in correct),
+            correct_answer_text=", ".join(o.option_text for o in correct),
+        )
+
+
+@dataclass(frozen=True)
+class QuizSnapshot:
+    """Immutable compiled view of a quiz's questions, in display order."""
+
+    quiz_id: str
+    version: str
+    questions: tuple
+
+    def __post_init__(self):
+        index = MappingProxyType({q.question_id: q for q in self.questions})
+        object.__setattr__(self, "_index", index)
+
+    @property
+    def total_points(self) -> int:
+        return sum(q.points for q in self.questions)
+
+    def get_question(self, question_id: str):
+        """Return the QuestionSnapshot for question_id, or None."""
+        return self._index.get(question_id)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "quiz_id": self.quiz_id,
+                "version": self.version,
+                "questions": [
+                    {
+                        "question_id": q.question_id,
+                        "question_type": q.question_type,
+                        "question_text": q.question_text,
+                        "points": q.points,
+                        "explanation": q.explanation,
+                        "options": [asdict(o) for o in q.options],
+                    }
+                    for q in self.questions
+                ],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "QuizSnapshot":
+        data = json.loads(raw)
+        questions = tuple(
+            QuestionSnapshot.build(
+                q["question_id"],
+                q["question_type"],
+                q["question_text"],
+                q["points"],
+                q["explanation"],
+                (OptionSnapshot(**o) for o in q["options"]),
+            )
+            for q in data["questions"]
+        )
+        return cls(quiz_id=data["quiz_id"], version=data["version"], questions=questions)
+
+
+class QuizSnapshotService(BaseService):
+    """Service for compiling, caching and invalidating quiz snapshots."""
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Read
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def get_snapshot(quiz: Quiz) -> QuizSnapshot:
+        """
+        Return the compiled snapshot for a quiz.
+
+        The quiz's updated_at is the snapshot version (QuestionService bumps it
+        on every question change), so a cached snapshot is never served for a
+        newer question set, even by another worker process.
+
+        Args:
+            quiz: Loaded Quiz instance
+
+        Returns:
+            QuizSnapshot: Immutable questions/options/answer keys
+        """
+        version = QuizSnapshotService._version_of(quiz)
+        key = (quiz.quiz_id, version)
+
+        with _local_cache_lock:
+            snapshot = _local_cache.get(key)
+            if snapshot is not None:
+                _local_cache.move_to_end(key)
+                return snapshot
+
+        client = QuizSnapshotService._redis_client()
+        snapshot = QuizSnapshotService._load_shared(client, quiz.quiz_id, version)
+        if snapshot is None:
+            snapshot = QuizSnapshotService.compile_snapshot(quiz.quiz_id, version)
+            QuizSnapshotService._store_shared(client, snapshot)
+
+        QuizSnapshotService._remember(snapshot)
+        return snapshot
+
+    @staticmethod
+    def peek_snapshot(quiz_id: str, version: str):
+        """
+        Return an already compiled snapshot without touching the database.
+
+        Used by callers that know the version they need (e.g. the autosave
+        buffer records it at attempt start) and only want a cache lookup.
+
+        Args:
+            quiz_id: Quiz UUID
+            version: Snapshot version as returned in QuizSnapshot.version
+
+        Returns:
+            QuizSnapshot or None: None when neither cache holds that version
+        """
+        key = (quiz_id, version)
+        with _local_cache_lock:
+            snapshot = _local_cache.get(key)
+            if snapshot is not None:
+                _local_cache.move_to_end(key)
+                return snapshot
+
+        snapshot = QuizSnapshotService._load_shared(
+            QuizSnapshotService._redis_client(), quiz_id, version
+        )
+        if snapshot is not None:
+            QuizSnapshotService._remember(snapshot)
+        return snapshot
+
+    @staticmethod
+    def compile_snapshot(quiz_id: str, version: str = "") -> QuizSnapshot:
+        """
+        Build a snapshot straight from the database with two queries.
+
+        Returns:
+            QuizSnapshot: Questions in display order with their options
+        """
+        questions = (
+            Question.query.filter_by(quiz_id=quiz_id)
+            .order_by(Question.question_order.asc(), Question.created_at.asc())
+            .all()
+        )
+        options_by_question = {}
+        options = (
+            QuestionOption.query.join(Question, Question.question_id == QuestionOption.question_id)
+            .filter(Question.quiz_id == quiz_id)
+            .order_by(QuestionOption.option_order.asc())
+            .all()
+        )
+        for opt in options:
+            options_by_question.setdefault(opt.question_id, []).append(
+                OptionSnapshot(
+                    option_id=opt.option_id,
+                    option_text=opt.option_text,
+                    option_order=opt.option_order,
+                    is_correct=bool(opt.is_correct),
+                )
+            )
+
+        return QuizSnapshot(
+            quiz_id=quiz_id,
+            version=version,
+            questions=tuple(
+                QuestionSnapshot.build(
+                    q.question_id,
+                    q.question_type,
+                    q.question_text,
+                    q.points,
+                    q.explanation,
+                    options_by_question.get(q.question_id, ()),
+                )
+                for q in questions
+            ),
+        )
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Invalidation
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def bump_version(quiz: Quiz) -> None:
+        """
+        Give the quiz a new snapshot version (call before the question commit).
+
+        updated_at is moved forward by at least one whole second because MySQL
+        DATETIME columns drop sub-second precision; two edits in the same second
+        must still produce different versions.
+        """
+        now = datetime.utcnow().replace(microsecond=0)
+        if quiz.updated_at and now <= quiz.updated_at.replace(microsecond=0):
+            now = quiz.updated_at.replace(microsecond=0) + timedelta(seconds=1)
+        quiz.updated_at = now
+
+    @staticmethod
+    def invalidate(quiz_id: str) -> None:
+        """Drop every cached snapshot of a quiz (call after the question commit)."""
+        with _local_cache_lock:
+            for key in [k for k in _local_cache if k[0] == quiz_id]:
+                del _local_cache[key]
+
+        client = QuizSnapshotService._redis_client()
+        if client is None:
+            return
+        try:
+            keys = list(client.scan_iter(match=f"{REDIS_KEY_PREFIX}:{quiz_id}:*"))
+            if keys:
+                client.delete(*keys)
+        except Exception as exc:
+            logger.warning("Quiz snapshot: Redis invalidation failed for %s: %s", quiz_id, exc)
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Internal helpers
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _version_of(quiz: Quiz) -> str:
+        return quiz.updated_at.replace(microsecond=0).isoformat() if quiz.updated_at else ""
+
+    @staticmethod
+    def _remember(snapshot: QuizSnapshot) -> None:
+        key = (snapshot.quiz_id, snapshot.version)
+        with _local_cache_lock:
+            _local_cache[key] = snapshot
+            _local_cache.move_to_end(key)
+            while len(_local_cache) > LOCAL_CACHE_SIZE:
+                _local_cache.popitem(last=False)
+
+    @staticmethod
+    def _redis_client():
+        return get_redis_client("QUIZ_SNAPSHOT_REDIS_ENABLED")
+
+    @staticmethod
+    def _load_shared(client, quiz_id: str, version: str):
+        if client is None:
+            return None
+        try:
+            raw = client.get(f"{REDIS_KEY_PREFIX}:{quiz_id}:{version}")
+            return QuizSnapshot.from_json(raw) if raw else None
+        except Exception as exc:
+            logger.warning("Quiz snapshot: Redis read failed for %s: %s", quiz_id, exc)
+            return None
+
+    @staticmethod
+    def _store_shared(client, snapshot: QuizSnapshot) -> None:
+        if client is None:
+            return
+        try:
+            ttl = current_app.config.get("QUIZ_SNAPSHOT_REDIS_TTL", 86400)
+            client.setex(
+                f"{REDIS_KEY_PREFIX}:{snapshot.quiz_id}:{snapshot.version}",
+                ttl,
+                snapshot.to_json(),
+            )
+        except Exception as exc:
+            logger.warning("Quiz snapshot: Redis write failed for %s: %s", snapshot.quiz_id, exc)
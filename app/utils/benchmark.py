@@ -0,0 +1,288 @@
+"""
+Request benchmark suite.
+
+Drives the hot user journeys through the Flask test client against the
+configured database (seed it first with ``flask seed synthetic``) and records
+the latency percentiles and SQL statement counts of every scenario into a JSON
+baseline (``flask benchmark run``). Two baselines, e.g. from two commits, are
+diffed with ``flask benchmark compare``.
+
+Each iteration is one virtual user, a synthetic student enrolled in a course,
+walking through: login, a require_auth-protected read (my courses), the course
+outline, a video progress heartbeat, a quiz start and submit, and the
+notification inbox.
+
+Requests run in-process, so the numbers are application and database time
+without network or WSGI server overhead; compare baselines taken on the same
+machine and dataset.
+"""
+
+import json
+import math
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+from app import db
+from app.middleware.query_profiler import count_queries
+from app.models.auth.user import User
+from app.models.courses.course_enrollment import CourseEnrollment
+from app.models.courses.lesson_content import LessonContent
+from app.models.quizzes.quiz import Quiz
+from app.utils.synthetic_data import SYNTHETIC_EMAIL_DOMAIN, SYNTHETIC_PASSWORD
+
+SCENARIOS = (
+    "login",
+    "my_courses",
+    "course_outline",
+    "progress_heartbeat",
+    "quiz_start",
+    "quiz_submit",
+    "notification_inbox",
+)
+
+PERCENTILES = (50, 95, 99)
+
+# A scenario regresses when a latency percentile grows by more than the
+# threshold or when it runs more SQL statements than before
+DEFAULT_THRESHOLD_PCT = 10.0
+
+
+def load_virtual_users(count: int) -> list:
+    """
+    Synthetic students with an active enrollment, and what they will request.
+
+    Returns:
+        list: {email, course_id, lesson_id, content_id, quiz_id} per user
+
+    Raises:
+        LookupError: If the database holds no synthetic enrollments
+    """
+    rows = (
+        db.session.query(User.email, CourseEnrollment.course_id)
+        .join(CourseEnrollment, CourseEnrollment.user_id == User.user_id)
+        .filter(
+            User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}"),
+            CourseEnrollment.status != "dropped",
+        )
+        .order_by(CourseEnrollment.enrollment_id)
+        .limit(count)
+        .all()
+    )
+    if not rows:
+        raise LookupError("No synthetic enrollments found; run `flask seed synthetic` first")
+
+    users = []
+    for email, course_id in rows:
+        video = (
+            LessonContent.query.filter_by(course_id=course_id, content_type="video")
+            .order_by(LessonContent.created_at, LessonContent.content_id)
+            .first()
+        )
+        quiz = Quiz.query.filter_by(course_id=course_id).first()
+        users.append(
+            {
+                "email": email,
+                "course_id": course_id,
+                "lesson_id": video.lesson_id if video else None,
+                "content_id": video.content_id if video else None,
+                "quiz_id": quiz.quiz_id if quiz else None,
+            }
+        )
+    db.session.remove()
+    return users
+
+
+class _Recorder:
+    """Latencies, statement counts and errors per scenario."""
+
+    def __init__(self):
+        self.samples = {name: [] for name in SCENARIOS}
+        self.errors = {name: 0 for name in SCENARIOS}
+        self.enabled = True
+
+    def request(self, scenario: str, client, method: str, url: str, **kwargs):
+        with count_queries() as stats:
+            started = time.perf_counter()
+            response = client.open(url, method=method, **kwargs)
+            elapsed = time.perf_counter() - started
+        if self.enabled:
+            self.samples[scenario].append((elapsed * 1000, stats.count))
+            if response.status_code >= 400:
+                self.errors[scenario] += 1
+        return response
+
+    def summary(self) -> dict:
+        return {
+            name: summarize(samples, self.errors[name]) for name, samples in self.samples.items()
+        }
+
+
+def _run_journey(app, recorder: _Recorder, user: dict):
+    client = app.test_client()
+    recorder.request(
+        "login", client, "POST", "/api/v1/auth/login",
+        json={"email": user["email"], "password": SYNTHETIC_PASSWORD},
+    )
+    recorder.request("my_courses", client, "GET", "/api/v1/users/my-courses")
+
+    course_url = f"/api/v1/courses/{user['course_id']}"
+    recorder.request("course_outline", client, "GET", f"{course_url}/content")
+
+    if user["content_id"]:
+        recorder.request(
+            "progress_heartbeat", client, "POST",
+            f"{course_url}/lessons/{user['lesson_id']}/contents/{user['content_id']}"
+            "/watch-progress",
+            json={"watched_percentage": 50, "current_position_seconds": 300,
+                  "watch_time_seconds": 30},
+        )
+
+    if user["quiz_id"]:
+        response = recorder.request(
+            "quiz_start", client, "POST", f"/api/v1/quizzes/{user['quiz_id']}/attempts"
+        )
+        attempt_id = ((response.get_json(silent=True) or {}).get("data") or {}).get("attempt_id")
+        if attempt_id:
+            recorder.request("quiz_submit", client, "POST", f"/api/v1/attempts/{attempt_id}/submit")
+
+    recorder.request("notification_inbox", client, "GET", "/api/v1/notifications")
+
+
+def run_benchmark(app, iterations: int = 100, virtual_users: int = 20, warmup: int = 5) -> dict:
+    """
+    Run the user journey iterations times, cycling through virtual_users.
+
+    Args:
+        app: Flask application (requests go through its test client)
+        iterations: Recorded journeys
+        virtual_users: Distinct students to cycle through
+        warmup: Unrecorded journeys run first (caches, connection pool)
+
+    Returns:
+        dict: Baseline document (see write_baseline)
+    """
+    with app.app_context():
+        users = load_virtual_users(virtual_users)
+        dialect = db.engine.dialect.name
+
+    recorder = _Recorder()
+    recorder.enabled = False
+    for i in range(warmup):
+        _run_journey(app, recorder, users[i % len(users)])
+
+    recorder.enabled = True
+    started = time.perf_counter()
+    for i in range(iterations):
+        _run_journey(app, recorder, users[i % len(users)])
+
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "commit": _git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "database": dialect,
+        },
+        "iterations": iterations,
+        "virtual_users": len(users),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "scenarios": recorder.summary(),
+    }
+
+
+def summarize(samples: list, errors: int = 0) -> dict:
+    """
+    Percentiles of (milliseconds, statements) samples.
+
+    Returns:
+        dict: requests, errors, p50_ms/p95_ms/p99_ms, mean_ms, queries_p50 and
+              queries_max
+    """
+    latencies = sorted(ms for ms, _ in samples)
+    queries = sorted(count for _, count in samples)
+    result = {"requests": len(samples), "errors": errors}
+    for p in PERCENTILES:
+        result[f"p{p}_ms"] = round(percentile(latencies, p), 3)
+    result["mean_ms"] = round(sum(latencies) / len(latencies), 3) if latencies else 0.0
+    result["queries_p50"] = percentile(queries, 50)
+    result["queries_max"] = queries[-1] if queries else 0
+    return result
+
+
+def percentile(values: list, p: float) -> float:
+    """Linearly interpolated percentile of sorted values (0 when empty)."""
+    if not values:
+        return 0
+    rank = (len(values) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def compare_baselines(
+    baseline: dict, current: dict, threshold_pct: float = DEFAULT_THRESHOLD_PCT
+) -> list:
+    """
+    Per-scenario differences between two baseline documents.
+
+    Returns:
+        list: {scenario, metric, baseline, current, change_pct, regression}
+              for every latency percentile and the statement count
+    """
+    rows = []
+    for scenario in SCENARIOS:
+        before = baseline["scenarios"].get(scenario)
+        after = current["scenarios"].get(scenario)
+        if not before or not after:
+            continue
+        for p in PERCENTILES:
+            metric = f"p{p}_ms"
+            change = _change_pct(before[metric], after[metric])
+            rows.append(
+                {
+                    "scenario": scenario,
+                    "metric": metric,
+                    "baseline": before[metric],
+                    "current": after[metric],
+                    "change_pct": change,
+                    "regression": change is not None and change > threshold_pct,
+                }
+            )
+        rows.append(
+            {
+                "scenario": scenario,
+                "metric": "queries_max",
+                "baseline": before["queries_max"],
+                "current": after["queries_max"],
+                "change_pct": _change_pct(before["queries_max"], after["queries_max"]),
+                "regression": after["queries_max"] > before["queries_max"],
+            }
+        )
+    return rows
+
+
+def _change_pct(before: float, after: float):
+    if not before:
+        return None
+    return round((after - before) / before * 100, 1)
+
+
+def write_baseline(result: dict, path: str) -> None:
+    """Write a baseline document as stable, diff-friendly JSON."""
+    with open(path, "w") as handle:
+        json.dump(result, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def read_baseline(path: str) -> dict:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
@@ -1,17 +1,62 @@
 """
 Database initialization and management utilities.
 Handles automatic database and table creation on application startup.
+
+Initialization is skipped entirely (one query) while the schema fingerprint
+recorded in the schema_version table matches the models and migration
+revisions; otherwise it runs once, under a lock: create missing tables, apply
+the Alembic revisions in migrations/, seed, record the new fingerprint.
 """
 
+import hashlib
 import logging
-import time
+import os
+from contextlib import contextmanager
+from datetime import datetime
 from urllib.parse import urlparse
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, select, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "migrations"
+)
+
+# schema_version row holding the fingerprint of the application models
+SCHEMA_COMPONENT = "app"
+
+
+def schema_fingerprint(metadata, dialect) -> str:
+    """
+    Fingerprint of the schema the models and migrations describe.
+
+    Args:
+        metadata: SQLAlchemy MetaData of the models
+        dialect: Dialect the DDL is rendered for
+
+    Returns:
+        str: SHA-256 hex digest of every table's and index's DDL and the
+             names and contents of the migration revision files
+    """
+    digest = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+
+    versions_dir = os.path.join(MIGRATIONS_DIR, "versions")
+    if os.path.isdir(versions_dir):
+        for name in sorted(os.listdir(versions_dir)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                # Editing a revision must re-run initialization, not only adding one
+                with open(os.path.join(versions_dir, name), "rb") as revision:
+                    digest.update(hashlib.sha256(revision.read()).digest())
+    return digest.hexdigest()
+
 
 class DatabaseInitializer:
     """
@@ -156,21 +201,34 @@ class DatabaseInitializer:
             self.logger.error(f"✗ Database connection failed: {str(e)}")
             return False
 
-    def initialize_database(self, db, app=None):
+    def initialize_database(self, db, app=None, seed=None):
         """
         Complete database initialization process:
+        0. Skip everything when the recorded schema fingerprint is current
         1. Create database if not exists
         2. Verify connection
         3. Create all tables from models (safe for multiple gunicorn workers)
+        4. Apply Alembic migrations
+        5. Seed initial data
+        6. Record the schema fingerprint
 
         Args:
             db: SQLAlchemy database instance
             app: Flask application instance (optional)
+            seed: Optional callable(app) seeding initial data
 
         Returns:
             bool: True if initialization successful, False otherwise
         """
         try:
+            fingerprint = None
+            if app:
+                with app.app_context():
+                    fingerprint = schema_fingerprint(db.metadata, db.engine.dialect)
+                    if self._schema_is_current(db, fingerprint):
+                        self.logger.info("✓ Database schema is up to date, skipping initialization")
+                        return True
+
             self.logger.info("Starting database initialization...")
 
             # Step 1: Create database if not exists
@@ -184,13 +242,37 @@ class DatabaseInitializer:
                 self.logger.error("Database connection verification failed")
                 return False
 
-            # Step 3: Create all tables (serialized across gunicorn workers via advisory lock)
+            # Steps 3-6, serialized across gunicorn workers via an advisory lock
             if app:
-                self.logger.info("Step 3: Creating database tables from models...")
-                with app.app_context():
+                with app.app_context(), self._schema_lock(db) as locked:
+                    if not locked:
+                        # The holder may have finished while this process waited
+                        if self._schema_is_current(db, fingerprint):
+                            self.logger.info("✓ Database schema initialized by another process")
+                            return True
+                        self.logger.error(
+                            "Could not acquire schema-init lock; another process is still "
+                            "initializing the database and the schema is not current."
+                        )
+                        return False
+                    if self._schema_is_current(db, fingerprint):
+                        self.logger.info("✓ Database schema initialized by another process")
+                        return True
+
+                    self.logger.info("Step 3: Creating database tables from models...")
                     self._create_tables_safe(db)
                     self.logger.info("✓ Database tables created/verified")
 
+                    self.logger.info("Step 4: Applying migrations...")
+                    self._apply_migrations(app, db)
+
+                    if seed:
+                        self.logger.info("Step 5: Seeding initial data...")
+                        seed(app)
+
+                    self._record_fingerprint(db, fingerprint)
+                    self.logger.info(f"✓ Schema fingerprint recorded ({fingerprint[:12]})")
+
             self.logger.info("✓ Database initialization completed successfully")
             return True
 
@@ -203,17 +285,18 @@ class DatabaseInitializer:
         Create all tables in a way that is safe against:
           - MySQL FK ordering errors (SET FOREIGN_KEY_CHECKS = 0)
           - MySQL 8.0.16+ error 3734 (FK ref to existing table missing column)
-          - Multiple gunicorn workers racing (MySQL advisory GET_LOCK)
           - "Table already exists" errors from concurrent workers
 
+        Callers hold the schema lock (_schema_lock), so only one worker runs
+        DDL at a time.
+
         For MySQL:
-          1. Acquire an advisory lock so only one worker runs DDL at a time.
-          2. Disable FK checks so self-referential / complex circular refs work.
-          3. Iterate db.metadata.sorted_tables (topological order) and create
+          1. Disable FK checks so self-referential / complex circular refs work.
+          2. Iterate db.metadata.sorted_tables (topological order) and create
              each table individually — this guarantees parent tables like
              'users' are always created before child tables that FK-reference
              them, avoiding MySQL 8 error 3734 even with FOREIGN_KEY_CHECKS=0.
-          4. Release the lock when done.
+          3. Re-enable FK checks when done.
 
         Other databases fall back to the standard db.create_all().
         """
@@ -223,25 +306,12 @@ class DatabaseInitializer:
             db.create_all()
             return
 
-        self.logger.info("MySQL: acquiring advisory lock for schema init...")
-
         # Use a dedicated autocommit connection for the entire DDL session.
         # AUTOCOMMIT means DDL statements are not wrapped in a transaction,
         # so a failure on one table does NOT roll back previously created tables.
         with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
-
-            # Acquire advisory lock (wait up to 30 s). Only one worker proceeds at a time.
-            lock_result = conn.execute(text("SELECT GET_LOCK('lms_schema_init', 30)")).scalar()
-            if lock_result != 1:
-                self.logger.warning(
-                    "Could not acquire schema-init lock; another worker may be initializing. "
-                    "Waiting 5 s then continuing anyway..."
-                )
-                time.sleep(5)
-                return  # Tables should already exist by now
-
             try:
-                self.logger.info("MySQL: advisory lock acquired. Disabling FK checks...")
+                self.logger.info("MySQL: disabling FK checks...")
                 conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
 
                 # MySQL 8.0.16+ raises error 3734 (even with FOREIGN_KEY_CHECKS=0) when
@@ -291,26 +361,129 @@ class DatabaseInitializer:
                                     f"MySQL: table '{table.name}' already exists with "
                                     "correct schema, skipping."
                                 )
+                                self._create_missing_indexes(conn, inspector, table)
                         except Exception as inspect_err:
                             self.logger.warning(
                                 f"MySQL: could not inspect table '{table.name}': "
                                 f"{inspect_err}. Skipping."
                             )
 
+            finally:
                 self.logger.info("MySQL: re-enabling FK checks...")
                 conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
 
+    @contextmanager
+    def _schema_lock(self, db):
+        """
+        Serialize schema initialization across processes.
+
+        Yields:
+            bool: Whether the lock is held (always True except on MySQL when
+                  another process holds it for more than 30 s)
+        """
+        if db.engine.dialect.name != "mysql":
+            yield True
+            return
+
+        self.logger.info("MySQL: acquiring advisory lock for schema init...")
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            acquired = conn.execute(text("SELECT GET_LOCK('lms_schema_init', 30)")).scalar() == 1
+            try:
+                yield acquired
             finally:
-                conn.execute(text("SELECT RELEASE_LOCK('lms_schema_init')"))
+                if acquired:
+                    conn.execute(text("SELECT RELEASE_LOCK('lms_schema_init')"))
+
+    def _schema_is_current(self, db, fingerprint):
+        """
+        Whether the database records the given schema fingerprint.
+
+        Returns:
+            bool: False as well when the database or schema_version table does
+                  not exist yet
+        """
+        from app.models.schema_version import SchemaVersion
+
+        try:
+            with db.engine.connect() as conn:
+                stored = conn.execute(
+                    select(SchemaVersion.fingerprint).where(
+                        SchemaVersion.component == SCHEMA_COMPONENT
+                    )
+                ).scalar()
+        except Exception:
+            return False
+        return stored == fingerprint
+
+    def _record_fingerprint(self, db, fingerprint):
+        """Store the fingerprint of the schema the database now has."""
+        from app.models.schema_version import SchemaVersion
+
+        db.session.merge(
+            SchemaVersion(
+                component=SCHEMA_COMPONENT, fingerprint=fingerprint, applied_at=datetime.utcnow()
+            )
+        )
+        db.session.commit()
+
+    def _apply_migrations(self, app, db):
+        """
+        Upgrade the database to the Alembic heads in migrations/.
+
+        A database without an alembic_version table was built from the models
+        by create_all and seeded at boot, which is what the existing revisions
+        would have done, so it is stamped at the heads instead of upgraded.
+        """
+        if not os.path.exists(os.path.join(MIGRATIONS_DIR, "env.py")):
+            self.logger.debug("No Alembic environment in migrations/, skipping migrations")
+            return
+
+        from alembic import command
+        from flask_migrate import Migrate
+        from sqlalchemy import inspect as sa_inspect
+
+        if "migrate" not in app.extensions:
+            Migrate(app, db, directory=MIGRATIONS_DIR)
+        config = app.extensions["migrate"].migrate.get_config(MIGRATIONS_DIR)
+
+        if sa_inspect(db.engine).has_table("alembic_version"):
+            command.upgrade(config, "heads")
+            self.logger.info("✓ Migrations applied")
+        else:
+            command.stamp(config, "heads")
+            self.logger.info("✓ Tables built from models; migrations stamped at heads")
+
+    def _create_missing_indexes(self, conn, inspector, table):
+        """
+        Create model-declared indexes that an existing table does not have yet.
+
+        create_all() never alters existing tables, so indexes added to a model
+        after its table was first created (e.g. the courses FULLTEXT index)
+        would otherwise only exist on fresh databases.
+        """
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                self.logger.info(f"MySQL: creating missing index '{index.name}'...")
+                index.create(bind=conn)
+            except Exception as index_err:
+                self.logger.warning(
+                    f"MySQL: could not create index '{index.name}' on '{table.name}': "
+                    f"{index_err}. Skipping."
+                )
 
 
-def init_database(app, db):
+def init_database(app, db, seed=None):
     """
     Initialize database on application startup.
 
     Args:
         app: Flask application instance
         db: SQLAlchemy database instance
+        seed: Optional callable(app) seeding initial data, run only when the
+              schema is (re)initialized
 
     Returns:
         bool: True if initialization successful
@@ -330,4 +503,4 @@ def init_database(app, db):
         return True
 
     initializer = DatabaseInitializer(db_uri, app.logger)
-    return initializer.initialize_database(db, app)
+    return initializer.initialize_database(db, app, seed=seed)
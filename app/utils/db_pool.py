@@ -0,0 +1,100 @@
+"""
+Database connection pool utilities.
+A QueuePool that records checkout wait times, and pool statistics for the
+health endpoint.
+"""
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters of one pool (per worker process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": (
+                    round(self.wait_seconds_total / attempts * 1000, 3) if attempts else 0.0
+                ),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that times how long each checkout waits for a connection
+    (including opening a new one), so pool exhaustion shows up as wait time
+    before it shows up as timeouts.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self._in_checkout = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; time the outer call only
+        if getattr(self._in_checkout, "active", False):
+            return super()._do_get()
+
+        self._in_checkout.active = True
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        finally:
+            self._in_checkout.active = False
+        self.metrics.record(time.perf_counter() - started)
+        return record
+
+
+def pool_status(engine) -> dict:
+    """
+    Current state of an engine's connection pool.
+
+    Returns:
+        dict: pool class, and for queue pools size, checked_in, checked_out,
+              overflow, max_overflow and timeout; checkout metrics when the
+              pool is a MeteredQueuePool
+    """
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    if isinstance(pool, MeteredQueuePool):
+        status.update(pool.metrics.to_dict())
+    return status
@@ -0,0 +1,186 @@
+"""
+Read-replica routing for the SQLAlchemy session.
+
+When a "replica" bind is configured (DATABASE_REPLICA_URL), code running under
+`read_only` sends its SELECTs to the replica. Everything else, and every read
+that could observe stale data, stays on the primary:
+
+- writes (flushes and Core INSERT/UPDATE/DELETE) and SELECT ... FOR UPDATE;
+- reads while the session has pending changes;
+- the rest of a request that wrote, and the client's following requests for
+  REPLICA_STICKY_SECONDS (read-your-writes, tracked with a cookie so it holds
+  across workers);
+- any read while the replica lags more than REPLICA_MAX_LAG_SECONDS behind,
+  or its lag cannot be determined.
+
+Usage:
+    @staticmethod
+    @read_only
+    def search_courses(...): ...
+
+    with read_only():
+        ...
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.sql.dml import UpdateBase
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_KEY = "replica"
+STICKY_COOKIE = "db_primary_until"
+
+_read_only_depth = ContextVar("db_read_only_depth", default=0)
+
+# engine -> (checked_at, usable); refreshed every REPLICA_LAG_CHECK_SECONDS
+_replica_state = {}
+_replica_state_lock = threading.Lock()
+
+
+class _ReadOnly:
+    """Context manager marking the enclosed reads as replica-safe."""
+
+    def __enter__(self):
+        self._token = _read_only_depth.set(_read_only_depth.get() + 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        _read_only_depth.reset(self._token)
+        return False
+
+
+def read_only(func=None):
+    """
+    Route the reads of a function (decorator) or block (`with read_only():`)
+    to the read replica when it is safe to do so.
+    """
+    if func is None:
+        return _ReadOnly()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _ReadOnly():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends read_only SELECTs to the replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[REPLICA_BIND_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause) -> bool:
+        if isinstance(clause, UpdateBase):
+            mark_write()
+            return False
+        if not _read_only_depth.get() or self._flushing:
+            return False
+        if not self._is_clean():
+            return False
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        if has_request_context() and (g.get("db_wrote") or g.get("db_pin_primary")):
+            return False
+        replica = self._db.engines.get(REPLICA_BIND_KEY)
+        return replica is not None and _replica_usable(replica)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    mark_write()
+
+
+def mark_write() -> None:
+    """Pin the current request (and the client, briefly) to the primary."""
+    if has_request_context():
+        g.db_wrote = True
+
+
+def init_db_routing(app) -> None:
+    """Install read-your-writes stickiness when a replica bind is configured."""
+    if REPLICA_BIND_KEY not in (app.config.get("SQLALCHEMY_BINDS") or {}):
+        return
+
+    @app.before_request
+    def _pin_recent_writers():
+        try:
+            pinned_until = float(request.cookies.get(STICKY_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        if pinned_until > time.time():
+            g.db_pin_primary = True
+
+    @app.after_request
+    def _remember_write(response):
+        if g.get("db_wrote"):
+            sticky = app.config.get("REPLICA_STICKY_SECONDS", 5)
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(round(time.time() + sticky, 3)),
+                max_age=sticky,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def _replica_usable(engine) -> bool:
+    """Whether the replica is within REPLICA_MAX_LAG_SECONDS (checked periodically)."""
+    config = current_app.config if has_app_context() else {}
+    interval = config.get("REPLICA_LAG_CHECK_SECONDS", 5)
+    now = time.monotonic()
+
+    state = _replica_state.get(engine)
+    if state is not None and now - state[0] < interval:
+        return state[1]
+
+    with _replica_state_lock:
+        state = _replica_state.get(engine)
+        if state is not None and now - state[0] < interval:
+            return state[1]
+        lag = replica_lag(engine)
+        usable = lag is not None and lag <= config.get("REPLICA_MAX_LAG_SECONDS", 5)
+        if not usable and (state is None or state[1]):
+            logger.warning("Read replica lag %s; reading from the primary", lag)
+        _replica_state[engine] = (now, usable)
+        return usable
+
+
+def replica_lag(engine):
+    """
+    Replication lag of a replica engine in seconds.
+
+    Returns:
+        float or None: 0 when the server does not replicate (e.g. SQLite or a
+        plain MySQL schema used as a stand-in), None when replication is
+        broken or the replica is unreachable
+    """
+    if engine.dialect.name != "mysql":
+        return 0
+    try:
+        with engine.connect() as connection:
+            try:
+                row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+                column = "Seconds_Behind_Source"
+            except Exception:
+                row = connection.execute(text("SHOW SLAVE STATUS")).mappings().first()
+                column = "Seconds_Behind_Master"
+    except Exception as exc:
+        logger.warning("Read replica unavailable: %s", exc)
+        return None
+    if row is None:
+        return 0
+    lag = row.get(column)
+    return float(lag) if lag is not None else None
@@ -0,0 +1,182 @@
+"""
+HTTP response caching for public read endpoints
+Conditional GET (ETag / Last-Modified -> 304), Cache-Control headers and an
+optional shared Redis response cache with tag-based invalidation.
+"""
+
+import hashlib
+import json
+import logging
+from functools import wraps
+
+from flask import current_app, make_response, request
+from werkzeug.http import http_date, parse_date
+
+from app.utils.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "httpcache"
+
+
+def _redis_client():
+    """Return a Redis client when the shared response cache is enabled, else None."""
+    return get_redis_client("HTTP_CACHE_REDIS_ENABLED")
+
+
+def _cache_control():
+    max_age = current_app.config.get("HTTP_CACHE_MAX_AGE", 60)
+    swr = current_app.config.get("HTTP_CACHE_STALE_WHILE_REVALIDATE", 300)
+    return f"public, max-age={max_age}, stale-while-revalidate={swr}"
+
+
+def _make_etag(version) -> str:
+    """Strong ETag over the representation (path + query) and entity version."""
+    raw = f"{request.full_path}|{version}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _is_not_modified(etag: str, last_modified) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the validators."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified and request.if_modified_since:
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(
+            tzinfo=None
+        )
+    return False
+
+
+def _with_validators(response, etag: str, last_modified):
+    response.set_etag(etag)
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Cache-Control"] = _cache_control()
+    return response
+
+
+def _not_modified_response(etag: str, last_modified):
+    return _with_validators(make_response("", 304), etag, last_modified)
+
+
+def _load_entry(client, key: str):
+    if client is None:
+        return None
+    try:
+        raw = client.get(key)
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning(f"HTTP cache: read failed for {key}: {str(e)}")
+        return None
+
+
+def _store_entry(client, key: str, response, etag: str, last_modified, tags) -> None:
+    if client is None:
+        return
+    try:
+        ttl = current_app.config.get("HTTP_CACHE_REDIS_TTL", 60)
+        entry = {
+            "etag": etag,
+            "last_modified": http_date(last_modified) if last_modified else None,
+            "mimetype": response.mimetype,
+            "body": response.get_data(as_text=True),
+        }
+        pipe = client.pipeline()
+        pipe.setex(key, ttl, json.dumps(entry))
+        for tag in tags:
+            tag_key = f"{CACHE_KEY_PREFIX}:tag:{tag}"
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl * 2)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"HTTP cache: write failed for {key}: {str(e)}")
+
+
+def cached_response(validator, tags=None):
+    """
+    Decorator adding conditional-GET support and shared caching to a public GET view.
+
+    The request is answered, in order, from:
+      1. the shared Redis cache (no database work at all), if enabled;
+      2. a 304 Not Modified when the client's ETag / Last-Modified still matches
+         the cheap validator query - the view (and its service call) never runs;
+      3. the view itself, whose 200 response gets ETag, Last-Modified and
+         Cache-Control headers and is stored in the shared cache.
+
+    Args:
+        validator: Callable receiving the view kwargs and returning
+            (version, last_modified) for the underlying entities, or None to
+            skip caching (e.g. the entity does not exist and the view will 404)
+        tags: Optional callable receiving the view kwargs and returning the
+            invalidation tags for the shared cache entry
+
+    Usage:
+        @bp.route('/courses/<course_id>')
+        @handle_exceptions
+        @cached_response(CourseService.get_course_version, tags=lambda course_id: [...])
+        def get_course(course_id):
+            ...
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            client = _redis_client()
+            key = f"{CACHE_KEY_PREFIX}:{request.full_path}"
+
+            entry = _load_entry(client, key)
+            if entry:
+                last_modified = None
+                if entry["last_modified"]:
+                    last_modified = parse_date(entry["last_modified"]).replace(tzinfo=None)
+                if _is_not_modified(entry["etag"], last_modified):
+                    return _not_modified_response(entry["etag"], last_modified)
+                response = make_response(entry["body"], 200)
+                response.mimetype = entry["mimetype"]
+                response.headers["X-Cache"] = "HIT"
+                return _with_validators(response, entry["etag"], last_modified)
+
+            state = validator(*args, **kwargs)
+            if state is None:
+                return func(*args, **kwargs)
+
+            version, last_modified = state
+            etag = _make_etag(version)
+            if _is_not_modified(etag, last_modified):
+                return _not_modified_response(etag, last_modified)
+
+            response = make_response(func(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            _with_validators(response, etag, last_modified)
+            response.headers["X-Cache"] = "MISS"
+            _store_entry(
+                client, key, response, etag, last_modified, tags(*args, **kwargs) if tags else []
+            )
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_cached_responses(*tags) -> None:
+    """
+    Drop every shared-cache entry stored under any of the given tags.
+
+    Call after the commit that changed the underlying data. A no-op when the
+    Redis response cache is disabled; ETag validation never depends on it.
+    """
+    client = _redis_client()
+    if client is None or not tags:
+        return
+    try:
+        tag_keys = [f"{CACHE_KEY_PREFIX}:tag:{tag}" for tag in tags]
+        keys = set()
+        for tag_key in tag_keys:
+            keys.update(client.smembers(tag_key))
+        client.delete(*keys, *tag_keys)
+    except Exception as e:
+        logger.warning(f"HTTP cache: invalidation failed for {tags}: {str(e)}")
@@ -0,0 +1,245 @@
+"""
+Index advisor.
+
+A catalogue of the hot query shapes of the service layer, and a check that
+runs the database's own EXPLAIN over each of them (EXPLAIN QUERY PLAN on
+SQLite, EXPLAIN on MySQL) and reports the ones that read a whole table or a
+whole index instead of seeking into one (``flask index-advisor``).
+
+The shapes mirror the filters the services issue; the bound values are
+placeholders because only the plan matters. Plans depend on table statistics,
+so run the advisor against a database seeded with realistic volumes.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from app import db
+from app.models.courses.course_activity_log import CourseActivityLog
+from app.models.courses.course_enrollment import CourseEnrollment
+from app.models.courses.lesson_content_progress import LessonContentProgress
+from app.models.notifications.notification_type_preferences import NotificationTypePreferences
+from app.models.quizzes.attempt_answer import AttemptAnswer
+from app.models.quizzes.quiz_attempt import QuizAttempt
+
+_ID = "00000000-0000-0000-0000-000000000000"
+
+# MySQL access types that read every row of the table or of an index
+_MYSQL_FULL_SCAN_TYPES = ("ALL", "index")
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\S+)|USING (INTEGER )?PRIMARY KEY")
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """One catalogued query: where it comes from and how to build it."""
+
+    name: str
+    source: str
+    build: Callable
+
+
+QUERY_SHAPES = (
+    QueryShape(
+        "progress.content_for_user",
+        "CourseProgressService.update_watch_progress",
+        lambda: LessonContentProgress.query.filter_by(content_id=_ID, user_id=_ID),
+    ),
+    QueryShape(
+        "progress.completed_in_course",
+        "CourseProgressService.get_course_progress",
+        lambda: LessonContentProgress.query.filter_by(
+            course_id=_ID, user_id=_ID, is_completed=True
+        ),
+    ),
+    QueryShape(
+        "progress.recording_views",
+        "CourseAnalyticsService.get_recording_views",
+        lambda: LessonContentProgress.query.filter_by(content_id=_ID, is_completed=True),
+    ),
+    QueryShape(
+        "progress.zoom_attendance",
+        "CourseAnalyticsService.get_lesson_attendance",
+        lambda: LessonContentProgress.query.filter(
+            LessonContentProgress.lesson_id == _ID,
+            LessonContentProgress.zoom_attended == True,  # noqa: E712
+        ),
+    ),
+    QueryShape(
+        "progress.course_completion_counts",
+        "CourseAnalyticsRollupService.get_content_completion_counts",
+        lambda: db.session.query(
+            LessonContentProgress.content_id, db.func.count(LessonContentProgress.progress_id)
+        )
+        .filter(LessonContentProgress.course_id == _ID)
+        .group_by(LessonContentProgress.content_id),
+    ),
+    QueryShape(
+        "activity.user_feed",
+        "CourseActivityService.get_activity_log",
+        lambda: CourseActivityLog.query.filter_by(course_id=_ID, user_id=_ID).order_by(
+            CourseActivityLog.timestamp.desc()
+        ),
+    ),
+    QueryShape(
+        "activity.course_since",
+        "CourseAnalyticsRollupService.get_activity_breakdown",
+        lambda: db.session.query(
+            CourseActivityLog.activity_type, db.func.count(CourseActivityLog.activity_id)
+        )
+        .filter(
+            CourseActivityLog.course_id == _ID,
+            CourseActivityLog.timestamp >= datetime(2000, 1, 1),
+        )
+        .group_by(CourseActivityLog.activity_type),
+    ),
+    QueryShape(
+        "enrollment.for_user_and_course",
+        "CourseProgressService._recalculate_enrollment_progress",
+        lambda: CourseEnrollment.query.filter_by(course_id=_ID, user_id=_ID),
+    ),
+    QueryShape(
+        "enrollment.my_courses",
+        "CourseEnrollmentService.get_my_courses",
+        lambda: CourseEnrollment.query.filter_by(user_id=_ID).order_by(
+            CourseEnrollment.enrolled_at.desc(), CourseEnrollment.enrollment_id.desc()
+        ),
+    ),
+    QueryShape(
+        "enrollment.course_by_status",
+        "CourseEnrollmentService.get_course_enrollments",
+        lambda: CourseEnrollment.query.filter_by(course_id=_ID).filter(
+            CourseEnrollment.status == "completed"
+        ),
+    ),
+    QueryShape(
+        "quiz_attempt.in_progress",
+        "QuizAttemptService._lock_slot",
+        lambda: db.session.query(QuizAttempt.attempt_id)
+        .filter_by(quiz_id=_ID, user_id=_ID, status="in_progress")
+        .order_by(QuizAttempt.started_at.desc()),
+    ),
+    QueryShape(
+        "quiz_attempt.finished_for_user",
+        "QuizAttemptService._count_completed",
+        lambda: QuizAttempt.query.filter(
+            QuizAttempt.quiz_id == _ID,
+            QuizAttempt.user_id == _ID,
+            QuizAttempt.status.in_(["submitted", "graded"]),
+        ),
+    ),
+    QueryShape(
+        "quiz_attempt.finished_for_quiz",
+        "QuizBatchGradingService.regrade_quiz",
+        lambda: db.session.query(QuizAttempt.attempt_id).filter(
+            QuizAttempt.quiz_id == _ID, QuizAttempt.status.in_(["submitted", "graded"])
+        ),
+    ),
+    QueryShape(
+        "attempt_answer.for_question",
+        "QuizAnswerService.save_answer",
+        lambda: AttemptAnswer.query.filter_by(attempt_id=_ID, question_id=_ID),
+    ),
+    QueryShape(
+        "attempt_answer.for_attempt",
+        "QuizAnswerService.submit_quiz",
+        lambda: AttemptAnswer.query.filter_by(attempt_id=_ID),
+    ),
+    QueryShape(
+        "attempt_answer.question_stats",
+        "QuizAnalyticsService.get_quiz_statistics",
+        lambda: db.session.query(
+            AttemptAnswer.question_id,
+            db.func.count(AttemptAnswer.question_id),
+            db.func.avg(AttemptAnswer.time_taken_seconds),
+        )
+        .filter(AttemptAnswer.question_id.in_([_ID, _ID]))
+        .group_by(AttemptAnswer.question_id),
+    ),
+    QueryShape(
+        "notification_preferences.for_type",
+        "NotificationPreferencesService.update_preferences",
+        lambda: NotificationTypePreferences.query.filter_by(
+            user_id=_ID, notification_type="course_update"
+        ),
+    ),
+)
+
+
+def explain(statement) -> list:
+    """
+    The database's plan for a statement, one dict per plan row.
+
+    Args:
+        statement: A SQLAlchemy Select (or ORM Query)
+
+    Returns:
+        list: Plan rows as dicts (SQLite: id/parent/notused/detail; MySQL: the
+              EXPLAIN columns)
+    """
+    if hasattr(statement, "statement"):
+        statement = statement.statement
+
+    connection = db.session.connection()
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    result = connection.exec_driver_sql(prefix + str(compiled), params)
+    return [dict(row) for row in result.mappings()]
+
+
+def analyze_plan(plan: list, dialect: str) -> dict:
+    """
+    Summarise a plan.
+
+    Returns:
+        dict: indexes (used to read tables) and full_scans (tables read in full,
+              directly or through one of their indexes)
+    """
+    indexes, full_scans = [], []
+    for row in plan:
+        if dialect == "sqlite":
+            detail = row["detail"]
+            words = detail.split()
+            # "SCAN (subquery-1)" and temp b-trees are not table reads
+            if words[0] not in ("SCAN", "SEARCH") or words[1].startswith("("):
+                continue
+            match = _SQLITE_INDEX.search(detail)
+            if match:
+                indexes.append(match.group(1) or "PRIMARY")
+            if words[0] == "SCAN":
+                full_scans.append(words[1])
+        else:
+            if row.get("table") is None or str(row["table"]).startswith("<"):
+                continue
+            if row.get("key"):
+                indexes.append(row["key"])
+            if row.get("type") in _MYSQL_FULL_SCAN_TYPES:
+                full_scans.append(row["table"])
+    return {"indexes": indexes, "full_scans": full_scans}
+
+
+def run_advisor(shapes: tuple = QUERY_SHAPES) -> list:
+    """
+    EXPLAIN every catalogued query shape.
+
+    Returns:
+        list: {name, source, indexes, full_scans, plan} per shape, in catalogue
+              order
+    """
+    dialect = db.session.connection().dialect.name
+    report = []
+    for shape in shapes:
+        plan = explain(shape.build())
+        report.append(
+            dict(name=shape.name, source=shape.source, plan=plan, **analyze_plan(plan, dialect))
+        )
+    return report
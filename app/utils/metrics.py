@@ -0,0 +1,348 @@
+"""
+Multiprocess-safe application metrics in the Prometheus text format.
+
+Each worker process writes its samples to its own memory-mapped value file in
+METRICS_DIR (one writer per file, so updates are a dict lookup and an 8-byte
+write). A scrape, served by any worker, reads every file and aggregates:
+
+- counters and histograms are summed over all files, including those of
+  workers that have exited, so totals never go backwards;
+- gauges are reported per live worker with a ``worker`` label.
+
+METRICS_DIR must be emptied when the server (re)starts; entrypoint.sh does
+this before gunicorn forks its workers.
+"""
+
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_REGISTRY = {}
+_keys = {}
+_state = {"directory": None, "pid": None, "values": None}
+_state_lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Value files
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _ValueFile:
+    """
+    Append-only records of (key, float64) in one mmap'd file.
+
+    Layout: a little-endian int32 holding the bytes in use, 4 bytes padding,
+    then records of int32 key length, the UTF-8 key padded to keep the value
+    8-byte aligned, and the float64 value.
+    """
+
+    INITIAL_SIZE = 1 << 16
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.INITIAL_SIZE:
+            self._file.truncate(self.INITIAL_SIZE)
+            size = self.INITIAL_SIZE
+        self._capacity = size
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._positions = {}
+        self._used = struct.unpack_from("<i", self._map, 0)[0]
+        if not self._used:
+            self._used = 8
+            struct.pack_into("<i", self._map, 0, self._used)
+        for key, _, position in _iter_records(self._map, self._used):
+            self._positions[key] = position
+
+    def add(self, key: str, amount: float):
+        with self._lock:
+            position = self._position(key)
+            value = struct.unpack_from("<d", self._map, position)[0]
+            struct.pack_into("<d", self._map, position, value + amount)
+
+    def set(self, key: str, value: float):
+        with self._lock:
+            struct.pack_into("<d", self._map, self._position(key), value)
+
+    def _position(self, key: str) -> int:
+        position = self._positions.get(key)
+        if position is not None:
+            return position
+
+        encoded = key.encode("utf-8")
+        padded = len(encoded) + 8 - (4 + len(encoded)) % 8
+        record = struct.pack(f"<i{padded}sd", len(encoded), encoded, 0.0)
+        if self._used + len(record) > self._capacity:
+            while self._used + len(record) > self._capacity:
+                self._capacity *= 2
+            self._map.close()
+            self._file.truncate(self._capacity)
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+
+        self._map[self._used : self._used + len(record)] = record
+        self._used += len(record)
+        # Publish the record only once it is fully written
+        struct.pack_into("<i", self._map, 0, self._used)
+        position = self._used - 8
+        self._positions[key] = position
+        return position
+
+
+def _iter_records(data, used: int):
+    position = 8
+    while position < used:
+        length = struct.unpack_from("<i", data, position)[0]
+        padded = length + 8 - (4 + length) % 8
+        key = bytes(data[position + 4 : position + 4 + length]).decode("utf-8")
+        value_position = position + 4 + padded
+        yield key, struct.unpack_from("<d", data, value_position)[0], value_position
+        position = value_position + 8
+
+
+def _read_file(path: str):
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if len(data) < 8:
+        return
+    used = min(struct.unpack_from("<i", data, 0)[0], len(data))
+    for key, value, _ in _iter_records(data, used):
+        yield key, value
+
+
+def configure(directory: str) -> None:
+    """Enable metrics, writing this process's values under directory."""
+    os.makedirs(directory, exist_ok=True)
+    _state["directory"] = directory
+
+
+def _values():
+    """This process's value file (reopened after a fork), or None when disabled."""
+    if _state["directory"] is None:
+        return None
+    pid = os.getpid()
+    if _state["pid"] != pid:
+        with _state_lock:
+            if _state["pid"] != pid:
+                path = os.path.join(_state["directory"], f"metrics_{pid}.db")
+                _state["values"] = _ValueFile(path)
+                _state["pid"] = pid
+    return _state["values"]
+
+
+def _key(family: str, suffix: str, labels: dict) -> str:
+    # Label sets repeat on every request; encode each one only once
+    cache_key = (family, suffix, tuple(labels.items()))
+    key = _keys.get(cache_key)
+    if key is None:
+        key = json.dumps([family, suffix, labels], sort_keys=True, separators=(",", ":"))
+        _keys[cache_key] = key
+    return key
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Metric types
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        _REGISTRY[name] = self
+
+
+class Counter(_Metric):
+    """Monotonic total, summed over all workers."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        values = _values()
+        if values is not None:
+            values.add(_key(self.name, "_total", labels), amount)
+
+
+class Gauge(_Metric):
+    """Current value, reported per live worker."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        values = _values()
+        if values is not None:
+            values.set(_key(self.name, "", labels), value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, summed over all workers."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        values = _values()
+        if values is None:
+            return
+        bound = next(b for b in self.buckets if value <= b)
+        values.add(_key(self.name, "_bucket", dict(labels, le=_format_value(bound))), 1)
+        values.add(_key(self.name, "_sum", labels), value)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Exposition
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect() -> dict:
+    """family -> {(suffix, sorted label items): value} over all value files."""
+    samples = defaultdict(lambda: defaultdict(float))
+    directory = _state["directory"]
+    if directory is None:
+        return samples
+
+    for path in glob.glob(os.path.join(directory, "metrics_*.db")):
+        try:
+            pid = int(os.path.basename(path)[len("metrics_") : -len(".db")])
+        except ValueError:
+            continue
+        alive = pid == os.getpid() or _pid_alive(pid)
+        for key, value in _read_file(path):
+            family, suffix, labels = json.loads(key)
+            metric = _REGISTRY.get(family)
+            if metric is None:
+                continue
+            if metric.kind == "gauge":
+                if not alive:
+                    continue
+                labels = dict(labels, worker=str(pid))
+            samples[family][(suffix, tuple(sorted(labels.items())))] += value
+    return samples
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    collected = _collect()
+    lines = []
+    for name, metric in _REGISTRY.items():
+        samples = collected.get(name, {})
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        if metric.kind == "histogram":
+            lines.extend(_render_histogram(metric, samples))
+        else:
+            for (suffix, labels), value in sorted(samples.items()):
+                label_text = _format_labels(dict(labels))
+                lines.append(f"{name}{suffix}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def format_family(name: str, kind: str, documentation: str, samples: list) -> str:
+    """Exposition text for a family computed at scrape time: [(labels, value)]."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _render_histogram(metric: Histogram, samples: dict) -> list:
+    series = defaultdict(lambda: {"buckets": defaultdict(float), "sum": 0.0})
+    for (suffix, labels), value in samples.items():
+        labels = dict(labels)
+        if suffix == "_bucket":
+            bound = labels.pop("le")
+            series[tuple(sorted(labels.items()))]["buckets"][bound] += value
+        elif suffix == "_sum":
+            series[tuple(sorted(labels.items()))]["sum"] += value
+
+    lines = []
+    name = metric.name
+    for labels, data in sorted(series.items()):
+        labels = dict(labels)
+        cumulative = 0.0
+        for bound in metric.buckets:
+            le = _format_value(bound)
+            cumulative += data["buckets"].get(le, 0.0)
+            bucket_labels = _format_labels(dict(labels, le=le))
+            lines.append(f"{name}_bucket{bucket_labels} {_format_value(cumulative)}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(data['sum'])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {_format_value(cumulative)}")
+    return lines
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    # Sorted, with a histogram's "le" last as is customary
+    ordered = sorted(labels.items(), key=lambda item: (item[0] == "le", item[0]))
+    pairs = (f'{key}="{_escape(value)}"' for key, value in ordered)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Application metrics
+# ──────────────────────────────────────────────────────────────────────────────
+
+HTTP_REQUEST_DURATION = Histogram(
+    "lms_http_request_duration_seconds", "Request latency by blueprint, route and method."
+)
+HTTP_REQUESTS = Counter(
+    "lms_http_requests", "Requests by blueprint, route, method and status code."
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "lms_db_pool_connections", "Database pool connections by state (per worker)."
+)
+DB_POOL_CHECKOUTS = Gauge(
+    "lms_db_pool_checkouts", "Database pool checkouts and timeouts since worker start."
+)
+DB_POOL_WAIT = Gauge(
+    "lms_db_pool_wait_seconds", "Average and maximum database pool checkout wait (per worker)."
+)
+NOTIFICATION_SEND_DURATION = Histogram(
+    "lms_notification_send_duration_seconds", "Notification channel send latency by channel."
+)
+NOTIFICATION_SENDS = Counter(
+    "lms_notification_sends", "Notification channel sends by channel and outcome."
+)
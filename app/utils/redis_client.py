@@ -0,0 +1,43 @@
+"""
+Shared Redis client
+One client (and so one connection pool) per process and REDIS_URL, reused by
+every Redis-backed feature instead of building a new client per request.
+"""
+
+import logging
+import threading
+
+import redis
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_redis_client(enabled_setting: str = None):
+    """
+    Return the per-process Redis client for the app's REDIS_URL.
+
+    Args:
+        enabled_setting: Config flag gating the calling feature; when given and
+            falsy, no client is returned
+
+    Returns:
+        redis.Redis client, or None if the feature is disabled or the client
+        cannot be created
+    """
+    if enabled_setting and not current_app.config.get(enabled_setting):
+        return None
+    url = current_app.config["REDIS_URL"]
+    with _clients_lock:
+        client = _clients.get(url)
+        if client is None:
+            try:
+                client = redis.from_url(url, decode_responses=True)
+            except Exception as exc:
+                logger.warning("Redis unavailable: %s", exc)
+                return None
+            _clients[url] = client
+    return client
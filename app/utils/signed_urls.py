@@ -0,0 +1,77 @@
+"""
+Short-lived signed URLs for uploaded files
+A caller that has already been authorized receives a URL carrying an expiry and
+an HMAC-SHA256 signature over the file path, so the file itself can be served
+without touching the database or the user's session.
+"""
+
+import base64
+import hashlib
+import hmac
+import time
+from urllib.parse import quote, unquote
+
+from flask import current_app
+
+UPLOADS_URL_PREFIX = "/uploads/"
+
+
+def _secret() -> bytes:
+    secret = current_app.config.get("MATERIAL_URL_SECRET") or current_app.config["SECRET_KEY"]
+    return secret.encode("utf-8")
+
+
+def _signature(relative_path: str, expires: int) -> str:
+    message = f"{relative_path}\n{expires}".encode("utf-8")
+    digest = hmac.new(_secret(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def sign_path(relative_path: str, expires_in: int = None) -> dict:
+    """
+    Sign a path relative to UPLOAD_FOLDER.
+
+    Args:
+        relative_path: File path relative to UPLOAD_FOLDER ("/" separated)
+        expires_in: Lifetime in seconds (default MATERIAL_URL_TTL_SECONDS)
+
+    Returns:
+        dict: url (under /uploads/) and expires (Unix timestamp)
+    """
+    relative_path = relative_path.replace("\\", "/").lstrip("/")
+    expires_in = expires_in or current_app.config.get("MATERIAL_URL_TTL_SECONDS", 300)
+    expires = int(time.time()) + expires_in
+    signature = _signature(relative_path, expires)
+    url = f"{UPLOADS_URL_PREFIX}{quote(relative_path)}?expires={expires}&signature={signature}"
+    return {"url": url, "expires": expires}
+
+
+def sign_file_url(file_url: str, expires_in: int = None) -> dict:
+    """
+    Sign a stored file URL when it points at local uploads.
+
+    External (http/https) URLs are returned unchanged with no expiry.
+
+    Returns:
+        dict: url and expires (None for external URLs)
+    """
+    if not file_url or not file_url.startswith(UPLOADS_URL_PREFIX):
+        return {"url": file_url, "expires": None}
+    relative_path = unquote(file_url[len(UPLOADS_URL_PREFIX):].split("?", 1)[0])
+    return sign_path(relative_path, expires_in)
+
+
+def verify_signature(relative_path: str, expires, signature) -> bool:
+    """
+    Check a signed path has not expired and was signed with our secret.
+
+    Returns:
+        bool: True if the signature is valid and current
+    """
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if not signature or expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(relative_path, expires), signature)
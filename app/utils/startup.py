@@ -0,0 +1,123 @@
+"""
+Worker start-up helpers.
+
+- profile_startup: what building the app costs, module by module, measured in
+  a fresh interpreter with ``python -X importtime`` (``flask startup-profile``);
+- prepare_preload: readies an app that the gunicorn master built once
+  (``gunicorn --preload``, PRELOAD_APP=true) to be shared copy-on-write by
+  the workers it forks.
+"""
+
+import gc
+import importlib
+import os
+import subprocess
+import sys
+
+from app import db
+
+# Imported lazily by the services; the master imports them before forking so
+# that every worker shares one copy instead of importing its own on first use
+PRELOAD_MODULES = (
+    "numpy",
+    "app.services.notifications.channels",
+)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_PROFILE_SCRIPT = """
+import resource, time
+started = time.perf_counter()
+from app import create_app
+create_app({config_name!r})
+elapsed = time.perf_counter() - started
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Parse ``python -X importtime`` output.
+
+    Returns:
+        list: {module, depth, self_ms, cumulative_ms} per imported module, in
+              import completion order
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return modules
+
+
+def profile_startup(config_name: str) -> dict:
+    """
+    Build the app in a fresh interpreter (SKIP_AUTO_INIT=true, as a worker
+    does) and measure it.
+
+    Args:
+        config_name: Configuration passed to create_app
+
+    Returns:
+        dict: seconds (create_app wall time, imports included), import_ms,
+              max_rss_mb and modules (see parse_importtime)
+
+    Raises:
+        RuntimeError: If the app cannot be built
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROFILE_SCRIPT.format(config_name=config_name)],
+        capture_output=True,
+        text=True,
+        cwd=_PROJECT_ROOT,
+        env=dict(os.environ, SKIP_AUTO_INIT="true"),
+        timeout=300,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    seconds, max_rss_kb = result.stdout.split()[-2:]
+    modules = parse_importtime(result.stderr)
+    return {
+        "seconds": float(seconds),
+        "import_ms": sum(m["cumulative_ms"] for m in modules if m["depth"] == 0),
+        "max_rss_mb": int(max_rss_kb) / 1024,
+        "modules": modules,
+    }
+
+
+def prepare_preload(app) -> None:
+    """
+    Prepare an app built in the gunicorn master for forking.
+
+    Imports PRELOAD_MODULES, closes the master's pooled connections, makes
+    every forked child discard the pools it inherited (a connection must never
+    be shared between processes) and freezes the current objects out of the
+    garbage collector so that collections in the workers do not touch, and
+    thereby copy, the shared pages.
+    """
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        engine.dispose()
+
+    def _discard_inherited_pools():
+        for engine in engines:
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=_discard_inherited_pools)
+    gc.freeze()
@@ -0,0 +1,450 @@
+"""
+Synthetic data for load testing.
+
+seed_synthetic fills the database with production-like volumes (``flask seed
+synthetic``): students and teachers who can log in, published courses with
+sections, lessons, videos and a quiz, skewed enrollments (a few courses hold
+most of them), video progress and notification inboxes.
+
+Rows are generated in Python and written with executemany INSERTs in batches,
+one commit per batch, bypassing the ORM unit of work. Every run uses a fresh
+tag in usernames, emails and slugs, so runs add to the data instead of
+colliding with earlier ones. Passing a seed makes the generated data
+reproducible (apart from that tag).
+"""
+
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from app import db
+from app.exceptions import ValidationError
+from app.models.auth.role import Role
+from app.models.auth.user import User
+from app.models.auth.user_account_status import UserAccountStatus
+from app.models.auth.user_role import UserRole
+from app.models.courses.course import Course
+from app.models.courses.course_category import CourseCategory
+from app.models.courses.course_enrollment import CourseEnrollment
+from app.models.courses.course_lesson import CourseLesson
+from app.models.courses.course_section import CourseSection
+from app.models.courses.course_stats import CourseStats
+from app.models.courses.lesson_content import LessonContent
+from app.models.courses.lesson_content_progress import LessonContentProgress
+from app.models.notifications.notification import Notification
+from app.models.quizzes.question import Question
+from app.models.quizzes.question_option import QuestionOption
+from app.models.quizzes.quiz import Quiz
+from app.utils.auth import PasswordManager
+
+# Every synthetic user logs in with this password
+SYNTHETIC_PASSWORD = "Synthetic@123"
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.example.com"
+
+# One teacher per this many courses
+COURSES_PER_TEACHER = 20
+CATEGORIES = 10
+OPTIONS_PER_QUESTION = 4
+
+# (status, share of enrollments, progress range)
+ENROLLMENT_STATUSES = (
+    ("enrolled", 0.50, (0, 0)),
+    ("in_progress", 0.35, (1, 99)),
+    ("completed", 0.10, (100, 100)),
+    ("dropped", 0.05, (0, 60)),
+)
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_count(value) -> int:
+    """
+    Parse a row count such as ``2000``, ``100k`` or ``1.5M``.
+
+    Raises:
+        ValueError: If the value is not a non-negative count
+    """
+    text = str(value).strip().lower().replace("_", "")
+    multiplier = _SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    count = int(float(text) * multiplier)
+    if count < 0:
+        raise ValueError(f"Count must not be negative: {value}")
+    return count
+
+
+def seed_synthetic(
+    users: int,
+    courses: int,
+    enrollments: int,
+    sections_per_course: int = 3,
+    lessons_per_section: int = 3,
+    questions_per_quiz: int = 5,
+    progress_per_enrollment: int = 2,
+    notifications_per_user: int = 5,
+    batch_size: int = 5000,
+    seed: int = None,
+    progress_callback=None,
+) -> dict:
+    """
+    Generate and insert a synthetic dataset.
+
+    Args:
+        users: Users to create, teachers included
+        courses: Published courses to create
+        enrollments: Student enrollments (capped at students x courses)
+        sections_per_course: Sections per course
+        lessons_per_section: Lessons per section, one video each
+        questions_per_quiz: Multiple-choice questions in each course's quiz
+        progress_per_enrollment: Videos with watch progress per enrollment
+        notifications_per_user: Inbox notifications per student
+        batch_size: Rows per INSERT batch and commit
+        seed: Random seed for reproducible data
+        progress_callback: Called with (table name, rows inserted) per table
+
+    Returns:
+        dict: Rows inserted per table, and the tag used in names
+
+    Raises:
+        ValidationError: If the counts are inconsistent or the roles are missing
+    """
+    teachers = max(1, -(-courses // COURSES_PER_TEACHER)) if courses else 0
+    if users <= teachers:
+        raise ValidationError(f"{courses} courses need more than {teachers} users")
+
+    roles = {role.role_name: role.role_id for role in Role.query.all()}
+    if "student" not in roles or "teacher" not in roles:
+        raise ValidationError("Roles are not seeded yet; start the app or run `flask db init`")
+
+    rng = random.Random(seed)
+    generator = _Generator(rng, uuid.uuid4().hex[:8], batch_size, progress_callback)
+    now = datetime.utcnow()
+
+    user_ids = generator.users(users, teachers, roles, now)
+    teacher_ids, student_ids = user_ids[:teachers], user_ids[teachers:]
+
+    course_ids = [generator.new_id() for _ in range(courses)]
+    pairs = _enrollment_pairs(rng, len(student_ids), courses, enrollments)
+    statuses = [_pick_status(rng) for _ in pairs]
+    generator.courses(course_ids, teacher_ids, pairs, statuses, now)
+    videos = generator.outlines(course_ids, sections_per_course, lessons_per_section, now)
+    generator.quizzes(course_ids, questions_per_quiz, now)
+    generator.enrollments(pairs, statuses, student_ids, course_ids, now)
+    generator.progress(pairs, statuses, student_ids, course_ids, videos,
+                       progress_per_enrollment, now)
+    generator.notifications(student_ids, notifications_per_user, now)
+
+    return dict(generator.counts, tag=generator.tag)
+
+
+def _enrollment_pairs(rng, students: int, courses: int, enrollments: int) -> list:
+    """
+    Distinct (student index, course index) pairs; course popularity is skewed
+    so that a few courses hold most of the enrollments.
+    """
+    enrollments = min(enrollments, students * courses)
+    seen = set()
+    pairs = []
+    while len(pairs) < enrollments:
+        student = rng.randrange(students)
+        course = int(courses * rng.random() ** 2)
+        key = student * courses + course
+        if key in seen:
+            continue
+        seen.add(key)
+        pairs.append((student, course))
+    return pairs
+
+
+def _pick_status(rng) -> tuple:
+    roll = rng.random()
+    for status, share, progress_range in ENROLLMENT_STATUSES:
+        if roll < share:
+            return status, rng.randint(*progress_range)
+        roll -= share
+    status, _, progress_range = ENROLLMENT_STATUSES[-1]
+    return status, rng.randint(*progress_range)
+
+
+class _Generator:
+    """Row generators for each table, sharing the random state and batching."""
+
+    def __init__(self, rng, tag: str, batch_size: int, progress_callback=None):
+        self.rng = rng
+        self.tag = tag
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.counts = Counter()
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def past(self, now: datetime, days: int = 365) -> datetime:
+        return now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def insert(self, model, rows):
+        """executemany INSERT of rows (any iterable of dicts) in batches."""
+        table = model.__table__
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(table, batch)
+                batch = []
+        if batch:
+            self._flush(table, batch)
+
+    def _flush(self, table, batch):
+        db.session.execute(table.insert(), batch)
+        db.session.commit()
+        self.counts[table.name] += len(batch)
+        if self.progress_callback:
+            self.progress_callback(table.name, self.counts[table.name])
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Tables
+    # ──────────────────────────────────────────────────────────────────────
+
+    def users(self, count: int, teachers: int, roles: dict, now: datetime) -> list:
+        # One hash for everyone: hashing is deliberately slow
+        password_hash = PasswordManager.hash_password(SYNTHETIC_PASSWORD)
+        user_ids = [self.new_id() for _ in range(count)]
+        created = [self.past(now) for _ in range(count)]
+
+        self.insert(
+            User,
+            (
+                {
+                    "user_id": user_id,
+                    "username": f"syn_{self.tag}_{i}",
+                    "email": f"syn_{self.tag}_{i}@{SYNTHETIC_EMAIL_DOMAIN}",
+                    "password_hash": password_hash,
+                    "first_name": "Synthetic",
+                    "last_name": f"User {i}",
+                    "email_verified": True,
+                    "created_at": created[i],
+                    "updated_at": created[i],
+                }
+                for i, user_id in enumerate(user_ids)
+            ),
+        )
+        self.insert(
+            UserAccountStatus,
+            ({"user_id": user_id, "is_active": True, "updated_at": now} for user_id in user_ids),
+        )
+        self.insert(
+            UserRole,
+            (
+                {
+                    "user_role_id": self.new_id(),
+                    "user_id": user_id,
+                    "role_id": roles["teacher" if i < teachers else "student"],
+                    "assigned_at": created[i],
+                }
+                for i, user_id in enumerate(user_ids)
+            ),
+        )
+        return user_ids
+
+    def courses(self, course_ids, teacher_ids, pairs, statuses, now):
+        category_ids = [self.new_id() for _ in range(CATEGORIES)]
+        self.insert(
+            CourseCategory,
+            (
+                {
+                    "category_id": category_id,
+                    "name": f"Synthetic {self.tag} category {i}",
+                    "slug": f"syn-{self.tag}-category-{i}",
+                }
+                for i, category_id in enumerate(category_ids)
+            ),
+        )
+
+        per_course = [Counter() for _ in course_ids]
+        progress_sums = [0] * len(course_ids)
+        for (_, course), (status, progress) in zip(pairs, statuses):
+            per_course[course][status] += 1
+            progress_sums[course] += progress
+
+        self.insert(
+            Course,
+            (
+                {
+                    "course_id": course_id,
+                    "title": f"Synthetic course {i}",
+                    "slug": f"syn-{self.tag}-course-{i}",
+                    "description": f"Synthetic course {i} for load testing ({self.tag})",
+                    "instructor_id": teacher_ids[i % len(teacher_ids)],
+                    "category_id": category_ids[i % CATEGORIES],
+                    "status": "published",
+                    "visibility": "public",
+                    "total_enrollments": sum(per_course[i].values()),
+                    "created_at": self.past(now),
+                    "updated_at": now,
+                }
+                for i, course_id in enumerate(course_ids)
+            ),
+        )
+        self.insert(
+            CourseStats,
+            (
+                {
+                    "course_id": course_id,
+                    "enrolled_count": per_course[i]["enrolled"],
+                    "in_progress_count": per_course[i]["in_progress"],
+                    "completed_count": per_course[i]["completed"],
+                    "dropped_count": per_course[i]["dropped"],
+                    "progress_sum": progress_sums[i],
+                    "updated_at": now,
+                }
+                for i, course_id in enumerate(course_ids)
+            ),
+        )
+
+    def outlines(self, course_ids, sections_per_course, lessons_per_section, now) -> list:
+        """Sections, lessons and one video per lesson; returns each course's videos."""
+        sections, lessons, contents = [], [], []
+        videos = []
+        for course_id in course_ids:
+            course_videos = []
+            for s in range(sections_per_course):
+                section_id = self.new_id()
+                sections.append(
+                    {
+                        "section_id": section_id,
+                        "course_id": course_id,
+                        "title": f"Section {s + 1}",
+                        "section_order": s + 1,
+                    }
+                )
+                for lesson in range(lessons_per_section):
+                    lesson_id, content_id = self.new_id(), self.new_id()
+                    lessons.append(
+                        {
+                            "lesson_id": lesson_id,
+                            "section_id": section_id,
+                            "course_id": course_id,
+                            "title": f"Lesson {s + 1}.{lesson + 1}",
+                            "lesson_order": lesson + 1,
+                            "duration_minutes": 15,
+                        }
+                    )
+                    contents.append(
+                        {
+                            "content_id": content_id,
+                            "lesson_id": lesson_id,
+                            "course_id": course_id,
+                            "content_type": "video",
+                            "content_order": 1,
+                            "title": f"Video {s + 1}.{lesson + 1}",
+                            "video_url": f"https://videos.example.com/{content_id}.mp4",
+                            "video_duration_minutes": 15,
+                        }
+                    )
+                    course_videos.append((lesson_id, content_id))
+            videos.append(course_videos)
+
+        self.insert(CourseSection, sections)
+        self.insert(CourseLesson, lessons)
+        self.insert(LessonContent, contents)
+        return videos
+
+    def quizzes(self, course_ids, questions_per_quiz, now):
+        quizzes, questions, options = [], [], []
+        for i, course_id in enumerate(course_ids):
+            quiz_id = self.new_id()
+            quizzes.append(
+                {
+                    "quiz_id": quiz_id,
+                    "course_id": course_id,
+                    "title": f"Synthetic quiz {i}",
+                    "passing_score": 60,
+                    # Unlimited attempts, so load tests can take it repeatedly
+                    "max_attempts": 0,
+                }
+            )
+            for q in range(questions_per_quiz):
+                question_id = self.new_id()
+                questions.append(
+                    {
+                        "question_id": question_id,
+                        "quiz_id": quiz_id,
+                        "question_type": "multiple_choice",
+                        "question_text": f"Question {q + 1}?",
+                        "question_order": q + 1,
+                    }
+                )
+                correct = self.rng.randrange(OPTIONS_PER_QUESTION)
+                for o in range(OPTIONS_PER_QUESTION):
+                    options.append(
+                        {
+                            "option_id": self.new_id(),
+                            "question_id": question_id,
+                            "option_text": f"Option {o + 1}",
+                            "is_correct": o == correct,
+                            "option_order": o + 1,
+                        }
+                    )
+
+        self.insert(Quiz, quizzes)
+        self.insert(Question, questions)
+        self.insert(QuestionOption, options)
+
+    def enrollments(self, pairs, statuses, student_ids, course_ids, now):
+        def rows():
+            for (student, course), (status, progress) in zip(pairs, statuses):
+                enrolled_at = self.past(now)
+                yield {
+                    "enrollment_id": self.new_id(),
+                    "course_id": course_ids[course],
+                    "user_id": student_ids[student],
+                    "status": status,
+                    "progress": progress,
+                    "enrolled_at": enrolled_at,
+                    "completed_at": enrolled_at if status == "completed" else None,
+                    "last_accessed": enrolled_at,
+                }
+
+        self.insert(CourseEnrollment, rows())
+
+    def progress(self, pairs, statuses, student_ids, course_ids, videos, per_enrollment, now):
+        def rows():
+            for (student, course), (status, _) in zip(pairs, statuses):
+                if status == "enrolled":
+                    continue
+                for lesson_id, content_id in videos[course][:per_enrollment]:
+                    watched = self.rng.randint(5, 100)
+                    accessed = self.past(now, days=90)
+                    yield {
+                        "progress_id": self.new_id(),
+                        "content_id": content_id,
+                        "lesson_id": lesson_id,
+                        "user_id": student_ids[student],
+                        "course_id": course_ids[course],
+                        "is_completed": watched >= 90,
+                        "completed_at": accessed if watched >= 90 else None,
+                        "first_accessed": accessed,
+                        "last_accessed": accessed,
+                        "video_watched_percentage": watched,
+                        "video_watch_count": 1,
+                    }
+
+        self.insert(LessonContentProgress, rows())
+
+    def notifications(self, student_ids, per_user, now):
+        def rows():
+            for user_id in student_ids:
+                for n in range(per_user):
+                    yield {
+                        "notification_id": self.new_id(),
+                        "user_id": user_id,
+                        "type": "course_update",
+                        "title": f"Course update {n + 1}",
+                        "message": "A course you are enrolled in has new content.",
+                        "is_read": self.rng.random() < 0.6,
+                        "created_at": self.past(now, days=60),
+                    }
+
+        self.insert(Notification, rows())
@@ -29,12 +29,26 @@ print('[entrypoint] One-time init & seed complete.')
 #    but SKIP_AUTO_INIT=true means they skip init/seed entirely.
 # ---------------------------------------------------------------------------
 export SKIP_AUTO_INIT=true
+# Worker count also sizes each worker's DB connection pool (app/config.py)
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-4}"
+# Per-worker metric value files (/metrics); start every deployment from zero
+export METRICS_DIR="${METRICS_DIR:-/tmp/lms_metrics}"
+rm -rf "$METRICS_DIR" && mkdir -p "$METRICS_DIR"
+
+# Build the app once in the master and fork the workers from it (fork-safe:
+# see app/utils/startup.py); PRELOAD_APP=false loads it in every worker
+export PRELOAD_APP="${PRELOAD_APP:-true}"
+PRELOAD_FLAG=()
+if [ "$PRELOAD_APP" = "true" ]; then
+    PRELOAD_FLAG=(--preload)
+fi
 
 echo "[entrypoint] Starting gunicorn..."
 exec gunicorn \
     --bind 0.0.0.0:5000 \
-    --workers 4 \
+    --workers "$WEB_CONCURRENCY" \
     --worker-class gevent \
+    "${PRELOAD_FLAG[@]}" \
     --timeout 120 \
     --access-logfile - \
     --error-logfile - \
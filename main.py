@@ -4,10 +4,19 @@ Main entry point for the Flask LMS Backend Application
 
 import os
 
+# gunicorn --preload imports this module in the master, before the gevent
+# workers would patch the standard library; patch it first so the modules the
+# workers inherit use the cooperative versions
+if os.environ.get("PRELOAD_APP", "false").lower() == "true":
+    from gevent import monkey
+
+    monkey.patch_all()
+
 from dotenv import load_dotenv
 
 from app import create_app
 from app.commands import register_db_commands
+from app.utils.startup import prepare_preload
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,6 +27,10 @@ app = create_app(config_name=os.environ.get("FLASK_ENV", "development"))
 # Register CLI commands
 register_db_commands(app)
 
+# Shared copy-on-write by the workers gunicorn forks from this process
+if app.config.get("PRELOAD_APP"):
+    prepare_preload(app)
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     debug = os.environ.get("DEBUG", True)
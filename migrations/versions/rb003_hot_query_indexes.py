@@ -0,0 +1,101 @@
+"""Composite Indexes for Hot Query Shapes
+
+Revision ID: rb003_hot_query_indexes
+Revises: rb002_superadmin
+Create Date: 2026-10-19
+
+Adds the composite indexes found missing by the index advisor
+(``flask index-advisor``):
+- lesson_content_progress (course_id, user_id, is_completed): course progress
+- lesson_content_progress (lesson_id, zoom_attended): live session attendance
+- course_activity_log (course_id, user_id, timestamp): a student's activity feed
+- course_enrollments (course_id, status): enrollment list filtered by status
+- quiz_attempts (quiz_id, user_id, status): attempt limits, in-progress lookup
+- attempt_answers (attempt_id, question_id): saving an answer
+
+Indexes that already exist are skipped: application start-up creates
+model-declared indexes on existing tables before it runs the migrations.
+On MySQL (InnoDB) ADD INDEX is an online operation; reads and writes to the
+table continue while the index builds.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# ---------------------------------------------------------------------------
+# Alembic revision metadata
+# ---------------------------------------------------------------------------
+revision = "rb003_hot_query_indexes"
+down_revision = "rb002_superadmin"
+branch_labels = None
+depends_on = None
+
+# ---------------------------------------------------------------------------
+# Index definitions: (name, table, columns)
+# ---------------------------------------------------------------------------
+INDEXES = [
+    (
+        "ix_lesson_content_progress_course_user_completed",
+        "lesson_content_progress",
+        ["course_id", "user_id", "is_completed"],
+    ),
+    (
+        "ix_lesson_content_progress_lesson_attended",
+        "lesson_content_progress",
+        ["lesson_id", "zoom_attended"],
+    ),
+    (
+        "ix_course_activity_log_course_user_timestamp",
+        "course_activity_log",
+        ["course_id", "user_id", "timestamp"],
+    ),
+    ("ix_course_enrollments_course_status", "course_enrollments", ["course_id", "status"]),
+    ("ix_quiz_attempts_quiz_user_status", "quiz_attempts", ["quiz_id", "user_id", "status"]),
+    ("ix_attempt_answers_attempt_question", "attempt_answers", ["attempt_id", "question_id"]),
+]
+
+
+def _existing_indexes(table_name):
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table_name):
+        return None
+    return {index["name"]: index["column_names"] for index in inspector.get_indexes(table_name)}
+
+
+def _backs_foreign_key(table_name, name, existing):
+    """
+    Whether the index is the only one MySQL can use for a foreign key.
+
+    InnoDB drops the index it created implicitly for a foreign key once
+    another index starts with the key's column, and refuses to drop that
+    other index afterwards.
+    """
+    if op.get_bind().dialect.name != "mysql":
+        return False
+    first_column = existing[name][0]
+    foreign_keys = sa.inspect(op.get_bind()).get_foreign_keys(table_name)
+    if not any(fk["constrained_columns"][0] == first_column for fk in foreign_keys):
+        return False
+    return not any(
+        columns[0] == first_column for other, columns in existing.items() if other != name
+    )
+
+
+def upgrade():
+    """Upgrade: Create the composite indexes that do not exist yet"""
+    for name, table_name, columns in INDEXES:
+        existing = _existing_indexes(table_name)
+        if existing is None or name in existing:
+            continue
+        op.create_index(name, table_name, columns)
+
+
+def downgrade():
+    """Downgrade: Drop the composite indexes"""
+    for name, table_name, _ in reversed(INDEXES):
+        existing = _existing_indexes(table_name)
+        if not existing or name not in existing:
+            continue
+        if _backs_foreign_key(table_name, name, existing):
+            continue
+        op.drop_index(name, table_name=table_name)
@@ -0,0 +1,114 @@
+"""Backfill Deadlines of Running Timed Quiz Attempts
+
+Revision ID: rb004_attempt_deadlines
+Revises: rb003_hot_query_indexes
+Create Date: 2026-10-19
+
+The expiry sweeper (``flask quiz expire-attempts``) only sees attempts with a
+row in quiz_attempt_deadlines, and those rows are written when an attempt
+starts. Timed attempts already in progress when the sweeper was deployed have
+no row and would never be auto-submitted, so this revision adds one for each:
+deadline_at = started_at + the quiz's duration_minutes. Attempts whose
+deadline has already passed are expired by the next sweep.
+
+Attempts that already have a row are left alone, so the revision can run on a
+database where the sweeper is live.
+"""
+
+from datetime import timedelta
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.sql import column, table
+
+# ---------------------------------------------------------------------------
+# Alembic revision metadata
+# ---------------------------------------------------------------------------
+revision = "rb004_attempt_deadlines"
+down_revision = "rb003_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# ---------------------------------------------------------------------------
+# Table definitions (only the columns this revision touches)
+# ---------------------------------------------------------------------------
+quizzes = table(
+    "quizzes",
+    column("quiz_id", sa.String),
+    column("duration_minutes", sa.Integer),
+)
+quiz_attempts = table(
+    "quiz_attempts",
+    column("attempt_id", sa.String),
+    column("quiz_id", sa.String),
+    column("user_id", sa.String),
+    column("started_at", sa.DateTime),
+    column("status", sa.String),
+)
+quiz_attempt_deadlines = table(
+    "quiz_attempt_deadlines",
+    column("attempt_id", sa.String),
+    column("quiz_id", sa.String),
+    column("user_id", sa.String),
+    column("deadline_at", sa.DateTime),
+    column("created_at", sa.DateTime),
+)
+
+
+def upgrade():
+    """Upgrade: Insert a deadline row for every running timed attempt without one"""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("quiz_attempt_deadlines"):
+        return
+
+    missing = (
+        sa.select(
+            quiz_attempts.c.attempt_id,
+            quiz_attempts.c.quiz_id,
+            quiz_attempts.c.user_id,
+            quiz_attempts.c.started_at,
+            quizzes.c.duration_minutes,
+        )
+        .join(quizzes, quizzes.c.quiz_id == quiz_attempts.c.quiz_id)
+        .outerjoin(
+            quiz_attempt_deadlines,
+            quiz_attempt_deadlines.c.attempt_id == quiz_attempts.c.attempt_id,
+        )
+        .where(
+            quiz_attempts.c.status == "in_progress",
+            quizzes.c.duration_minutes > 0,
+            quiz_attempt_deadlines.c.attempt_id.is_(None),
+        )
+        .order_by(quiz_attempts.c.attempt_id)
+        .limit(BATCH_SIZE)
+    )
+
+    # Each batch's rows drop out of the anti-join, so re-running the query
+    # pages through the attempts without an offset
+    while True:
+        rows = bind.execute(missing).all()
+        if not rows:
+            break
+        op.bulk_insert(
+            quiz_attempt_deadlines,
+            [
+                {
+                    "attempt_id": row.attempt_id,
+                    "quiz_id": row.quiz_id,
+                    "user_id": row.user_id,
+                    "deadline_at": row.started_at + timedelta(minutes=row.duration_minutes),
+                    "created_at": row.started_at,
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade():
+    """Downgrade: Nothing to undo
+
+    Backfilled rows cannot be told apart from rows written at attempt start,
+    and removing either would stop the sweeper from expiring those attempts.
+    """
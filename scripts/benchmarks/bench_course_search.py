@@ -0,0 +1,142 @@
+"""
+Course search benchmark.
+
+Seeds N synthetic courses into an in-memory SQLite database and compares the
+legacy ILIKE '%q%' catalogue search with the full-text (FTS5) search used by
+CourseService.search_courses.
+
+Usage:
+    python scripts/benchmarks/bench_course_search.py [--courses 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import or_  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models.auth import User  # noqa: E402
+from app.models.courses import Course  # noqa: E402
+from app.services.courses import CourseService  # noqa: E402
+
+WORDS = (
+    "python java physics chemistry biology algebra calculus geometry statistics history "
+    "literature economics accounting marketing design drawing music guitar piano english "
+    "sinhala tamil programming networks databases security cloud robotics electronics "
+    "mechanics astronomy geography philosophy psychology sociology grammar writing speaking "
+    "revision paper theory practical advanced beginner intermediate complete masterclass"
+).split()
+
+# Long tail of filler words so description terms have realistic selectivity
+FILLER = [
+    "".join(random.Random(i).choices("abcdefghijklmnopqrstuvwxyz", k=7)) for i in range(5000)
+]
+
+QUERIES = ["python", "advanced calculus", "prog", "chemistry paper revision", "zzzz"]
+
+
+def _seed(n_courses: int, instructor_id: str) -> None:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    batch = []
+    for i in range(n_courses):
+        title = " ".join(rng.sample(WORDS, 4)).title()
+        batch.append({
+            "course_id": str(uuid.uuid4()),
+            "title": title,
+            "slug": f"course-{i}",
+            "description": " ".join(rng.choices(WORDS, k=4) + rng.choices(FILLER, k=36)),
+            "instructor_id": instructor_id,
+            "language": "en",
+            "is_paid": False,
+            "status": "published" if i % 10 else "draft",
+            "visibility": "public",
+            "course_type": "monthly",
+            "total_reviews": 0,
+            "total_enrollments": 0,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        })
+        if len(batch) == 5000:
+            db.session.execute(Course.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Course.__table__.insert(), batch)
+    db.session.commit()
+
+
+def _legacy_search(query: str, limit: int = 20) -> int:
+    like = f"%{query}%"
+    q = Course.query.filter(
+        Course.status == "published",
+        Course.visibility == "public",
+        or_(Course.title.ilike(like), Course.description.ilike(like)),
+    )
+    total = q.count()
+    q.order_by(Course.created_at.desc()).limit(limit).all()
+    return total
+
+
+def _fts_search(query: str, limit: int = 20) -> int:
+    return CourseService.search_courses(query=query, limit=limit)["total"]
+
+
+def _time(fn, query: str, repeat: int) -> tuple:
+    samples = []
+    total = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--courses", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        teacher = User(
+            user_id=str(uuid.uuid4()),
+            email="bench-teacher@example.com",
+            username="bench_teacher",
+            password_hash="x",
+            first_name="Bench",
+            last_name="Teacher",
+        )
+        db.session.add(teacher)
+        db.session.commit()
+
+        start = time.perf_counter()
+        _seed(args.courses, teacher.user_id)
+        print(f"Seeded {args.courses:,} courses in {time.perf_counter() - start:.1f}s\n")
+
+        print(
+            f"{'query':<28}{'ilike ms':>10}{'fts ms':>10}{'speedup':>9}"
+            f"{'ilike n':>9}{'fts n':>8}"
+        )
+        for query in QUERIES:
+            legacy_ms, legacy_total = _time(_legacy_search, query, args.repeat)
+            fts_ms, fts_total = _time(_fts_search, query, args.repeat)
+            print(
+                f"{query:<28}{legacy_ms:>10.1f}{fts_ms:>10.1f}"
+                f"{legacy_ms / fts_ms if fts_ms else 0:>8.1f}x{legacy_total:>9}{fts_total:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
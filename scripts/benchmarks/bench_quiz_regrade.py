@@ -0,0 +1,253 @@
+"""
+Quiz batch grading benchmark.
+
+Seeds one quiz with Q questions and N submitted attempts into an in-memory
+SQLite database, then compares:
+
+  * legacy   - per-question grading that loads each question's options from the
+               database (the pre-snapshot submit path), timed on a sample of
+               attempts and extrapolated;
+  * loop     - per-question grading against the compiled snapshot
+               (QuizAnswerService._auto_grade for every answer);
+  * vector   - BatchAnswerKey.encode + BatchGradingService.grade on the matrix;
+  * regrade  - `flask quiz regrade` end to end (read, grade, bulk update), once
+               over ungraded answers and again after an answer-key fix.
+
+The loop and vector results are checked for equality.
+
+Usage:
+    python scripts/benchmarks/bench_quiz_regrade.py [--attempts 10000] [--questions 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import numpy as np  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models.auth import User  # noqa: E402
+from app.models.courses import Course  # noqa: E402
+from app.models.quizzes import (  # noqa: E402
+    AttemptAnswer,
+    Question,
+    QuestionOption,
+    Quiz,
+    QuizAttempt,
+)
+from app.services.quizzes import BatchGradingService, QuizSnapshotService  # noqa: E402
+from app.services.quizzes.quiz_answer_service import (  # noqa: E402
+    AUTO_GRADED_TYPES,
+    QuizAnswerService,
+)
+from app.services.quizzes.quiz_batch_grading_service import BatchAnswerKey  # noqa: E402
+from app.services.quizzes.quiz_snapshot_service import normalize_text_answer  # noqa: E402
+
+TYPE_MIX = ["multiple_choice"] * 6 + ["multiple_answer"] * 2 + ["fill_blank", "essay"]
+WORDS = ["colombo", "kandy", "galle", "jaffna", "matara"]
+
+
+def _uid() -> str:
+    return str(uuid.uuid4())
+
+
+def _seed(n_attempts: int, n_questions: int) -> Quiz:
+    rng = random.Random(7)
+    now = datetime.utcnow()
+
+    teacher = User(
+        user_id=_uid(), email="bench@example.com", username="bench",
+        password_hash="x", first_name="Bench", last_name="Teacher",
+    )
+    course = Course(
+        course_id=_uid(), title="Bench", slug="bench", instructor_id=teacher.user_id,
+        status="published",
+    )
+    quiz = Quiz(quiz_id=_uid(), course_id=course.course_id, title="Bench quiz", max_attempts=100)
+    db.session.add_all([teacher, course, quiz])
+    db.session.flush()
+
+    questions, options = [], []
+    for i in range(n_questions):
+        q_type = TYPE_MIX[i % len(TYPE_MIX)]
+        question = {
+            "question_id": _uid(), "quiz_id": quiz.quiz_id, "question_type": q_type,
+            "question_text": f"Q{i}", "points": rng.randint(1, 3), "difficulty": "medium",
+            "question_order": i, "created_at": now, "updated_at": now,
+        }
+        questions.append(question)
+        texts = WORDS if q_type == "fill_blank" else [f"opt{j}" for j in range(4)]
+        correct = {0} if q_type in ("multiple_choice", "fill_blank") else {0, 2}
+        question["_options"] = []
+        for j, text in enumerate(texts if q_type != "essay" else []):
+            opt = {
+                "option_id": _uid(), "question_id": question["question_id"],
+                "option_text": text.title(), "is_correct": j in correct,
+                "option_order": j, "created_at": now,
+            }
+            options.append(opt)
+            question["_options"].append(opt)
+
+    db.session.execute(
+        Question.__table__.insert(),
+        [{k: v for k, v in q.items() if not k.startswith("_")} for q in questions],
+    )
+    db.session.execute(QuestionOption.__table__.insert(), options)
+
+    attempts, answers = [], []
+    for _ in range(n_attempts):
+        attempt_id = _uid()
+        attempts.append({
+            "attempt_id": attempt_id, "quiz_id": quiz.quiz_id, "user_id": teacher.user_id,
+            "started_at": now, "submitted_at": now, "status": "graded",
+        })
+        for q in questions:
+            opts = q["_options"]
+            if q["question_type"] == "multiple_choice":
+                answer = rng.choice(opts)["option_id"]
+            elif q["question_type"] == "multiple_answer":
+                answer = ",".join(o["option_id"] for o in rng.sample(opts, 2))
+            elif q["question_type"] == "fill_blank":
+                answer = f"  {rng.choice(WORDS).upper()} "
+            else:
+                answer = "free text"
+            answers.append({
+                "answer_id": _uid(), "attempt_id": attempt_id,
+                "question_id": q["question_id"], "user_answer": answer, "answered_at": now,
+            })
+        if len(answers) >= 50_000:
+            db.session.execute(AttemptAnswer.__table__.insert(), answers)
+            answers = []
+    db.session.execute(QuizAttempt.__table__.insert(), attempts)
+    if answers:
+        db.session.execute(AttemptAnswer.__table__.insert(), answers)
+    db.session.commit()
+    return quiz
+
+
+def _legacy_auto_grade(question: Question, user_answer: str) -> int:
+    """Pre-snapshot grading: one options query per question."""
+    correct = QuestionOption.query.filter_by(
+        question_id=question.question_id, is_correct=True
+    ).all()
+    if not user_answer:
+        return 0
+    if question.question_type == "multiple_choice":
+        ok = user_answer.strip() in {o.option_id for o in correct}
+    elif question.question_type == "multiple_answer":
+        ok = {a.strip() for a in user_answer.split(",") if a.strip()} == {
+            o.option_id for o in correct
+        }
+    else:
+        ok = normalize_text_answer(user_answer) in {
+            normalize_text_answer(o.option_text) for o in correct
+        }
+    return question.points if ok else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=10_000)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--legacy-sample", type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        start = time.perf_counter()
+        quiz = _seed(args.attempts, args.questions)
+        print(
+            f"Seeded {args.attempts:,} attempts x {args.questions} questions "
+            f"in {time.perf_counter() - start:.1f}s\n"
+        )
+
+        rows = db.session.query(
+            AttemptAnswer.attempt_id, AttemptAnswer.question_id, AttemptAnswer.user_answer
+        ).all()
+        snapshot = QuizSnapshotService.get_snapshot(quiz)
+
+        # legacy: options query per question, on a sample of attempts
+        questions = {q.question_id: q for q in Question.query.filter_by(quiz_id=quiz.quiz_id)}
+        sample = rows[: args.legacy_sample * args.questions]
+        start = time.perf_counter()
+        for _, question_id, user_answer in sample:
+            question = questions[question_id]
+            if question.question_type in AUTO_GRADED_TYPES:
+                _legacy_auto_grade(question, user_answer)
+        legacy_s = (time.perf_counter() - start) * args.attempts / args.legacy_sample
+
+        # loop: per-answer grading against the snapshot
+        start = time.perf_counter()
+        loop_scores = {}
+        for attempt_id, question_id, user_answer in rows:
+            q = snapshot.get_question(question_id)
+            if q.question_type in AUTO_GRADED_TYPES:
+                _, points, _ = QuizAnswerService._auto_grade(q, user_answer)
+                loop_scores[attempt_id] = loop_scores.get(attempt_id, 0) + points
+        loop_s = time.perf_counter() - start
+
+        # vector: encode the matrix and grade it in one go
+        start = time.perf_counter()
+        key = BatchAnswerKey.compile(snapshot)
+        column_of = key.column_of
+        row_of = {}
+        matrix = np.full((args.attempts, args.questions), -1, dtype=np.int64)
+        for attempt_id, question_id, user_answer in rows:
+            row = row_of.setdefault(attempt_id, len(row_of))
+            col = column_of[question_id]
+            matrix[row, col] = key.encode(col, user_answer)
+        encode_s = time.perf_counter() - start
+        start = time.perf_counter()
+        result = BatchGradingService.grade(key, matrix)
+        grade_s = time.perf_counter() - start
+
+        mismatches = sum(
+            1 for attempt_id, row in row_of.items()
+            if int(result.totals[row]) != loop_scores.get(attempt_id, 0)
+        )
+
+        # regrade: grade everything once, fix the key of every multiple_choice
+        # question, then regrade (only the affected answers are rewritten)
+        start = time.perf_counter()
+        BatchGradingService.regrade_quiz(quiz.quiz_id)
+        initial_s = time.perf_counter() - start
+        for q in Question.query.filter_by(quiz_id=quiz.quiz_id, question_type="multiple_choice"):
+            for opt in QuestionOption.query.filter_by(question_id=q.question_id):
+                opt.is_correct = opt.option_order == 1
+        QuizSnapshotService.bump_version(quiz)
+        db.session.commit()
+        QuizSnapshotService.invalidate(quiz.quiz_id)
+        start = time.perf_counter()
+        summary = BatchGradingService.regrade_quiz(quiz.quiz_id)
+        regrade_s = time.perf_counter() - start
+
+        answers = args.attempts * args.questions
+        print(f"{'path':<34}{'seconds':>10}{'answers/s':>14}")
+        for label, seconds in (
+            (f"legacy (extrapolated from {args.legacy_sample})", legacy_s),
+            ("loop over snapshot", loop_s),
+            ("vector encode", encode_s),
+            ("vector grade", grade_s),
+            ("vector encode + grade", encode_s + grade_s),
+            ("initial grading pass (DB)", initial_s),
+            ("regrade after key fix (DB)", regrade_s),
+        ):
+            print(f"{label:<34}{seconds:>10.3f}{answers / seconds:>14,.0f}")
+        print(f"\nloop/vector total mismatches: {mismatches}")
+        print(
+            f"regrade: {summary['answers_changed']:,} answers and "
+            f"{summary['attempts_changed']:,} attempts rewritten"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Quiz statistics benchmark.
+
+Seeds one graded quiz with N attempts x Q questions (1M answers by default)
+into an in-memory SQLite database and compares latency and peak Python memory
+(tracemalloc) of the legacy ORM-loading implementation of the instructor
+statistics endpoints with the SQL-aggregated / streaming one in
+QuizAnalyticsService. Results of both implementations are checked for equality.
+
+Usage:
+    python scripts/benchmarks/bench_quiz_statistics.py [--attempts 20000] [--questions 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app import create_app, db  # noqa: E402
+from app.models.auth import User  # noqa: E402
+from app.models.courses import Course  # noqa: E402
+from app.models.quizzes import AttemptAnswer, Question, Quiz, QuizAttempt  # noqa: E402
+from app.services.quizzes import QuizAnalyticsService  # noqa: E402
+
+
+def _uid() -> str:
+    return str(uuid.uuid4())
+
+
+def _seed(n_attempts: int, n_questions: int) -> tuple:
+    rng = random.Random(11)
+    now = datetime.utcnow()
+
+    teacher = User(
+        user_id=_uid(), email="bench@example.com", username="bench",
+        password_hash="x", first_name="Bench", last_name="Teacher",
+    )
+    course = Course(
+        course_id=_uid(), title="Bench", slug="bench", instructor_id=teacher.user_id,
+        status="published",
+    )
+    quiz = Quiz(quiz_id=_uid(), course_id=course.course_id, title="Bench quiz", max_attempts=100)
+    db.session.add_all([teacher, course, quiz])
+    db.session.flush()
+
+    questions = [
+        {
+            "question_id": _uid(), "quiz_id": quiz.quiz_id, "question_type": "multiple_choice",
+            "question_text": f"Q{i}", "points": 1, "difficulty": "medium",
+            "question_order": i, "created_at": now, "updated_at": now,
+            # Per-question difficulty so results are not uniform
+            "_p": rng.uniform(0.3, 0.9),
+        }
+        for i in range(n_questions)
+    ]
+    db.session.execute(
+        Question.__table__.insert(),
+        [{k: v for k, v in q.items() if not k.startswith("_")} for q in questions],
+    )
+
+    attempts, answers = [], []
+    for _ in range(n_attempts):
+        attempt_id = _uid()
+        ability = rng.uniform(-0.25, 0.25)
+        score = 0
+        for q in questions:
+            is_correct = rng.random() < q["_p"] + ability
+            score += is_correct
+            answers.append({
+                "answer_id": _uid(), "attempt_id": attempt_id, "question_id": q["question_id"],
+                "user_answer": "x", "is_correct": is_correct, "points_earned": int(is_correct),
+                "time_taken_seconds": rng.randint(5, 120), "answered_at": now,
+            })
+        percentage = round(score / n_questions * 100, 2)
+        attempts.append({
+            "attempt_id": attempt_id, "quiz_id": quiz.quiz_id, "user_id": teacher.user_id,
+            "score": score, "total_points": n_questions, "percentage": percentage,
+            "passed": percentage >= 70, "started_at": now, "submitted_at": now,
+            "time_taken_minutes": rng.randint(5, 60), "status": "graded",
+        })
+        if len(answers) >= 100_000:
+            db.session.execute(AttemptAnswer.__table__.insert(), answers)
+            answers = []
+    db.session.execute(QuizAttempt.__table__.insert(), attempts)
+    if answers:
+        db.session.execute(AttemptAnswer.__table__.insert(), answers)
+    db.session.commit()
+    return teacher.user_id, quiz.quiz_id, questions[0]["question_id"]
+
+
+# ── Legacy implementations (ORM objects loaded into Python) ───────────────────
+
+
+def _legacy_quiz_statistics(quiz_id: str) -> dict:
+    attempts = QuizAttempt.query.filter(
+        QuizAttempt.quiz_id == quiz_id,
+        QuizAttempt.status.in_(["submitted", "graded"]),
+    ).all()
+    total_attempts = len(attempts)
+    question_stats = []
+    for q in Question.query.filter_by(quiz_id=quiz_id).order_by(Question.question_order).all():
+        q_answers = AttemptAnswer.query.filter_by(question_id=q.question_id).all()
+        answered = len(q_answers)
+        correct = sum(1 for a in q_answers if a.is_correct)
+        question_stats.append({
+            "question_id": q.question_id,
+            "question_text": q.question_text,
+            "total_answers": answered,
+            "correct_answers": correct,
+            "correct_percentage": round(correct / answered * 100, 2),
+            "average_time_seconds": round(
+                sum(a.time_taken_seconds or 0 for a in q_answers) / answered, 1
+            ),
+        })
+    return {
+        "quiz_id": quiz_id,
+        "total_attempts": total_attempts,
+        "average_score": round(
+            sum(float(a.percentage or 0) for a in attempts) / total_attempts, 2
+        ),
+        "pass_rate": round(sum(1 for a in attempts if a.passed) / total_attempts * 100, 2),
+        "average_time_minutes": round(
+            sum(a.time_taken_minutes or 0 for a in attempts) / total_attempts, 1
+        ),
+        "questions": question_stats,
+    }
+
+
+def _legacy_discrimination(question_id: str) -> float:
+    answers = AttemptAnswer.query.filter_by(question_id=question_id).all()
+    attempt_scores = {
+        a.attempt_id: float(a.percentage or 0)
+        for a in QuizAttempt.query.filter(
+            QuizAttempt.attempt_id.in_([a.attempt_id for a in answers])
+        ).all()
+    }
+    all_scores = sorted(attempt_scores.values())
+    n = len(all_scores)
+    upper_cut = all_scores[int(n * 0.67)]
+    lower_cut = all_scores[int(n * 0.33)]
+    upper = [a for a in answers if attempt_scores.get(a.attempt_id, 0) >= upper_cut]
+    lower = [a for a in answers if attempt_scores.get(a.attempt_id, 0) <= lower_cut]
+    p_upper = sum(1 for a in upper if a.is_correct) / len(upper)
+    p_lower = sum(1 for a in lower if a.is_correct) / len(lower)
+    return round(p_upper - p_lower, 2)
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+
+def _measure(fn):
+    db.session.expunge_all()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=20_000)
+    parser.add_argument("--questions", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+
+        start = time.perf_counter()
+        teacher_id, quiz_id, question_id = _seed(args.attempts, args.questions)
+        print(
+            f"Seeded {args.attempts * args.questions:,} answers "
+            f"({args.attempts:,} attempts x {args.questions} questions) "
+            f"in {time.perf_counter() - start:.1f}s\n"
+        )
+
+        cases = [
+            (
+                "quiz statistics",
+                lambda: _legacy_quiz_statistics(quiz_id),
+                lambda: QuizAnalyticsService.get_quiz_statistics(
+                    quiz_id, teacher_id, "admin"
+                ),
+                lambda result: result,
+            ),
+            (
+                "question discrimination",
+                lambda: _legacy_discrimination(question_id),
+                lambda: QuizAnalyticsService.get_question_analytics(
+                    question_id, teacher_id, "admin"
+                ),
+                lambda result: result["discrimination_index"],
+            ),
+        ]
+
+        print(
+            f"{'endpoint':<26}{'legacy s':>10}{'new s':>9}{'legacy MiB':>12}"
+            f"{'new MiB':>9}{'equal':>7}"
+        )
+        for label, legacy, new, pick in cases:
+            legacy_result, legacy_s, legacy_mib = _measure(legacy)
+            new_result, new_s, new_mib = _measure(new)
+            print(
+                f"{label:<26}{legacy_s:>10.2f}{new_s:>9.2f}{legacy_mib:>12.1f}"
+                f"{new_mib:>9.1f}{str(legacy_result == pick(new_result)):>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,15 @@
 Test configuration and fixtures
 """
 
+import uuid
+from contextlib import contextmanager
+
 import pytest
 
 from app import create_app, db
+from app.config import TestingConfig
+from app.middleware.query_profiler import count_queries
+from app.models import Course, Question, QuestionOption, Quiz, User
 
 
 @pytest.fixture
@@ -21,6 +27,36 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture
+def file_database(tmp_path, monkeypatch):
+    """
+    Point the testing configuration at an SQLite file under tmp_path.
+
+    Returns:
+        str: The database URI
+    """
+    uri = f"sqlite:///{tmp_path / 'lms.db'}"
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", uri)
+    return uri
+
+
+@pytest.fixture
+def file_app(file_database, tmp_path, monkeypatch):
+    """
+    Application backed by an SQLite file, so each thread gets its own
+    connection (the in-memory database shares one connection), with uploads
+    stored under tmp_path.
+    """
+    monkeypatch.setattr(TestingConfig, "UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    app = create_app("testing")
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
 @pytest.fixture
 def client(app):
     """
@@ -35,3 +71,120 @@ def runner(app):
     A test runner for the app's CLI commands.
     """
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert an upper bound on the SQL statements a block runs.
+
+    Usage:
+        with query_budget(5):
+            client.get("/api/v1/courses")
+    """
+
+    @contextmanager
+    def budget(max_queries):
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Query budget of {max_queries} exceeded\n{stats.report()}"
+        )
+
+    return budget
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Model factories (each commits and returns the new row's ID)
+# ──────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def make_user():
+    """
+    Create a user named after its username.
+
+    Usage:
+        student_id = make_user("student", last_name="Doe")
+    """
+
+    def factory(name, **fields):
+        fields.setdefault("first_name", name)
+        fields.setdefault("last_name", name)
+        user = User(
+            user_id=str(uuid.uuid4()), email=f"{name}@example.com", username=name,
+            password_hash="x", **fields,
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user.user_id
+
+    return factory
+
+
+@pytest.fixture
+def make_course():
+    """
+    Create a course taught by an existing user.
+
+    Usage:
+        course_id = make_course(teacher_id, title="Python", status="published")
+    """
+
+    def factory(instructor_id, title="Course", **fields):
+        fields.setdefault("slug", title.lower().replace(" ", "-"))
+        course = Course(
+            course_id=str(uuid.uuid4()), title=title, instructor_id=instructor_id, **fields
+        )
+        db.session.add(course)
+        db.session.commit()
+        return course.course_id
+
+    return factory
+
+
+@pytest.fixture
+def make_quiz():
+    """
+    Create a quiz in an existing course.
+
+    Usage:
+        quiz_id = make_quiz(course_id, max_attempts=2, duration_minutes=30)
+    """
+
+    def factory(course_id, title="Quiz", **fields):
+        quiz = Quiz(quiz_id=str(uuid.uuid4()), course_id=course_id, title=title, **fields)
+        db.session.add(quiz)
+        db.session.commit()
+        return quiz.quiz_id
+
+    return factory
+
+
+@pytest.fixture
+def make_question():
+    """
+    Create a question, with options given as {option text: is_correct}.
+
+    Usage:
+        question_id = make_question(quiz_id, "multiple_choice", {"3": False, "4": True})
+    """
+
+    def factory(quiz_id, question_type="multiple_choice", options=None, **fields):
+        fields.setdefault("question_text", question_type)
+        question = Question(
+            question_id=str(uuid.uuid4()), quiz_id=quiz_id, question_type=question_type,
+            **fields,
+        )
+        db.session.add(question)
+        db.session.add_all(
+            QuestionOption(
+                option_id=str(uuid.uuid4()), question_id=question.question_id,
+                option_text=text, is_correct=is_correct, option_order=order,
+            )
+            for order, (text, is_correct) in enumerate((options or {}).items(), start=1)
+        )
+        db.session.commit()
+        return question.question_id
+
+    return factory
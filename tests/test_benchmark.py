@@ -0,0 +1,71 @@
+"""
+Tests for the synthetic data seeder and the benchmark suite
+"""
+
+import pytest
+
+from app.models import CourseEnrollment, User
+from app.models.courses.course_stats import CourseStats
+from app.utils.benchmark import SCENARIOS, compare_baselines, run_benchmark
+from app.utils.synthetic_data import parse_count, seed_synthetic
+
+
+def _seed_roles():
+    from app import db
+    from app.models.auth.role import Role
+
+    db.session.add_all([Role(role_name="student"), Role(role_name="teacher")])
+    db.session.commit()
+
+
+class TestSyntheticData:
+    """Test the synthetic dataset generator"""
+
+    def test_parse_count(self):
+        """Test counts accept k/M suffixes"""
+        assert parse_count("100k") == 100_000
+        assert parse_count("1.5M") == 1_500_000
+        assert parse_count("2000") == 2000
+        with pytest.raises(ValueError):
+            parse_count("many")
+
+    def test_seed_synthetic(self, app):
+        """Test the requested volumes are inserted and course stats match them"""
+        _seed_roles()
+        counts = seed_synthetic(users=12, courses=3, enrollments=20, seed=7, batch_size=8)
+
+        assert User.query.count() == 12
+        assert CourseEnrollment.query.count() == 20
+        assert counts["course_enrollments"] == 20
+        stats_total = sum(stats.total_enrollments for stats in CourseStats.query.all())
+        assert stats_total == 20
+
+
+class TestBenchmark:
+    """Test the benchmark suite runs every scenario"""
+
+    def test_run_and_compare(self, app):
+        """Test each journey step is recorded without errors and baselines diff"""
+        _seed_roles()
+        seed_synthetic(users=4, courses=1, enrollments=3, seed=1)
+
+        result = run_benchmark(app, iterations=2, virtual_users=2, warmup=0)
+
+        assert set(result["scenarios"]) == set(SCENARIOS)
+        for name, stats in result["scenarios"].items():
+            assert stats["requests"] == 2, name
+            assert stats["errors"] == 0, name
+            assert stats["queries_max"] > 0, name
+
+        slower = {"scenarios": {
+            name: dict(stats, p95_ms=stats["p95_ms"] * 2, queries_max=stats["queries_max"] + 1)
+            for name, stats in result["scenarios"].items()
+        }}
+        regressions = {
+            (row["scenario"], row["metric"])
+            for row in compare_baselines(result, slower)
+            if row["regression"]
+        }
+        assert ("my_courses", "p95_ms") in regressions
+        assert ("my_courses", "queries_max") in regressions
+        assert ("my_courses", "p50_ms") not in regressions
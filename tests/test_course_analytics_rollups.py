@@ -0,0 +1,134 @@
+"""
+Tests for the incremental daily course analytics rollups
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import CourseActivityLog, CourseEnrollment
+from app.models.courses.course_enrollment_daily_rollup import CourseEnrollmentDailyRollup
+from app.services.courses import (
+    CourseAnalyticsRollupService,
+    CourseAnalyticsService,
+    CourseEnrollmentService,
+)
+
+
+@pytest.fixture
+def rollup_course(app, make_user, make_course):
+    """
+    Published course with three students enrolled two days ago.
+
+    Returns:
+        (teacher_id, course_id, [student_id, ...])
+    """
+    teacher_id = make_user("teacher")
+    course_id = make_course(teacher_id, status="published")
+    students = [make_user(name) for name in ("ann", "ben", "cat")]
+    for student_id in students:
+        CourseEnrollmentService.enroll_student(course_id, student_id)
+    _backdate(course_id, datetime.utcnow() - timedelta(days=2))
+    return teacher_id, course_id, students
+
+
+def _backdate(course_id, enrolled_at):
+    CourseEnrollment.query.filter_by(course_id=course_id).update({"enrolled_at": enrolled_at})
+    db.session.commit()
+
+
+def _recent_enrollments(teacher_id, course_id) -> int:
+    db.session.expire_all()
+    analytics = CourseAnalyticsService.get_course_analytics(course_id, teacher_id, "teacher")
+    return analytics["recent_enrollments_30d"]
+
+
+def _log_activity(course_id, user_id, activity_type, timestamp):
+    db.session.add(
+        CourseActivityLog(
+            course_id=course_id, user_id=user_id, activity_type=activity_type,
+            timestamp=timestamp,
+        )
+    )
+    db.session.commit()
+
+
+class TestUnenrollAfterRollup:
+    """Test unenrollments leave the rolled-up enrollment counts"""
+
+    def test_unenroll_of_rolled_up_enrollment_decrements(self, rollup_course):
+        """Test an enrollment already folded into the rollup is taken back out"""
+        teacher_id, course_id, students = rollup_course
+        CourseAnalyticsRollupService.refresh_rollups()
+        assert _recent_enrollments(teacher_id, course_id) == 3
+
+        CourseEnrollmentService.unenroll_student(course_id, students[0], students[0], "student")
+
+        assert _recent_enrollments(teacher_id, course_id) == 2
+        rollup = CourseEnrollmentDailyRollup.query.filter_by(course_id=course_id).one()
+        assert rollup.new_enrollments == 2
+
+    def test_unenroll_past_watermark_leaves_rollup(self, rollup_course, make_user):
+        """Test an enrollment only counted live needs no rollup correction"""
+        teacher_id, course_id, _ = rollup_course
+        CourseAnalyticsRollupService.refresh_rollups()
+        late_id = make_user("late")
+        CourseEnrollmentService.enroll_student(course_id, late_id)
+        assert _recent_enrollments(teacher_id, course_id) == 4
+
+        CourseEnrollmentService.unenroll_student(course_id, late_id, late_id, "student")
+
+        assert _recent_enrollments(teacher_id, course_id) == 3
+        rollup = CourseEnrollmentDailyRollup.query.filter_by(course_id=course_id).one()
+        assert rollup.new_enrollments == 3
+
+    def test_every_student_unenrolled(self, rollup_course):
+        """Test the rollup counts down to zero and the total never goes negative"""
+        teacher_id, course_id, students = rollup_course
+        CourseAnalyticsRollupService.refresh_rollups()
+
+        for student_id in students:
+            CourseEnrollmentService.unenroll_student(course_id, student_id, student_id, "student")
+
+        assert _recent_enrollments(teacher_id, course_id) == 0
+        assert CourseEnrollmentDailyRollup.query.filter_by(
+            course_id=course_id
+        ).one().new_enrollments == 0
+
+
+class TestWatermarkAdvance:
+    """Test each rollup run folds in only the rows since the previous watermark"""
+
+    def test_runs_process_each_row_once(self, rollup_course):
+        """Test the watermark advances and rollup plus live delta match the live counts"""
+        teacher_id, course_id, students = rollup_course
+        now = datetime.utcnow()
+        first_upper = now - timedelta(hours=1)
+        _log_activity(course_id, students[0], "view", now - timedelta(days=1))
+        _log_activity(course_id, students[1], "view", now - timedelta(minutes=30))
+
+        first = CourseAnalyticsRollupService.refresh_rollups(until=first_upper)
+
+        assert first["window_start"] is None
+        assert first["rows_processed"] == 4  # three enrollments, one activity
+        assert CourseAnalyticsRollupService.get_watermark() == first_upper
+        breakdown = CourseAnalyticsService.get_course_analytics(
+            course_id, teacher_id, "teacher"
+        )["activity_breakdown_30d"]
+        assert breakdown == {"view": 2}
+
+        # Re-running with the same bound finds nothing new
+        again = CourseAnalyticsRollupService.refresh_rollups(until=first_upper)
+        assert again["rows_processed"] == 0
+
+        _log_activity(course_id, students[2], "download", now - timedelta(minutes=10))
+        second_upper = now - timedelta(minutes=5)
+        second = CourseAnalyticsRollupService.refresh_rollups(until=second_upper)
+
+        assert second["window_start"] == first_upper.isoformat()
+        assert second["rows_processed"] == 2
+        assert CourseAnalyticsRollupService.get_watermark() == second_upper
+        analytics = CourseAnalyticsService.get_course_analytics(course_id, teacher_id, "teacher")
+        assert analytics["activity_breakdown_30d"] == {"view": 2, "download": 1}
+        assert analytics["recent_enrollments_30d"] == 3
@@ -0,0 +1,115 @@
+"""
+Tests for listing a student's enrolled courses
+"""
+
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.exceptions import ValidationError
+from app.models import CourseEnrollment
+from app.services.courses import CourseEnrollmentService
+
+
+@pytest.fixture
+def enrolled_student(app, make_user, make_course):
+    """
+    Student enrolled in seven courses; three share the same enrolled_at so the
+    enrollment_id tie-break is exercised.
+
+    Returns:
+        (student_id, [course_id, ...] newest enrollment first)
+    """
+    teacher_id = make_user("teacher")
+    student_id = make_user("student")
+    now = datetime.utcnow().replace(microsecond=0)
+    days_ago = [1, 2, 3, 3, 3, 4, 5]
+    for index, days in enumerate(days_ago):
+        course_id = make_course(teacher_id, title=f"Course {index}", status="published")
+        CourseEnrollmentService.enroll_student(course_id, student_id)
+        CourseEnrollment.query.filter_by(course_id=course_id, user_id=student_id).update(
+            {"enrolled_at": now - timedelta(days=days)}
+        )
+    db.session.commit()
+    newest_first = [
+        e.course_id
+        for e in CourseEnrollment.query.filter_by(user_id=student_id).order_by(
+            CourseEnrollment.enrolled_at.desc(), CourseEnrollment.enrollment_id.desc()
+        )
+    ]
+    return student_id, newest_first
+
+
+def _walk(student_id, limit) -> list:
+    """Every keyset page from the first one until next_cursor runs out."""
+    pages, cursor = [], ""
+    while cursor is not None:
+        page = CourseEnrollmentService.get_my_courses(student_id, limit=limit, cursor=cursor)
+        assert len(page["courses"]) <= limit
+        pages.append(page)
+        cursor = page["next_cursor"]
+    return pages
+
+
+def _ids(page) -> list:
+    return [course["course_id"] for course in page["courses"]]
+
+
+class TestMyCoursesKeyset:
+    """Test cursor pagination of get_my_courses"""
+
+    def test_pages_cover_every_enrollment_once(self, enrolled_student):
+        """Test pages are non-overlapping, in order, and the last one has no cursor"""
+        student_id, newest_first = enrolled_student
+
+        pages = _walk(student_id, limit=3)
+
+        assert [len(page["courses"]) for page in pages] == [3, 3, 1]
+        assert [page["has_more"] for page in pages] == [True, True, False]
+        assert pages[-1]["next_cursor"] is None
+        assert [cid for page in pages for cid in _ids(page)] == newest_first
+
+    def test_exact_multiple_ends_without_empty_page(self, enrolled_student):
+        """Test a final full page reports no next cursor"""
+        student_id, newest_first = enrolled_student
+
+        pages = _walk(student_id, limit=7)
+
+        assert len(pages) == 1
+        assert _ids(pages[0]) == newest_first
+        assert pages[0]["next_cursor"] is None
+
+    def test_new_enrollment_does_not_shift_later_pages(
+        self, enrolled_student, make_user, make_course
+    ):
+        """Test a cursor keeps pointing at the same row when newer rows appear"""
+        student_id, newest_first = enrolled_student
+        first = CourseEnrollmentService.get_my_courses(student_id, limit=3, cursor="")
+
+        CourseEnrollmentService.enroll_student(
+            make_course(make_user("other"), status="published"), student_id
+        )
+        second = CourseEnrollmentService.get_my_courses(
+            student_id, limit=3, cursor=first["next_cursor"]
+        )
+
+        assert _ids(first) == newest_first[:3]
+        assert _ids(second) == newest_first[3:6]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not base64!",
+            "é",
+            base64.urlsafe_b64encode(b"no-separator").decode(),
+            base64.urlsafe_b64encode(b"yesterday|abc").decode(),
+        ],
+    )
+    def test_malformed_cursor_is_rejected(self, enrolled_student, cursor):
+        """Test an undecodable cursor raises ValidationError"""
+        student_id, _ = enrolled_student
+
+        with pytest.raises(ValidationError):
+            CourseEnrollmentService.get_my_courses(student_id, limit=3, cursor=cursor)
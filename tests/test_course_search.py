@@ -0,0 +1,130 @@
+"""
+Tests for full-text course catalogue search
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Course, CourseCategory
+from app.services.courses import CourseSearchService, CourseService
+
+
+@pytest.fixture
+def catalogue(app, make_user, make_course):
+    """
+    Published public courses created a day apart (newest last).
+
+    Returns:
+        {title: course_id}
+    """
+    teacher_id = make_user("teacher")
+    category = CourseCategory(category_id=str(uuid.uuid4()), name="Programming", slug="prog")
+    db.session.add(category)
+    db.session.commit()
+
+    specs = [
+        ("Python Programming", "Learn the basics", "beginner", False, category.category_id),
+        ("Data Science", "Notebooks and statistics with Python", "advanced", True, None),
+        ("Advanced Python Programming", "Decorators and metaclasses", "advanced", True,
+         category.category_id),
+        ("Cooking for Programmers", "Quick recipes", "beginner", False, None),
+    ]
+    start = datetime.utcnow() - timedelta(days=len(specs))
+    courses = {}
+    for offset, (title, description, difficulty, is_paid, category_id) in enumerate(specs):
+        courses[title] = make_course(
+            teacher_id, title=title, description=description, difficulty=difficulty,
+            is_paid=is_paid, category_id=category_id, status="published", visibility="public",
+            created_at=start + timedelta(days=offset),
+        )
+    return courses, category.category_id
+
+
+def _titles(query=None, **filters) -> list:
+    result = CourseService.search_courses(query=query, **filters)
+    assert result["total"] == len(result["courses"])
+    return [course["title"] for course in result["courses"]]
+
+
+class TestCourseSearch:
+    """Test full-text matching, ranking and filters"""
+
+    def test_terms_match_as_prefixes(self, catalogue):
+        """Test every term is a prefix and all terms must match"""
+        assert _titles("pyth prog") == ["Python Programming", "Advanced Python Programming"]
+        assert _titles("PROG pyth") == ["Python Programming", "Advanced Python Programming"]
+        assert _titles("metaclass") == ["Advanced Python Programming"]
+        assert _titles("python cooking") == []
+
+    def test_title_hits_rank_above_description_hits(self, catalogue):
+        """Test title matches outrank description matches, tighter titles first"""
+        assert _titles("python") == [
+            "Python Programming", "Advanced Python Programming", "Data Science",
+        ]
+
+    def test_equal_rank_orders_newest_first(self, app, make_user, make_course):
+        """Test courses with the same relevance fall back to newest first"""
+        teacher_id = make_user("teacher")
+        now = datetime.utcnow()
+        for days_ago in (3, 1, 2):
+            make_course(
+                teacher_id, title=f"Rust Basics {days_ago}", description="Ownership",
+                status="published", visibility="public",
+                created_at=now - timedelta(days=days_ago),
+            )
+
+        assert _titles("rust basics") == ["Rust Basics 1", "Rust Basics 2", "Rust Basics 3"]
+
+    def test_filters_apply_to_text_matches(self, catalogue):
+        """Test category, difficulty and price filters narrow the full-text results"""
+        _, category_id = catalogue
+
+        assert _titles("python", category_id=category_id) == [
+            "Python Programming", "Advanced Python Programming",
+        ]
+        assert _titles("python", difficulty="advanced") == [
+            "Advanced Python Programming", "Data Science",
+        ]
+        assert _titles("python", is_paid=False) == ["Python Programming"]
+        assert _titles("prog", is_paid=False, difficulty="beginner") == [
+            "Cooking for Programmers", "Python Programming",
+        ]
+
+    def test_operators_only_query_falls_back_to_substring(self, catalogue):
+        """Test a query without word terms does not reach the full-text index"""
+        assert CourseSearchService._tokenize('+"*') == []
+        assert _titles("*") == []
+
+
+class TestSearchIndexSync:
+    """Test the SQLite triggers keep the FTS index in step with courses"""
+
+    def test_update_reindexes_title(self, catalogue):
+        """Test a renamed course is found by its new title only"""
+        courses, _ = catalogue
+        course = db.session.get(Course, courses["Cooking for Programmers"])
+        course.title = "Rust Systems Programming"
+        db.session.commit()
+
+        assert _titles("rust") == ["Rust Systems Programming"]
+        assert _titles("cooking") == []
+
+    def test_delete_removes_from_index(self, catalogue):
+        """Test a deleted course no longer matches"""
+        courses, _ = catalogue
+        db.session.delete(db.session.get(Course, courses["Python Programming"]))
+        db.session.commit()
+
+        assert _titles("pyth prog") == ["Advanced Python Programming"]
+
+    def test_rebuild_index_resyncs(self, catalogue):
+        """Test rebuilding the index keeps search results unchanged"""
+        before = _titles("python")
+
+        result = CourseSearchService.rebuild_index()
+
+        assert result == {"dialect": "sqlite", "indexed_courses": 4}
+        assert _titles("python") == before
@@ -0,0 +1,62 @@
+"""
+Tests for the materialized course_stats row
+"""
+
+import pytest
+
+from app import db
+from app.models import CourseEnrollment
+from app.models.courses.course_stats import CourseStats
+from app.services.courses import CourseEnrollmentService, CourseStatsService
+
+
+@pytest.fixture
+def published_course(app, make_user, make_course):
+    """A published course its students can enroll in."""
+    return make_course(make_user("teacher"), status="published")
+
+
+class TestCourseStatsFirstTouch:
+    """Test the first enrollments of a course create its stats row safely"""
+
+    def test_first_enrollment_materializes_row(self, app, published_course, make_user):
+        """Test the stats row is created on the first enrollment"""
+        course_id = published_course
+        student_id = make_user("student")
+
+        CourseEnrollmentService.enroll_student(course_id, student_id)
+
+        assert db.session.get(CourseStats, course_id).enrolled_count == 1
+
+    def test_concurrent_first_row_keeps_enrollment(
+        self, app, published_course, make_user, monkeypatch
+    ):
+        """Test losing the race to create the row does not roll back the enrollment"""
+        course_id = published_course
+        first, second = make_user("first"), make_user("second")
+        CourseEnrollmentService.enroll_student(course_id, first)
+        db.session.remove()
+
+        # The second enrollment's UPDATE ran before the first one's row was
+        # committed, and its rebuild did not see that row either
+        apply_delta = CourseStatsService._apply_delta
+        calls = []
+
+        def racing_apply_delta(cid, values):
+            calls.append(cid)
+            return 0 if len(calls) == 1 else apply_delta(cid, values)
+
+        def racing_rebuild(cid):
+            stats = CourseStats(course_id=cid, enrolled_count=1)
+            db.session.add(stats)
+            return stats
+
+        monkeypatch.setattr(CourseStatsService, "_apply_delta", racing_apply_delta)
+        monkeypatch.setattr(CourseStatsService, "rebuild_course_stats", racing_rebuild)
+
+        CourseEnrollmentService.enroll_student(course_id, second)
+        db.session.remove()
+
+        assert len(calls) == 2
+        assert CourseEnrollment.query.filter_by(course_id=course_id).count() == 2
+        assert db.session.get(CourseStats, course_id).enrolled_count == 2
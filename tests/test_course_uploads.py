@@ -0,0 +1,244 @@
+"""
+Tests for chunked, resumable course material uploads
+"""
+
+import base64
+import errno
+import hashlib
+import io
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.exceptions import ConflictError, ValidationError
+from app.models import CourseUpload, CourseUploadChunk
+from app.services.courses import CourseUploadService
+
+MB = 1024 * 1024
+CHUNK_SIZE = 8 * MB
+
+# Multi-hundred-MB file with a short last chunk
+LARGE_FILE_SIZE = 320 * MB + 12345
+CONCURRENT_UPLOADERS = 4
+
+
+@pytest.fixture
+def owned_course(file_app, make_user, make_course):
+    """A course and its teacher; returns (course_id, teacher_id)."""
+    teacher_id = make_user("teacher")
+    return make_course(teacher_id), teacher_id
+
+
+def _chunk(index, total_size, chunk_size=CHUNK_SIZE):
+    """Deterministic pseudo-random bytes of chunk index."""
+    length = min(chunk_size, total_size - index * chunk_size)
+    return random.Random(index).randbytes(length)
+
+
+def _file_checksum(total_size, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    for index in range(-(-total_size // chunk_size)):
+        digest.update(_chunk(index, total_size, chunk_size))
+    return digest.hexdigest()
+
+
+def _chunk_header(data):
+    return "sha256 " + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+def _start(course_id, user_id, total_size, checksum, chunk_size=CHUNK_SIZE):
+    return CourseUploadService.create_upload(
+        course_id, user_id, "teacher", "lecture video.mp4", total_size, checksum, chunk_size
+    )
+
+
+def _write(course_id, upload_id, user_id, index, data, checksum=None, chunk_size=CHUNK_SIZE):
+    return CourseUploadService.write_chunk(
+        course_id, upload_id, user_id, "teacher", index * chunk_size, io.BytesIO(data), checksum
+    )
+
+
+class TestChunkedUpload:
+    """Test large files are assembled from concurrent, out-of-order chunks"""
+
+    def test_concurrent_chunks_assemble_large_file(self, file_app, owned_course):
+        """Test a 320MB file uploaded by parallel workers in shuffled order"""
+        course_id, user_id = owned_course
+        upload = _start(course_id, user_id, LARGE_FILE_SIZE, _file_checksum(LARGE_FILE_SIZE))
+        upload_id = upload["upload_id"]
+        assert upload["total_chunks"] == 41
+
+        indexes = list(range(upload["total_chunks"]))
+        random.Random(49).shuffle(indexes)
+        # A retried chunk is accepted again without being recorded twice
+        indexes.append(indexes[0])
+
+        def send(index):
+            with file_app.app_context():
+                try:
+                    data = _chunk(index, LARGE_FILE_SIZE)
+                    return _write(course_id, upload_id, user_id, index, data, _chunk_header(data))
+                finally:
+                    db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=CONCURRENT_UPLOADERS) as pool:
+            receipts = list(pool.map(send, indexes))
+
+        assert receipts[-1]["offset"] == min((indexes[0] + 1) * CHUNK_SIZE, LARGE_FILE_SIZE)
+        assert CourseUploadChunk.query.filter_by(upload_id=upload_id).count() == 41
+
+        result = CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+
+        stored = os.path.join(file_app.config["UPLOAD_FOLDER"], result["file_path"])
+        assert result["status"] == "completed"
+        assert result["file_path"].endswith("lecture_video.mp4")
+        assert os.path.getsize(stored) == LARGE_FILE_SIZE
+        assert not os.listdir(os.path.join(os.path.dirname(stored), ".partial"))
+        with pytest.raises(ConflictError):
+            CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+
+    def test_resume_reports_missing_chunks(self, file_app, owned_course):
+        """Test status lists missing chunks and bad chunks are not recorded"""
+        course_id, user_id = owned_course
+        size, chunk_size = 5 * MB + 100, MB
+        upload = _start(course_id, user_id, size, _file_checksum(size, chunk_size), chunk_size)
+        upload_id = upload["upload_id"]
+
+        for index in (0, 1, 3):
+            _write(course_id, upload_id, user_id, index, _chunk(index, size, chunk_size),
+                   chunk_size=chunk_size)
+
+        with pytest.raises(ConflictError):
+            CourseUploadService.write_chunk(
+                course_id, upload_id, user_id, "teacher", 100, io.BytesIO(b"x")
+            )
+        with pytest.raises(ValidationError):
+            _write(course_id, upload_id, user_id, 2, b"short", chunk_size=chunk_size)
+        with pytest.raises(ValidationError):
+            _write(course_id, upload_id, user_id, 4, _chunk(4, size, chunk_size),
+                   _chunk_header(b"other"), chunk_size=chunk_size)
+        # A failed retry of a received chunk has overwritten its bytes
+        corrupt = bytes(chunk_size)
+        with pytest.raises(ValidationError):
+            _write(course_id, upload_id, user_id, 1, corrupt, _chunk_header(b"other"),
+                   chunk_size=chunk_size)
+        with pytest.raises(ValidationError):
+            CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+
+        status = CourseUploadService.get_upload_status(course_id, upload_id, user_id, "teacher")
+        assert status["status"] == "uploading"
+        assert status["missing_chunks"] == [1, 2, 4, 5]
+        assert status["offset"] == chunk_size
+        assert status["bytes_received"] == 2 * chunk_size
+
+        for index in status["missing_chunks"]:
+            _write(course_id, upload_id, user_id, index, _chunk(index, size, chunk_size),
+                   chunk_size=chunk_size)
+        result = CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+        assert result["status"] == "completed"
+
+    def test_checksum_mismatch_discards_upload(self, file_app, owned_course):
+        """Test a file that does not match its declared checksum is not stored"""
+        course_id, user_id = owned_course
+        size = MB
+        upload = _start(course_id, user_id, size, hashlib.sha256(b"other").hexdigest(), MB)
+        upload_id = upload["upload_id"]
+        _write(course_id, upload_id, user_id, 0, _chunk(0, size, MB), chunk_size=MB)
+
+        with pytest.raises(ValidationError):
+            CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+
+        failed = db.session.get(CourseUpload, upload_id)
+        assert failed.status == "failed"
+        assert failed.file_path is None
+        partial = os.path.join(file_app.config["UPLOAD_FOLDER"], failed.partial_path)
+        assert not os.path.exists(partial)
+
+    def test_same_name_never_overwrites(self, file_app, owned_course, monkeypatch):
+        """Test a file taking the name while an upload finalizes is kept"""
+        course_id, user_id = owned_course
+        contents = [random.Random(seed).randbytes(MB) for seed in range(2)]
+        upload_ids = []
+        for data in contents:
+            upload_id = _start(course_id, user_id, MB, hashlib.sha256(data).hexdigest(), MB)[
+                "upload_id"
+            ]
+            _write(course_id, upload_id, user_id, 0, data, chunk_size=MB)
+            upload_ids.append(upload_id)
+
+        link = os.link
+        competing = []
+
+        def racing_link(source, target):
+            # Another finalize takes the free name just before this one links
+            if not competing:
+                competing.append(target)
+                with open(target, "wb") as handle:
+                    handle.write(b"competing")
+            return link(source, target)
+
+        monkeypatch.setattr(os, "link", racing_link)
+        paths = [
+            CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")[
+                "file_path"
+            ]
+            for upload_id in upload_ids
+        ]
+
+        root = file_app.config["UPLOAD_FOLDER"]
+        assert [os.path.basename(path) for path in paths] == [
+            "lecture_video_1.mp4", "lecture_video_2.mp4",
+        ]
+        with open(competing[0], "rb") as handle:
+            assert handle.read() == b"competing"
+        for path, data in zip(paths, contents):
+            with open(os.path.join(root, path), "rb") as handle:
+                assert handle.read() == data
+
+
+class TestUploadRecovery:
+    """Test uploads are never left stuck in finalizing"""
+
+    def test_failed_finalize_releases_claim(self, file_app, owned_course, monkeypatch):
+        """Test an unexpected error while finalizing lets the client complete again"""
+        course_id, user_id = owned_course
+        upload = _start(course_id, user_id, MB, _file_checksum(MB, MB), MB)
+        upload_id = upload["upload_id"]
+        _write(course_id, upload_id, user_id, 0, _chunk(0, MB, MB), chunk_size=MB)
+
+        file_sha256 = CourseUploadService._file_sha256
+
+        def failing_read(path):
+            raise OSError(errno.EIO, "I/O error", path)
+
+        monkeypatch.setattr(CourseUploadService, "_file_sha256", failing_read)
+        with pytest.raises(OSError):
+            CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+        assert db.session.get(CourseUpload, upload_id).status == "uploading"
+
+        monkeypatch.setattr(CourseUploadService, "_file_sha256", file_sha256)
+        result = CourseUploadService.complete_upload(course_id, upload_id, user_id, "teacher")
+        assert result["status"] == "completed"
+
+    def test_expire_removes_stale_finalizing(self, file_app, owned_course):
+        """Test cleanup removes uploads left finalizing, after a grace period"""
+        course_id, user_id = owned_course
+        now = datetime.utcnow()
+        uploads = {}
+        for name, expired_for in (("crashed", timedelta(hours=2)), ("running", timedelta(0))):
+            upload_id = _start(course_id, user_id, MB, _file_checksum(MB, MB), MB)["upload_id"]
+            upload = db.session.get(CourseUpload, upload_id)
+            upload.status = "finalizing"
+            upload.expires_at = now - expired_for - timedelta(minutes=1)
+            uploads[name] = upload_id
+        db.session.commit()
+
+        result = CourseUploadService.expire_stale_uploads(now)
+
+        assert result == {"expired": 1, "bytes_freed": MB}
+        assert db.session.get(CourseUpload, uploads["crashed"]) is None
+        assert db.session.get(CourseUpload, uploads["running"]).status == "finalizing"
@@ -0,0 +1,106 @@
+"""
+Tests for schema-fingerprint based database initialization
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from app import create_app, db
+from app.middleware.query_profiler import count_queries
+from app.models import SchemaVersion
+from app.utils import database
+from app.utils.database import DatabaseInitializer
+
+
+@pytest.fixture
+def initializer_app(file_database):
+    """Application on an SQLite file, which init_database does not special-case."""
+    app = create_app("testing")
+    yield app, DatabaseInitializer(file_database, app.logger)
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+class TestSchemaInitialization:
+    """Test when boot initializes the schema and when it skips it"""
+
+    def test_initializes_once_then_costs_one_query(self, initializer_app):
+        """Test a database at the current fingerprint is not initialized again"""
+        app, initializer = initializer_app
+        seeded = []
+
+        assert initializer.initialize_database(db, app, seed=seeded.append)
+        assert seeded == [app]
+        with app.app_context():
+            assert db.session.get(SchemaVersion, database.SCHEMA_COMPONENT) is not None
+
+        with count_queries() as stats:
+            assert initializer.initialize_database(db, app, seed=seeded.append)
+        assert stats.count == 1
+        assert seeded == [app]
+
+    def test_schema_change_reinitializes(self, initializer_app, monkeypatch):
+        """Test a different fingerprint runs table creation and seeding again"""
+        app, initializer = initializer_app
+        seeded = []
+        initializer.initialize_database(db, app, seed=seeded.append)
+
+        monkeypatch.setattr(database, "schema_fingerprint", lambda metadata, dialect: "0" * 64)
+        assert initializer.initialize_database(db, app, seed=seeded.append)
+        assert seeded == [app, app]
+        with app.app_context():
+            assert db.session.get(SchemaVersion, database.SCHEMA_COMPONENT).fingerprint == "0" * 64
+
+    def test_revision_contents_are_fingerprinted(self, app, tmp_path, monkeypatch):
+        """Test editing a migration file changes the fingerprint, not only adding one"""
+        versions = tmp_path / "versions"
+        versions.mkdir()
+        revision = versions / "rb001_example.py"
+        revision.write_text("def upgrade():\n    pass\n")
+        monkeypatch.setattr(database, "MIGRATIONS_DIR", str(tmp_path))
+        before = database.schema_fingerprint(db.metadata, db.engine.dialect)
+
+        revision.write_text("def upgrade():\n    backfill()\n")
+
+        assert database.schema_fingerprint(db.metadata, db.engine.dialect) != before
+
+
+class TestSchemaLockTimeout:
+    """Test boot when another process holds the schema-init lock"""
+
+    @staticmethod
+    def _lock_held_elsewhere(monkeypatch, initializer, finished_by_other=None):
+        @contextmanager
+        def lock_not_acquired(db):
+            if finished_by_other:
+                finished_by_other()
+            yield False
+
+        monkeypatch.setattr(initializer, "_schema_lock", lock_not_acquired)
+
+    def test_not_ready_while_other_process_initializes(self, initializer_app, monkeypatch):
+        """Test a timed-out lock with a stale schema reports failure and seeds nothing"""
+        app, initializer = initializer_app
+        seeded = []
+        self._lock_held_elsewhere(monkeypatch, initializer)
+
+        assert initializer.initialize_database(db, app, seed=seeded.append) is False
+        assert seeded == []
+
+    def test_ready_once_other_process_finished(self, initializer_app, monkeypatch):
+        """Test the fingerprint is re-checked after the lock wait times out"""
+        app, initializer = initializer_app
+        seeded = []
+
+        def other_process_initializes():
+            initializer._create_tables_safe(db)
+            initializer._record_fingerprint(
+                db, database.schema_fingerprint(db.metadata, db.engine.dialect)
+            )
+
+        self._lock_held_elsewhere(monkeypatch, initializer, other_process_initializes)
+
+        assert initializer.initialize_database(db, app, seed=seeded.append) is True
+        assert seeded == []
@@ -0,0 +1,89 @@
+"""
+Tests for read-replica routing
+"""
+
+import time
+import uuid
+
+import pytest
+from flask import Response, g
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models import CourseCategory
+from app.utils import db_routing
+from app.utils.db_routing import STICKY_COOKIE, read_only
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """Application with a primary and a "replica" backed by two SQLite files."""
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'primary.db'}"
+    )
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_BINDS", {"replica": f"sqlite:///{tmp_path / 'replica.db'}"}
+    )
+    db_routing._replica_state.clear()
+    app = create_app("testing")
+    with app.app_context():
+        db.engine.echo = False
+        db.create_all()
+        db.metadata.create_all(db.engines["replica"])
+        # The replica holds one row the primary does not have
+        with db.engines["replica"].begin() as connection:
+            connection.execute(
+                CourseCategory.__table__.insert().values(
+                    category_id=str(uuid.uuid4()), name="Replica only", slug="replica-only"
+                )
+            )
+        yield app
+        db.session.remove()
+        db.drop_all()
+        # init_app registered the bind's metadata on the shared db object
+        db.metadatas.pop("replica", None)
+
+
+def _category_count():
+    with read_only():
+        return CourseCategory.query.count()
+
+
+class TestReadReplicaRouting:
+    """Test which engine read_only reads are sent to"""
+
+    def test_read_only_reads_from_replica(self, replica_app):
+        """Test read_only queries use the replica and others the primary"""
+        assert _category_count() == 1
+        assert CourseCategory.query.count() == 0
+
+    def test_request_that_wrote_reads_from_primary(self, replica_app):
+        """Test reads after a write in the same request see the write"""
+        with replica_app.test_request_context():
+            db.session.add(
+                CourseCategory(category_id=str(uuid.uuid4()), name="New", slug="new")
+            )
+            db.session.commit()
+
+            assert g.db_wrote
+            assert _category_count() == 1
+            assert CourseCategory.query.filter_by(slug="new").count() == 1
+
+    def test_recent_writer_is_pinned_to_primary(self, replica_app):
+        """Test the sticky cookie set after a write pins the next request"""
+        with replica_app.test_request_context():
+            g.db_wrote = True
+            response = replica_app.process_response(Response())
+        assert STICKY_COOKIE in response.headers.get("Set-Cookie", "")
+
+        cookie = f"{STICKY_COOKIE}={time.time() + 5}"
+        with replica_app.test_request_context(headers={"Cookie": cookie}):
+            replica_app.preprocess_request()
+            assert _category_count() == 0
+
+    def test_lagging_replica_falls_back_to_primary(self, replica_app, monkeypatch):
+        """Test reads go to the primary while the replica is too far behind"""
+        monkeypatch.setattr(db_routing, "replica_lag", lambda engine: 60)
+        db_routing._replica_state.clear()
+
+        assert _category_count() == 0
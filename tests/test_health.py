@@ -18,6 +18,12 @@ class TestHealthCheck:
         assert "service" in data
         assert "version" in data
 
+    def test_health_check_reports_database_pool(self, client):
+        """Test the health check includes connection pool state"""
+        response = client.get("/api/v1/health")
+        data = json.loads(response.data)
+        assert "pool" in data["database_pool"]
+
     def test_readiness_check(self, client):
         """Test the readiness check endpoint"""
         response = client.get("/api/v1/health/ready")
@@ -11,6 +11,7 @@ from app.utils.helpers import (
     safe_bool,
     generate_slug,
 )
+from app.utils.redis_client import get_redis_client
 
 
 class TestPaginationHelpers:
@@ -136,3 +137,20 @@ class TestSlugGeneration:
         """Test slug with empty string"""
         slug = generate_slug("")
         assert isinstance(slug, str)
+
+
+class TestSharedRedisClient:
+    """Test the per-process Redis client shared by Redis-backed features"""
+
+    def test_reuses_one_client_per_url(self, app):
+        """Test every caller gets the same client instead of a new pool"""
+        app.config["QUIZ_AUTOSAVE_ENABLED"] = True
+        first = get_redis_client("QUIZ_AUTOSAVE_ENABLED")
+        assert first is not None
+        assert get_redis_client("QUIZ_AUTOSAVE_ENABLED") is first
+        assert get_redis_client() is first
+
+    def test_disabled_feature_gets_no_client(self, app):
+        """Test a falsy feature flag returns None"""
+        app.config["HTTP_CACHE_REDIS_ENABLED"] = False
+        assert get_redis_client("HTTP_CACHE_REDIS_ENABLED") is None
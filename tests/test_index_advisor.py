@@ -0,0 +1,29 @@
+"""
+Tests for the index advisor and the hot query indexes
+"""
+
+from app.models.courses.course_activity_log import CourseActivityLog
+from app.utils.index_advisor import QUERY_SHAPES, QueryShape, run_advisor
+
+
+class TestIndexAdvisor:
+    """Test every catalogued query shape is served by an index"""
+
+    def test_catalogued_queries_use_an_index(self, app):
+        """Test no catalogued query reads a whole table"""
+        report = run_advisor()
+        assert len(report) == len(QUERY_SHAPES)
+        scanning = {entry["name"]: entry["full_scans"] for entry in report if entry["full_scans"]}
+        assert scanning == {}
+        assert all(entry["indexes"] for entry in report)
+
+    def test_full_scan_is_reported(self, app):
+        """Test a filter on an unindexed column is reported as a full scan"""
+        shape = QueryShape(
+            "activity.by_browser",
+            "test",
+            lambda: CourseActivityLog.query.filter_by(browser="firefox"),
+        )
+        (entry,) = run_advisor((shape,))
+        assert entry["full_scans"] == ["course_activity_log"]
+        assert entry["indexes"] == []
@@ -44,3 +44,27 @@ class TestAPIBasics:
             field in data
             for field in ["status", "service", "version", "timestamp"]
         )
+
+
+class TestCatalogueHttpCaching:
+    """Test conditional GET support on public catalogue endpoints"""
+
+    def test_categories_sets_cache_headers(self, client):
+        """Test catalogue responses carry ETag and Cache-Control"""
+        response = client.get("/api/v1/courses/categories")
+        assert response.status_code == 200
+        assert response.headers.get("ETag")
+        assert "public" in response.headers.get("Cache-Control", "")
+
+    def test_matching_etag_returns_304(self, client):
+        """Test a matching If-None-Match short-circuits with 304"""
+        etag = client.get("/api/v1/courses").headers["ETag"]
+        response = client.get("/api/v1/courses", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_missing_course_is_not_cached(self, client):
+        """Test 404s are passed through without validators"""
+        response = client.get("/api/v1/courses/does-not-exist")
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
@@ -0,0 +1,122 @@
+"""
+Tests for signed material URLs and file delivery
+"""
+
+import os
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.exceptions import ResourceNotFoundError
+from app.models import CourseActivityLog, CourseLesson, CourseSection, LessonContent
+from app.services.courses import MaterialDeliveryService
+from app.utils.signed_urls import sign_path
+
+MATERIAL_PATH = "courses/materials/course-1/notes.pdf"
+MATERIAL_BYTES = bytes(range(256)) * 4096
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Application with uploads stored under tmp_path and one material on disk."""
+    monkeypatch.setattr(TestingConfig, "UPLOAD_FOLDER", str(tmp_path))
+    path = tmp_path / MATERIAL_PATH
+    path.parent.mkdir(parents=True)
+    path.write_bytes(MATERIAL_BYTES)
+    (path.parent / ".partial").mkdir()
+    (path.parent / ".partial" / "pending.part").write_bytes(b"partial")
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+class TestSignedDelivery:
+    """Test signed /uploads/ URLs are served with Range and validator support"""
+
+    def test_range_and_conditional_requests(self, client):
+        """Test full, partial and not-modified responses for a signed URL"""
+        url = sign_path(MATERIAL_PATH)["url"]
+
+        full = client.get(url)
+        assert full.status_code == 200
+        assert full.data == MATERIAL_BYTES
+        assert full.headers["Accept-Ranges"] == "bytes"
+        assert "private" in full.headers["Cache-Control"]
+
+        partial = client.get(url, headers={"Range": "bytes=1000-1999"})
+        assert partial.status_code == 206
+        assert partial.data == MATERIAL_BYTES[1000:2000]
+        assert partial.headers["Content-Range"] == f"bytes 1000-1999/{len(MATERIAL_BYTES)}"
+
+        cached = client.get(url, headers={"If-None-Match": full.headers["ETag"]})
+        assert cached.status_code == 304
+
+    def test_rejects_bad_links(self, app, client):
+        """Test tampered, expired, escaping and hidden paths are refused"""
+        url = sign_path(MATERIAL_PATH)["url"]
+        assert client.get(url[:-2] + "xx").status_code == 403
+        assert client.get(f"/uploads/{MATERIAL_PATH}").status_code == 403
+        assert client.get(sign_path(MATERIAL_PATH, expires_in=-1)["url"]).status_code == 403
+        escaping = parse_qs(urlparse(sign_path("../secret.txt")["url"]).query)
+        with app.test_request_context(), pytest.raises(ResourceNotFoundError):
+            MaterialDeliveryService.serve_file(
+                "../secret.txt", escaping["expires"][0], escaping["signature"][0]
+            )
+        hidden = os.path.join(os.path.dirname(MATERIAL_PATH), ".partial", "pending.part")
+        assert client.get(sign_path(hidden)["url"]).status_code == 404
+
+    @pytest.mark.parametrize(
+        "mode, header, value",
+        [
+            ("x-accel-redirect", "X-Accel-Redirect", f"/protected-uploads/{MATERIAL_PATH}"),
+            ("x-sendfile", "X-Sendfile", MATERIAL_PATH),
+        ],
+    )
+    def test_offloaded_delivery(self, app, client, mode, header, value):
+        """Test the transfer is handed to the front-end server without a body"""
+        app.config["MATERIAL_DELIVERY_MODE"] = mode
+
+        response = client.get(sign_path(MATERIAL_PATH)["url"])
+
+        assert response.status_code == 200
+        assert response.headers[header].endswith(value)
+        assert response.data == b""
+
+
+class TestPdfDownload:
+    """Test the download endpoint authorizes once and records the download"""
+
+    def test_signed_url_and_tracking(self, app, client, make_user, make_course):
+        """Test an uploaded PDF gets a working signed URL and a download event"""
+        teacher_id = make_user("teacher")
+        course_id = make_course(teacher_id)
+        section = CourseSection(course_id=course_id, title="Section")
+        db.session.add(section)
+        db.session.flush()
+        lesson = CourseLesson(section_id=section.section_id, course_id=course_id, title="Lesson")
+        db.session.add(lesson)
+        db.session.flush()
+        content = LessonContent(
+            lesson_id=lesson.lesson_id, course_id=course_id, content_type="pdf",
+            title="Notes", pdf_file_url=f"/uploads/{MATERIAL_PATH}",
+        )
+        db.session.add(content)
+        db.session.commit()
+
+        download = MaterialDeliveryService.get_pdf_download(
+            course_id, lesson.lesson_id, content.content_id, teacher_id, "teacher"
+        )
+
+        assert download["pdf_file_url"].startswith(f"/uploads/{MATERIAL_PATH}?expires=")
+        assert download["expires_at"] > time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+        assert client.get(download["pdf_file_url"]).data == MATERIAL_BYTES
+        assert CourseActivityLog.query.filter_by(
+            content_id=content.content_id, activity_type="pdf_download"
+        ).count() == 1
@@ -0,0 +1,75 @@
+"""
+Tests for the /metrics endpoint and the multiprocess metric store
+"""
+
+import os
+
+import pytest
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.utils import metrics
+
+
+@pytest.fixture
+def metrics_app(tmp_path, monkeypatch):
+    """Application recording metrics into a temporary METRICS_DIR."""
+    monkeypatch.setattr(TestingConfig, "METRICS_ENABLED", True)
+    monkeypatch.setattr(TestingConfig, "METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_state", {"directory": None, "pid": None, "values": None})
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _sample(text, prefix):
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestMetrics:
+    """Test request metrics and their aggregation across workers"""
+
+    def test_requests_are_recorded_per_route(self, metrics_app):
+        """Test latency histogram and status counter use the route template"""
+        client = metrics_app.test_client()
+        client.get("/api/v1/health/live")
+        client.get("/api/v1/health/live")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+
+        labels = 'blueprint="health",method="GET",route="/api/v1/health/live"'
+        text = response.get_data(as_text=True)
+        assert _sample(text, f"lms_http_requests_total{{{labels},status=\"200\"}}") == 2
+        assert _sample(text, f"lms_http_request_duration_seconds_count{{{labels}}}") == 2
+        assert _sample(text, f'lms_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 2
+        assert "lms_notification_queue_depth" in text
+        assert "lms_redis_up" in text
+
+    def test_counters_are_summed_across_worker_files(self, metrics_app, tmp_path):
+        """Test values written by another (exited) worker are included"""
+        metrics.HTTP_REQUESTS.inc(blueprint="x", route="/x", method="GET", status="200")
+
+        # Simulate a second worker by copying this process's value file
+        own = tmp_path / f"metrics_{os.getpid()}.db"
+        (tmp_path / "metrics_999999999.db").write_bytes(own.read_bytes())
+
+        text = metrics.render()
+        labels = 'blueprint="x",method="GET",route="/x",status="200"'
+        assert _sample(text, f"lms_http_requests_total{{{labels}}}") == 2
+
+    def test_token_is_required_when_configured(self, metrics_app):
+        """Test METRICS_TOKEN protects the endpoint"""
+        metrics_app.config["METRICS_TOKEN"] = "secret"
+        client = metrics_app.test_client()
+
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
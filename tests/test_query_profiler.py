@@ -0,0 +1,55 @@
+"""
+Tests for the per-request SQL query profiler
+"""
+
+import logging
+import uuid
+
+import pytest
+
+from app.models import User
+
+
+@pytest.fixture
+def make_courses(app, make_user, make_course):
+    """Create count published, public courses of one teacher."""
+
+    def factory(count):
+        teacher_id = make_user("teacher")
+        for i in range(count):
+            make_course(
+                teacher_id, title=f"Course {i}", status="published", visibility="public"
+            )
+
+    return factory
+
+
+class TestQueryProfiler:
+    """Test query counting, response headers and N+1 detection"""
+
+    def test_response_reports_queries(self, client, make_courses):
+        """Test every response carries the query count and DB time"""
+        make_courses(3)
+        response = client.get("/api/v1/courses")
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Queries"]) > 0
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    def test_catalogue_search_query_budget(self, client, query_budget, make_courses):
+        """Test the catalogue page does not grow with the number of courses"""
+        make_courses(15)
+        with query_budget(5):
+            client.get("/api/v1/courses?limit=15")
+
+    def test_repeated_statements_are_logged(self, app, client, caplog):
+        """Test a request repeating one statement shape is flagged as N+1"""
+
+        def n_plus_one():
+            for _ in range(app.config["QUERY_REPEAT_THRESHOLD"] + 1):
+                User.query.filter_by(user_id=str(uuid.uuid4())).first()
+            return "ok"
+
+        app.add_url_rule("/test/n-plus-one", "n_plus_one", n_plus_one)
+        with caplog.at_level(logging.WARNING, logger="app.middleware.query_profiler"):
+            client.get("/test/n-plus-one")
+        assert "Possible N+1 on GET /test/n-plus-one" in caplog.text
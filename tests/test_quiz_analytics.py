@@ -0,0 +1,141 @@
+"""
+Tests for instructor quiz statistics
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.exceptions import AuthorizationError
+from app.models import AttemptAnswer, Question, QuizAttempt
+from app.services.quizzes import QuizAnalyticsService
+
+# Student -> (status, percentage, passed, time_taken_minutes,
+#             [(question index, is_correct, time_taken_seconds), ...])
+ATTEMPTS = {
+    "ann": ("graded", 100, True, 12, [(0, True, 30), (1, True, None)]),
+    "ben": ("graded", 45.5, False, None, [(0, False, 10), (1, None, 20)]),
+    "cat": ("submitted", None, None, 7, [(0, True, 5)]),
+    # Still in progress: left out of the attempt figures, answers still counted
+    "dan": ("in_progress", 80, True, 3, [(0, True, 100)]),
+}
+
+
+@pytest.fixture
+def stats_quiz(app, make_user, make_course, make_quiz, make_question):
+    """
+    Quiz with three questions (the last never answered) and the ATTEMPTS above.
+
+    Returns:
+        (teacher_id, quiz_id)
+    """
+    teacher_id = make_user("teacher")
+    quiz_id = make_quiz(make_course(teacher_id), passing_score=50)
+    questions = [
+        make_question(quiz_id, "multiple_choice", {"a": True}, question_order=1),
+        make_question(quiz_id, "essay", question_order=2),
+        make_question(quiz_id, "short_answer", question_order=3),
+    ]
+    for name, (status, percentage, passed, minutes, answers) in ATTEMPTS.items():
+        attempt = QuizAttempt(
+            attempt_id=str(uuid.uuid4()), quiz_id=quiz_id, user_id=make_user(name),
+            status=status, percentage=percentage, passed=passed,
+            time_taken_minutes=minutes,
+            submitted_at=datetime.utcnow() if status != "in_progress" else None,
+        )
+        db.session.add(attempt)
+        db.session.add_all(
+            AttemptAnswer(
+                answer_id=str(uuid.uuid4()), attempt_id=attempt.attempt_id,
+                question_id=questions[index], user_answer="answer",
+                is_correct=is_correct, time_taken_seconds=seconds,
+            )
+            for index, is_correct, seconds in answers
+        )
+    db.session.commit()
+    return teacher_id, quiz_id
+
+
+def _python_statistics(quiz_id) -> dict:
+    """The row-by-row computation get_quiz_statistics replaced, kept as the reference."""
+    attempts = QuizAttempt.query.filter(
+        QuizAttempt.quiz_id == quiz_id,
+        QuizAttempt.status.in_(["submitted", "graded"]),
+    ).all()
+    total_attempts = len(attempts)
+
+    question_stats = []
+    for q in Question.query.filter_by(quiz_id=quiz_id).order_by(Question.question_order):
+        q_answers = AttemptAnswer.query.filter_by(question_id=q.question_id).all()
+        answered_count = len(q_answers)
+        correct_count = sum(1 for a in q_answers if a.is_correct)
+        question_stats.append(
+            {
+                "question_id": q.question_id,
+                "question_text": q.question_text,
+                "total_answers": answered_count,
+                "correct_answers": correct_count,
+                "correct_percentage": (
+                    round(correct_count / answered_count * 100, 2) if answered_count else 0
+                ),
+                "average_time_seconds": (
+                    round(sum(a.time_taken_seconds or 0 for a in q_answers) / answered_count, 1)
+                    if answered_count else 0
+                ),
+            }
+        )
+
+    return {
+        "quiz_id": quiz_id,
+        "total_attempts": total_attempts,
+        "average_score": round(
+            sum(float(a.percentage or 0) for a in attempts) / total_attempts, 2
+        ),
+        "pass_rate": round(sum(1 for a in attempts if a.passed) / total_attempts * 100, 2),
+        "average_time_minutes": round(
+            sum(a.time_taken_minutes or 0 for a in attempts) / total_attempts, 1
+        ),
+        "questions": question_stats,
+    }
+
+
+class TestQuizStatistics:
+    """Test the SQL aggregates behind get_quiz_statistics"""
+
+    def test_matches_python_computation(self, stats_quiz):
+        """Test averages, pass rate and counts equal the per-row Python figures"""
+        teacher_id, quiz_id = stats_quiz
+
+        stats = QuizAnalyticsService.get_quiz_statistics(quiz_id, teacher_id, "teacher")
+
+        assert stats == _python_statistics(quiz_id)
+        assert stats["total_attempts"] == 3
+        assert stats["average_score"] == 48.5
+        assert stats["pass_rate"] == 33.33
+        assert stats["average_time_minutes"] == 6.3
+        assert [
+            (q["total_answers"], q["correct_answers"], q["correct_percentage"],
+             q["average_time_seconds"])
+            for q in stats["questions"]
+        ] == [(4, 3, 75.0, 36.2), (2, 1, 50.0, 10.0), (0, 0, 0, 0)]
+
+    def test_quiz_without_finished_attempts(self, app, make_user, make_course, make_quiz):
+        """Test a quiz nobody has submitted reports zeros"""
+        teacher_id = make_user("teacher")
+        quiz_id = make_quiz(make_course(teacher_id))
+
+        stats = QuizAnalyticsService.get_quiz_statistics(quiz_id, teacher_id, "teacher")
+
+        assert stats == {
+            "quiz_id": quiz_id, "total_attempts": 0, "average_score": 0, "pass_rate": 0,
+            "average_time_minutes": 0, "questions": [],
+        }
+
+    def test_rejects_non_owner(self, stats_quiz, make_user):
+        """Test another teacher cannot read the statistics"""
+        _, quiz_id = stats_quiz
+
+        with pytest.raises(AuthorizationError):
+            QuizAnalyticsService.get_quiz_statistics(quiz_id, make_user("other"), "teacher")
@@ -0,0 +1,351 @@
+"""
+Tests for quiz attempt start under concurrency
+"""
+
+import importlib.util
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+import redis
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import event
+
+from app import db
+from app.exceptions import ConflictError, LMSException
+from app.models import (
+    AttemptAnswer,
+    QuestionItemStats,
+    QuestionOption,
+    QuizAttempt,
+    QuizAttemptDeadline,
+    QuizAttemptSlot,
+)
+from app.services.quizzes import (
+    QuizAnswerService,
+    QuizAttemptExpiryService,
+    QuizAttemptService,
+    QuizAutosaveService,
+)
+from app.utils.database import MIGRATIONS_DIR
+
+CONCURRENT_STARTS = 8
+
+
+@pytest.fixture
+def make_teacher_quiz(make_user, make_course, make_quiz):
+    """Create a quiz owned by a new teacher; returns (teacher_id, quiz_id)."""
+
+    def factory(**fields):
+        teacher_id = make_user("teacher")
+        return teacher_id, make_quiz(make_course(teacher_id), **fields)
+
+    return factory
+
+
+@pytest.fixture
+def add_question(make_question):
+    """Add a one-point multiple-choice question; returns (question_id, correct option ID)."""
+
+    def factory(quiz_id):
+        question_id = make_question(
+            quiz_id, "multiple_choice", {"3": False, "4": True},
+            question_text="2 + 2?", points=1, question_order=1,
+        )
+        option = QuestionOption.query.filter_by(question_id=question_id, is_correct=True).one()
+        return question_id, option.option_id
+
+    return factory
+
+
+def _start_answered(quiz_id, user_id, question_id, option_id, overdue=False):
+    """Start an attempt, answer the question and optionally move its deadline into the past."""
+    attempt_id = QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")["attempt_id"]
+    db.session.add(
+        AttemptAnswer(
+            answer_id=str(uuid.uuid4()), attempt_id=attempt_id, question_id=question_id,
+            user_answer=option_id,
+        )
+    )
+    if overdue:
+        db.session.get(QuizAttemptDeadline, attempt_id).deadline_at = (
+            datetime.utcnow() - timedelta(hours=1)
+        )
+    db.session.commit()
+    return attempt_id
+
+
+def _redis_down(*args, **kwargs):
+    raise redis.ConnectionError("Connection refused")
+
+
+@contextmanager
+def _deadlock_slot_inserts(times):
+    """Fail the next ``times`` attempt slot inserts the way MySQL reports a deadlock."""
+    raised = []
+
+    def fail(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO quiz_attempt_slots") and len(raised) < times:
+            raised.append(1213)
+            raise sqlite3.OperationalError(1213, "Deadlock found when trying to get lock")
+
+    event.listen(db.engine, "before_cursor_execute", fail)
+    try:
+        yield raised
+    finally:
+        event.remove(db.engine, "before_cursor_execute", fail)
+
+
+def _upgrade(revision_file):
+    """Run one migration's upgrade() against the app database."""
+    path = os.path.join(MIGRATIONS_DIR, "versions", revision_file)
+    spec = importlib.util.spec_from_file_location(revision_file[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with db.engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            module.upgrade()
+
+
+def _start_concurrently(app, quiz_id, user_id):
+    def start():
+        with app.app_context():
+            try:
+                return QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")["attempt_id"]
+            except ConflictError:
+                return None
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=CONCURRENT_STARTS) as pool:
+        futures = [pool.submit(start) for _ in range(CONCURRENT_STARTS)]
+        return [f.result() for f in futures]
+
+
+class TestConcurrentAttemptStart:
+    """Test that concurrent starts cannot create duplicate attempts"""
+
+    def test_concurrent_starts_create_one_attempt(self, file_app, make_teacher_quiz):
+        """Test only one of many simultaneous starts succeeds"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=3)
+
+        results = _start_concurrently(file_app, quiz_id, user_id)
+
+        assert len([r for r in results if r]) == 1
+        assert QuizAttempt.query.filter_by(quiz_id=quiz_id, status="in_progress").count() == 1
+
+    def test_concurrent_starts_respect_max_attempts(self, file_app, make_teacher_quiz):
+        """Test the last allowed attempt is granted exactly once"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=2)
+        first = QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")
+        QuizAnswerService.submit_quiz(first["attempt_id"], user_id)
+
+        results = _start_concurrently(file_app, quiz_id, user_id)
+        attempt_id = next(r for r in results if r)
+        QuizAnswerService.submit_quiz(attempt_id, user_id)
+
+        assert len([r for r in results if r]) == 1
+        with pytest.raises(ConflictError):
+            QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")
+        assert QuizAttempt.query.filter_by(quiz_id=quiz_id).count() == 2
+
+    @pytest.mark.parametrize("failures, started", [(1, True), (2, False)])
+    def test_slot_insert_deadlock_is_retried_once(
+        self, app, make_teacher_quiz, failures, started
+    ):
+        """Test a deadlock creating the slot is retried once, then reported as a conflict"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=1)
+
+        with _deadlock_slot_inserts(failures) as raised:
+            if started:
+                QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")
+            else:
+                with pytest.raises(ConflictError):
+                    QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")
+
+        assert raised == [1213] * failures
+        assert QuizAttempt.query.filter_by(quiz_id=quiz_id).count() == int(started)
+        assert QuizAttemptSlot.query.filter_by(quiz_id=quiz_id).count() == int(started)
+
+
+class TestAutosaveFlushOnSubmit:
+    """Test a submission never discards autosaved answers it could not flush"""
+
+    def test_lock_timeout_fails_submit_and_reopens_buffer(
+        self, app, make_teacher_quiz, monkeypatch
+    ):
+        """Test a flush lock timeout rolls the submission back and reopens the buffer"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=1)
+        attempt_id = QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")["attempt_id"]
+        reopened = []
+        monkeypatch.setattr(QuizAutosaveService, "_redis_client", lambda: redis.Redis())
+        monkeypatch.setattr(QuizAutosaveService, "close", lambda attempt_id: True)
+        monkeypatch.setattr(QuizAutosaveService, "reopen", reopened.append)
+        # Another flush holds the lock for longer than blocking_timeout
+        monkeypatch.setattr(redis.lock.Lock, "acquire", lambda self, *args, **kwargs: False)
+
+        with pytest.raises(ConflictError):
+            QuizAnswerService.submit_quiz(attempt_id, user_id)
+
+        assert reopened == [attempt_id]
+        db.session.remove()
+        attempt = db.session.get(QuizAttempt, attempt_id)
+        assert attempt.status == "in_progress"
+        assert attempt.submitted_at is None
+
+    def test_redis_failure_on_close_fails_submit(self, app, make_teacher_quiz, monkeypatch):
+        """Test a Redis error while closing the buffer is a 503, not 'nothing buffered'"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=1)
+        attempt_id = QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")["attempt_id"]
+        monkeypatch.setattr(QuizAutosaveService, "_redis_client", lambda: redis.Redis())
+        monkeypatch.setattr(redis.commands.core.Script, "__call__", _redis_down)
+
+        with pytest.raises(LMSException) as excinfo:
+            QuizAnswerService.submit_quiz(attempt_id, user_id)
+
+        assert excinfo.value.status_code == 503
+        db.session.remove()
+        assert db.session.get(QuizAttempt, attempt_id).status == "in_progress"
+        slot = db.session.get(QuizAttemptSlot, (quiz_id, user_id))
+        assert slot.active_attempt_id == attempt_id
+        assert slot.completed_attempts == 0
+
+    def test_redis_failure_on_close_defers_expiry(
+        self, app, make_teacher_quiz, add_question, monkeypatch
+    ):
+        """Test the sweep leaves an attempt whose buffer cannot be closed for its next run"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=1, duration_minutes=30)
+        question_id, option_id = add_question(quiz_id)
+        attempt_id = _start_answered(quiz_id, user_id, question_id, option_id, overdue=True)
+        monkeypatch.setattr(QuizAutosaveService, "_redis_client", lambda: redis.Redis())
+        monkeypatch.setattr(redis.commands.core.Script, "__call__", _redis_down)
+
+        summary = QuizAttemptExpiryService.expire_overdue()
+
+        assert summary["expired"] == 0
+        db.session.remove()
+        assert db.session.get(QuizAttempt, attempt_id).status == "in_progress"
+        assert db.session.get(QuizAttemptDeadline, attempt_id) is not None
+
+    def test_lua_scripts_are_registered_once_per_client(self, app):
+        """Test repeated saves reuse the registered script instead of re-hashing it"""
+        client = redis.Redis()
+        script = QuizAutosaveService._script(client, "return 1")
+
+        assert QuizAutosaveService._script(client, "return 1") is script
+        assert QuizAutosaveService._script(redis.Redis(), "return 1") is not script
+
+
+class TestAttemptExpiry:
+    """Test the sweep that auto-submits timed attempts past their deadline"""
+
+    def test_expires_only_overdue_attempts(self, app, make_teacher_quiz, add_question, make_user):
+        """Test overdue attempts are graded as of their deadline and the rest left running"""
+        teacher_id, quiz_id = make_teacher_quiz(max_attempts=1, duration_minutes=30)
+        question_id, option_id = add_question(quiz_id)
+        student_id = make_user("student")
+        overdue_id = _start_answered(quiz_id, teacher_id, question_id, option_id, overdue=True)
+        running_id = _start_answered(quiz_id, student_id, question_id, option_id)
+        deadline = db.session.get(QuizAttemptDeadline, overdue_id).deadline_at
+
+        summary = QuizAttemptExpiryService.expire_overdue()
+
+        assert summary == {"expired": 1, "graded": 1, "batches": 1}
+        db.session.remove()
+        overdue = db.session.get(QuizAttempt, overdue_id)
+        assert overdue.status == "graded"
+        assert overdue.score == 1
+        assert overdue.submitted_at == deadline
+        assert db.session.get(QuizAttemptDeadline, overdue_id) is None
+        slot = db.session.get(QuizAttemptSlot, (quiz_id, teacher_id))
+        assert slot.active_attempt_id is None
+        assert slot.completed_attempts == 1
+
+        assert db.session.get(QuizAttempt, running_id).status == "in_progress"
+        assert db.session.get(QuizAttemptDeadline, running_id) is not None
+
+    def test_submit_racing_sweep_is_finalized_once(
+        self, file_app, make_teacher_quiz, add_question, monkeypatch
+    ):
+        """Test a submission landing between the sweep's select and its claim wins alone"""
+        user_id, quiz_id = make_teacher_quiz(max_attempts=1, duration_minutes=30)
+        question_id, option_id = add_question(quiz_id)
+        attempt_id = _start_answered(quiz_id, user_id, question_id, option_id, overdue=True)
+
+        def submit():
+            with file_app.app_context():
+                try:
+                    return QuizAnswerService.submit_quiz(attempt_id, user_id)
+                finally:
+                    db.session.remove()
+
+        close = QuizAutosaveService.close
+        submissions = []
+
+        def close_after_submit(closing_id):
+            # The sweep has selected the attempt; the student submits now
+            monkeypatch.setattr(QuizAutosaveService, "close", close)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                submissions.append(pool.submit(submit).result())
+            return close(closing_id)
+
+        monkeypatch.setattr(QuizAutosaveService, "close", close_after_submit)
+
+        summary = QuizAttemptExpiryService.expire_overdue()
+
+        assert len(submissions) == 1
+        assert summary["expired"] == 0
+        db.session.remove()
+        attempt = db.session.get(QuizAttempt, attempt_id)
+        assert attempt.status == "graded"
+        assert attempt.submitted_at == datetime.fromisoformat(submissions[0]["submitted_at"])
+        assert QuestionItemStats.query.filter_by(question_id=question_id).one().responses == 1
+        assert db.session.get(QuizAttemptSlot, (quiz_id, user_id)).completed_attempts == 1
+        with pytest.raises(ConflictError):
+            QuizAnswerService.submit_quiz(attempt_id, user_id)
+
+    def test_backfill_adds_deadlines_of_running_timed_attempts(
+        self, file_app, make_teacher_quiz, add_question, make_user, make_course, make_quiz
+    ):
+        """Test the migration gives pre-sweeper attempts a deadline the sweep then honours"""
+        teacher_id, quiz_id = make_teacher_quiz(max_attempts=1, duration_minutes=30)
+        question_id, option_id = add_question(quiz_id)
+        untimed_id = make_quiz(make_course(teacher_id, title="Untimed"), max_attempts=1)
+        started = datetime.utcnow().replace(microsecond=0) - timedelta(hours=2)
+        legacy_id = _start_answered(quiz_id, teacher_id, question_id, option_id)
+        recent_id = _start_answered(quiz_id, make_user("recent"), question_id, option_id)
+        tracked_id = _start_answered(quiz_id, make_user("tracked"), question_id, option_id)
+        untimed_attempt_id = QuizAttemptService.start_attempt(
+            untimed_id, teacher_id, "teacher"
+        )["attempt_id"]
+        db.session.get(QuizAttempt, legacy_id).started_at = started
+        db.session.get(QuizAttempt, recent_id).started_at = started + timedelta(hours=2)
+        QuizAttemptDeadline.query.filter(
+            QuizAttemptDeadline.attempt_id.in_([legacy_id, recent_id])
+        ).delete(synchronize_session=False)
+        tracked_deadline = db.session.get(QuizAttemptDeadline, tracked_id).deadline_at
+        db.session.commit()
+
+        _upgrade("rb004_backfill_attempt_deadlines.py")
+        _upgrade("rb004_backfill_attempt_deadlines.py")
+
+        db.session.remove()
+        deadlines = {row.attempt_id: row.deadline_at for row in QuizAttemptDeadline.query}
+        assert deadlines == {
+            legacy_id: started + timedelta(minutes=30),
+            recent_id: started + timedelta(hours=2, minutes=30),
+            tracked_id: tracked_deadline,
+        }
+        assert untimed_attempt_id not in deadlines
+
+        summary = QuizAttemptExpiryService.expire_overdue()
+
+        assert summary["expired"] == 1
+        db.session.remove()
+        assert db.session.get(QuizAttempt, legacy_id).status == "graded"
+        assert db.session.get(QuizAttempt, recent_id).status == "in_progress"
@@ -0,0 +1,234 @@
+"""
+Tests for vectorized quiz grading and bulk regrading
+"""
+
+import numpy as np
+import pytest
+
+from app import db
+from app.commands import regrade_quiz as regrade_command
+from app.models import AttemptAnswer, ManualGrade, QuestionOption, Quiz, QuizAttempt
+from app.services.quizzes import (
+    QuizAnswerService,
+    QuizAttemptService,
+    QuizGradingService,
+    QuizSnapshotService,
+)
+from app.services.quizzes.quiz_batch_grading_service import BatchAnswerKey, BatchGradingService
+
+
+@pytest.fixture
+def every_type_quiz(app, make_user, make_course, make_quiz, make_question):
+    """
+    Quiz with one question of every type, including a multiple-choice question
+    with two correct options.
+
+    Returns:
+        (quiz_id, {label: question_id}, {option text: option_id})
+    """
+    quiz_id = make_quiz(make_course(make_user("teacher")))
+    specs = {
+        "multiple_choice": ("multiple_choice", {"a": True, "b": False, "c": False}),
+        "multi_correct": ("multiple_choice", {"d": True, "e": True, "f": False}),
+        "multiple_answer": ("multiple_answer", {"g": True, "h": True, "i": False}),
+        "fill_blank": ("fill_blank", {"Paris": True, " New York ": True, "Rome": False}),
+        "matching": ("matching", {"Red": True, "Blue": False}),
+        "short_answer": ("short_answer", None),
+        "essay": ("essay", None),
+    }
+    questions = {
+        label: make_question(quiz_id, question_type, options, points=order, question_order=order)
+        for order, (label, (question_type, options)) in enumerate(specs.items(), start=1)
+    }
+    options = {
+        option.option_text: option.option_id
+        for option in QuestionOption.query.filter(
+            QuestionOption.question_id.in_(questions.values())
+        )
+    }
+    return quiz_id, questions, options
+
+
+def _raw_answers(options) -> dict:
+    """Raw answers per question label, covering normalization and malformed input."""
+    o = options
+    return {
+        "multiple_choice": [
+            o["a"], f"  {o['a']} ", o["b"], "", None, "   ", "not-an-option", o["d"],
+        ],
+        "multi_correct": [o["d"], o["e"], f"{o['e']} ", o["f"], f"{o['d']},{o['e']}", ""],
+        "multiple_answer": [
+            f"{o['g']},{o['h']}", f" {o['h']} , {o['g']} ", f"{o['g']},{o['h']},{o['g']}",
+            o["g"], f"{o['g']},{o['h']},{o['i']}", ",,", f"{o['g']},,{o['h']},", "",
+        ],
+        "fill_blank": [
+            "Paris", "  paris ", "PARIS", "new york", "New  York", "Rome", "Pariss", "", "  ",
+        ],
+        "matching": ["red", " RED", "blue", "Red,Blue", None],
+        "short_answer": ["Paris", "", None],
+        "essay": ["An essay", None],
+    }
+
+
+class TestBatchGradingParity:
+    """Test the vectorized grader agrees with per-answer auto-grading"""
+
+    def test_matches_auto_grade_for_every_question_type(self, every_type_quiz):
+        """Test every raw answer gets the same correctness and points as _auto_grade"""
+        quiz_id, questions, options = every_type_quiz
+        snapshot = QuizSnapshotService.get_snapshot(db.session.get(Quiz, quiz_id))
+        key = BatchAnswerKey.compile(snapshot)
+        raw = _raw_answers(options)
+        rows = max(len(answers) for answers in raw.values())
+        label_of = {question_id: label for label, question_id in questions.items()}
+
+        matrix = np.full((rows, len(key.question_ids)), -1, dtype=np.int64)
+        for col, question_id in enumerate(key.question_ids):
+            for row, answer in enumerate(raw[label_of[question_id]]):
+                matrix[row, col] = key.encode(col, answer)
+        result = BatchGradingService.grade(key, matrix)
+
+        checked = 0
+        for col, question_id in enumerate(key.question_ids):
+            question = snapshot.get_question(question_id)
+            for row, answer in enumerate(raw[label_of[question_id]]):
+                is_correct, points, _ = QuizAnswerService._auto_grade(question, answer)
+                context = (label_of[question_id], answer)
+                if is_correct is None:
+                    # Manual questions are never marked correct by the engine
+                    assert not key.auto_mask[col], context
+                    assert not result.correct[row, col], context
+                    assert result.points_earned[row, col] == 0, context
+                else:
+                    assert bool(result.correct[row, col]) == is_correct, context
+                    assert int(result.points_earned[row, col]) == points, context
+                checked += 1
+
+        assert checked == sum(len(answers) for answers in raw.values())
+        # Each accepted spelling was actually exercised
+        corrects = {
+            label_of[question_id]: int(result.correct[:, col].sum())
+            for col, question_id in enumerate(key.question_ids)
+        }
+        assert corrects == {
+            "multiple_choice": 2, "multi_correct": 3, "multiple_answer": 4,
+            "fill_blank": 4, "matching": 2, "short_answer": 0, "essay": 0,
+        }
+
+
+@pytest.fixture
+def regrade_quiz(app, make_user, make_course, make_quiz, make_question):
+    """
+    Quiz (MCQ 2 points, fill-in 3 points, essay 5 points) with two submitted
+    attempts. The first student's essay is graded 4/5, so their attempt is
+    graded; the second attempt is still waiting for manual grading.
+
+    Returns:
+        (teacher_id, quiz_id, {label: question_id}, {student: attempt_id})
+    """
+    teacher_id = make_user("teacher")
+    quiz_id = make_quiz(make_course(teacher_id), passing_score=50, max_attempts=1)
+    questions = {
+        "mcq": make_question(
+            quiz_id, "multiple_choice", {"a": True, "b": False}, points=2, question_order=1
+        ),
+        "fill": make_question(
+            quiz_id, "fill_blank", {"Paris": True, "London": False}, points=3, question_order=2
+        ),
+        "essay": make_question(quiz_id, "essay", points=5, question_order=3),
+    }
+    option_of = {
+        option.option_text: option.option_id
+        for option in QuestionOption.query.filter(
+            QuestionOption.question_id == questions["mcq"]
+        )
+    }
+
+    attempts = {}
+    for name, mcq, fill in (("first", "b", " london "), ("second", "a", "PARIS")):
+        user_id = make_user(name)
+        attempt_id = QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")["attempt_id"]
+        for label, answer in (("mcq", option_of[mcq]), ("fill", fill), ("essay", "Essay")):
+            QuizAnswerService.save_answer(attempt_id, user_id, questions[label], answer)
+        QuizAnswerService.submit_quiz(attempt_id, user_id)
+        attempts[name] = attempt_id
+
+    essay = AttemptAnswer.query.filter_by(
+        attempt_id=attempts["first"], question_id=questions["essay"]
+    ).one()
+    QuizGradingService.grade_answers_bulk(quiz_id, teacher_id, "teacher", [
+        {"answer_id": essay.answer_id, "points_awarded": 4},
+    ])
+    return teacher_id, quiz_id, questions, attempts
+
+
+def _correct_the_key(quiz_id, questions):
+    """Make option b the MCQ answer and also accept London in the fill-in."""
+    for question_id, text, is_correct in (
+        (questions["mcq"], "a", False),
+        (questions["mcq"], "b", True),
+        (questions["fill"], "London", True),
+    ):
+        QuestionOption.query.filter_by(
+            question_id=question_id, option_text=text
+        ).one().is_correct = is_correct
+    QuizSnapshotService.bump_version(db.session.get(Quiz, quiz_id))
+    db.session.commit()
+
+
+def _grading_state(quiz_id) -> dict:
+    db.session.expire_all()
+    return {
+        "attempts": sorted(
+            (a.attempt_id, a.score, a.total_points, float(a.percentage), a.passed, a.status)
+            for a in QuizAttempt.query.filter_by(quiz_id=quiz_id)
+        ),
+        "answers": sorted(
+            (a.answer_id, a.is_correct, a.points_earned)
+            for a in AttemptAnswer.query.join(QuizAttempt).filter(QuizAttempt.quiz_id == quiz_id)
+        ),
+    }
+
+
+class TestRegradeQuiz:
+    """Test regrading a quiz after its answer key was corrected"""
+
+    def test_dry_run_reports_without_writing(self, regrade_quiz, runner):
+        """Test a dry run counts the changes but leaves every row untouched"""
+        _, quiz_id, questions, _ = regrade_quiz
+        _correct_the_key(quiz_id, questions)
+        before = _grading_state(quiz_id)
+
+        summary = BatchGradingService.regrade_quiz(quiz_id, dry_run=True)
+        output = runner.invoke(regrade_command, [quiz_id, "--dry-run"]).output
+
+        assert summary["attempts_scanned"] == 2
+        assert summary["answers_changed"] == 3
+        assert summary["attempts_changed"] == 2
+        assert "Answers changed: 3" in output
+        assert _grading_state(quiz_id) == before
+
+    def test_regrade_keeps_manual_points(self, regrade_quiz):
+        """Test auto answers are rescored while manually awarded points are preserved"""
+        _, quiz_id, questions, attempts = regrade_quiz
+        _correct_the_key(quiz_id, questions)
+
+        summary = BatchGradingService.regrade_quiz(quiz_id, batch_size=1)
+
+        assert summary["answers_changed"] == 3
+        assert summary["attempts_changed"] == 2
+        db.session.remove()
+        first = db.session.get(QuizAttempt, attempts["first"])
+        assert (first.score, float(first.percentage), first.passed) == (9, 90.0, True)
+        assert first.status == "graded"
+        essay = AttemptAnswer.query.filter_by(
+            attempt_id=attempts["first"], question_id=questions["essay"]
+        ).one()
+        assert essay.points_earned == 4
+        assert ManualGrade.query.filter_by(answer_id=essay.answer_id).one().points_awarded == 4
+        # The second attempt lost its MCQ point and still awaits manual grading
+        second = db.session.get(QuizAttempt, attempts["second"])
+        assert (second.score, second.passed, second.status) == (3, None, "submitted")
+
+        again = BatchGradingService.regrade_quiz(quiz_id)
+        assert (again["answers_changed"], again["attempts_changed"]) == (0, 0)
@@ -0,0 +1,176 @@
+"""
+Tests for manual grading of quiz answers
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.exceptions import AuthorizationError, ValidationError
+from app.models import AttemptAnswer, ManualGrade, QuizAttempt
+from app.services.quizzes import QuizGradingService
+
+
+# Question type -> points of the quiz every test grades
+QUESTION_POINTS = {"multiple_choice": 2, "essay": 5, "short_answer": 3}
+
+
+@pytest.fixture
+def make_graded_quiz(make_course, make_quiz, make_question):
+    """Create a quiz with an auto-graded MCQ, an essay and a short answer."""
+
+    def factory(teacher_id, title="Quiz"):
+        quiz_id = make_quiz(make_course(teacher_id, title=title), title=title, passing_score=50)
+        questions = {
+            question_type: make_question(
+                quiz_id, question_type, points=points, question_order=order
+            )
+            for order, (question_type, points) in enumerate(QUESTION_POINTS.items(), start=1)
+        }
+        return quiz_id, questions
+
+    return factory
+
+
+def _submit(quiz_id, questions, student_id):
+    """Submitted attempt with its MCQ auto-graded and the manual answers pending."""
+    attempt = QuizAttempt(
+        attempt_id=str(uuid.uuid4()), quiz_id=quiz_id, user_id=student_id,
+        status="submitted", submitted_at=datetime.utcnow(),
+    )
+    db.session.add(attempt)
+    answers = {}
+    for question_type, question_id in questions.items():
+        auto = question_type == "multiple_choice"
+        answers[question_type] = AttemptAnswer(
+            answer_id=str(uuid.uuid4()), attempt_id=attempt.attempt_id,
+            question_id=question_id, user_answer=f"{question_type} answer",
+            is_correct=True if auto else None,
+            points_earned=QUESTION_POINTS[question_type] if auto else None,
+        )
+    db.session.add_all(answers.values())
+    return attempt.attempt_id, {t: a.answer_id for t, a in answers.items()}
+
+
+class TestBulkGrading:
+    """Test grading many answers of a quiz in one request"""
+
+    def test_mixed_batch_recalculates_attempts(self, app, make_user, make_graded_quiz):
+        """Test a batch over several attempts updates grades, scores and status"""
+        teacher_id = make_user("teacher")
+        quiz_id, questions = make_graded_quiz(teacher_id)
+        first_id, first = _submit(quiz_id, questions, make_user("first"))
+        second_id, second = _submit(quiz_id, questions, make_user("second"))
+        db.session.commit()
+
+        result = QuizGradingService.grade_answers_bulk(quiz_id, teacher_id, "teacher", [
+            {"answer_id": first["essay"], "points_awarded": 4, "feedback": "Good"},
+            {"answer_id": first["short_answer"], "points_awarded": 3},
+            {"answer_id": second["essay"], "points_awarded": 1},
+        ])
+
+        assert result["graded"] == 3
+        attempts = {a["attempt_id"]: a for a in result["attempts"]}
+        assert attempts[first_id]["score"] == 9
+        assert attempts[first_id]["total_points"] == 10
+        assert attempts[first_id]["percentage"] == 90.0
+        assert attempts[first_id]["status"] == "graded"
+        assert attempts[first_id]["passed"] is True
+        # The second student's short answer is still waiting for a grade
+        assert attempts[second_id]["score"] == 3
+        assert attempts[second_id]["percentage"] == 30.0
+        assert attempts[second_id]["status"] == "submitted"
+        assert ManualGrade.query.count() == 3
+
+        # Regrading replaces the grade and rescores the attempt
+        QuizGradingService.grade_answers_bulk(quiz_id, teacher_id, "teacher", [
+            {"answer_id": first["essay"], "points_awarded": 0},
+        ])
+        db.session.remove()
+        attempt = db.session.get(QuizAttempt, first_id)
+        assert attempt.score == 5
+        assert float(attempt.percentage) == 50.0
+        assert ManualGrade.query.filter_by(answer_id=first["essay"]).one().points_awarded == 0
+
+    def test_rejects_answer_of_another_quiz(self, app, make_user, make_graded_quiz):
+        """Test an answer from another quiz fails the whole batch"""
+        teacher_id = make_user("teacher")
+        quiz_id, questions = make_graded_quiz(teacher_id)
+        other_quiz_id, other_questions = make_graded_quiz(teacher_id, title="Other")
+        attempt_id, answers = _submit(quiz_id, questions, make_user("first"))
+        _, foreign = _submit(other_quiz_id, other_questions, make_user("second"))
+        db.session.commit()
+
+        with pytest.raises(ValidationError):
+            QuizGradingService.grade_answers_bulk(quiz_id, teacher_id, "teacher", [
+                {"answer_id": answers["essay"], "points_awarded": 5},
+                {"answer_id": foreign["essay"], "points_awarded": 5},
+            ])
+
+        assert ManualGrade.query.count() == 0
+        assert db.session.get(QuizAttempt, attempt_id).score is None
+
+    def test_rejects_points_over_maximum(self, app, make_user, make_graded_quiz):
+        """Test points above the question's maximum fail the whole batch"""
+        teacher_id = make_user("teacher")
+        quiz_id, questions = make_graded_quiz(teacher_id)
+        _, answers = _submit(quiz_id, questions, make_user("first"))
+        db.session.commit()
+
+        with pytest.raises(ValidationError, match="exceed"):
+            QuizGradingService.grade_answers_bulk(quiz_id, teacher_id, "teacher", [
+                {"answer_id": answers["short_answer"], "points_awarded": 3},
+                {"answer_id": answers["essay"], "points_awarded": 6},
+            ])
+
+        assert ManualGrade.query.count() == 0
+
+
+class TestGradingQueue:
+    """Test the per-question queue of answers waiting for manual grading"""
+
+    def test_pages_through_ungraded_manual_answers(self, app, make_user, make_graded_quiz):
+        """Test only pending essay/short answers are queued, each exactly once"""
+        teacher_id = make_user("teacher")
+        quiz_id, questions = make_graded_quiz(teacher_id)
+        pending = []
+        for name in ("first", "second", "third"):
+            _, answers = _submit(quiz_id, questions, make_user(name))
+            pending += [answers["essay"], answers["short_answer"]]
+        in_progress_id, _ = _submit(quiz_id, questions, make_user("fourth"))
+        db.session.get(QuizAttempt, in_progress_id).status = "in_progress"
+        db.session.commit()
+        QuizGradingService.grade_answers_bulk(quiz_id, teacher_id, "teacher", [
+            {"answer_id": pending.pop(0), "points_awarded": 5},
+        ])
+
+        seen, question_types, cursor = [], [], None
+        while True:
+            page = QuizGradingService.get_grading_queue(
+                quiz_id, teacher_id, "teacher", limit=2, cursor=cursor
+            )
+            for question in page["questions"]:
+                for answer in question["answers"]:
+                    question_types.append(question["question_type"])
+                    seen.append(answer["answer_id"])
+            assert sum(len(q["answers"]) for q in page["questions"]) <= 2
+            if not page["has_more"]:
+                assert page["next_cursor"] is None
+                break
+            cursor = page["next_cursor"]
+
+        assert len(seen) == len(set(seen)) == 5
+        assert set(seen) == set(pending)
+        # Grouped question by question, in question order
+        assert question_types == ["essay"] * 2 + ["short_answer"] * 3
+
+    def test_rejects_non_owner(self, app, make_user, make_graded_quiz):
+        """Test another teacher cannot read the queue"""
+        quiz_id, _ = make_graded_quiz(make_user("teacher"))
+        other_teacher_id = make_user("other")
+        db.session.commit()
+
+        with pytest.raises(AuthorizationError):
+            QuizGradingService.get_grading_queue(quiz_id, other_teacher_id, "teacher")
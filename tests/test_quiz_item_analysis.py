@@ -0,0 +1,203 @@
+"""
+Tests for the per-question item-analysis store
+"""
+
+import pytest
+
+from app import db
+from app.models import QuestionItemStats, QuestionOption, Quiz, QuizAttempt
+from app.services.quizzes import (
+    ItemAnalysisService,
+    QuizAnalyticsService,
+    QuizAnswerService,
+    QuizAttemptService,
+)
+
+# Student -> (MCQ option picked, multiple-answer options picked)
+RESPONSES = {
+    "ann": ("a", "x,y"),
+    "ben": ("a", "y"),
+    "cat": ("b", "x,y"),
+    "dan": ("c", "z"),
+    "eve": ("a", "x,y"),
+    "fay": ("b", "x"),
+}
+
+
+@pytest.fixture
+def item_quiz(app, make_user, make_course, make_quiz, make_question):
+    """
+    Quiz with a single-answer and a multi-answer option question.
+
+    Returns:
+        (teacher_id, quiz_id, {question_type: question_id}, {option text: option_id})
+    """
+    teacher_id = make_user("teacher")
+    quiz_id = make_quiz(make_course(teacher_id), max_attempts=1)
+    questions = {
+        "multiple_choice": make_question(
+            quiz_id, "multiple_choice", {"a": True, "b": False, "c": False},
+            points=1, question_order=1,
+        ),
+        "multiple_answer": make_question(
+            quiz_id, "multiple_answer", {"x": True, "y": True, "z": False},
+            points=1, question_order=2,
+        ),
+    }
+    options = {
+        option.option_text: option.option_id
+        for option in QuestionOption.query.filter(
+            QuestionOption.question_id.in_(questions.values())
+        )
+    }
+    return teacher_id, quiz_id, questions, options
+
+
+def _submit_all(quiz_id, questions, options, make_user, responses=RESPONSES):
+    for name, (choice, picks) in responses.items():
+        user_id = make_user(name)
+        attempt_id = QuizAttemptService.start_attempt(quiz_id, user_id, "teacher")["attempt_id"]
+        QuizAnswerService.save_answer(
+            attempt_id, user_id, questions["multiple_choice"], options[choice]
+        )
+        QuizAnswerService.save_answer(
+            attempt_id, user_id, questions["multiple_answer"],
+            ",".join(options[pick] for pick in picks.split(",")), time_taken_seconds=10,
+        )
+        QuizAnswerService.submit_quiz(attempt_id, user_id)
+
+
+def _stored(question_id) -> dict:
+    """Every stored column of a question's row, read fresh from the database."""
+    db.session.expire_all()
+    row = db.session.get(QuestionItemStats, question_id)
+    return {
+        column.name: getattr(row, column.name)
+        for column in QuestionItemStats.__table__.columns
+        if column.name != "updated_at"
+    }
+
+
+def _assert_same(incremental: dict, rebuilt: dict):
+    assert incremental.keys() == rebuilt.keys()
+    for column, value in rebuilt.items():
+        if column == "distractor_counts":
+            assert {k: v for k, v in incremental[column].items() if v} == value
+        elif isinstance(value, float):
+            assert incremental[column] == pytest.approx(value), column
+        else:
+            assert incremental[column] == value, column
+
+
+class TestIncrementalItemStats:
+    """Test submissions keep the store equal to a from-scratch rebuild"""
+
+    def test_submissions_match_rebuild(self, item_quiz, make_user):
+        """Test stats folded in per submission equal a batch recompute of the quiz"""
+        _, quiz_id, questions, options = item_quiz
+
+        _submit_all(quiz_id, questions, options, make_user)
+
+        mcq = _stored(questions["multiple_choice"])
+        assert mcq["responses"] == 6
+        assert mcq["correct_responses"] == 3
+        assert mcq["distractor_counts"] == {
+            options["a"]: 3, options["b"]: 2, options["c"]: 1,
+        }
+        assert sum(mcq["score_histogram"]) == 6
+        multi = _stored(questions["multiple_answer"])
+        assert multi["correct_responses"] == 3
+        assert multi["time_sum"] == 60
+
+        incremental = {qid: _stored(qid) for qid in questions.values()}
+        ItemAnalysisService.recompute_quiz(quiz_id)
+        for question_id in questions.values():
+            _assert_same(incremental[question_id], _stored(question_id))
+
+    def test_regrade_moves_attempt_between_buckets(self, item_quiz, make_user):
+        """Test removing and re-adding an attempt with a new score matches a rebuild"""
+        _, quiz_id, questions, options = item_quiz
+        _submit_all(quiz_id, questions, options, make_user)
+
+        attempt = QuizAttempt.query.filter_by(quiz_id=quiz_id, percentage=100).first()
+        quiz = db.session.get(Quiz, quiz_id)
+        ItemAnalysisService.record_attempt(attempt, quiz, sign=-1)
+        attempt.percentage = 0
+        ItemAnalysisService.record_attempt(attempt, quiz)
+        db.session.commit()
+
+        incremental = {qid: _stored(qid) for qid in questions.values()}
+        ItemAnalysisService.recompute_quiz(quiz_id)
+        for question_id in questions.values():
+            _assert_same(incremental[question_id], _stored(question_id))
+
+    def test_row_created_concurrently_gets_the_delta(self, item_quiz, make_user, monkeypatch):
+        """Test losing the race to create a row rolls back only the savepoint"""
+        _, quiz_id, questions, options = item_quiz
+        _submit_all(quiz_id, questions, options, make_user, {"ann": ("a", "x,y")})
+        apply_delta = ItemAnalysisService._apply_delta
+        missed = []
+
+        def miss_first_update(question_id, values):
+            # The row did not exist yet when this submission first looked
+            if question_id not in missed:
+                missed.append(question_id)
+                return 0
+            return apply_delta(question_id, values)
+
+        monkeypatch.setattr(ItemAnalysisService, "_apply_delta", miss_first_update)
+
+        _submit_all(quiz_id, questions, options, make_user, {"ben": ("b", "z")})
+
+        assert sorted(missed) == sorted(questions.values())
+        assert QuizAttempt.query.filter_by(quiz_id=quiz_id, status="graded").count() == 2
+        mcq = _stored(questions["multiple_choice"])
+        assert mcq["responses"] == 2
+        assert mcq["distractor_counts"] == {options["a"]: 1, options["b"]: 1}
+
+
+class TestItemStatsRebuild:
+    """Test rebuilding and reading questions without a stored row"""
+
+    def test_recompute_recreates_deleted_rows(self, item_quiz, make_user):
+        """Test a batch recompute rebuilds rows identical to the incremental ones"""
+        _, quiz_id, questions, options = item_quiz
+        _submit_all(quiz_id, questions, options, make_user)
+        incremental = {qid: _stored(qid) for qid in questions.values()}
+        QuestionItemStats.query.delete()
+        db.session.commit()
+
+        result = ItemAnalysisService.recompute_quiz(quiz_id)
+
+        assert result == {"quiz_id": quiz_id, "questions": 2, "responses": 12}
+        for question_id in questions.values():
+            _assert_same(incremental[question_id], _stored(question_id))
+
+    def test_analytics_read_without_row_does_not_write(self, item_quiz, make_user):
+        """Test a GET on a question without a stored row computes it without persisting"""
+        teacher_id, quiz_id, questions, options = item_quiz
+        _submit_all(quiz_id, questions, options, make_user)
+        QuestionItemStats.query.delete()
+        db.session.commit()
+
+        analytics = QuizAnalyticsService.get_question_analytics(
+            questions["multiple_choice"], teacher_id, "teacher"
+        )
+
+        assert analytics["total_attempts"] == 6
+        assert analytics["correct_attempts"] == 3
+        assert analytics["distractor_counts"][options["b"]] == 2
+        assert not db.session.new and not db.session.dirty
+        db.session.rollback()
+        assert QuestionItemStats.query.count() == 0
+
+    def test_first_response_materializes_row(self, item_quiz, make_user):
+        """Test the first graded attempt creates the rows with that attempt counted once"""
+        _, quiz_id, questions, options = item_quiz
+
+        _submit_all(quiz_id, questions, options, make_user, {"ann": ("b", "x,y")})
+
+        mcq = _stored(questions["multiple_choice"])
+        assert mcq["responses"] == 1
+        assert mcq["correct_responses"] == 0
+        assert mcq["distractor_counts"] == {options["b"]: 1}
@@ -0,0 +1,122 @@
+"""
+Tests for streamed quiz results exports
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import AttemptAnswer, QuizAttempt
+from app.services.quizzes import QuizResultsExportService
+
+
+@pytest.fixture
+def quiz_results(app, make_user, make_course, make_quiz, make_question):
+    """
+    Quiz with two questions, two submitted attempts (one of them answered only
+    the first question) and one attempt still in progress.
+
+    Returns:
+        (teacher_id, quiz_id)
+    """
+    teacher_id = make_user("teacher")
+    quiz_id = make_quiz(make_course(teacher_id))
+    question_ids = [
+        make_question(quiz_id, question_type, points=points, question_order=order)
+        for order, (question_type, points) in enumerate(
+            [("multiple_choice", 1), ("essay", 4)], start=1
+        )
+    ]
+
+    started_at = datetime(2026, 1, 5, 9, 0)
+    for offset, (name, status, answered) in enumerate(
+        [("first", "graded", 2), ("second", "submitted", 1), ("third", "in_progress", 2)]
+    ):
+        attempt = QuizAttempt(
+            attempt_id=str(uuid.uuid4()), quiz_id=quiz_id,
+            user_id=make_user(name, last_name="Student"),
+            status=status, started_at=started_at,
+            submitted_at=(
+                started_at + timedelta(minutes=10 + offset) if status != "in_progress" else None
+            ),
+            score=1, total_points=5, percentage=20,
+        )
+        db.session.add(attempt)
+        db.session.add_all(
+            AttemptAnswer(
+                answer_id=str(uuid.uuid4()), attempt_id=attempt.attempt_id,
+                question_id=question_id, user_answer=f"{name} answer {index}",
+                is_correct=index == 1 or None, points_earned=1 if index == 1 else None,
+            )
+            for index, question_id in enumerate(question_ids[:answered], start=1)
+        )
+    db.session.commit()
+    return teacher_id, quiz_id
+
+
+def _decode(fmt, chunks):
+    """Decode an export into (column names, rows as dicts)."""
+    if fmt == "parquet":
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pq.read_table(io.BytesIO(b"".join(chunks)))
+        return table.column_names, table.to_pylist()
+    text = "".join(chunks)
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        return reader.fieldnames, list(reader)
+    rows = [json.loads(line) for line in text.splitlines()]
+    return list(rows[0]), rows
+
+
+class TestResultsExport:
+    """Test every export format decodes to the expected rows and columns"""
+
+    @pytest.mark.parametrize("fmt", ["csv", "jsonl", "parquet"])
+    def test_long_layout(self, quiz_results, fmt):
+        """Test the long layout has one row per answer of a submitted attempt"""
+        teacher_id, quiz_id = quiz_results
+
+        export = QuizResultsExportService.export_results(quiz_id, teacher_id, "teacher", fmt)
+        columns, rows = _decode(fmt, export["chunks"])
+
+        assert export["filename"].endswith(f"-long.{fmt}")
+        assert columns[-7:] == [
+            "question_id", "question_order", "question_type", "user_answer",
+            "is_correct", "points_earned", "time_taken_seconds",
+        ]
+        assert len(rows) == 3
+        assert [row["email"] for row in rows] == [
+            "first@example.com", "first@example.com", "second@example.com",
+        ]
+        assert [row["user_answer"] for row in rows] == [
+            "first answer 1", "first answer 2", "second answer 1",
+        ]
+
+    @pytest.mark.parametrize("fmt", ["csv", "jsonl", "parquet"])
+    def test_wide_layout(self, quiz_results, fmt):
+        """Test the wide layout has one row per attempt with q<N>_* question columns"""
+        teacher_id, quiz_id = quiz_results
+
+        export = QuizResultsExportService.export_results(
+            quiz_id, teacher_id, "teacher", fmt, layout="wide"
+        )
+        columns, rows = _decode(fmt, export["chunks"])
+
+        assert columns[-6:] == [
+            "q1_answer", "q1_correct", "q1_points", "q2_answer", "q2_correct", "q2_points",
+        ]
+        assert "question_id" not in columns
+        assert len(rows) == 2
+        first, second = rows
+        assert first["student_name"] == "first Student"
+        assert first["q1_answer"] == "first answer 1"
+        assert first["q2_answer"] == "first answer 2"
+        assert second["q1_answer"] == "second answer 1"
+        # An unanswered question leaves its columns empty
+        assert second["q2_answer"] in (None, "")
+        assert second["q2_points"] in (None, "")
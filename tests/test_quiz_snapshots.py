@@ -0,0 +1,115 @@
+"""
+Tests for compiled quiz snapshots and their versioning
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models import Quiz
+from app.services.quizzes import QuestionService, QuizSnapshotService
+from app.services.quizzes.quiz_snapshot_service import QuizSnapshot
+
+
+@pytest.fixture
+def snapshot_quiz(app, make_user, make_course, make_quiz, make_question):
+    """
+    Quiz with one multiple-choice question.
+
+    Returns:
+        (teacher_id, quiz_id, question_id)
+    """
+    teacher_id = make_user("teacher")
+    quiz_id = make_quiz(make_course(teacher_id))
+    question_id = make_question(
+        quiz_id, "multiple_choice", {"a": True, "b": False}, question_text="First"
+    )
+    return teacher_id, quiz_id, question_id
+
+
+def _snapshot(quiz_id) -> QuizSnapshot:
+    db.session.expire_all()
+    return QuizSnapshotService.get_snapshot(db.session.get(Quiz, quiz_id))
+
+
+def _texts(snapshot) -> list:
+    return [question.question_text for question in snapshot.questions]
+
+
+class TestSnapshotVersioning:
+    """Test question edits through QuestionService publish a new snapshot"""
+
+    def test_question_changes_bump_version(self, snapshot_quiz):
+        """Test create, update and delete each give the next read a fresh snapshot"""
+        teacher_id, quiz_id, question_id = snapshot_quiz
+        versions = []
+        original = _snapshot(quiz_id)
+        versions.append(original.version)
+        assert _texts(original) == ["First"]
+
+        created = QuestionService.create_question(
+            quiz_id, teacher_id, "teacher", "essay", "Second", question_order=2,
+        )
+        snapshot = _snapshot(quiz_id)
+        versions.append(snapshot.version)
+        assert _texts(snapshot) == ["First", "Second"]
+
+        QuestionService.update_question(
+            question_id, teacher_id, "teacher", points=5,
+            options=[
+                {"option_text": "a", "is_correct": False},
+                {"option_text": "b", "is_correct": True},
+            ],
+        )
+        snapshot = _snapshot(quiz_id)
+        versions.append(snapshot.version)
+        updated = snapshot.get_question(question_id)
+        assert updated.points == 5
+        assert {o.option_text for o in updated.options if o.is_correct} == {"b"}
+
+        QuestionService.delete_question(created["question_id"], teacher_id, "teacher")
+        snapshot = _snapshot(quiz_id)
+        versions.append(snapshot.version)
+        assert _texts(snapshot) == ["First"]
+
+        assert versions == sorted(set(versions))
+        # The snapshot read before the edits is unchanged
+        assert _texts(original) == ["First"]
+        assert original.get_question(question_id).points == 1
+
+    def test_bump_version_advances_within_one_second(self, snapshot_quiz):
+        """Test repeated bumps in the same second still yield distinct versions"""
+        _, quiz_id, _ = snapshot_quiz
+        quiz = db.session.get(Quiz, quiz_id)
+        quiz.updated_at = datetime.utcnow().replace(microsecond=999999)
+        versions = {QuizSnapshotService._version_of(quiz)}
+
+        for _ in range(3):
+            QuizSnapshotService.bump_version(quiz)
+            versions.add(QuizSnapshotService._version_of(quiz))
+
+        assert len(versions) == 4
+        assert quiz.updated_at.microsecond == 0
+
+
+class TestSnapshotSerialization:
+    """Test the JSON form shared through Redis"""
+
+    def test_json_round_trip(self, snapshot_quiz, make_question):
+        """Test from_json(to_json()) rebuilds an equal snapshot with its answer keys"""
+        _, quiz_id, question_id = snapshot_quiz
+        make_question(
+            quiz_id, "fill_blank", {" Paris ": True, "Rome": False},
+            points=3, question_order=2, explanation="Capital",
+        )
+        snapshot = QuizSnapshotService.compile_snapshot(quiz_id, "v1")
+
+        restored = QuizSnapshot.from_json(snapshot.to_json())
+
+        assert restored == snapshot
+        assert restored.total_points == snapshot.total_points
+        assert restored.get_question(question_id) == snapshot.get_question(question_id)
+        fill = restored.questions[1]
+        assert fill.correct_texts == frozenset({"paris"})
+        assert fill.explanation == "Capital"
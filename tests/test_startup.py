@@ -0,0 +1,49 @@
+"""
+Tests for worker start-up cost
+"""
+
+import os
+import subprocess
+import sys
+
+from app.utils.startup import parse_importtime
+
+# Loaded on first use, never by create_app
+LAZY_MODULES = ("alembic", "flask_migrate", "numpy", "requests", "smtplib")
+
+
+class TestStartup:
+    """Test what building the app imports"""
+
+    def test_create_app_skips_lazy_modules(self):
+        """Test a worker builds the app without loading the lazily imported libraries"""
+        script = (
+            "import sys\n"
+            "from app import create_app\n"
+            "create_app('testing')\n"
+            f"print(sorted(m for m in {LAZY_MODULES!r} if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=dict(os.environ, SKIP_AUTO_INIT="true"),
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split("\n")[-2] == "[]"
+
+    def test_parse_importtime(self):
+        """Test -X importtime output is parsed into per-module timings"""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     _io\n"
+            "import time:      1500 |       2000 |   app.models\n"
+            "import time:       300 |       2300 | app\n"
+        )
+        modules = parse_importtime(output)
+        assert [m["module"] for m in modules] == ["_io", "app.models", "app"]
+        assert [m["depth"] for m in modules] == [2, 1, 0]
+        assert modules[1]["self_ms"] == 1.5
+        assert modules[2]["cumulative_ms"] == 2.3